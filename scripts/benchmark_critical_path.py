@@ -0,0 +1,86 @@
+"""Benchmark the sweep-line critical path engine on a large trace.
+
+Builds a trace of deep chains hanging off a wide concurrent fan-out (by
+default 1000 chains of 200 nested spans: 200k spans), times
+`compute_critical_path` on its `TraceFrame`, and exits non-zero when the best
+run exceeds `--budget` seconds.
+
+Usage:
+    uv run python scripts/benchmark_critical_path.py [--chains 1000]
+        [--depth 200] [--repeat 3] [--budget 1.0]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+try:
+    from sre_agent.tools.common.trace_frame import TraceFrame
+    from sre_agent.tools.common.trace_index import compute_critical_path
+except ImportError:
+    # Handle running from root
+    sys.path.append(os.getcwd())
+    from sre_agent.tools.common.trace_frame import TraceFrame
+    from sre_agent.tools.common.trace_index import compute_critical_path
+
+
+def build_spans(chains: int, depth: int) -> list[dict[str, Any]]:
+    """Build `chains` chains of `depth` nested spans below one root.
+
+    The span of chain c at `level` runs from `level` to `chains + c - level`
+    ms, so the chains overlap and the last one is on the critical path.
+    """
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ms = [base + timedelta(milliseconds=i) for i in range(2 * chains + 1)]
+    spans: list[dict[str, Any]] = [
+        {"span_id": "root", "name": "root", "start_time": ms[0], "end_time": ms[-1]}
+    ]
+    for chain in range(chains):
+        parent = "root"
+        for level in range(depth):
+            span_id = f"c{chain}-{level}"
+            spans.append(
+                {
+                    "span_id": span_id,
+                    "parent_span_id": parent,
+                    "name": f"op{level}",
+                    "start_time": ms[level],
+                    "end_time": ms[chains + chain - level],
+                }
+            )
+            parent = span_id
+    return spans
+
+
+def main() -> None:
+    """Run the benchmark and fail if it is over budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chains", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=1.0)
+    args = parser.parse_args()
+    if args.depth >= args.chains:
+        parser.error("--depth must be smaller than --chains")
+
+    frame = TraceFrame.from_dict({"spans": build_spans(args.chains, args.depth)})
+    best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        path = compute_critical_path(frame)
+        best = min(best, time.perf_counter() - started)
+
+    if path is None or frame.spans[path.rows[1]]["span_id"] != f"c{args.chains - 1}-0":
+        print("FAIL: unexpected critical path")
+        sys.exit(1)
+    print(f"critical path of {len(frame):,} spans: {best:.3f}s (best of {args.repeat})")
+    if best > args.budget:
+        print(f"FAIL: took {best:.3f}s, budget is {args.budget:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
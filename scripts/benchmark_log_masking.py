@@ -0,0 +1,132 @@
+"""Benchmark Drain3 log masking: sequential instructions vs one fused regex.
+
+Masks GKE-like log messages (request logs, gRPC/DB errors, kubelet and
+controller lines, JSON access logs) with Drain3's `LogMasker`, which runs
+each masking instruction in turn, and with `FusedLogMasker`, and reports
+messages per second for masking alone and for full template mining.
+
+Usage:
+    uv run python scripts/benchmark_log_masking.py [--size 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from drain3.masking import LogMasker
+
+try:
+    from sre_agent.tools.analysis.logs.masking import (
+        MASKING_INSTRUCTIONS,
+        FusedLogMasker,
+    )
+    from sre_agent.tools.analysis.logs.patterns import LogPatternExtractor
+except ImportError:
+    # Handle running from root
+    sys.path.append(os.getcwd())
+    from sre_agent.tools.analysis.logs.masking import (
+        MASKING_INSTRUCTIONS,
+        FusedLogMasker,
+    )
+    from sre_agent.tools.analysis.logs.patterns import LogPatternExtractor
+
+_TEMPLATES = [
+    "{ts} INFO  [checkout-{pod}] POST /api/v1/orders/{uuid} 200 {ms}ms",
+    "GET /healthz 200 {int}ms remote={ip} user_agent=kube-probe/1.29",
+    "upstream connect error or disconnect/reset before headers. "
+    "reset reason: connection failure, transport failure reason: "
+    "delayed connect error: 111 to {ip}:8080",
+    'rpc error: code = Unavailable desc = connection error: desc = "transport: '
+    'Error while dialing dial tcp {ip}:5432: connect: connection refused"',
+    "Pulling image gcr.io/my-project/frontend@sha256:{hex}",
+    "Successfully assigned default/payments-{pod} to gke-prod-pool-1-{node}",
+    "Liveness probe failed: Get http://{ip}:8080/healthz: "
+    "context deadline exceeded (Client.Timeout exceeded) after {ms}ms",
+    "trace_id={hex32} span_id={span} Query SELECT * FROM orders WHERE id = $1 "
+    "took {ms}ms",
+    '{{"level":"error","msg":"payment declined","user":"jane@example.com",'
+    '"order":"{uuid}","at":"{date} {time}"}}',
+    "Readiness probe failed: HTTP probe failed with statuscode: 503",
+    "I{date} {time}.{int} 1 reflector.go:255] Listing and watching "
+    "*v1.Pod from k8s.io/client-go/informers/factory.go:150",
+    "Scaled up replica set cart-{pod} to {int}",
+]
+
+
+def build_messages(size: int, seed: int = 7) -> list[str]:
+    """Build `size` GKE-like log messages."""
+    rng = random.Random(seed)
+    messages = []
+    for i in range(size):
+        template = _TEMPLATES[rng.randrange(len(_TEMPLATES))]
+        messages.append(
+            template.format(
+                ts=f"2024-05-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i % 60:02d}",
+                date=f"2024-05-{1 + i % 28:02d}",
+                time=f"{i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}",
+                pod=f"{rng.getrandbits(40):010x}"[:10],
+                node=f"{rng.getrandbits(16):04x}",
+                uuid=uuid.UUID(int=rng.getrandbits(128)),
+                hex=f"{rng.getrandbits(256):064x}",
+                hex32=f"{rng.getrandbits(128):032x}",
+                span=rng.getrandbits(63),
+                ip=".".join(str(rng.randrange(256)) for _ in range(4)),
+                ms=f"{rng.random() * 900:.2f}",
+                int=rng.randrange(1, 5000),
+            )
+        )
+    return messages
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _mine_all(masker: LogMasker, messages: list[str]) -> None:
+    extractor = LogPatternExtractor()
+    extractor.miner.masker = masker
+    for message in messages:
+        extractor.miner.add_log_message(message)
+
+
+def main() -> None:
+    """Run the benchmark and print messages per second per masker."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = build_messages(args.size)
+    sequential = LogMasker(MASKING_INSTRUCTIONS, "<", ">")
+    fused = FusedLogMasker("<", ">")
+
+    mismatches = sum(sequential.mask(m) != fused.mask(m) for m in messages)
+    print(f"{args.size} messages, {mismatches} masked differently")
+
+    cases: list[tuple[str, Callable[[LogMasker], Any]]] = [
+        ("mask", lambda masker: [masker.mask(m) for m in messages]),
+        ("mask + mine", lambda masker: _mine_all(masker, messages)),
+    ]
+    print(f"{'stage':<14} {'sequential':>14} {'fused':>14} {'speedup':>9}")
+    for label, run in cases:
+        sequential_s = _best_of(partial(run, sequential), args.repeat)
+        fused_s = _best_of(partial(run, fused), args.repeat)
+        print(
+            f"{label:<14} {args.size / sequential_s:>10,.0f} m/s "
+            f"{args.size / fused_s:>10,.0f} m/s {sequential_s / fused_s:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
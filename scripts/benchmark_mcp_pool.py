@@ -0,0 +1,127 @@
+"""Benchmark MCP tool calls with a new toolset per call vs the toolset pool.
+
+Uses `MockMcpToolset` as the MCP server, with a simulated session handshake
+(paid when a new toolset first lists its tools) and tool latency, and reports
+calls per second for sequential and concurrent calls. "per call" opens and
+closes a toolset around every call, as `call_mcp_tool_with_retry` used to;
+"pooled" goes through `call_mcp_tool_with_retry` and the MCP toolset pool.
+
+Usage:
+    uv run python scripts/benchmark_mcp_pool.py [--calls 200] [--handshake-ms 150]
+        [--tool-ms 20] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any
+
+try:
+    from sre_agent.tools.mcp.gcp import call_mcp_tool_with_retry
+    from sre_agent.tools.mcp.mock_mcp import MockMcpTool, MockMcpToolset
+    from sre_agent.tools.mcp.pool import get_mcp_toolset_pool
+except ImportError:
+    # Handle running from root
+    sys.path.append(os.getcwd())
+    from sre_agent.tools.mcp.gcp import call_mcp_tool_with_retry
+    from sre_agent.tools.mcp.mock_mcp import MockMcpTool, MockMcpToolset
+    from sre_agent.tools.mcp.pool import get_mcp_toolset_pool
+
+# The mock tools ignore the ADK tool context.
+_NO_CONTEXT: Any = None
+
+
+class _SlowMockTool(MockMcpTool):
+    def __init__(self, name: str, latency_s: float) -> None:
+        super().__init__(name)
+        self.latency_s = latency_s
+
+    async def run_async(
+        self, args: dict[str, Any], tool_context: Any
+    ) -> dict[str, Any]:
+        await asyncio.sleep(self.latency_s)
+        return await super().run_async(args, tool_context)
+
+
+class _SlowMockToolset(MockMcpToolset):
+    """Mock toolset whose first `get_tools()` pays a session handshake."""
+
+    handshakes = 0
+
+    def __init__(self, handshake_s: float, tool_s: float) -> None:
+        self.handshake_s = handshake_s
+        self.tool_s = tool_s
+        self.connected = False
+
+    async def get_tools(self) -> list[MockMcpTool]:
+        if not self.connected:
+            await asyncio.sleep(self.handshake_s)
+            self.connected = True
+            _SlowMockToolset.handshakes += 1
+        tools = await super().get_tools()
+        return [_SlowMockTool(tool.name, self.tool_s) for tool in tools]
+
+
+async def _call_per_toolset(create: Any, args: dict[str, Any]) -> None:
+    toolset = create(None)
+    try:
+        for tool in await toolset.get_tools():
+            if tool.name == "list_log_entries":
+                await tool.run_async(args=args, tool_context=_NO_CONTEXT)
+    finally:
+        await toolset.close()
+
+
+async def _call_pooled(create: Any, args: dict[str, Any]) -> None:
+    result = await call_mcp_tool_with_retry(
+        create, "list_log_entries", args, _NO_CONTEXT, project_id="bench"
+    )
+    assert result["status"] == "success", result
+
+
+async def _run(mode: str, calls: int, concurrency: int, create: Any) -> float:
+    call = _call_pooled if mode == "pooled" else _call_per_toolset
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await call(create, {"filter": f"severity>=ERROR AND seq={i}"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    await get_mcp_toolset_pool().close()
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark and print calls per second per mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=150.0)
+    parser.add_argument("--tool-ms", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    def create(project_id: str | None) -> _SlowMockToolset:
+        return _SlowMockToolset(args.handshake_ms / 1e3, args.tool_ms / 1e3)
+
+    print(
+        f"{args.calls} calls, handshake {args.handshake_ms:.0f}ms, "
+        f"tool {args.tool_ms:.0f}ms"
+    )
+    print(f"{'mode':<10} {'concurrency':>11} {'calls/s':>9} {'handshakes':>11}")
+    for concurrency in (1, args.concurrency):
+        for mode in ("per call", "pooled"):
+            _SlowMockToolset.handshakes = 0
+            elapsed = asyncio.run(_run(mode, args.calls, concurrency, create))
+            print(
+                f"{mode:<10} {concurrency:>11} {args.calls / elapsed:>9,.1f} "
+                f"{_SlowMockToolset.handshakes:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Benchmark the raw-protobuf conversion of Cloud API responses.
+
+Compares the attribute-based conversion over proto-plus wrappers (what the
+clients did before `sre_agent.tools.common.proto_convert`) with the raw
+message path, on a 10k-span trace, a 10k-point time series and a 10k-entry
+log page.
+
+Usage:
+    uv run python scripts/benchmark_proto_convert.py [--size 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from google.cloud import logging_v2, monitoring_v3, trace_v1
+
+try:
+    from sre_agent.tools.common.proto_convert import (
+        log_entry_to_dict,
+        raw_message,
+        time_series_to_dict,
+        trace_span_columns,
+    )
+    from sre_agent.tools.common.trace_frame import datetime_to_ns
+except ImportError:
+    # Handle running from root
+    sys.path.append(os.getcwd())
+    from sre_agent.tools.common.proto_convert import (
+        log_entry_to_dict,
+        raw_message,
+        time_series_to_dict,
+        trace_span_columns,
+    )
+    from sre_agent.tools.common.trace_frame import datetime_to_ns
+
+_BASE_SECONDS = 1_700_000_000
+
+
+def _timestamp(i: int) -> dict[str, int]:
+    return {"seconds": _BASE_SECONDS + i // 1000, "nanos": (i % 1000) * 1_000_000}
+
+
+def build_trace(size: int) -> trace_v1.Trace:
+    """Build a proto-plus trace with `size` spans."""
+    spans = [
+        {
+            "span_id": i + 1,
+            "parent_span_id": (i + 1) // 2 if i else 0,
+            "name": f"op-{i % 50}",
+            "start_time": _timestamp(i),
+            "end_time": _timestamp(i + 3),
+            "labels": {"/component": "grpc", "/http/status_code": "200"},
+        }
+        for i in range(size)
+    ]
+    return trace_v1.Trace(project_id="bench", trace_id="a" * 32, spans=spans)
+
+
+def build_time_series(size: int) -> monitoring_v3.TimeSeries:
+    """Build a proto-plus time series with `size` points."""
+    points = [
+        {
+            "interval": {"end_time": _timestamp(i * 60_000)},
+            "value": {"double_value": i * 0.5},
+        }
+        for i in range(size)
+    ]
+    return monitoring_v3.TimeSeries(
+        metric={"type": "custom.googleapis.com/bench", "labels": {"k": "v"}},
+        resource={"type": "gce_instance", "labels": {"instance_id": "1"}},
+        points=points,
+    )
+
+
+def build_log_page(size: int) -> logging_v2.types.ListLogEntriesResponse:
+    """Build a proto-plus log page with `size` text entries."""
+    entries = [
+        {
+            "timestamp": _timestamp(i),
+            "severity": 500,
+            "text_payload": f"request {i} failed",
+            "resource": {"type": "k8s_container", "labels": {"pod": f"p-{i % 7}"}},
+            "insert_id": str(i),
+        }
+        for i in range(size)
+    ]
+    return logging_v2.types.ListLogEntriesResponse(entries=entries)
+
+
+def legacy_trace(trace: Any) -> list[dict[str, Any]]:
+    """Attribute-based span extraction (previous `TraceFrame.from_proto`)."""
+    spans = []
+    for span in trace.spans:
+        start_dt = span.start_time
+        end_dt = span.end_time
+        spans.append(
+            {
+                "span_id": span.span_id,
+                "name": span.name,
+                "start_time": start_dt.isoformat() if start_dt else None,
+                "end_time": end_dt.isoformat() if end_dt else None,
+                "parent_span_id": span.parent_span_id,
+                "labels": dict(span.labels),
+                "start_ns": datetime_to_ns(start_dt) if start_dt else None,
+                "end_ns": datetime_to_ns(end_dt) if end_dt else None,
+            }
+        )
+    return spans
+
+
+def legacy_time_series(series: Any) -> dict[str, Any]:
+    """Attribute-based conversion (previous `list_time_series`)."""
+    return {
+        "metric": {"type": series.metric.type, "labels": dict(series.metric.labels)},
+        "resource": {
+            "type": series.resource.type,
+            "labels": dict(series.resource.labels),
+        },
+        "points": [
+            {
+                "timestamp": point.interval.end_time.isoformat(),
+                "value": point.value.double_value,
+            }
+            for point in series.points
+        ],
+    }
+
+
+def legacy_log_page(page: Any) -> list[dict[str, Any]]:
+    """Attribute-based conversion (previous `list_log_entries`)."""
+    return [
+        {
+            "timestamp": entry.timestamp.isoformat() if entry.timestamp else None,
+            "severity": str(entry.severity),
+            "payload": entry.text_payload,
+            "resource": {
+                "type": entry.resource.type,
+                "labels": dict(entry.resource.labels),
+            },
+            "insert_id": entry.insert_id,
+        }
+        for entry in page.entries
+    ]
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print one line per response type."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    trace = build_trace(args.size)
+    series = build_time_series(args.size)
+    page = build_log_page(args.size)
+
+    def convert_log_page() -> list[dict[str, Any]]:
+        raw_page = raw_message(page)
+        if raw_page is None:
+            raise TypeError("log page is not a protobuf message")
+        return [log_entry_to_dict(e) for e in raw_page.entries]
+
+    cases: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        (
+            f"trace ({args.size} spans)",
+            lambda: legacy_trace(trace),
+            lambda: trace_span_columns(raw_message(trace)),
+        ),
+        (
+            f"time series ({args.size} points)",
+            lambda: legacy_time_series(series),
+            lambda: time_series_to_dict(raw_message(series)),
+        ),
+        (
+            f"log page ({args.size} entries)",
+            lambda: legacy_log_page(page),
+            convert_log_page,
+        ),
+    ]
+
+    print(f"{'response':<28} {'proto-plus':>12} {'raw pb':>12} {'speedup':>9}")
+    for label, legacy, fast in cases:
+        legacy_s = _best_of(legacy, args.repeat)
+        fast_s = _best_of(fast, args.repeat)
+        print(
+            f"{label:<28} {legacy_s * 1000:>10.1f}ms {fast_s * 1000:>10.1f}ms "
+            f"{legacy_s / fast_s:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
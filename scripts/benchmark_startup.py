@@ -0,0 +1,86 @@
+"""Benchmark agent and server cold-start import time.
+
+Imports a module (`sre_agent.agent` by default) in fresh interpreters with
+`-X importtime`, reports the best total import time and the slowest modules,
+and exits non-zero when startup regressed: when a module that only tools
+need (client libraries, Drain3, NumPy) is imported at startup, or when the
+import takes longer than `--budget` seconds.
+
+Usage:
+    uv run python scripts/benchmark_startup.py [--module server] [--repeat 5]
+        [--budget 8.0]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Only imported by tools; `sre_agent.tools.registry` defers them to first call.
+TOOL_ONLY_MODULES = [
+    "drain3",
+    "google.cloud.errorreporting_v1beta1",
+    "google.cloud.logging_v2",
+    "google.cloud.monitoring_v3",
+    "google.cloud.trace_v1",
+    "numpy",
+    "sre_agent.tools.clients.factory",
+]
+
+
+def profile_import(module: str) -> dict[str, tuple[int, int]]:
+    """Import `module` in a fresh interpreter.
+
+    Returns:
+        Imported module name -> (self, cumulative) import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.getcwd(),
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (
+            part.strip() for part in line.replace(":", "|", 1).split("|")
+        )
+        times[name] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> None:
+    """Profile the import and fail on regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="sre_agent.agent")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [profile_import(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times[args.module][1])
+    total_s = best[args.module][1] / 1e6
+    print(f"import {args.module}: {total_s:.2f}s (best of {args.repeat})")
+
+    print(f"{'module':<60} {'self':>9} {'cumulative':>11}")
+    slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[: args.top]:
+        print(f"{name:<60} {self_us / 1e3:>7.1f}ms {cumulative_us / 1e3:>9.1f}ms")
+
+    failures = [
+        f"{name} is imported at startup" for name in TOOL_ONLY_MODULES if name in best
+    ]
+    if args.budget is not None and total_s > args.budget:
+        failures.append(f"startup took {total_s:.2f}s, budget is {args.budget:.2f}s")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
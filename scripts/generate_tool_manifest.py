@@ -0,0 +1,34 @@
+"""Regenerate `sre_agent/tools/tool_manifest.json`.
+
+The manifest holds the name, description and function declarations of every
+tool in `sre_agent.tools.TOOL_MODULES`, so the agent can advertise its tools
+without importing their modules at startup (see `sre_agent/tools/registry.py`).
+Run it after adding a tool or changing a tool's signature or docstring.
+
+Usage:
+    uv run python scripts/generate_tool_manifest.py
+"""
+
+import json
+import os
+import sys
+
+try:
+    from sre_agent.tools.registry import MANIFEST_PATH, build_tool_manifest
+except ImportError:
+    # Handle running from root
+    sys.path.append(os.getcwd())
+    from sre_agent.tools.registry import MANIFEST_PATH, build_tool_manifest
+
+
+def main() -> None:
+    """Write the manifest and report how many tools it describes."""
+    manifest = build_tool_manifest()
+    with MANIFEST_PATH.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Wrote {len(manifest['tools'])} tools to {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -41,12 +41,6 @@ from pydantic import BaseModel
 
 from sre_agent.agent import root_agent
 from sre_agent.services import get_session_service, get_storage_service
-from sre_agent.tools import (
-    extract_log_patterns,
-    fetch_trace,
-    list_gcp_projects,
-    list_log_entries,
-)
 from sre_agent.tools.analysis import genui_adapter
 from sre_agent.tools.config import (
     ToolCategory,
@@ -159,6 +153,9 @@ async def get_tool_context() -> "ToolContext":
 @app.get("/api/tools/trace/{trace_id}")
 async def get_trace(trace_id: str, project_id: Any | None = None) -> Any:
     """Fetch and summarize a trace."""
+    # Client libraries are imported on first use to keep cold starts short.
+    from sre_agent.tools import fetch_trace
+
     try:
         # ctx = await get_tool_context()  # Not used currently but good to have if we need it
         result = await fetch_trace(
@@ -178,6 +175,8 @@ async def get_trace(trace_id: str, project_id: Any | None = None) -> Any:
 @app.get("/api/tools/projects/list")
 async def list_projects() -> Any:
     """List accessible GCP projects."""
+    from sre_agent.tools import list_gcp_projects
+
     try:
         result = await list_gcp_projects()
         return result
@@ -191,30 +190,33 @@ async def list_projects() -> Any:
 @app.post("/api/tools/logs/analyze")
 async def analyze_logs(payload: dict[str, Any]) -> Any:
     """Fetch logs and extract patterns."""
-    try:
-        # ctx = await get_tool_context()
-        # 1. Fetch logs from Cloud Logging
-        entries_json = await list_log_entries(
-            filter_str=payload.get("filter"),
-            project_id=payload.get("project_id"),
-        )
-
-        # Parse JSON result from list_log_entries since it returns a string
-        import json
-
-        entries_data = json.loads(entries_json)
-
-        # Handle potential error response
-        if "error" in entries_data:
-            raise HTTPException(status_code=500, detail=entries_data["error"])
+    from sre_agent.tools.analysis.logs import extract_log_patterns_from_stream
+    from sre_agent.tools.clients.logging import (
+        DEFAULT_STREAM_MAX_ENTRIES,
+        iter_log_entries,
+    )
 
-        log_entries = entries_data.get("entries", [])
+    project_id = payload.get("project_id")
+    filter_str = payload.get("filter")
+    max_entries = payload.get("max_entries", DEFAULT_STREAM_MAX_ENTRIES)
+    if not isinstance(project_id, str) or not project_id:
+        raise HTTPException(status_code=400, detail="project_id is required")
+    if not isinstance(filter_str, str) or not filter_str:
+        raise HTTPException(status_code=400, detail="filter is required")
+    if not isinstance(max_entries, int) or max_entries <= 0:
+        raise HTTPException(
+            status_code=400, detail="max_entries must be a positive integer"
+        )
 
-        # 2. Extract patterns from the fetched entries
-        result = await extract_log_patterns(
-            log_entries=log_entries,
+    try:
+        # Stream entries from Cloud Logging straight into Drain3; pages are
+        # prefetched and never buffered as a whole.
+        entries = iter_log_entries(
+            project_id=project_id,
+            filter_str=filter_str,
+            max_entries=max_entries,
         )
-        return result
+        return await extract_log_patterns_from_stream(entries)
     except Exception as e:
         import traceback
 
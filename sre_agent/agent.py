@@ -83,95 +83,6 @@ from .sub_agents import (
     statistics_analyzer,
     structure_analyzer,
 )
-from .tools import (
-    # BigQuery tools
-    analyze_aggregate_metrics,
-    # Critical path analysis tools
-    analyze_critical_path,
-    # SLO/SLI tools
-    analyze_error_budget_burn,
-    # GKE tools
-    analyze_hpa_events,
-    analyze_log_anomalies,
-    analyze_node_conditions,
-    analyze_signal_correlation_strength,
-    analyze_trace_patterns,
-    analyze_upstream_downstream_impact,
-    build_call_graph,
-    build_cross_signal_timeline,
-    # Service dependency tools
-    build_service_dependency_graph,
-    calculate_critical_path_contribution,
-    calculate_series_stats,
-    calculate_span_durations,
-    compare_log_patterns,
-    compare_metric_windows,
-    compare_span_timings,
-    compare_time_periods,
-    compute_latency_statistics,
-    # SLO correlation
-    correlate_incident_with_slo_impact,
-    correlate_logs_with_trace,
-    correlate_metrics_with_traces_via_exemplars,
-    # Cross-signal correlation tools
-    correlate_trace_with_kubernetes,
-    correlate_trace_with_metrics,
-    detect_all_sre_patterns,
-    detect_cascading_timeout,
-    detect_circular_dependencies,
-    detect_connection_pool_issues,
-    detect_latency_anomalies,
-    # Metrics analysis tools
-    detect_metric_anomalies,
-    detect_retry_storm,
-    detect_trend_changes,
-    # Discovery tools
-    discover_telemetry_sources,
-    # Remediation tools
-    estimate_remediation_risk,
-    extract_errors,
-    # Log pattern analysis tools
-    extract_log_patterns,
-    # Trace tools
-    fetch_trace,
-    find_bottleneck_services,
-    find_example_traces,
-    find_exemplar_traces,
-    find_hidden_dependencies,
-    find_similar_past_incidents,
-    find_structural_differences,
-    # Remediation
-    generate_remediation_suggestions,
-    get_alert,
-    # GKE tools
-    get_container_oom_events,
-    get_current_time,
-    get_gcloud_commands,
-    get_gke_cluster_health,
-    # SLO Golden Signals
-    get_golden_signals,
-    get_logs_for_trace,
-    get_pod_restart_events,
-    get_slo_status,
-    get_trace_by_url,
-    get_workload_health_summary,
-    list_alert_policies,
-    # Alerting tools
-    list_alerts,
-    list_error_events,
-    # GCP direct API tools
-    list_log_entries,
-    # SLO listing
-    list_slos,
-    list_time_series,
-    list_traces,
-    perform_causal_analysis,
-    # SLO prediction
-    predict_slo_violation,
-    query_promql,
-    summarize_trace,
-    validate_trace_quality,
-)
 from .tools.common import adk_tool
 from .tools.common.telemetry import setup_telemetry
 from .tools.config import get_tool_config_manager
@@ -180,12 +91,8 @@ from .tools.mcp.gcp import (
     create_logging_mcp_toolset,
     create_monitoring_mcp_toolset,
     get_project_id_with_fallback,
-    mcp_execute_sql,
-    mcp_list_log_entries,
-    mcp_list_timeseries,
-    mcp_query_range,
 )
-from .tools.reporting import synthesize_report
+from .tools.registry import get_lazy_tool, lazy_tools
 
 # Initialize logger for this module
 logger = logging.getLogger(__name__)
@@ -328,7 +235,7 @@ async def run_aggregate_analysis(
         # 1. Auto-Discovery if needed
         if not dataset_id or not table_name:
             logger.info("Dataset or table not provided. Running discovery...")
-            discovery_result = await discover_telemetry_sources(
+            discovery_result = await get_lazy_tool("discover_telemetry_sources")(
                 tool_context=tool_context
             )
 
@@ -650,93 +557,111 @@ Please:
 # Tool Registry for Configuration
 # ============================================================================
 
+# Tools are imported on their first call (see tools/registry.py), so none of
+# the client libraries behind them load at startup.
 TOOL_NAME_MAP = {
     # Observability
-    "fetch_trace": fetch_trace,
-    "list_log_entries": list_log_entries,
-    "query_promql": query_promql,
-    "list_slos": list_slos,
-    "list_traces": list_traces,
-    "get_logs_for_trace": get_logs_for_trace,
-    "get_trace_by_url": get_trace_by_url,
-    "summarize_trace": summarize_trace,
-    "get_golden_signals": get_golden_signals,
+    "fetch_trace": get_lazy_tool("fetch_trace"),
+    "list_log_entries": get_lazy_tool("list_log_entries"),
+    "query_promql": get_lazy_tool("query_promql"),
+    "list_slos": get_lazy_tool("list_slos"),
+    "list_traces": get_lazy_tool("list_traces"),
+    "get_logs_for_trace": get_lazy_tool("get_logs_for_trace"),
+    "get_trace_by_url": get_lazy_tool("get_trace_by_url"),
+    "summarize_trace": get_lazy_tool("summarize_trace"),
+    "get_golden_signals": get_lazy_tool("get_golden_signals"),
     # Analysis
-    "calculate_span_durations": calculate_span_durations,
-    "find_bottleneck_services": find_bottleneck_services,
-    "correlate_logs_with_trace": correlate_logs_with_trace,
-    "analyze_critical_path": analyze_critical_path,
-    "build_call_graph": build_call_graph,
-    "build_service_dependency_graph": build_service_dependency_graph,
-    "build_cross_signal_timeline": build_cross_signal_timeline,
-    "analyze_trace_patterns": analyze_trace_patterns,
-    "find_structural_differences": find_structural_differences,
-    "find_hidden_dependencies": find_hidden_dependencies,
+    "calculate_span_durations": get_lazy_tool("calculate_span_durations"),
+    "find_bottleneck_services": get_lazy_tool("find_bottleneck_services"),
+    "correlate_logs_with_trace": get_lazy_tool("correlate_logs_with_trace"),
+    "analyze_critical_path": get_lazy_tool("analyze_critical_path"),
+    "build_call_graph": get_lazy_tool("build_call_graph"),
+    "build_service_dependency_graph": get_lazy_tool("build_service_dependency_graph"),
+    "build_cross_signal_timeline": get_lazy_tool("build_cross_signal_timeline"),
+    "analyze_trace_patterns": get_lazy_tool("analyze_trace_patterns"),
+    "find_structural_differences": get_lazy_tool("find_structural_differences"),
+    "find_hidden_dependencies": get_lazy_tool("find_hidden_dependencies"),
     # Metrics
-    "detect_metric_anomalies": detect_metric_anomalies,
-    "list_time_series": list_time_series,
-    "compare_metric_windows": compare_metric_windows,
-    "analyze_signal_correlation_strength": analyze_signal_correlation_strength,
-    "analyze_error_budget_burn": analyze_error_budget_burn,
-    "predict_slo_violation": predict_slo_violation,
+    "detect_metric_anomalies": get_lazy_tool("detect_metric_anomalies"),
+    "list_time_series": get_lazy_tool("list_time_series"),
+    "compare_metric_windows": get_lazy_tool("compare_metric_windows"),
+    "analyze_signal_correlation_strength": get_lazy_tool(
+        "analyze_signal_correlation_strength"
+    ),
+    "analyze_error_budget_burn": get_lazy_tool("analyze_error_budget_burn"),
+    "predict_slo_violation": get_lazy_tool("predict_slo_violation"),
     # GKE / Infrastructure
-    "get_gke_cluster_health": get_gke_cluster_health,
-    "analyze_node_conditions": analyze_node_conditions,
-    "analyze_hpa_events": analyze_hpa_events,
-    "get_pod_restart_events": get_pod_restart_events,
-    "get_container_oom_events": get_container_oom_events,
-    "get_workload_health_summary": get_workload_health_summary,
+    "get_gke_cluster_health": get_lazy_tool("get_gke_cluster_health"),
+    "analyze_node_conditions": get_lazy_tool("analyze_node_conditions"),
+    "analyze_hpa_events": get_lazy_tool("analyze_hpa_events"),
+    "get_pod_restart_events": get_lazy_tool("get_pod_restart_events"),
+    "get_container_oom_events": get_lazy_tool("get_container_oom_events"),
+    "get_workload_health_summary": get_lazy_tool("get_workload_health_summary"),
     # Alerts
-    "list_alerts": list_alerts,
-    "list_alert_policies": list_alert_policies,
-    "get_alert": get_alert,
+    "list_alerts": get_lazy_tool("list_alerts"),
+    "list_alert_policies": get_lazy_tool("list_alert_policies"),
+    "get_alert": get_lazy_tool("get_alert"),
     # Advanced Diagnostics
-    "perform_causal_analysis": perform_causal_analysis,
-    "analyze_upstream_downstream_impact": analyze_upstream_downstream_impact,
-    "correlate_trace_with_kubernetes": correlate_trace_with_kubernetes,
-    "correlate_trace_with_metrics": correlate_trace_with_metrics,
-    "calculate_series_stats": calculate_series_stats,
-    "detect_trend_changes": detect_trend_changes,
+    "perform_causal_analysis": get_lazy_tool("perform_causal_analysis"),
+    "analyze_upstream_downstream_impact": get_lazy_tool(
+        "analyze_upstream_downstream_impact"
+    ),
+    "correlate_trace_with_kubernetes": get_lazy_tool("correlate_trace_with_kubernetes"),
+    "correlate_trace_with_metrics": get_lazy_tool("correlate_trace_with_metrics"),
+    "calculate_series_stats": get_lazy_tool("calculate_series_stats"),
+    "detect_trend_changes": get_lazy_tool("detect_trend_changes"),
     # Pattern Analysis
-    "extract_log_patterns": extract_log_patterns,
-    "compare_log_patterns": compare_log_patterns,
-    "detect_all_sre_patterns": detect_all_sre_patterns,
-    "analyze_log_anomalies": analyze_log_anomalies,
+    "extract_log_patterns": get_lazy_tool("extract_log_patterns"),
+    "compare_log_patterns": get_lazy_tool("compare_log_patterns"),
+    "compare_log_pattern_windows": get_lazy_tool("compare_log_pattern_windows"),
+    "detect_all_sre_patterns": get_lazy_tool("detect_all_sre_patterns"),
+    "analyze_log_anomalies": get_lazy_tool("analyze_log_anomalies"),
     # Root Cause
-    "detect_cascading_timeout": detect_cascading_timeout,
-    "detect_retry_storm": detect_retry_storm,
-    "detect_connection_pool_issues": detect_connection_pool_issues,
-    "detect_circular_dependencies": detect_circular_dependencies,
-    "find_similar_past_incidents": find_similar_past_incidents,
+    "detect_cascading_timeout": get_lazy_tool("detect_cascading_timeout"),
+    "detect_retry_storm": get_lazy_tool("detect_retry_storm"),
+    "detect_sre_patterns_across_traces": get_lazy_tool(
+        "detect_sre_patterns_across_traces"
+    ),
+    "detect_connection_pool_issues": get_lazy_tool("detect_connection_pool_issues"),
+    "detect_circular_dependencies": get_lazy_tool("detect_circular_dependencies"),
+    "find_similar_past_incidents": get_lazy_tool("find_similar_past_incidents"),
     # Remediation
-    "generate_remediation_suggestions": generate_remediation_suggestions,
-    "estimate_remediation_risk": estimate_remediation_risk,
-    "get_gcloud_commands": get_gcloud_commands,
+    "generate_remediation_suggestions": get_lazy_tool(
+        "generate_remediation_suggestions"
+    ),
+    "estimate_remediation_risk": get_lazy_tool("estimate_remediation_risk"),
+    "get_gcloud_commands": get_lazy_tool("get_gcloud_commands"),
     # Specialized Analysis
-    "analyze_aggregate_metrics": analyze_aggregate_metrics,
-    "calculate_critical_path_contribution": calculate_critical_path_contribution,
-    "compare_span_timings": compare_span_timings,
-    "compare_time_periods": compare_time_periods,
-    "compute_latency_statistics": compute_latency_statistics,
-    "correlate_incident_with_slo_impact": correlate_incident_with_slo_impact,
-    "correlate_metrics_with_traces_via_exemplars": correlate_metrics_with_traces_via_exemplars,
-    "detect_latency_anomalies": detect_latency_anomalies,
-    "extract_errors": extract_errors,
-    "find_example_traces": find_example_traces,
-    "find_exemplar_traces": find_exemplar_traces,
-    "get_current_time": get_current_time,
-    "get_slo_status": get_slo_status,
-    "list_error_events": list_error_events,
-    "validate_trace_quality": validate_trace_quality,
+    "analyze_aggregate_metrics": get_lazy_tool("analyze_aggregate_metrics"),
+    "calculate_critical_path_contribution": get_lazy_tool(
+        "calculate_critical_path_contribution"
+    ),
+    "compare_span_timings": get_lazy_tool("compare_span_timings"),
+    "compare_time_periods": get_lazy_tool("compare_time_periods"),
+    "compute_latency_statistics": get_lazy_tool("compute_latency_statistics"),
+    "correlate_incident_with_slo_impact": get_lazy_tool(
+        "correlate_incident_with_slo_impact"
+    ),
+    "correlate_metrics_with_traces_via_exemplars": get_lazy_tool(
+        "correlate_metrics_with_traces_via_exemplars"
+    ),
+    "detect_latency_anomalies": get_lazy_tool("detect_latency_anomalies"),
+    "extract_errors": get_lazy_tool("extract_errors"),
+    "find_example_traces": get_lazy_tool("find_example_traces"),
+    "find_exemplar_traces": get_lazy_tool("find_exemplar_traces"),
+    "get_current_time": get_lazy_tool("get_current_time"),
+    "get_slo_status": get_lazy_tool("get_slo_status"),
+    "list_error_events": get_lazy_tool("list_error_events"),
+    "validate_trace_quality": get_lazy_tool("validate_trace_quality"),
     # MCP Tools
-    "mcp_execute_sql": mcp_execute_sql,
-    "mcp_list_log_entries": mcp_list_log_entries,
-    "mcp_list_timeseries": mcp_list_timeseries,
-    "mcp_query_range": mcp_query_range,
+    "mcp_execute_sql": get_lazy_tool("mcp_execute_sql"),
+    "mcp_list_log_entries": get_lazy_tool("mcp_list_log_entries"),
+    "mcp_list_timeseries": get_lazy_tool("mcp_list_timeseries"),
+    "mcp_query_range": get_lazy_tool("mcp_query_range"),
     # Discovery
-    "discover_telemetry_sources": discover_telemetry_sources,
+    "discover_telemetry_sources": get_lazy_tool("discover_telemetry_sources"),
     # Reporting
-    "synthesize_report": synthesize_report,
+    "synthesize_report": get_lazy_tool("synthesize_report"),
     # Orchestration
     "run_aggregate_analysis": run_aggregate_analysis,
     "run_triage_analysis": run_triage_analysis,
@@ -746,21 +671,24 @@ TOOL_NAME_MAP = {
 
 # Common tools for all agents
 base_tools: list[Any] = [
-    fetch_trace,
-    list_log_entries,
-    query_promql,
-    list_slos,
-    calculate_span_durations,
-    find_bottleneck_services,
-    correlate_logs_with_trace,
-    get_gke_cluster_health,
-    list_alerts,
-    detect_metric_anomalies,
-    analyze_signal_correlation_strength,
-    # Log pattern tools
-    extract_log_patterns,
-    compare_log_patterns,
-    analyze_log_anomalies,
+    *lazy_tools(
+        "fetch_trace",
+        "list_log_entries",
+        "query_promql",
+        "list_slos",
+        "calculate_span_durations",
+        "find_bottleneck_services",
+        "correlate_logs_with_trace",
+        "get_gke_cluster_health",
+        "list_alerts",
+        "detect_metric_anomalies",
+        "analyze_signal_correlation_strength",
+        # Log pattern tools
+        "extract_log_patterns",
+        "compare_log_patterns",
+        "compare_log_pattern_windows",
+        "analyze_log_anomalies",
+    ),
     # Orchestration tools
     run_aggregate_analysis,
     run_triage_analysis,
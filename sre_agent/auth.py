@@ -1,4 +1,6 @@
 import contextvars
+import hashlib
+from typing import Any
 
 import google.auth
 from google.oauth2.credentials import Credentials
@@ -30,3 +32,22 @@ def get_current_credentials() -> tuple[google.auth.credentials.Credentials, str
 def get_current_credentials_or_none() -> Credentials | None:
     """Gets the explicitly set credentials or None."""
     return _credentials_context.get()
+
+
+def credentials_identity(creds: Any) -> str | None:
+    """Identity of user credentials, for keying state kept per user.
+
+    The auth middleware builds new credentials for every request, so this is
+    a digest of the token rather than the object. Service account credentials
+    without a token yet are identified by their account. Returns None for
+    other credentials without a token, whose state must not be shared: the
+    id of the object would be reused by other credentials once it is freed,
+    and a quota project is shared by many users.
+    """
+    token = getattr(creds, "token", None)
+    if isinstance(token, str) and token:
+        return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    email = getattr(creds, "service_account_email", None)
+    if isinstance(email, str) and email and email != "default":
+        return f"account:{email}"
+    return None
@@ -9,8 +9,7 @@ Its goal is NOT to solve the problem, but to classify it rapidly:
 
 from google.adk.agents import LlmAgent
 
-from ..tools.clients.alerts import get_alert, list_alert_policies, list_alerts
-from ..tools.discovery.discovery_tool import discover_telemetry_sources
+from ..tools.registry import lazy_tools
 
 ALERT_ANALYST_PROMPT = """
 You are the **Alert Analyst** 🚨 - "The First Responder".
@@ -47,10 +46,10 @@ alert_analyst = LlmAgent(
     model="gemini-2.5-flash",
     description="Analyzes active alerts and incidents from Cloud Monitoring.",
     instruction=ALERT_ANALYST_PROMPT,
-    tools=[
-        list_alerts,
-        list_alert_policies,
-        get_alert,
-        discover_telemetry_sources,
-    ],
+    tools=lazy_tools(
+        "list_alerts",
+        "list_alert_policies",
+        "get_alert",
+        "discover_telemetry_sources",
+    ),
 )
@@ -11,11 +11,7 @@ Workflow:
 
 from google.adk.agents import LlmAgent
 
-from ..tools import (
-    compare_time_periods,
-    detect_trend_changes,
-    list_log_entries,
-)
+from ..tools.registry import lazy_tools
 
 CHANGE_DETECTIVE_PROMPT = """
 Role: You are the **Change Detective** 🕵️‍♀️📅 - The Blame Game Champion.
@@ -51,5 +47,9 @@ change_detective = LlmAgent(
     model="gemini-2.5-flash",
     description="Correlates anomalies with recent changes (deployments, config updates).",
     instruction=CHANGE_DETECTIVE_PROMPT,
-    tools=[list_log_entries, detect_trend_changes, compare_time_periods],
+    tools=lazy_tools(
+        "list_log_entries",
+        "detect_trend_changes",
+        "compare_time_periods",
+    ),
 )
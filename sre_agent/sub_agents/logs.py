@@ -11,10 +11,7 @@ of analysis tools:
 
 from google.adk.agents import LlmAgent
 
-from ..tools.analysis.bigquery.logs import analyze_bigquery_log_patterns
-from ..tools.analysis.bigquery.otel import compare_time_periods
-from ..tools.analysis.logs.patterns import extract_log_patterns
-from ..tools.discovery.discovery_tool import discover_telemetry_sources
+from ..tools.registry import lazy_tools
 
 LOG_ANALYST_PROMPT = """
 You are the **Log Analyst** 📜🕵️‍♂️ - The "Log Whisperer".
@@ -51,10 +48,10 @@ log_analyst = LlmAgent(
     model="gemini-2.5-flash",
     description="Analyzes log patterns to find anomalies and new errors.",
     instruction=LOG_ANALYST_PROMPT,
-    tools=[
-        analyze_bigquery_log_patterns,
-        extract_log_patterns,
-        compare_time_periods,
-        discover_telemetry_sources,
-    ],
+    tools=lazy_tools(
+        "analyze_bigquery_log_patterns",
+        "extract_log_patterns",
+        "compare_time_periods",
+        "discover_telemetry_sources",
+    ),
 )
@@ -11,20 +11,7 @@ workflow to ensure precise and actionable findings:
 from google.adk.agents import LlmAgent
 
 from ..resources.gcp_metrics import COMMON_GCP_METRICS
-from ..tools import (
-    calculate_series_stats,
-    compare_metric_windows,
-    correlate_metrics_with_traces_via_exemplars,
-    # Cross-signal correlation
-    correlate_trace_with_metrics,
-    # Analysis tools
-    detect_metric_anomalies,
-    # Metrics tools
-    list_time_series,
-    mcp_list_timeseries,
-    mcp_query_range,
-    query_promql,
-)
+from ..tools.registry import lazy_tools
 
 # =============================================================================
 # Prompts
@@ -110,15 +97,15 @@ metrics_analyzer = LlmAgent(
         "specific traces corresponding to metric spikes."
     ),
     instruction=METRICS_ANALYZER_PROMPT,
-    tools=[
-        list_time_series,
-        mcp_list_timeseries,
-        query_promql,
-        mcp_query_range,
-        detect_metric_anomalies,
-        compare_metric_windows,
-        calculate_series_stats,
-        correlate_trace_with_metrics,
-        correlate_metrics_with_traces_via_exemplars,
-    ],
+    tools=lazy_tools(
+        "list_time_series",
+        "mcp_list_timeseries",
+        "query_promql",
+        "mcp_query_range",
+        "detect_metric_anomalies",
+        "compare_metric_windows",
+        "calculate_series_stats",
+        "correlate_trace_with_metrics",
+        "correlate_metrics_with_traces_via_exemplars",
+    ),
 )
@@ -19,42 +19,7 @@ Stage 2: Deep Dive (The Root Cause Investigators)
 
 from google.adk.agents import LlmAgent
 
-from ..tools import (
-    # BigQuery tools
-    analyze_aggregate_metrics,
-    # Critical path tools
-    analyze_critical_path,
-    # Trace tools
-    analyze_upstream_downstream_impact,
-    build_call_graph,
-    build_cross_signal_timeline,
-    # Dependency tools
-    build_service_dependency_graph,
-    calculate_critical_path_contribution,
-    calculate_span_durations,
-    compare_span_timings,
-    compare_time_periods,
-    compute_latency_statistics,
-    correlate_logs_with_trace,
-    correlate_metrics_with_traces_via_exemplars,
-    # Cross-signal correlation tools
-    correlate_trace_with_metrics,
-    detect_all_sre_patterns,
-    detect_cascading_timeout,
-    detect_circular_dependencies,
-    detect_connection_pool_issues,
-    detect_latency_anomalies,
-    detect_retry_storm,
-    detect_trend_changes,
-    discover_telemetry_sources,
-    extract_errors,
-    fetch_trace,
-    find_bottleneck_services,
-    find_exemplar_traces,
-    find_structural_differences,
-    mcp_execute_sql,
-    perform_causal_analysis,
-)
+from ..tools.registry import lazy_tools
 
 # =============================================================================
 # Prompts
@@ -241,6 +206,7 @@ Retry storms? Circuit breakers? Cascading failures? I eat them for lunch.
 - `detect_cascading_timeout`: Trace the deadlines.
 - `detect_connection_pool_issues`: Check the wait times.
 - `detect_all_sre_patterns`: The master scan.
+- `detect_sre_patterns_across_traces`: The master scan, fleet-wide. 🌍
 - `detect_circular_dependencies`: Find the death loops. ♾️
 - `calculate_critical_path_contribution`: Analyze the chain. ⛓️
 
@@ -263,18 +229,18 @@ aggregate_analyzer = LlmAgent(
         "and select exemplar traces for investigation. Includes cross-signal correlation."
     ),
     instruction=AGGREGATE_ANALYZER_PROMPT,
-    tools=[
-        mcp_execute_sql,
-        analyze_aggregate_metrics,
-        find_exemplar_traces,
-        compare_time_periods,
-        detect_trend_changes,
-        correlate_logs_with_trace,
-        correlate_metrics_with_traces_via_exemplars,
-        find_bottleneck_services,
-        build_service_dependency_graph,
-        discover_telemetry_sources,
-    ],
+    tools=lazy_tools(
+        "mcp_execute_sql",
+        "analyze_aggregate_metrics",
+        "find_exemplar_traces",
+        "compare_time_periods",
+        "detect_trend_changes",
+        "correlate_logs_with_trace",
+        "correlate_metrics_with_traces_via_exemplars",
+        "find_bottleneck_services",
+        "build_service_dependency_graph",
+        "discover_telemetry_sources",
+    ),
 )
 
 # Stage 1: Triage Analyzers
@@ -294,13 +260,13 @@ Tools: fetch_trace, calculate_span_durations, compare_span_timings, analyze_crit
 
 Use when: You need to understand what got slower or faster between two requests.""",
     instruction=LATENCY_ANALYZER_PROMPT,
-    tools=[
-        fetch_trace,
-        calculate_span_durations,
-        compare_span_timings,
-        analyze_critical_path,
-        calculate_critical_path_contribution,
-    ],
+    tools=lazy_tools(
+        "fetch_trace",
+        "calculate_span_durations",
+        "compare_span_timings",
+        "analyze_critical_path",
+        "calculate_critical_path_contribution",
+    ),
 )
 
 error_analyzer = LlmAgent(
@@ -318,7 +284,10 @@ Tools: fetch_trace, extract_errors
 
 Use when: You need to find what errors occurred in a trace or compare error patterns.""",
     instruction=ERROR_ANALYZER_PROMPT,
-    tools=[fetch_trace, extract_errors],
+    tools=lazy_tools(
+        "fetch_trace",
+        "extract_errors",
+    ),
 )
 
 structure_analyzer = LlmAgent(
@@ -336,7 +305,11 @@ Tools: fetch_trace, build_call_graph, find_structural_differences
 
 Use when: You need to understand if the code path or service topology changed.""",
     instruction=STRUCTURE_ANALYZER_PROMPT,
-    tools=[fetch_trace, build_call_graph, find_structural_differences],
+    tools=lazy_tools(
+        "fetch_trace",
+        "build_call_graph",
+        "find_structural_differences",
+    ),
 )
 
 statistics_analyzer = LlmAgent(
@@ -355,12 +328,12 @@ Tools: fetch_trace, calculate_span_durations
 
 Use when: You need statistical analysis, percentile distributions, or anomaly detection.""",
     instruction=STATISTICS_ANALYZER_PROMPT,
-    tools=[
-        fetch_trace,
-        calculate_span_durations,
-        compute_latency_statistics,
-        detect_latency_anomalies,
-    ],
+    tools=lazy_tools(
+        "fetch_trace",
+        "calculate_span_durations",
+        "compute_latency_statistics",
+        "detect_latency_anomalies",
+    ),
 )
 
 # Stage 2: Deep Dive Analyzers
@@ -381,15 +354,15 @@ Tools: fetch_trace, perform_causal_analysis, analyze_critical_path, find_structu
 
 Use when: You need to find WHY something got slow, not just WHAT got slow.""",
     instruction=CAUSALITY_ANALYZER_PROMPT,
-    tools=[
-        fetch_trace,
-        perform_causal_analysis,
-        build_call_graph,
-        correlate_logs_with_trace,
-        build_cross_signal_timeline,
-        correlate_trace_with_metrics,
-        analyze_upstream_downstream_impact,
-    ],
+    tools=lazy_tools(
+        "fetch_trace",
+        "perform_causal_analysis",
+        "build_call_graph",
+        "correlate_logs_with_trace",
+        "build_cross_signal_timeline",
+        "correlate_trace_with_metrics",
+        "analyze_upstream_downstream_impact",
+    ),
 )
 
 service_impact_analyzer = LlmAgent(
@@ -407,13 +380,13 @@ Tools: build_service_dependency_graph, analyze_upstream_downstream_impact
 
 Use when: You need to know 'Who else is broken?' or 'How bad is this?'.""",
     instruction=SERVICE_IMPACT_ANALYZER_PROMPT,
-    tools=[
-        fetch_trace,
-        build_call_graph,
-        build_service_dependency_graph,
-        analyze_upstream_downstream_impact,
-        detect_circular_dependencies,
-    ],
+    tools=lazy_tools(
+        "fetch_trace",
+        "build_call_graph",
+        "build_service_dependency_graph",
+        "analyze_upstream_downstream_impact",
+        "detect_circular_dependencies",
+    ),
 )
 
 # Stage 2: Specialist Experts
@@ -422,14 +395,15 @@ resiliency_architect = LlmAgent(
     model="gemini-2.5-flash",
     description="Detects architectural risks like retry storms and cascading failures.",
     instruction=RESILIENCY_ARCHITECT_PROMPT,
-    tools=[
-        fetch_trace,
-        build_call_graph,
-        detect_circular_dependencies,
-        calculate_critical_path_contribution,
-        detect_retry_storm,
-        detect_cascading_timeout,
-        detect_connection_pool_issues,
-        detect_all_sre_patterns,
-    ],
+    tools=lazy_tools(
+        "fetch_trace",
+        "build_call_graph",
+        "detect_circular_dependencies",
+        "calculate_critical_path_contribution",
+        "detect_retry_storm",
+        "detect_cascading_timeout",
+        "detect_connection_pool_issues",
+        "detect_all_sre_patterns",
+        "detect_sre_patterns_across_traces",
+    ),
 )
@@ -6,155 +6,292 @@ This module provides tools for interacting with GCP Observability services:
 - Cloud Monitoring MCP for metrics queries
 - Direct API clients as fallback
 - Analysis tools for Traces, Logs, Metrics, GKE, SLOs, and Remediation
+
+Importing this package is cheap: every name below is imported from its
+module on first access. `TOOL_MODULES` maps each tool to that module, so
+`registry.py` can hand the agents tools whose modules load on first call.
 """
 
-# Client Tools
-# Analysis Tools - BigQuery
-from .analysis.bigquery.logs import analyze_bigquery_log_patterns
-from .analysis.bigquery.otel import (
-    analyze_aggregate_metrics,
-    compare_time_periods,
-    correlate_logs_with_trace,
-    detect_trend_changes,
-    find_exemplar_traces,
-)
-
-# Analysis Tools - Correlation
-from .analysis.correlation.critical_path import (
-    analyze_critical_path,
-    calculate_critical_path_contribution,
-    find_bottleneck_services,
-)
-from .analysis.correlation.cross_signal import (
-    analyze_signal_correlation_strength,
-    build_cross_signal_timeline,
-    correlate_metrics_with_traces_via_exemplars,
-    correlate_trace_with_metrics,
-)
-from .analysis.correlation.dependencies import (
-    analyze_upstream_downstream_impact,
-    build_service_dependency_graph,
-    detect_circular_dependencies,
-    find_hidden_dependencies,
-)
-
-# Analysis Tools - Logs
-from .analysis.logs.patterns import (
-    analyze_log_anomalies,
-    compare_log_patterns,
-    extract_log_patterns,
-)
-
-# Analysis Tools - Metrics
-from .analysis.metrics.anomaly_detection import (
-    compare_metric_windows,
-    detect_metric_anomalies,
-)
-from .analysis.metrics.statistics import (
-    calculate_series_stats,
-)
-
-# Analysis Tools - Remediation
-from .analysis.remediation.suggestions import (
-    estimate_remediation_risk,
-    find_similar_past_incidents,
-    generate_remediation_suggestions,
-    get_gcloud_commands,
-)
-from .analysis.trace.analysis import (
-    build_call_graph,
-    calculate_span_durations,
-    extract_errors,
-    summarize_trace,
-    validate_trace_quality,
-)
-from .analysis.trace.comparison import (
-    compare_span_timings,
-    find_structural_differences,
-)
-from .analysis.trace.filters import (
-    select_traces_from_statistical_outliers,
-    select_traces_manually,
-)
-
-# Analysis Tools - Trace Patterns
-from .analysis.trace.patterns import (
-    detect_all_sre_patterns,
-    detect_cascading_timeout,
-    detect_connection_pool_issues,
-    detect_retry_storm,
-)
-
-# Analysis Tools - Trace
-from .analysis.trace.statistical_analysis import (
-    analyze_trace_patterns,
-    compute_latency_statistics,
-    detect_latency_anomalies,
-    perform_causal_analysis,
-)
-from .clients.alerts import get_alert, list_alert_policies, list_alerts
-from .clients.gcp_projects import list_gcp_projects
-from .clients.gke import (
-    analyze_hpa_events,
-    analyze_node_conditions,
-    correlate_trace_with_kubernetes,
-    get_container_oom_events,
-    get_gke_cluster_health,
-    get_pod_restart_events,
-    get_workload_health_summary,
-)
-from .clients.logging import (
-    get_logs_for_trace,
-    list_error_events,
-    list_log_entries,
-)
-from .clients.monitoring import list_time_series, query_promql
-from .clients.slo import (
-    analyze_error_budget_burn,
-    correlate_incident_with_slo_impact,
-    get_golden_signals,
-    get_slo_status,
-    list_slos,
-    predict_slo_violation,
-)
-from .clients.trace import (
-    fetch_trace,
-    find_example_traces,
-    get_current_time,
-    get_trace_by_url,
-    list_traces,
-)
-
-# Configuration
-from .config import (
-    ToolCategory,
-    ToolConfig,
-    ToolConfigManager,
-    ToolTestResult,
-    ToolTestStatus,
-    get_tool_config_manager,
-)
-
-# Discovery Tools
-from .discovery.discovery_tool import discover_telemetry_sources
-
-# MCP Tools
-from .mcp.gcp import (
-    call_mcp_tool_with_retry,
-    create_bigquery_mcp_toolset,
-    create_logging_mcp_toolset,
-    create_monitoring_mcp_toolset,
-    get_project_id_with_fallback,
-    mcp_execute_sql,
-    mcp_list_log_entries,
-    mcp_list_timeseries,
-    mcp_query_range,
-)
-
-# Reporting Tools
-from .reporting import synthesize_report
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # Client Tools
+    # Analysis Tools - BigQuery
+    from .analysis.bigquery.logs import analyze_bigquery_log_patterns
+    from .analysis.bigquery.otel import (
+        analyze_aggregate_metrics,
+        compare_time_periods,
+        correlate_logs_with_trace,
+        detect_trend_changes,
+        find_exemplar_traces,
+    )
+
+    # Analysis Tools - Correlation
+    from .analysis.correlation.critical_path import (
+        analyze_critical_path,
+        calculate_critical_path_contribution,
+        find_bottleneck_services,
+    )
+    from .analysis.correlation.cross_signal import (
+        analyze_signal_correlation_strength,
+        build_cross_signal_timeline,
+        correlate_metrics_with_traces_via_exemplars,
+        correlate_trace_with_metrics,
+    )
+    from .analysis.correlation.dependencies import (
+        analyze_upstream_downstream_impact,
+        build_service_dependency_graph,
+        detect_circular_dependencies,
+        find_hidden_dependencies,
+    )
+
+    # Analysis Tools - Logs
+    from .analysis.logs.pattern_store import compare_log_pattern_windows
+    from .analysis.logs.patterns import (
+        analyze_log_anomalies,
+        compare_log_patterns,
+        extract_log_patterns,
+    )
+
+    # Analysis Tools - Metrics
+    from .analysis.metrics.anomaly_detection import (
+        compare_metric_windows,
+        detect_metric_anomalies,
+    )
+    from .analysis.metrics.statistics import (
+        calculate_series_stats,
+    )
+
+    # Analysis Tools - Remediation
+    from .analysis.remediation.suggestions import (
+        estimate_remediation_risk,
+        find_similar_past_incidents,
+        generate_remediation_suggestions,
+        get_gcloud_commands,
+    )
+    from .analysis.trace.analysis import (
+        build_call_graph,
+        calculate_span_durations,
+        extract_errors,
+        summarize_trace,
+        validate_trace_quality,
+    )
+    from .analysis.trace.comparison import (
+        compare_span_timings,
+        find_structural_differences,
+    )
+    from .analysis.trace.filters import (
+        select_traces_from_statistical_outliers,
+        select_traces_manually,
+    )
+
+    # Analysis Tools - Trace Patterns
+    from .analysis.trace.patterns import (
+        detect_all_sre_patterns,
+        detect_cascading_timeout,
+        detect_connection_pool_issues,
+        detect_retry_storm,
+        detect_sre_patterns_across_traces,
+    )
+
+    # Analysis Tools - Trace
+    from .analysis.trace.statistical_analysis import (
+        analyze_trace_patterns,
+        compute_latency_statistics,
+        detect_latency_anomalies,
+        perform_causal_analysis,
+    )
+    from .clients.alerts import get_alert, list_alert_policies, list_alerts
+    from .clients.gcp_projects import list_gcp_projects
+    from .clients.gke import (
+        analyze_hpa_events,
+        analyze_node_conditions,
+        correlate_trace_with_kubernetes,
+        get_container_oom_events,
+        get_gke_cluster_health,
+        get_pod_restart_events,
+        get_workload_health_summary,
+    )
+    from .clients.logging import (
+        get_logs_for_trace,
+        list_error_events,
+        list_log_entries,
+    )
+    from .clients.monitoring import list_time_series, query_promql
+    from .clients.slo import (
+        analyze_error_budget_burn,
+        correlate_incident_with_slo_impact,
+        get_golden_signals,
+        get_slo_status,
+        list_slos,
+        predict_slo_violation,
+    )
+    from .clients.trace import (
+        fetch_trace,
+        find_example_traces,
+        get_current_time,
+        get_trace_by_url,
+        list_traces,
+    )
+
+    # Configuration
+    from .config import (
+        ToolCategory,
+        ToolConfig,
+        ToolConfigManager,
+        ToolTestResult,
+        ToolTestStatus,
+        get_tool_config_manager,
+    )
+
+    # Discovery Tools
+    from .discovery.discovery_tool import discover_telemetry_sources
+
+    # MCP Tools
+    from .mcp.gcp import (
+        call_mcp_tool_with_retry,
+        create_bigquery_mcp_toolset,
+        create_logging_mcp_toolset,
+        create_monitoring_mcp_toolset,
+        get_project_id_with_fallback,
+        mcp_execute_sql,
+        mcp_list_log_entries,
+        mcp_list_timeseries,
+        mcp_query_range,
+    )
+
+    # Reporting Tools
+    from .reporting import synthesize_report
+
+# Tool name -> module defining it, relative to this package.
+TOOL_MODULES: dict[str, str] = {
+    # Analysis Tools - BigQuery
+    "analyze_bigquery_log_patterns": ".analysis.bigquery.logs",
+    "analyze_aggregate_metrics": ".analysis.bigquery.otel",
+    "compare_time_periods": ".analysis.bigquery.otel",
+    "correlate_logs_with_trace": ".analysis.bigquery.otel",
+    "detect_trend_changes": ".analysis.bigquery.otel",
+    "find_exemplar_traces": ".analysis.bigquery.otel",
+    # Analysis Tools - Correlation
+    "analyze_critical_path": ".analysis.correlation.critical_path",
+    "calculate_critical_path_contribution": ".analysis.correlation.critical_path",
+    "find_bottleneck_services": ".analysis.correlation.critical_path",
+    "analyze_signal_correlation_strength": ".analysis.correlation.cross_signal",
+    "build_cross_signal_timeline": ".analysis.correlation.cross_signal",
+    "correlate_metrics_with_traces_via_exemplars": ".analysis.correlation.cross_signal",
+    "correlate_trace_with_metrics": ".analysis.correlation.cross_signal",
+    "analyze_upstream_downstream_impact": ".analysis.correlation.dependencies",
+    "build_service_dependency_graph": ".analysis.correlation.dependencies",
+    "detect_circular_dependencies": ".analysis.correlation.dependencies",
+    "find_hidden_dependencies": ".analysis.correlation.dependencies",
+    # Analysis Tools - Logs
+    "compare_log_pattern_windows": ".analysis.logs.pattern_store",
+    "analyze_log_anomalies": ".analysis.logs.patterns",
+    "compare_log_patterns": ".analysis.logs.patterns",
+    "extract_log_patterns": ".analysis.logs.patterns",
+    # Analysis Tools - Metrics
+    "compare_metric_windows": ".analysis.metrics.anomaly_detection",
+    "detect_metric_anomalies": ".analysis.metrics.anomaly_detection",
+    "calculate_series_stats": ".analysis.metrics.statistics",
+    # Analysis Tools - Remediation
+    "estimate_remediation_risk": ".analysis.remediation.suggestions",
+    "find_similar_past_incidents": ".analysis.remediation.suggestions",
+    "generate_remediation_suggestions": ".analysis.remediation.suggestions",
+    "get_gcloud_commands": ".analysis.remediation.suggestions",
+    # Analysis Tools - Trace
+    "build_call_graph": ".analysis.trace.analysis",
+    "calculate_span_durations": ".analysis.trace.analysis",
+    "extract_errors": ".analysis.trace.analysis",
+    "summarize_trace": ".analysis.trace.analysis",
+    "validate_trace_quality": ".analysis.trace.analysis",
+    "compare_span_timings": ".analysis.trace.comparison",
+    "find_structural_differences": ".analysis.trace.comparison",
+    "select_traces_from_statistical_outliers": ".analysis.trace.filters",
+    "select_traces_manually": ".analysis.trace.filters",
+    "analyze_trace_patterns": ".analysis.trace.statistical_analysis",
+    "compute_latency_statistics": ".analysis.trace.statistical_analysis",
+    "detect_latency_anomalies": ".analysis.trace.statistical_analysis",
+    "perform_causal_analysis": ".analysis.trace.statistical_analysis",
+    # Analysis Tools - Trace Patterns
+    "detect_all_sre_patterns": ".analysis.trace.patterns",
+    "detect_cascading_timeout": ".analysis.trace.patterns",
+    "detect_connection_pool_issues": ".analysis.trace.patterns",
+    "detect_retry_storm": ".analysis.trace.patterns",
+    "detect_sre_patterns_across_traces": ".analysis.trace.patterns",
+    # Client Tools
+    "get_alert": ".clients.alerts",
+    "list_alert_policies": ".clients.alerts",
+    "list_alerts": ".clients.alerts",
+    "list_gcp_projects": ".clients.gcp_projects",
+    "analyze_hpa_events": ".clients.gke",
+    "analyze_node_conditions": ".clients.gke",
+    "correlate_trace_with_kubernetes": ".clients.gke",
+    "get_container_oom_events": ".clients.gke",
+    "get_gke_cluster_health": ".clients.gke",
+    "get_pod_restart_events": ".clients.gke",
+    "get_workload_health_summary": ".clients.gke",
+    "get_logs_for_trace": ".clients.logging",
+    "list_error_events": ".clients.logging",
+    "list_log_entries": ".clients.logging",
+    "list_time_series": ".clients.monitoring",
+    "query_promql": ".clients.monitoring",
+    "analyze_error_budget_burn": ".clients.slo",
+    "correlate_incident_with_slo_impact": ".clients.slo",
+    "get_golden_signals": ".clients.slo",
+    "get_slo_status": ".clients.slo",
+    "list_slos": ".clients.slo",
+    "predict_slo_violation": ".clients.slo",
+    "fetch_trace": ".clients.trace",
+    "find_example_traces": ".clients.trace",
+    "get_current_time": ".clients.trace",
+    "get_trace_by_url": ".clients.trace",
+    "list_traces": ".clients.trace",
+    # Discovery Tools
+    "discover_telemetry_sources": ".discovery.discovery_tool",
+    # MCP Tools
+    "mcp_execute_sql": ".mcp.gcp",
+    "mcp_list_log_entries": ".mcp.gcp",
+    "mcp_list_timeseries": ".mcp.gcp",
+    "mcp_query_range": ".mcp.gcp",
+    # Reporting Tools
+    "synthesize_report": ".reporting",
+}
+
+# Exports that are not tools.
+_HELPER_MODULES: dict[str, str] = {
+    # Configuration
+    "ToolCategory": ".config",
+    "ToolConfig": ".config",
+    "ToolConfigManager": ".config",
+    "ToolTestResult": ".config",
+    "ToolTestStatus": ".config",
+    "get_tool_config_manager": ".config",
+    # MCP helpers
+    "call_mcp_tool_with_retry": ".mcp.gcp",
+    "create_bigquery_mcp_toolset": ".mcp.gcp",
+    "create_logging_mcp_toolset": ".mcp.gcp",
+    "create_monitoring_mcp_toolset": ".mcp.gcp",
+    "get_project_id_with_fallback": ".mcp.gcp",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name from its module on first access."""
+    module = TOOL_MODULES.get(name) or _HELPER_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
+
 
 __all__ = [
+    "TOOL_MODULES",
     # Configuration
     "ToolCategory",
     "ToolConfig",
@@ -178,6 +315,7 @@ __all__ = [
     "calculate_series_stats",
     "calculate_span_durations",
     "call_mcp_tool_with_retry",
+    "compare_log_pattern_windows",
     "compare_log_patterns",
     "compare_metric_windows",
     "compare_span_timings",
@@ -198,6 +336,7 @@ __all__ = [
     "detect_latency_anomalies",
     "detect_metric_anomalies",
     "detect_retry_storm",
+    "detect_sre_patterns_across_traces",
     "detect_trend_changes",
     "discover_telemetry_sources",
     "estimate_remediation_risk",
@@ -9,6 +9,12 @@ Key concepts:
 - Slack: Operations NOT on critical path (can be slower without affecting latency)
 - Bottleneck: The single span contributing most to critical path duration
 
+The path itself comes from the shared `TraceIndex` (see
+`common.trace_index.compute_critical_path`), which handles overlapping
+children with a sweep line over their intervals: a span fanning out to 30
+concurrent calls is blocked on the union of those calls, not on their sum,
+and only the calls it actually waited on are on the critical path.
+
 References:
 - https://queue.acm.org/detail.cfm?id=3526967 (Distributed Latency Profiling)
 - https://cloud.google.com/blog/products/devops-sre/introducing-the-new-google-cloud-trace-explorer
@@ -16,11 +22,13 @@ References:
 
 import json
 import logging
-from typing import Any, cast
+from typing import Any
 
 from ...clients.trace import fetch_trace_data
 from ...common import adk_tool
 from ...common.telemetry import get_meter, get_tracer
+from ...common.trace_frame import TraceFrame, as_trace_frame
+from ...common.trace_index import CriticalPath, get_trace_index
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +42,7 @@ critical_path_operations = meter.create_counter(
 )
 
 
-@adk_tool
+@adk_tool(memoize=True)
 def analyze_critical_path(
     trace_id: str,
     project_id: str | None = None,
@@ -51,7 +59,8 @@ def analyze_critical_path(
 
     Returns:
         Dictionary with:
-        - critical_path: Ordered list of spans on the critical path
+        - critical_path: Spans on the critical path, root first, with the
+          time each was blocked on children versus running in parallel
         - critical_path_duration_ms: Total duration of critical path
         - bottleneck_span: The single span contributing most to latency
         - parallel_opportunities: Spans that could be parallelized
@@ -70,45 +79,32 @@ def analyze_critical_path(
         if not spans:
             return {"error": "No spans found in trace"}
 
-        # Build span lookup and timing data
+        # Build span lookup from the columnar frame (timestamps parsed once)
+        frame = as_trace_frame(trace)
+        service_names = frame.service_names
         span_map = {}
         children_map: dict[str, list[str]] = {}
 
-        for s in spans:
+        for i, s in enumerate(frame.spans):
             span_id = s.get("span_id")
             parent_id = s.get("parent_span_id")
 
             if span_id:
-                # Parse timestamps
-                start_time = s.get("start_time", "")
-                end_time = s.get("end_time", "")
-
-                # Calculate duration
-                duration_ms: float = 0.0
-                if start_time and end_time:
-                    from datetime import datetime
-
-                    try:
-                        start_dt = datetime.fromisoformat(
-                            start_time.replace("Z", "+00:00")
-                        )
-                        end_dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-                        duration_ms = (end_dt - start_dt).total_seconds() * 1000
-                    except (ValueError, TypeError):
-                        pass
+                duration_ms = frame.span_duration_ms(i) or 0.0
+                labels = s.get("labels", {})
 
                 span_map[span_id] = {
                     "span_id": span_id,
                     "parent_id": parent_id,
                     "name": s.get("name", "unknown"),
-                    "start_time": start_time,
-                    "end_time": end_time,
+                    "start_time": s.get("start_time", ""),
+                    "end_time": s.get("end_time", ""),
                     "duration_ms": duration_ms,
-                    "service": _extract_service_name(s),
-                    "status_code": s.get("labels", {}).get("status.code", 0),
-                    "is_error": _is_error_span(s),
+                    "service": service_names[i],
+                    "status_code": labels.get("status.code", 0),
+                    "is_error": bool(frame.is_error[i]),
                     "kind": s.get("kind", "INTERNAL"),
-                    "labels": s.get("labels", {}),
+                    "labels": labels,
                 }
 
                 if parent_id:
@@ -116,20 +112,13 @@ def analyze_critical_path(
                         children_map[parent_id] = []
                     children_map[parent_id].append(span_id)
 
-        # Find root spans
-        root_spans = [s for s in span_map.values() if not s.get("parent_id")]
-
-        if not root_spans:
+        path = get_trace_index(frame).critical_path
+        if path is None:
             return {"error": "No root span found in trace"}
-
-        # For each root, calculate critical path
-        all_critical_paths = []
-        for root in root_spans:
-            path = _calculate_critical_path(root["span_id"], span_map, children_map)
-            all_critical_paths.append(path)
-
-        # Take the longest critical path as THE critical path
-        critical_path = max(all_critical_paths, key=lambda p: p["total_duration_ms"])
+        critical_path: dict[str, Any] = {
+            "spans": _path_entries(frame, path),
+            "total_duration_ms": path.total_duration_ms,
+        }
 
         # Find the bottleneck (span with highest self-time on critical path)
         bottleneck = None
@@ -191,104 +180,27 @@ def analyze_critical_path(
         return result
 
 
-def _extract_service_name(span: dict[str, Any]) -> str | None:
-    """Extract service name from span labels/attributes."""
-    labels = cast(dict[str, Any], span.get("labels", {}))
-    # Try common attribute names
-    for key in ["service.name", "/service.name", "g.co/service.name"]:
-        if key in labels:
-            return cast(str, labels[key])
-    return None
-
-
-def _is_error_span(span: dict[str, Any]) -> bool:
-    """Check if span represents an error."""
-    labels = span.get("labels", {})
-    # Check status code
-    status = labels.get("status.code", labels.get("/http/status_code", 0))
-    try:
-        code = int(status)
-        if code >= 400:
-            return True
-    except (ValueError, TypeError):
-        pass
-    # Check error labels
-    for key in labels:
-        if "error" in key.lower():
-            val = str(labels[key]).lower()
-            if val not in ("false", "0", "none", "ok", ""):
-                return True
-    return False
-
-
-def _calculate_critical_path(
-    span_id: str,
-    span_map: dict[str, dict[str, Any]],
-    children_map: dict[str, list[str]],
-) -> dict[str, Any]:
-    """Recursively calculate the critical path from a span.
-
-    The critical path is the path through child spans that has the longest
-    total duration. We track both wall-clock duration and self-time.
-    """
-    span = span_map.get(span_id)
-    if not span:
-        return {"spans": [], "total_duration_ms": 0}
-
-    children_ids = children_map.get(span_id, [])
-
-    if not children_ids:
-        # Leaf span - it IS its own critical path
-        return {
-            "spans": [
-                {
-                    "span_id": span_id,
-                    "name": span["name"],
-                    "service": span["service"],
-                    "duration_ms": span["duration_ms"],
-                    "self_time_ms": span["duration_ms"],  # No children = all self time
-                    "is_error": span["is_error"],
-                    "depth": 0,
-                }
-            ],
-            "total_duration_ms": span["duration_ms"],
+def _path_entries(frame: TraceFrame, path: CriticalPath) -> list[dict[str, Any]]:
+    """Build the per-span entries of the critical path, root first."""
+    service_names = frame.service_names
+    entries = []
+    for row, depth in zip(path.rows, path.depths, strict=True):
+        entry: dict[str, Any] = {
+            "span_id": frame.span_ids[row],
+            "name": frame.spans[row].get("name", "unknown"),
+            "service": service_names[row],
+            "duration_ms": frame.span_duration_ms(row) or 0.0,
+            "self_time_ms": float(path.self_time_ms[row]),
+            "critical_time_ms": float(path.critical_ms[row]),
+            "is_error": bool(frame.is_error[row]),
         }
-
-    # Get critical paths for all children
-    child_paths = []
-    for child_id in children_ids:
-        child_path = _calculate_critical_path(child_id, span_map, children_map)
-        child_paths.append(child_path)
-
-    # The child with the longest path is on our critical path
-    longest_child_path = max(child_paths, key=lambda p: p["total_duration_ms"])
-
-    # Calculate self-time (duration minus time spent in children)
-    total_child_duration = sum(
-        span_map[cid]["duration_ms"] for cid in children_ids if cid in span_map
-    )
-    self_time = max(0, span["duration_ms"] - total_child_duration)
-
-    # Build our critical path entry
-    current_span_entry = {
-        "span_id": span_id,
-        "name": span["name"],
-        "service": span["service"],
-        "duration_ms": span["duration_ms"],
-        "self_time_ms": self_time,
-        "is_error": span["is_error"],
-        "child_count": len(children_ids),
-        "depth": 0,
-    }
-
-    # Increment depth for child spans
-    for child_entry in longest_child_path["spans"]:
-        child_entry["depth"] = child_entry.get("depth", 0) + 1
-
-    return {
-        "spans": [current_span_entry] + longest_child_path["spans"],
-        "total_duration_ms": span["duration_ms"],
-    }
+        if path.child_count[row]:
+            entry["child_count"] = int(path.child_count[row])
+            entry["blocked_ms"] = float(path.blocked_ms[row])
+            entry["parallel_ms"] = float(path.parallel_ms[row])
+        entry["depth"] = depth
+        entries.append(entry)
+    return entries
 
 
 def _find_parallel_opportunities(
@@ -427,14 +339,15 @@ def _generate_optimization_recommendations(
         )
 
     # Long span chain recommendation
-    if len(critical_path["spans"]) > 5:
+    path_depth = max((s["depth"] for s in critical_path["spans"]), default=-1) + 1
+    if path_depth > 5:
         recommendations.append(
             {
                 "priority": "LOW",
                 "type": "architecture_review",
-                "span_depth": len(critical_path["spans"]),
+                "span_depth": path_depth,
                 "recommendation": (
-                    f"The critical path has {len(critical_path['spans'])} spans deep. "
+                    f"The critical path has {path_depth} spans deep. "
                     "Consider if the call chain can be simplified."
                 ),
                 "investigation_steps": [
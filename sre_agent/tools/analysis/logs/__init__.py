@@ -9,6 +9,7 @@ This module provides advanced log analysis capabilities:
 Tools:
     - extract_log_patterns: Extract log templates using Drain3
     - compare_log_patterns: Compare patterns between time periods
+    - compare_log_pattern_windows: Compare stored pattern counts of two windows
     - analyze_log_anomalies: Find anomalous/emergent patterns
     - extract_log_message: Smart extraction of message from payloads
 """
@@ -18,21 +19,35 @@ from .extraction import (
     extract_log_message,
     extract_messages_from_entries,
 )
+from .pattern_store import (
+    PatternStore,
+    compare_log_pattern_windows,
+    get_pattern_store,
+)
 from .patterns import (
     LogPatternExtractor,
     analyze_log_anomalies,
     compare_log_patterns,
     extract_log_patterns,
+    extract_log_patterns_from_stream,
     get_pattern_summary,
+    mine_log_patterns_parallel,
 )
+from .timeline import PatternTimeline
 
 __all__ = [
     "LogMessageExtractor",
     "LogPatternExtractor",
+    "PatternStore",
+    "PatternTimeline",
     "analyze_log_anomalies",
+    "compare_log_pattern_windows",
     "compare_log_patterns",
     "extract_log_message",
     "extract_log_patterns",
+    "extract_log_patterns_from_stream",
     "extract_messages_from_entries",
+    "get_pattern_store",
     "get_pattern_summary",
+    "mine_log_patterns_parallel",
 ]
@@ -7,6 +7,12 @@ For jsonPayload, we use heuristics to find the main message field:
 1. Common field names: message, msg, log, text, body, error, description
 2. Longest string field (often the log message)
 3. Field containing common log patterns
+
+A given log (logName, or resource type when entries carry no logName)
+almost always puts its message in the same field, so the field the
+heuristics settle on is learned per schema: the log plus the payload's
+top-level keys. Later entries of that schema read the learned paths
+directly, and the heuristics only run when none of them holds a message.
 """
 
 import json
@@ -47,6 +53,13 @@ LOG_MESSAGE_PATTERNS = [
     r"(?:GET|POST|PUT|DELETE|PATCH)\s+/",  # HTTP methods
 ]
 
+# Learned schemas kept before the cache is reset.
+MAX_LEARNED_SCHEMAS = 4096
+
+# A path into a JSON payload (dict keys and list indexes), with the length a
+# string must exceed there to be taken as the message.
+_MessagePath = tuple[tuple[str | int, ...], int]
+
 
 class LogMessageExtractor:
     """Intelligent extractor for log messages from various payload formats.
@@ -59,7 +72,8 @@ class LogMessageExtractor:
 
     def __init__(self) -> None:
         """Initialize the extractor with regex patterns and field cache."""
-        self._field_cache: dict[str, str] = {}
+        # (log name, payload keys) -> message paths, in order of preference
+        self._field_cache: dict[tuple[str, tuple[str, ...]], list[_MessagePath]] = {}
         self._pattern_re = [re.compile(p, re.IGNORECASE) for p in LOG_MESSAGE_PATTERNS]
 
     def extract(self, log_entry: dict[str, Any]) -> str:
@@ -79,7 +93,9 @@ class LogMessageExtractor:
 
         # Try jsonPayload
         if "jsonPayload" in log_entry:
-            return self._extract_from_json(log_entry["jsonPayload"])
+            return self._extract_from_json(
+                log_entry["jsonPayload"], self._log_name(log_entry)
+            )
 
         # Try protoPayload (audit logs)
         if "protoPayload" in log_entry:
@@ -92,33 +108,77 @@ class LogMessageExtractor:
                 if isinstance(val, str):
                     return val.strip()
                 elif isinstance(val, dict):
-                    return self._extract_from_json(val)
+                    return self._extract_from_json(val, self._log_name(log_entry))
 
         # Last resort: stringify the entry
         return str(log_entry)[:500]
 
-    def _extract_from_json(self, payload: dict[str, Any]) -> str:
-        """Extract message from JSON payload using heuristics."""
+    @staticmethod
+    def _log_name(log_entry: dict[str, Any]) -> str:
+        """Name the log an entry comes from, for schema learning."""
+        log_name = log_entry.get("logName")
+        if isinstance(log_name, str) and log_name:
+            return log_name
+        resource = log_entry.get("resource")
+        if isinstance(resource, dict):
+            return str(resource.get("type", ""))
+        return ""
+
+    def _extract_from_json(self, payload: dict[str, Any], log_name: str = "") -> str:
+        """Extract message from JSON payload, via the schema's learned paths.
+
+        Field-name candidates (strategy 1) depend only on the payload keys,
+        so reading them in order gives the heuristic result. A field picked
+        by scoring or nested search is reused for the schema as long as it
+        holds a long enough string, even if another field would now score
+        higher.
+        """
         if not isinstance(payload, dict):
             return str(payload)[:500]
 
+        schema = (log_name, tuple(payload))
+        paths = self._field_cache.get(schema)
+        if paths is not None:
+            for path, min_length in paths:
+                val = _lookup(payload, path)
+                if isinstance(val, str) and len(val) > min_length:
+                    return val.strip()
+
+        message, paths = self._search_json(payload)
+        if len(self._field_cache) >= MAX_LEARNED_SCHEMAS:
+            self._field_cache.clear()
+        self._field_cache[schema] = paths
+        return message
+
+    def _search_json(self, payload: dict[str, Any]) -> tuple[str, list[_MessagePath]]:
+        """Extract message from JSON payload using heuristics.
+
+        Returns:
+            The message, and the paths to try first for payloads with the
+            same keys: every known field name present, then the field the
+            message was found in if it came from a later strategy
+        """
         # Strategy 1: Check known message field names
+        field_keys: list[str] = []
         for field_name in MESSAGE_FIELD_NAMES:
-            # Check exact match
+            # Check exact match, then case-insensitive
             if field_name in payload:
-                val = payload[field_name]
-                if isinstance(val, str) and len(val) > 0:
-                    return val.strip()
-
-            # Check case-insensitive
+                field_keys.append(field_name)
             for key in payload:
                 if key.lower() == field_name.lower():
-                    val = payload[key]
-                    if isinstance(val, str) and len(val) > 0:
-                        return val.strip()
+                    field_keys.append(key)
+        candidates: list[_MessagePath] = [
+            ((key,), 0) for key in dict.fromkeys(field_keys)
+        ]
+
+        for key in field_keys:
+            val = payload[key]
+            if isinstance(val, str) and len(val) > 0:
+                return val.strip(), candidates
 
         # Strategy 2: Find longest string that looks like a log message
         best_candidate = None
+        best_key = ""
         best_score = 0
 
         for key, val in payload.items():
@@ -127,21 +187,23 @@ class LogMessageExtractor:
                 if score > best_score:
                     best_score = score
                     best_candidate = val
+                    best_key = key
 
         if best_candidate:
-            return best_candidate.strip()
+            return best_candidate.strip(), [*candidates, ((best_key,), 10)]
 
         # Strategy 3: Nested search for common patterns
-        nested_msg = self._search_nested(payload, depth=2)
-        if nested_msg:
-            return nested_msg.strip()
+        nested_path = self._find_nested(payload, depth=2)
+        if nested_path:
+            nested_msg = _lookup(payload, nested_path)
+            return nested_msg.strip(), [*candidates, (nested_path, 10)]
 
         # Fallback: Compact JSON representation
         try:
             compact = json.dumps(payload, separators=(",", ":"))
-            return compact[:500] if len(compact) > 500 else compact
+            return compact[:500] if len(compact) > 500 else compact, candidates
         except Exception:
-            return str(payload)[:500]
+            return str(payload)[:500], candidates
 
     def _extract_from_proto(self, payload: dict[str, Any]) -> str:
         """Extract message from audit log protoPayload."""
@@ -204,8 +266,8 @@ class LogMessageExtractor:
 
         return score
 
-    def _search_nested(self, obj: Any, depth: int = 2) -> str | None:
-        """Recursively search for message fields in nested structures."""
+    def _find_nested(self, obj: Any, depth: int = 2) -> tuple[str | int, ...] | None:
+        """Find the path of a message field in nested structures."""
         if depth <= 0:
             return None
 
@@ -215,23 +277,35 @@ class LogMessageExtractor:
                 if field_name in obj:
                     val = obj[field_name]
                     if isinstance(val, str) and len(val) > 10:
-                        return val
+                        return (field_name,)
 
             # Recurse into nested dicts
-            for val in obj.values():
-                result = self._search_nested(val, depth - 1)
+            for key, val in obj.items():
+                result = self._find_nested(val, depth - 1)
                 if result:
-                    return result
+                    return (key, *result)
 
         elif isinstance(obj, list) and obj:
             # Check first element
-            result = self._search_nested(obj[0], depth - 1)
+            result = self._find_nested(obj[0], depth - 1)
             if result:
-                return result
+                return (0, *result)
 
         return None
 
 
+def _lookup(obj: Any, path: tuple[str | int, ...]) -> Any:
+    """Follow a path of dict keys and list indexes, or return None."""
+    for step in path:
+        if isinstance(obj, dict):
+            obj = obj.get(step)
+        elif isinstance(obj, list) and isinstance(step, int) and step < len(obj):
+            obj = obj[step]
+        else:
+            return None
+    return obj
+
+
 # Global extractor instance
 _extractor = LogMessageExtractor()
 
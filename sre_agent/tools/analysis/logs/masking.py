@@ -0,0 +1,140 @@
+r"""Single-pass masking of variable tokens before Drain3 templating.
+
+Drain3's `LogMasker` applies each `MaskingInstruction` in turn, so every
+message is scanned once per instruction (nine times with
+`MASKING_INSTRUCTIONS`), and each scan tries a match at every position
+since the patterns start with a word boundary. `FusedLogMasker` masks the
+same tokens with one regex in one scan:
+
+- The regex starts with the character class of every token's first
+  character, so the scan skips ahead in C to candidate positions.
+- The leading word boundary is checked once, as a lookbehind on that first
+  character, and the alternatives are grouped by first character class.
+- Each alternative is a named group; the group name picks the mask.
+
+The scan returns the leftmost token, while Drain3 goes by instruction
+priority and rescans text that earlier masks changed, so the two differ
+where tokens overlap or touch: `12:30:453ms` is `<<TIME>>3ms` for the scan
+but `<<TIME>><<DURATION>>` for Drain3. Apart from the quotes around
+emails, no token contains a character outside `[\w.:@-]`, so both maskers
+work within runs of those characters independently:
+
+- A match that spans its whole run (`remote=10.4.0.17`, `took 12ms`) is
+  what Drain3 would mask too, since no higher-priority token fits inside
+  it.
+- Any other run with a match (`10.8.2.1:8080`, a timestamp with fractional
+  seconds) is masked with the instructions in turn, as Drain3 does.
+- Emails are masked last, so a quoted run is only an email if nothing
+  inside it is masked first (`"deadbeef...@1.5ms"` holds a duration).
+
+The result therefore always equals Drain3's sequential masking.
+
+`scripts/benchmark_log_masking.py` compares both maskers on GKE-like logs.
+"""
+
+import re
+
+from drain3.masking import LogMasker, MaskingInstruction
+
+# Variable tokens masked before templating, in the order Drain3 applies them.
+MASKING_INSTRUCTIONS = [
+    MaskingInstruction(r"\b\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", "<TIMESTAMP>"),
+    MaskingInstruction(r"\b\d{4}-\d{2}-\d{2}", "<DATE>"),
+    MaskingInstruction(r"\b\d{2}:\d{2}:\d{2}", "<TIME>"),
+    MaskingInstruction(
+        r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
+        "<UUID>",
+    ),
+    MaskingInstruction(r"\b[0-9a-f]{24,}\b", "<ID>"),
+    MaskingInstruction(r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b", "<IP>"),
+    MaskingInstruction(r"\b\d+\.\d+ms\b", "<DURATION>"),
+    MaskingInstruction(r"\b\d+ms\b", "<DURATION>"),
+    MaskingInstruction(r'"\w+@\w+\.\w+"', "<EMAIL>"),
+]
+
+# MASKING_INSTRUCTIONS as one regex; the first character is matched before
+# the alternatives, which match the rest of the token. Keep the two in step.
+_FUSED_MASKING = re.compile(
+    r'[\da-f"](?:'
+    r"(?<!\w.)(?:"
+    r"(?<=\d)(?:"
+    r"(?P<TIMESTAMP>\d{3}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})"
+    r"|(?P<DATE>\d{3}-\d{2}-\d{2})"
+    r"|(?P<TIME>\d:\d{2}:\d{2})"
+    r"|(?P<IP>\d{0,2}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b)"
+    r"|(?P<DURATION>\d*(?:\.\d+)?ms\b)"
+    r")"
+    r"|(?<=[0-9a-f])(?:"
+    r"(?P<UUID>[0-9a-f]{7}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b)"
+    r"|(?P<ID>[0-9a-f]{23,}\b)"
+    r")"
+    r")"
+    r'|(?<=")(?P<EMAIL>\w+@\w+\.\w+")'
+    r")"
+)
+
+# Characters that can be part of a token other than an email's quotes; runs
+# of them are masked independently of each other.
+_TOKEN_CHAR = re.compile(r"[\w.:@-]")
+_TOKEN_RUN_TAIL = re.compile(r"[\w.:@-]*")
+
+
+class FusedLogMasker(LogMasker):  # type: ignore[misc]
+    """Drain3 log masker applying `MASKING_INSTRUCTIONS` in one pass.
+
+    The instructions are still registered with the base class, so Drain3's
+    mask names and parameter extraction are unchanged.
+    """
+
+    def __init__(self, mask_prefix: str = "<", mask_suffix: str = ">") -> None:
+        """Create the masker.
+
+        Args:
+            mask_prefix: Prefix of inserted masks (Drain3 config)
+            mask_suffix: Suffix of inserted masks (Drain3 config)
+        """
+        super().__init__(MASKING_INSTRUCTIONS, mask_prefix, mask_suffix)
+        self._masks: dict[str | None, str] = {
+            mi.mask_with.strip("<>"): mask_prefix + mi.mask_with + mask_suffix
+            for mi in MASKING_INSTRUCTIONS
+        }
+
+    def mask(self, content: str) -> str:
+        """Mask every variable token of `content` in a single scan."""
+        masks = self._masks
+        search = _FUSED_MASKING.search
+        token_char = _TOKEN_CHAR.match
+        parts: list[str] = []
+        pos = 0
+        while (match := search(content, pos)) is not None:
+            start, end = match.span()
+            kind = match.lastgroup
+            if kind == "EMAIL":
+                if search(content, start + 1, end - 1) is None:
+                    parts += (content[pos:start], masks[kind])
+                    pos = end
+                else:
+                    # A token inside is masked first, so Drain3 sees no
+                    # email here, and the closing quote may open the next one
+                    masked = super().mask(content[start:end])
+                    parts += (content[pos:start], masked[:-1])
+                    pos = end - 1
+            elif (start == 0 or not token_char(content, start - 1)) and not token_char(
+                content, end
+            ):
+                parts += (content[pos:start], masks[kind])
+                pos = end
+            else:
+                run_start = start
+                while run_start > pos and token_char(content, run_start - 1):
+                    run_start -= 1
+                run_end = _TOKEN_RUN_TAIL.match(content, end).end()
+                parts += (
+                    content[pos:run_start],
+                    super().mask(content[run_start:run_end]),
+                )
+                pos = run_end
+        if not parts:
+            return content
+        parts.append(content[pos:])
+        return "".join(parts)
@@ -0,0 +1,632 @@
+"""Persistent, incremental log pattern state per project and service.
+
+`extract_log_patterns` and friends build a fresh `LogPatternExtractor` on
+every call, so each call relearns the same templates and pattern IDs drift
+as templates generalize differently. `PatternStore` keeps one long-lived
+Drain3 parse tree per scope (project + service) and, next to it, per-minute
+counts of every pattern:
+
+- The parse tree is saved and restored through Drain3's persistence hooks,
+  in a SQLite database (WAL mode, shared between workers). Each ingest holds
+  the database write lock from reading a scope to writing it back, and
+  reloads a cached tree that another process has updated since, so cluster
+  IDs, pattern IDs and covered ranges stay consistent across workers.
+- Each scope remembers the time ranges it has already ingested. Log queries
+  ordered by timestamp return contiguous ranges, so entries inside a covered
+  range are skipped and only new ones are counted. Only a complete result
+  marks its range covered; a truncated one (pages left to fetch) has gaps,
+  so it is mined but not counted.
+- Counts are kept per pattern, epoch minute and severity, which turns a
+  baseline-versus-incident comparison into two range lookups. Counts older
+  than the retention window are deleted, as are scopes not updated within it.
+- A Drain3 cluster keeps the pattern ID of its first template when the
+  template generalizes (`User 1 logged in` becoming `User <*> logged in`),
+  so its counts are not split across two IDs; the stored template is the
+  latest one. The cluster-to-ID mapping is saved with the parse tree.
+
+Scopes are keyed by a digest of the log filter too, since entries from a
+narrower query would otherwise be mistaken for the whole covered range.
+Logs fetched with user credentials are kept per credential identity, so a
+user only sees patterns (and their sample values) mined from logs fetched
+with their own credentials; callers without an identity bypass the store.
+
+Environment variables:
+    SRE_AGENT_PATTERN_STORE_PATH: SQLite database path (in memory if unset)
+    SRE_AGENT_PATTERN_RETENTION_DAYS: Days of counts kept (0 keeps them all)
+
+Example:
+    >>> store = PatternStore("/tmp/sre_agent_patterns.db")
+    >>> store.ingest("my-project", entries, service="checkout")
+    >>> store.compare_windows("my-project", b_start, b_end, c_start, c_end)
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from drain3.persistence_handler import PersistenceHandler
+
+from ....auth import credentials_identity, get_current_credentials_or_none
+from ...common import adk_tool
+from ...common.trace_frame import parse_timestamp_ns
+from .patterns import (
+    DuplicateGroups,
+    LogPattern,
+    LogPatternExtractor,
+    PatternComparison,
+    _determine_alert_level,
+    compare_patterns,
+    merge_shards,
+)
+from .timeline import minute_isoformat
+
+logger = logging.getLogger(__name__)
+
+_NS_PER_MINUTE = 60 * 1_000_000_000
+
+# Parse trees kept in memory; others are restored from the database on use.
+DEFAULT_MAX_LIVE_SCOPES = 64
+
+# Cloud Logging's default retention; older logs cannot be fetched again.
+DEFAULT_RETENTION_DAYS = 30.0
+# Minimum time between two retention sweeps.
+PRUNE_INTERVAL_SECONDS = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pattern_scopes (
+    scope TEXT PRIMARY KEY,
+    drain_state BLOB,
+    covered TEXT NOT NULL DEFAULT '[]',
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pattern_templates (
+    scope TEXT NOT NULL,
+    pattern_id TEXT NOT NULL,
+    template TEXT NOT NULL,
+    PRIMARY KEY (scope, pattern_id)
+);
+CREATE TABLE IF NOT EXISTS pattern_clusters (
+    scope TEXT NOT NULL,
+    cluster_id INTEGER NOT NULL,
+    pattern_id TEXT NOT NULL,
+    PRIMARY KEY (scope, cluster_id)
+);
+CREATE TABLE IF NOT EXISTS pattern_counts (
+    scope TEXT NOT NULL,
+    pattern_id TEXT NOT NULL,
+    minute INTEGER NOT NULL,
+    severity TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (scope, pattern_id, minute, severity)
+);
+CREATE INDEX IF NOT EXISTS idx_pattern_counts_minute
+    ON pattern_counts (scope, minute);
+"""
+
+
+def _scope_key(project_id: str, service: str, log_filter: str = "") -> str | None:
+    """Scope of the current caller, or None if their credentials have no identity."""
+    scope = f"{project_id}/{service}"
+    log_filter = " ".join(log_filter.split())
+    if log_filter:
+        digest = hashlib.blake2b(log_filter.encode(), digest_size=8).hexdigest()
+        scope = f"{scope}/{digest}"
+    creds = get_current_credentials_or_none()
+    if creds is None:
+        return scope
+    identity = credentials_identity(creds)
+    return None if identity is None else f"{scope}@{identity}"
+
+
+def _to_minute(timestamp: str) -> int:
+    ns = parse_timestamp_ns(timestamp)
+    if ns is None:
+        raise ValueError(f"Invalid timestamp: {timestamp!r}")
+    return ns // _NS_PER_MINUTE
+
+
+def _is_covered(covered: list[list[int]], ns: int) -> bool:
+    """Whether `ns` falls in one of the sorted, disjoint `[lo, hi]` ranges."""
+    i = bisect.bisect_right(covered, [ns, float("inf")]) - 1
+    return i >= 0 and covered[i][0] <= ns <= covered[i][1]
+
+
+def _trim_ranges(covered: list[list[int]], start: int) -> list[list[int]]:
+    """Drop the parts of sorted `[lo, hi]` ranges before `start`."""
+    return [[max(lo, start), hi] for lo, hi in covered if hi >= start]
+
+
+def _add_range(covered: list[list[int]], lo: int, hi: int) -> list[list[int]]:
+    """Insert `[lo, hi]` into sorted ranges, merging overlaps."""
+    merged: list[list[int]] = []
+    for start, end in sorted([*covered, [lo, hi]]):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class _ScopePersistence(PersistenceHandler):  # type: ignore[misc]
+    """Drain3 persistence handler backed by a row of `pattern_scopes`."""
+
+    def __init__(self, store: "PatternStore", scope: str) -> None:
+        self._store = store
+        self._scope = scope
+
+    def save_state(self, state: bytes) -> None:
+        self._store._save_drain_state(self._scope, state)
+
+    def load_state(self) -> bytes | None:
+        return self._store._load_drain_state(self._scope)
+
+
+class PatternStore:
+    """Long-lived Drain3 pattern state and per-minute counts per scope.
+
+    Thread Safety:
+        All operations run under one lock; other processes coordinate
+        through SQLite's WAL locking. `ingest()` runs in one `BEGIN
+        IMMEDIATE` transaction, and a parse tree cached in memory is
+        restored again when its scope's `updated_at` no longer matches.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_live_scopes: int = DEFAULT_MAX_LIVE_SCOPES,
+        retention_days: float | None = DEFAULT_RETENTION_DAYS,
+    ) -> None:
+        """Open (or create) the pattern database.
+
+        Args:
+            path: Path of the SQLite database file (in memory by default).
+            max_live_scopes: Number of parse trees kept in memory.
+            retention_days: Age after which counts and idle scopes are
+                deleted (None keeps them all).
+        """
+        self.path = path
+        self.max_live_scopes = max_live_scopes
+        self.retention_days = retention_days
+        self._pruned_at = 0.0
+        self._lock = threading.RLock()
+        # Live extractors, with the `updated_at` of the state they hold
+        self._live: OrderedDict[str, tuple[LogPatternExtractor, float | None]] = (
+            OrderedDict()
+        )
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def ingest(
+        self,
+        project_id: str,
+        entries: list[Any],
+        service: str = "",
+        log_filter: str = "",
+        complete: bool = True,
+    ) -> tuple[LogPatternExtractor, int]:
+        """Mine entries with the scope's parse tree and count the new ones.
+
+        Every entry is mined (so the returned patterns describe the whole
+        batch, with pattern IDs stable across calls), but only entries of a
+        complete batch, within the retention window and outside the scope's
+        already ingested time ranges are added to the per-minute counts.
+        For a caller whose credentials have no identity, the batch is mined
+        on its own and nothing is recorded.
+
+        Args:
+            project_id: The Google Cloud Project ID.
+            entries: Log entry dicts (from list_log_entries).
+            service: Service the entries belong to ("" for the whole project).
+            log_filter: Filter the entries were fetched with.
+            complete: Whether `entries` is the whole result of the query;
+                a truncated result is mined but not counted.
+
+        Returns:
+            An extractor holding the batch's patterns, and the number of
+            entries newly counted.
+        """
+        scope = _scope_key(project_id, service, log_filter)
+        if scope is None:
+            batch = LogPatternExtractor()
+            groups = DuplicateGroups()
+            for pos, entry in enumerate(entries):
+                groups.add(pos, entry)
+            merge_shards(batch, [groups.mine(batch)])
+            return batch, 0
+        with self._lock:
+            if time.time() - self._pruned_at >= PRUNE_INTERVAL_SECONDS:
+                self.prune()
+            # Other processes cannot write between reading the scope and
+            # writing it back, so the tree and covered ranges stay current.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                batch, ingested = self._ingest(scope, entries, complete)
+            except BaseException:
+                self._conn.rollback()
+                self._live.pop(scope, None)
+                raise
+            self._conn.commit()
+
+        logger.debug(f"PatternStore ingested {ingested}/{len(entries)} for {scope}")
+        return batch, ingested
+
+    def _ingest(
+        self, scope: str, entries: list[Any], complete: bool
+    ) -> tuple[LogPatternExtractor, int]:
+        """Body of `ingest()`; the caller holds the lock and the transaction."""
+        updated_at, covered = self._scope_state(scope)
+        miner = self._extractor(scope, updated_at)
+        cutoff = self._cutoff_ns()
+        covered = _trim_ranges(covered, cutoff)
+
+        groups = DuplicateGroups()
+        lo: int | None = None
+        hi: int | None = None
+        ingested = 0
+        for pos, entry in enumerate(entries):
+            minute = None
+            record = False
+            if isinstance(entry, dict):
+                ns = parse_timestamp_ns(entry.get("timestamp"))
+                if (
+                    complete
+                    and ns is not None
+                    and ns >= cutoff
+                    and not _is_covered(covered, ns)
+                ):
+                    record = True
+                    ingested += 1
+                    lo = ns if lo is None else min(lo, ns)
+                    hi = ns if hi is None else max(hi, ns)
+                if ns is not None:
+                    minute = ns // _NS_PER_MINUTE
+            groups.add(pos, entry, minute, record)
+
+        batch = LogPatternExtractor()
+        changes = miner.tree_changes
+        merge_shards(batch, [groups.mine(miner)])
+        if ingested and lo is not None and hi is not None:
+            now = time.time()
+            self._write_counts(
+                scope, miner, groups, batch, _add_range(covered, lo, hi), now
+            )
+            miner.snapshot()
+            self._live[scope] = (miner, now)
+        elif miner.tree_changes != changes:
+            # Not saved, so the next ingest restores the stored tree
+            self._live.pop(scope, None)
+        return batch, ingested
+
+    def window_patterns(
+        self,
+        project_id: str,
+        start: str,
+        end: str,
+        service: str = "",
+        log_filter: str = "",
+    ) -> list[LogPattern]:
+        """Get pattern counts over `[start, end)` from the stored buckets.
+
+        Args:
+            project_id: The Google Cloud Project ID.
+            start: Window start (RFC3339), rounded down to the minute.
+            end: Window end (RFC3339, exclusive), rounded down to the minute.
+            service: Scope service ("" for the whole project).
+            log_filter: Scope log filter.
+
+        Returns:
+            Patterns with counts, severity counts and minute-precision
+            first/last seen times, most frequent first.
+        """
+        scope = _scope_key(project_id, service, log_filter)
+        if scope is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.pattern_id, t.template, c.severity, SUM(c.count), "
+                "MIN(c.minute), MAX(c.minute) "
+                "FROM pattern_counts c JOIN pattern_templates t "
+                "ON t.scope = c.scope AND t.pattern_id = c.pattern_id "
+                "WHERE c.scope = ? AND c.minute >= ? AND c.minute < ? "
+                "GROUP BY c.pattern_id, c.severity",
+                (scope, _to_minute(start), _to_minute(end)),
+            ).fetchall()
+
+        patterns: dict[str, tuple[LogPattern, int, int]] = {}
+        for pattern_id, template, severity, count, first, last in rows:
+            current = patterns.get(pattern_id)
+            if current is None:
+                pattern = LogPattern(pattern_id=pattern_id, template=template, count=0)
+                current = patterns[pattern_id] = (pattern, first, last)
+            pattern, lo, hi = current
+            pattern.count += count
+            if severity:
+                pattern.severity_counts[severity] = count
+            patterns[pattern_id] = (pattern, min(lo, first), max(hi, last))
+
+        result = []
+        for pattern, first, last in patterns.values():
+            pattern.first_seen = minute_isoformat(first)
+            pattern.last_seen = minute_isoformat(last)
+            result.append(pattern)
+        result.sort(key=lambda p: p.count, reverse=True)
+        return result
+
+    def compare_windows(
+        self,
+        project_id: str,
+        baseline_start: str,
+        baseline_end: str,
+        comparison_start: str,
+        comparison_end: str,
+        service: str = "",
+        significance_threshold: float = 0.5,
+        log_filter: str = "",
+    ) -> PatternComparison:
+        """Compare two time windows of a scope without re-mining any logs."""
+        return compare_patterns(
+            self.window_patterns(
+                project_id, baseline_start, baseline_end, service, log_filter
+            ),
+            self.window_patterns(
+                project_id, comparison_start, comparison_end, service, log_filter
+            ),
+            significance_threshold=significance_threshold,
+        )
+
+    def prune(self) -> int:
+        """Delete counts older than the retention window and idle scopes.
+
+        Returns:
+            Number of count rows deleted
+        """
+        if self.retention_days is None:
+            return 0
+        cutoff = time.time() - self.retention_days * 86400
+        with self._lock, self._conn:
+            stale = [
+                (row[0],)
+                for row in self._conn.execute(
+                    "SELECT scope FROM pattern_scopes WHERE updated_at < ?",
+                    (cutoff,),
+                )
+            ]
+            for table in ("pattern_scopes", "pattern_templates", "pattern_clusters"):
+                self._conn.executemany(f"DELETE FROM {table} WHERE scope = ?", stale)
+            deleted = self._conn.executemany(
+                "DELETE FROM pattern_counts WHERE scope = ?", stale
+            ).rowcount
+            deleted += self._conn.execute(
+                "DELETE FROM pattern_counts WHERE minute < ?",
+                (int(cutoff // 60),),
+            ).rowcount
+            for (scope,) in stale:
+                self._live.pop(scope, None)
+            self._pruned_at = time.time()
+        if deleted or stale:
+            logger.debug(
+                f"PatternStore pruned {deleted} counts and {len(stale)} scopes"
+            )
+        return deleted
+
+    def clear(self) -> None:
+        """Delete all scopes, templates and counts."""
+        with self._lock:
+            self._live.clear()
+            self._conn.execute("DELETE FROM pattern_scopes")
+            self._conn.execute("DELETE FROM pattern_templates")
+            self._conn.execute("DELETE FROM pattern_clusters")
+            self._conn.execute("DELETE FROM pattern_counts")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _extractor(self, scope: str, updated_at: float | None) -> LogPatternExtractor:
+        """Get the scope's live extractor, restoring it if needed.
+
+        A live extractor is restored again when the scope was written (by
+        another process) since it was loaded or last saved. The caller must
+        hold the lock.
+        """
+        live = self._live.get(scope)
+        extractor = live[0] if live is not None and live[1] == updated_at else None
+        if extractor is None:
+            extractor = LogPatternExtractor(
+                persistence_handler=_ScopePersistence(self, scope), stable_ids=True
+            )
+            extractor._cluster_to_pattern.update(
+                self._conn.execute(
+                    "SELECT cluster_id, pattern_id FROM pattern_clusters "
+                    "WHERE scope = ?",
+                    (scope,),
+                ).fetchall()
+            )
+            self._live[scope] = (extractor, updated_at)
+            self._live.move_to_end(scope)
+            if len(self._live) > self.max_live_scopes:
+                self._live.popitem(last=False)
+        else:
+            self._live.move_to_end(scope)
+        return extractor
+
+    def _cutoff_ns(self) -> int:
+        """Oldest timestamp counted, in nanoseconds (0 without retention)."""
+        if self.retention_days is None:
+            return 0
+        return int((time.time() - self.retention_days * 86400) * 1e9)
+
+    def _scope_state(self, scope: str) -> tuple[float | None, list[list[int]]]:
+        """Get the scope's `updated_at` and covered ranges (None, [] if new)."""
+        row = self._conn.execute(
+            "SELECT updated_at, covered FROM pattern_scopes WHERE scope = ?",
+            (scope,),
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else (None, [])
+
+    def _write_counts(
+        self,
+        scope: str,
+        miner: LogPatternExtractor,
+        groups: DuplicateGroups,
+        batch: LogPatternExtractor,
+        covered: list[list[int]],
+        updated_at: float,
+    ) -> None:
+        """Upsert templates, pattern IDs, counts and covered ranges.
+
+        Runs in the caller's transaction; `covered` must already include the
+        ranges stored for the scope.
+        """
+        counts: dict[tuple[str, int, str], int] = {}
+        for group in groups.groups.values():
+            if group.pattern_id is None:
+                continue
+            for (minute, severity), count in group.recorded_counts.items():
+                key = (group.pattern_id, minute, severity)
+                counts[key] = counts.get(key, 0) + count
+
+        self._conn.executemany(
+            "INSERT INTO pattern_templates (scope, pattern_id, template) "
+            "VALUES (?, ?, ?) ON CONFLICT (scope, pattern_id) "
+            "DO UPDATE SET template = excluded.template",
+            [(scope, p.pattern_id, p.template) for p in batch.patterns.values()],
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO pattern_clusters (scope, cluster_id, pattern_id) "
+            "VALUES (?, ?, ?)",
+            [(scope, *item) for item in miner._cluster_to_pattern.items()],
+        )
+        self._conn.executemany(
+            "INSERT INTO pattern_counts "
+            "(scope, pattern_id, minute, severity, count) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (scope, pattern_id, minute, severity) "
+            "DO UPDATE SET count = count + excluded.count",
+            [(scope, *key, count) for key, count in counts.items()],
+        )
+        self._conn.execute(
+            "INSERT INTO pattern_scopes (scope, covered, updated_at) "
+            "VALUES (?, ?, ?) ON CONFLICT (scope) "
+            "DO UPDATE SET covered = excluded.covered, "
+            "updated_at = excluded.updated_at",
+            (scope, json.dumps(covered), updated_at),
+        )
+
+    def _save_drain_state(self, scope: str, state: bytes) -> None:
+        # Only saved by `ingest()`, after `_write_counts` created the row and
+        # within the same transaction
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pattern_scopes SET drain_state = ? WHERE scope = ?",
+                (state, scope),
+            )
+
+    def _load_drain_state(self, scope: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT drain_state FROM pattern_scopes WHERE scope = ?", (scope,)
+            ).fetchone()
+        return row[0] if row and row[0] is not None else None
+
+
+_pattern_store: PatternStore | None = None
+_pattern_store_lock = threading.Lock()
+
+
+def get_pattern_store() -> PatternStore:
+    """Get the global pattern store.
+
+    The database lives at SRE_AGENT_PATTERN_STORE_PATH when set, and in
+    memory (per process) otherwise; counts are kept for
+    SRE_AGENT_PATTERN_RETENTION_DAYS.
+    """
+    global _pattern_store
+    with _pattern_store_lock:
+        if _pattern_store is None:
+            path = os.environ.get("SRE_AGENT_PATTERN_STORE_PATH") or ":memory:"
+            retention_days = float(
+                os.environ.get(
+                    "SRE_AGENT_PATTERN_RETENTION_DAYS", str(DEFAULT_RETENTION_DAYS)
+                )
+            )
+            try:
+                _pattern_store = PatternStore(
+                    path, retention_days=retention_days or None
+                )
+            except sqlite3.Error as e:
+                logger.warning(
+                    f"Pattern store at {path} unavailable ({e}), using memory"
+                )
+                _pattern_store = PatternStore(retention_days=retention_days or None)
+        return _pattern_store
+
+
+@adk_tool
+def compare_log_pattern_windows(
+    project_id: str,
+    baseline_start: str,
+    baseline_end: str,
+    comparison_start: str,
+    comparison_end: str,
+    service: str = "",
+    significance_threshold: float = 0.5,
+    log_filter: str = "",
+) -> dict[str, Any]:
+    """Compare log patterns of two time windows from the stored pattern counts.
+
+    Works on logs previously passed to `extract_log_patterns` with the same
+    `project_id`, `service` and `log_filter`, and the same user credentials;
+    no logs are fetched or re-mined.
+
+    Args:
+        project_id: The Google Cloud Project ID
+        baseline_start: Start of the baseline window (RFC3339)
+        baseline_end: End of the baseline window (RFC3339)
+        comparison_start: Start of the comparison window (RFC3339)
+        comparison_end: End of the comparison window (RFC3339)
+        service: Service scope used when the logs were extracted
+        significance_threshold: Minimum % change to be significant (0.5 = 50%)
+        log_filter: Log filter used when the logs were extracted
+
+    Returns:
+        Comparison results in the same format as `compare_log_patterns`
+    """
+    store = get_pattern_store()
+    try:
+        baseline = store.window_patterns(
+            project_id, baseline_start, baseline_end, service, log_filter
+        )
+        comparison_patterns = store.window_patterns(
+            project_id, comparison_start, comparison_end, service, log_filter
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+
+    comparison = compare_patterns(
+        baseline, comparison_patterns, significance_threshold=significance_threshold
+    )
+    return {
+        "baseline_summary": {
+            "total_logs": sum(p.count for p in baseline),
+            "unique_patterns": len(baseline),
+        },
+        "comparison_summary": {
+            "total_logs": sum(p.count for p in comparison_patterns),
+            "unique_patterns": len(comparison_patterns),
+        },
+        "anomalies": comparison.to_dict(),
+        "alert_level": _determine_alert_level(comparison),
+    }
@@ -12,18 +12,70 @@ The main goals are:
 
 import hashlib
 import logging
+import multiprocessing
+import os
+import threading
+from collections.abc import AsyncIterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
 from drain3 import TemplateMiner
-from drain3.masking import MaskingInstruction
+from drain3.persistence_handler import PersistenceHandler
 from drain3.template_miner_config import TemplateMinerConfig
 
 from ...common import adk_tool
 from .extraction import extract_log_message
+from .masking import MASKING_INSTRUCTIONS, FusedLogMasker
+from .timeline import (
+    PatternTimeline,
+    epoch_minute,
+    minute_isoformat,
+    stack_series,
+)
 
 logger = logging.getLogger(__name__)
 
+# Inputs this large are mined in parallel, sharded by resource/service.
+PARALLEL_MIN_ENTRIES = 50_000
+
+# Worker processes for parallel mining, shared by every call and started on
+# first use. Workers come from a forkserver (spawn where there is none), so
+# they never inherit the server's threads, locks or open clients.
+_mining_pool: ProcessPoolExecutor | None = None
+_mining_pool_lock = threading.Lock()
+
+# Resource labels identifying the emitting service, in order of preference.
+_SERVICE_LABELS = (
+    "service_name",
+    "container_name",
+    "module_id",
+    "function_name",
+    "configuration_name",
+)
+
+# Distinct resource types remembered per pattern.
+MAX_PATTERN_RESOURCES = 10
+
+# Windowed detection: minimum occurrences for a rate change or burst to be
+# reported, the relative change that counts as a rate change, and how many
+# standard deviations above its other minutes a burst minute must be.
+MIN_ANOMALY_COUNT = 5
+RATE_CHANGE_THRESHOLD = 0.5
+BURST_SIGMA = 3.0
+
+
+def _add_resource(resources: list[str], resource: str) -> None:
+    """Remember a resource type, up to MAX_PATTERN_RESOURCES distinct ones."""
+    if (
+        resource
+        and len(resources) < MAX_PATTERN_RESOURCES
+        and resource not in resources
+    ):
+        resources.append(resource)
+
 
 @dataclass
 class LogPattern:
@@ -37,6 +89,7 @@ class LogPattern:
     severity_counts: dict[str, int] = field(default_factory=dict)
     sample_messages: list[str] = field(default_factory=list)
     resources: list[str] = field(default_factory=list)
+    timeline: PatternTimeline = field(default_factory=PatternTimeline)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert the pattern to a dictionary representation."""
@@ -48,7 +101,7 @@ class LogPattern:
             "last_seen": self.last_seen,
             "severity_counts": self.severity_counts,
             "sample_messages": self.sample_messages[:3],  # Limit samples
-            "resources": list(set(self.resources))[:5],  # Unique, limited
+            "resources": list(dict.fromkeys(self.resources))[:5],  # Unique, limited
         }
 
 
@@ -98,6 +151,8 @@ class LogPatternExtractor:
         sim_th: float = 0.4,
         max_children: int = 100,
         max_clusters: int = 1000,
+        persistence_handler: PersistenceHandler | None = None,
+        stable_ids: bool = False,
     ):
         """Initialize the pattern extractor.
 
@@ -106,6 +161,10 @@ class LogPatternExtractor:
             sim_th: Similarity threshold for clustering (0-1)
             max_children: Max children per node
             max_clusters: Maximum number of patterns to track
+            persistence_handler: Optional Drain3 persistence to restore the
+                parse tree from; state is saved only by `snapshot()`
+            stable_ids: Keep a cluster's first pattern ID when its template
+                generalizes, instead of hashing the new template
         """
         config = TemplateMinerConfig()
         config.drain_depth = depth
@@ -113,25 +172,34 @@ class LogPatternExtractor:
         config.drain_max_children = max_children
         config.drain_max_clusters = max_clusters
 
-        # Mask common variable patterns using MaskingInstruction objects
-        config.masking_instructions = [
-            MaskingInstruction(r"\b\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", "<TIMESTAMP>"),
-            MaskingInstruction(r"\b\d{4}-\d{2}-\d{2}", "<DATE>"),
-            MaskingInstruction(r"\b\d{2}:\d{2}:\d{2}", "<TIME>"),
-            MaskingInstruction(
-                r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
-                "<UUID>",
-            ),
-            MaskingInstruction(r"\b[0-9a-f]{24,}\b", "<ID>"),
-            MaskingInstruction(r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b", "<IP>"),
-            MaskingInstruction(r"\b\d+\.\d+ms\b", "<DURATION>"),
-            MaskingInstruction(r"\b\d+ms\b", "<DURATION>"),
-            MaskingInstruction(r'"\w+@\w+\.\w+"', "<EMAIL>"),
-        ]
+        config.masking_instructions = MASKING_INSTRUCTIONS
 
-        self.miner = TemplateMiner(config=config)
+        config.snapshot_compress_state = True
+
+        self.miner = TemplateMiner(
+            persistence_handler=persistence_handler, config=config
+        )
+        # One regex scan per message instead of one per instruction
+        self.miner.masker = FusedLogMasker(config.mask_prefix, config.mask_suffix)
+        # Drain3 would snapshot the whole tree on every new cluster; detach
+        # the handler after restoring and save explicitly instead.
+        self.miner.persistence_handler = None
+        self._persistence_handler = persistence_handler
         self.patterns: dict[str, LogPattern] = {}
         self._cluster_to_pattern: dict[int, str] = {}
+        self._stable_ids = stable_ids
+        # Messages that created a cluster or changed its template
+        self.tree_changes = 0
+
+    def snapshot(self) -> None:
+        """Save the Drain3 parse tree through the persistence handler."""
+        if self._persistence_handler is None:
+            return
+        self.miner.persistence_handler = self._persistence_handler
+        try:
+            self.miner.save_state("snapshot")
+        finally:
+            self.miner.persistence_handler = None
 
     def add_log(
         self,
@@ -151,24 +219,10 @@ class LogPatternExtractor:
         Returns:
             The pattern ID this message belongs to
         """
-        result = self.miner.add_log_message(message)
-
-        if result is None:
+        mined = self._mine(message)
+        if mined is None:
             return "unknown"
-
-        # Handle both dict (newer API) and object (older API) return types
-        if isinstance(result, dict):
-            cluster_id = result.get("cluster_id")
-            template = result.get("template_mined", message)
-        else:
-            cluster_id = result.cluster_id
-            template = result.get_template()
-
-        # Generate stable pattern ID from template
-        pattern_id = self._generate_pattern_id(template)
-
-        # Map cluster to pattern
-        self._cluster_to_pattern[cluster_id] = pattern_id  # type: ignore
+        pattern_id, template = mined
 
         # Update or create pattern
         if pattern_id not in self.patterns:
@@ -192,7 +246,10 @@ class LogPatternExtractor:
             )
 
         if resource:
-            pattern.resources.append(resource)
+            _add_resource(pattern.resources, resource)
+        minute = epoch_minute(timestamp)
+        if minute is not None:
+            pattern.timeline.add(minute, severity)
 
         # Keep limited samples
         if len(pattern.sample_messages) < 5:
@@ -200,6 +257,34 @@ class LogPatternExtractor:
 
         return pattern_id
 
+    def _mine(self, message: str) -> tuple[str, str] | None:
+        """Run a message through Drain3 and return its pattern ID and template."""
+        result = self.miner.add_log_message(message)
+
+        if result is None:
+            return None
+
+        # Handle both dict (newer API) and object (older API) return types
+        if isinstance(result, dict):
+            cluster_id = result.get("cluster_id")
+            template = result.get("template_mined", message)
+            if result.get("change_type", "none") != "none":
+                self.tree_changes += 1
+        else:
+            cluster_id = result.cluster_id
+            template = result.get_template()
+            self.tree_changes += 1
+
+        if self._stable_ids and cluster_id in self._cluster_to_pattern:
+            return self._cluster_to_pattern[cluster_id], template
+
+        # Generate stable pattern ID from template
+        pattern_id = self._generate_pattern_id(template)
+
+        # Map cluster to pattern
+        self._cluster_to_pattern[cluster_id] = pattern_id  # type: ignore
+        return pattern_id, template
+
     def _generate_pattern_id(self, template: str) -> str:
         """Generate a stable pattern ID from template."""
         # Use hash of template for consistent IDs
@@ -375,52 +460,394 @@ def extract_log_patterns(
     log_entries_json: str,
     max_patterns: int = 30,
     min_count: int = 2,
+    project_id: str | None = None,
+    service: str = "",
+    log_filter: str = "",
 ) -> dict[str, Any]:
     """Extract log patterns from a list of log entries using Drain3.
 
     This tool compresses repetitive logs into patterns, making it easier
     to understand the log landscape without overwhelming context.
 
+    When `project_id` is given, the entries are mined with the persistent
+    pattern state of that project/service/filter, so pattern IDs stay stable
+    across calls, and new entries are recorded for
+    `compare_log_pattern_windows`. Only a list_log_entries result without a
+    `next_page_token` is recorded; a partial result, or a plain list whose
+    completeness is unknown, is mined but not recorded.
+
     Args:
-        log_entries_json: JSON string of log entry dicts (from list_log_entries)
+        log_entries_json: JSON string of log entry dicts, or the
+            list_log_entries result (entries and next_page_token)
         max_patterns: Maximum patterns to return
         min_count: Minimum occurrences for a pattern
+        project_id: Optional GCP project ID to record the patterns under
+        service: Optional service name to scope the recorded patterns
+        log_filter: Cloud Logging filter the entries were fetched with, to
+            scope the recorded patterns
 
     Returns:
         Summary dict with patterns and statistics
     """
-    import json
+    log_entries, complete = _load_entries(log_entries_json)
 
-    log_entries = []
-    if isinstance(log_entries_json, list):
-        log_entries = log_entries_json
+    if project_id:
+        extractor = _mine_in_scope(
+            log_entries, project_id, service, log_filter, complete
+        )
+    elif len(log_entries) >= PARALLEL_MIN_ENTRIES and (os.cpu_count() or 1) > 1:
+        extractor = mine_log_patterns_parallel(log_entries)
     else:
+        groups = DuplicateGroups()
+        for pos, entry in enumerate(log_entries):
+            groups.add(pos, entry)
+        extractor = LogPatternExtractor()
+        merge_shards(extractor, [groups.mine(extractor)])
+
+    return extractor.get_summary(max_patterns=max_patterns)
+
+
+def _load_entries(log_entries_json: Any) -> tuple[list[Any], bool]:
+    """Parse a tool's log entries argument.
+
+    Args:
+        log_entries_json: A list of log entry dicts or a list_log_entries
+            result (entries and next_page_token), parsed or as JSON
+
+    Returns:
+        The entries, and whether they are known to be the whole result of
+        their query: only a list_log_entries result without a
+        `next_page_token` is
+    """
+    import json
+
+    data: Any = log_entries_json
+    if not isinstance(data, list | dict):
         try:
-            log_entries = json.loads(log_entries_json)
-            if not isinstance(log_entries, list):
-                log_entries = []
+            data = json.loads(log_entries_json)
         except (json.JSONDecodeError, TypeError):
-            log_entries = []
+            data = []
+    complete = False
+    if isinstance(data, dict):
+        complete = not data.get("next_page_token")
+        data = data.get("entries")
+    return (data if isinstance(data, list) else []), complete
+
+
+def _mine_in_scope(
+    log_entries: list[Any],
+    project_id: str,
+    service: str,
+    log_filter: str,
+    complete: bool,
+) -> LogPatternExtractor:
+    """Mine entries with the persistent pattern state of a scope."""
+    from .pattern_store import get_pattern_store
+
+    extractor, _ = get_pattern_store().ingest(
+        project_id, log_entries, service, log_filter=log_filter, complete=complete
+    )
+    return extractor
+
+
+async def extract_log_patterns_from_stream(
+    log_entries: AsyncIterable[dict[str, Any]],
+    max_patterns: int = 30,
+) -> dict[str, Any]:
+    """Extract log patterns from a stream of log entries.
+
+    Entries are collapsed into duplicate groups as they arrive (e.g. from
+    `iter_log_entries`), so only one copy of each distinct message is kept
+    in memory before mining.
+
+    Args:
+        log_entries: Async iterable of log entry dicts
+        max_patterns: Maximum patterns to return
+
+    Returns:
+        Summary dict with patterns and statistics, as `extract_log_patterns`
+    """
+    groups = DuplicateGroups()
+    pos = 0
+    async for entry in log_entries:
+        groups.add(pos, entry)
+        pos += 1
 
     extractor = LogPatternExtractor()
+    merge_shards(extractor, [groups.mine(extractor)])
+    return extractor.get_summary(max_patterns=max_patterns)
+
+
+@dataclass(slots=True)
+class _MessageGroup:
+    """Byte-identical log messages, with what mining needs of each entry."""
+
+    first_pos: int
+    first_seen: str | None
+    last_pos: int = 0
+    last_seen: str | None = None
+    count: int = 0
+    severity_counts: dict[str, int] = field(default_factory=dict)
+    resources: list[str] = field(default_factory=list)
+    sample_positions: list[int] = field(default_factory=list)
+    # (epoch minute, severity) -> count, of every timestamped entry
+    minute_counts: dict[tuple[int, str], int] = field(default_factory=dict)
+    # The same buckets, for entries added with `record=True` only
+    recorded_counts: dict[tuple[int, str], int] = field(default_factory=dict)
+    pattern_id: str | None = None
+
+
+# A pattern mined from one duplicate group, with the input positions of its
+# first and last entry and of its samples, and its per-minute counts.
+_PartialPattern = tuple[LogPattern, int, int, list[int], dict[tuple[int, str], int]]
+
+
+class DuplicateGroups:
+    """Hashing pre-pass that collapses identical messages before mining.
+
+    Bursts are dominated by repeats of the same line, so each distinct
+    message goes through masking and the Drain tree once; counts,
+    timestamps, severities and resources are added back per group. Every
+    occurrence of a message is attributed to the template it first matched.
+    """
 
-    for entry in log_entries:
+    def __init__(self) -> None:
+        """Initialize with no groups."""
+        self.groups: dict[str, _MessageGroup] = {}
+
+    def add(
+        self, pos: int, entry: Any, minute: int | None = None, record: bool = False
+    ) -> None:
+        """Record the entry at input position `pos`; non-dicts are skipped.
+
+        Args:
+            pos: Position of the entry in the input
+            entry: Log entry dict
+            minute: Epoch minute of the entry, if already parsed
+            record: Also count the entry in the group's `recorded_counts`
+        """
         if not isinstance(entry, dict):
-            continue
+            return
         message = extract_log_message(entry)
         timestamp = entry.get("timestamp", "")
+        group = self.groups.get(message)
+        if group is None:
+            group = self.groups[message] = _MessageGroup(pos, timestamp)
+        group.count += 1
+        group.last_pos = pos
+        group.last_seen = timestamp
+        if len(group.sample_positions) < 5:
+            group.sample_positions.append(pos)
+
         severity = entry.get("severity", "")
+        if severity:
+            group.severity_counts[severity] = group.severity_counts.get(severity, 0) + 1
+        if minute is None:
+            minute = epoch_minute(timestamp)
+        if minute is not None:
+            bucket = (minute, severity or "")
+            group.minute_counts[bucket] = group.minute_counts.get(bucket, 0) + 1
+            if record:
+                group.recorded_counts[bucket] = group.recorded_counts.get(bucket, 0) + 1
         resource = entry.get("resource", {})
         resource_type = resource.get("type", "") if isinstance(resource, dict) else ""
+        if resource_type:
+            _add_resource(group.resources, resource_type)
 
-        extractor.add_log(
-            message=message,
-            timestamp=timestamp,
-            severity=severity,
-            resource=resource_type,
-        )
+    def mine(self, extractor: LogPatternExtractor) -> list[_PartialPattern]:
+        """Mine each distinct message once, in order of first appearance.
 
-    return extractor.get_summary(max_patterns=max_patterns)
+        Returns:
+            One partial pattern per group with its input positions, to be
+            unified by `merge_shards`
+        """
+        results = []
+        for message, group in self.groups.items():
+            mined = extractor._mine(message)
+            if mined is None:
+                continue
+            pattern_id, template = mined
+            group.pattern_id = pattern_id
+            pattern = LogPattern(
+                pattern_id=pattern_id,
+                template=template,
+                count=group.count,
+                first_seen=group.first_seen,
+                last_seen=group.last_seen,
+                severity_counts=group.severity_counts,
+                sample_messages=[message[:200]] * len(group.sample_positions),
+                resources=group.resources,
+            )
+            results.append(
+                (
+                    pattern,
+                    group.first_pos,
+                    group.last_pos,
+                    group.sample_positions,
+                    group.minute_counts,
+                )
+            )
+        return results
+
+
+def _shard_key(entry: Any) -> tuple[str, str]:
+    """Return the (resource type, service) an entry is sharded by."""
+    if not isinstance(entry, dict):
+        return ("", "")
+    resource = entry.get("resource")
+    if not isinstance(resource, dict):
+        return ("", "")
+    labels = resource.get("labels")
+    service = ""
+    if isinstance(labels, dict):
+        for key in _SERVICE_LABELS:
+            if labels.get(key):
+                service = str(labels[key])
+                break
+    return (str(resource.get("type", "")), service)
+
+
+def _mine_shard(
+    shard: list[tuple[int, Any]], config: dict[str, Any]
+) -> list[_PartialPattern]:
+    """Run Drain3 over one shard of `(position, entry)` pairs.
+
+    Returns:
+        Each pattern with the input positions of its first and last entry
+        and of its sample messages, so shards can be merged in input order,
+        and its per-minute counts
+    """
+    groups = DuplicateGroups()
+    for pos, entry in shard:
+        groups.add(pos, entry)
+    return groups.mine(LogPatternExtractor(**config))
+
+
+def merge_shards(
+    extractor: LogPatternExtractor,
+    shard_results: list[list[_PartialPattern]],
+) -> None:
+    """Unify partial patterns by pattern ID into `extractor.patterns`.
+
+    Partial patterns come from duplicate groups, within one shard or across
+    shards.
+
+    Counts, severities and resources are summed; first/last seen and
+    samples come from the earliest/latest input positions, and patterns are
+    inserted in order of first appearance, as a single miner would have.
+    Per-minute counts are summed too and loaded into each merged pattern's
+    timeline, so only final patterns allocate one.
+    """
+    merged: dict[str, tuple[LogPattern, int, int, list[tuple[int, str]]]] = {}
+    minute_counts: dict[str, dict[tuple[int, str], int]] = {}
+    for results in shard_results:
+        for pattern, first, last, sample_positions, minutes in results:
+            samples = list(zip(sample_positions, pattern.sample_messages, strict=True))
+            buckets = minute_counts.setdefault(pattern.pattern_id, {})
+            for bucket, count in minutes.items():
+                buckets[bucket] = buckets.get(bucket, 0) + count
+            current = merged.get(pattern.pattern_id)
+            if current is None:
+                merged[pattern.pattern_id] = (pattern, first, last, samples)
+                continue
+
+            target, target_first, target_last, target_samples = current
+            # Later results of a stable-ID extractor carry the generalized
+            # template; otherwise the IDs, and so the templates, are equal
+            target.template = pattern.template
+            target.count += pattern.count
+            for sev, count in pattern.severity_counts.items():
+                target.severity_counts[sev] = target.severity_counts.get(sev, 0) + count
+            for resource in pattern.resources:
+                _add_resource(target.resources, resource)
+            if first < target_first:
+                target.first_seen = pattern.first_seen
+            if last > target_last:
+                target.last_seen = pattern.last_seen
+            merged[pattern.pattern_id] = (
+                target,
+                min(first, target_first),
+                max(last, target_last),
+                sorted(target_samples + samples)[:5],
+            )
+
+    extractor.patterns = {}
+    for pattern, _, _, samples in sorted(merged.values(), key=lambda m: m[1]):
+        pattern.sample_messages = [message for _, message in samples]
+        pattern.timeline.add_counts(minute_counts[pattern.pattern_id])
+        extractor.patterns[pattern.pattern_id] = pattern
+
+
+def _get_mining_pool() -> ProcessPoolExecutor:
+    """Get the shared mining pool, starting it on first use."""
+    global _mining_pool
+    with _mining_pool_lock:
+        if _mining_pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            _mining_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _mining_pool
+
+
+def _reset_mining_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken mining pool so the next call starts a new one."""
+    global _mining_pool
+    with _mining_pool_lock:
+        if _mining_pool is pool:
+            _mining_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def mine_log_patterns_parallel(
+    log_entries: list[Any],
+    max_workers: int | None = None,
+    **config: Any,
+) -> LogPatternExtractor:
+    """Extract patterns with one Drain3 tree per resource/service shard.
+
+    Entries are grouped by resource type and service label, the groups are
+    balanced across shards mined in a shared process pool (started on first
+    use and kept for later calls), and the per-shard patterns are merged by
+    pattern ID. The merged extractor's `get_summary()` has the same shape as
+    a sequential one; templates can be more specific, since services no
+    longer share a parse tree. The result does not depend on `max_workers`.
+
+    Args:
+        log_entries: Log entry dicts (from list_log_entries)
+        max_workers: Shards to mine in parallel (defaults to the CPU count);
+            a single shard is mined in-process
+        **config: `LogPatternExtractor` parameters
+
+    Returns:
+        A LogPatternExtractor holding the merged patterns
+    """
+    groups: dict[tuple[str, str], list[tuple[int, Any]]] = {}
+    for pos, entry in enumerate(log_entries):
+        groups.setdefault(_shard_key(entry), []).append((pos, entry))
+
+    workers = min(max_workers or os.cpu_count() or 1, len(groups)) or 1
+    # Largest groups first, each to the least loaded shard
+    shards: list[list[tuple[int, Any]]] = [[] for _ in range(workers)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(shards, key=len).extend(group)
+
+    shard_results = None
+    if workers > 1:
+        pool = _get_mining_pool()
+        try:
+            shard_results = list(pool.map(_mine_shard, shards, [config] * len(shards)))
+        except BrokenProcessPool as e:
+            logger.warning(f"Log mining pool failed, mining in-process: {e}")
+            _reset_mining_pool(pool)
+    if shard_results is None:
+        shard_results = [_mine_shard(shard, config) for shard in shards]
+
+    extractor = LogPatternExtractor(**config)
+    merge_shards(extractor, shard_results)
+    return extractor
 
 
 @adk_tool
@@ -428,6 +855,9 @@ def compare_log_patterns(
     baseline_entries_json: str,
     comparison_entries_json: str,
     significance_threshold: float = 0.5,
+    project_id: str | None = None,
+    service: str = "",
+    log_filter: str = "",
 ) -> dict[str, Any]:
     """Compare log patterns between two time periods to find anomalies.
 
@@ -437,61 +867,57 @@ def compare_log_patterns(
     - INCREASED patterns: Errors happening more frequently
     - DECREASED patterns: Improvements
 
+    When `project_id` is given, both periods are mined with the persistent
+    pattern state of that project/service/filter (as in
+    `extract_log_patterns`), so their pattern IDs match each other and
+    earlier calls.
+
     Args:
         baseline_entries_json: JSON string of log entries from the baseline period
         comparison_entries_json: JSON string of log entries from the period to compare
         significance_threshold: Minimum % change to be significant (0.5 = 50%)
+        project_id: Optional GCP project ID to mine and record the patterns under
+        service: Optional service name to scope the recorded patterns
+        log_filter: Cloud Logging filter the entries were fetched with, to
+            scope the recorded patterns
 
     Returns:
         Comparison results with categorized patterns
     """
-    import json
-
-    baseline_entries = []
-    if isinstance(baseline_entries_json, list):
-        baseline_entries = baseline_entries_json
-    else:
-        try:
-            baseline_entries = json.loads(baseline_entries_json)
-            if not isinstance(baseline_entries, list):
-                baseline_entries = []
-        except (json.JSONDecodeError, TypeError):
-            baseline_entries = []
-
-    comparison_entries = []
-    if isinstance(comparison_entries_json, list):
-        comparison_entries = comparison_entries_json
-    else:
-        try:
-            comparison_entries = json.loads(comparison_entries_json)
-            if not isinstance(comparison_entries, list):
-                comparison_entries = []
-        except (json.JSONDecodeError, TypeError):
-            comparison_entries = []
+    baseline_entries, baseline_complete = _load_entries(baseline_entries_json)
+    comparison_entries, comparison_complete = _load_entries(comparison_entries_json)
 
     # Extract patterns from both periods
-    baseline_extractor = LogPatternExtractor()
-    comparison_extractor = LogPatternExtractor()
-
-    for entry in baseline_entries:
-        if not isinstance(entry, dict):
-            continue
-        message = extract_log_message(entry)
-        baseline_extractor.add_log(
-            message=message,
-            timestamp=entry.get("timestamp", ""),
-            severity=entry.get("severity", ""),
+    if project_id:
+        baseline_extractor = _mine_in_scope(
+            baseline_entries, project_id, service, log_filter, baseline_complete
         )
-
-    for entry in comparison_entries:
-        if not isinstance(entry, dict):
-            continue
-        message = extract_log_message(entry)
-        comparison_extractor.add_log(
-            message=message,
-            timestamp=entry.get("timestamp", ""),
-            severity=entry.get("severity", ""),
+        comparison_extractor = _mine_in_scope(
+            comparison_entries, project_id, service, log_filter, comparison_complete
         )
+    else:
+        baseline_extractor = LogPatternExtractor()
+        comparison_extractor = LogPatternExtractor()
+
+        for entry in baseline_entries:
+            if not isinstance(entry, dict):
+                continue
+            message = extract_log_message(entry)
+            baseline_extractor.add_log(
+                message=message,
+                timestamp=entry.get("timestamp", ""),
+                severity=entry.get("severity", ""),
+            )
+
+        for entry in comparison_entries:
+            if not isinstance(entry, dict):
+                continue
+            message = extract_log_message(entry)
+            comparison_extractor.add_log(
+                message=message,
+                timestamp=entry.get("timestamp", ""),
+                severity=entry.get("severity", ""),
+            )
 
     baseline_patterns = baseline_extractor.get_patterns()
     comparison_patterns = comparison_extractor.get_patterns()
@@ -521,47 +947,45 @@ def analyze_log_anomalies(
     log_entries_json: str,
     focus_on_errors: bool = True,
     max_results: int = 10,
+    window_minutes: int = 15,
+    project_id: str | None = None,
+    service: str = "",
+    log_filter: str = "",
 ) -> dict[str, Any]:
     """Analyze logs for anomalous patterns, focusing on errors if specified.
 
     This tool extracts patterns and highlights the most concerning ones,
-    perfect for quick incident triage.
+    perfect for quick incident triage. From the per-minute counts of each
+    pattern it also reports rate changes between the last `window_minutes`
+    and the window before, and single-minute bursts, without needing a
+    separate baseline query.
 
     Args:
         log_entries_json: JSON string of list of log entry dicts
         focus_on_errors: If True, prioritize ERROR/CRITICAL patterns
         max_results: Maximum patterns to return
+        window_minutes: Length of the sliding window, ending at the newest log
+        project_id: Optional GCP project ID to mine and record the patterns
+            under, for pattern IDs stable across calls
+        service: Optional service name to scope the recorded patterns
+        log_filter: Cloud Logging filter the entries were fetched with, to
+            scope the recorded patterns
 
     Returns:
         Analysis results with prioritized anomalies
     """
-    import json
-
-    log_entries = []
-    if isinstance(log_entries_json, list):
-        log_entries = log_entries_json
-    else:
-        try:
-            log_entries = json.loads(log_entries_json)
-            if not isinstance(log_entries, list):
-                log_entries = []
-        except (json.JSONDecodeError, TypeError):
-            log_entries = []
-
-    extractor = LogPatternExtractor()
+    log_entries, complete = _load_entries(log_entries_json)
 
-    for entry in log_entries:
-        if not isinstance(entry, dict):
-            continue
-        message = extract_log_message(entry)
-        extractor.add_log(
-            message=message,
-            timestamp=entry.get("timestamp", ""),
-            severity=entry.get("severity", ""),
-            resource=entry.get("resource", {}).get("type", "")
-            if isinstance(entry.get("resource"), dict)
-            else "",
+    if project_id:
+        extractor = _mine_in_scope(
+            log_entries, project_id, service, log_filter, complete
         )
+    else:
+        groups = DuplicateGroups()
+        for pos, entry in enumerate(log_entries):
+            groups.add(pos, entry)
+        extractor = LogPatternExtractor()
+        merge_shards(extractor, [groups.mine(extractor)])
 
     # Get patterns sorted appropriately
     sort_by = "severity" if focus_on_errors else "count"
@@ -579,10 +1003,103 @@ def analyze_log_anomalies(
         "error_patterns": [p.to_dict() for p in errors[:5]],
         "warning_patterns": [p.to_dict() for p in warnings[:5]],
         "top_patterns": [p.to_dict() for p in patterns],
+        **_detect_rate_anomalies(
+            list(extractor.patterns.values()), window_minutes, max_results
+        ),
         "recommendation": _generate_recommendation(critical, errors, warnings),
     }
 
 
+def _detect_rate_anomalies(
+    patterns: list[LogPattern], window_minutes: int, max_results: int
+) -> dict[str, Any]:
+    """Find rate changes and bursts from the patterns' timelines.
+
+    All timelines are stacked over the current window and the one before it
+    (both ending at the newest minute seen), and every pattern is scored in
+    one pass over that array. Rate changes need logs in the earlier window;
+    bursts are scored over the minutes that have logs, as a minute at least
+    BURST_SIGMA standard deviations (and twice the mean) above the others.
+    """
+    timed = [p for p in patterns if p.timeline.head is not None]
+    if not timed:
+        return {"window": None, "rate_changes": [], "bursts": []}
+
+    end = max(p.timeline.head or 0 for p in timed)
+    window = max(1, min(window_minutes, timed[0].timeline.size // 2))
+    counts = stack_series([p.timeline for p in timed], end, 2 * window)
+    observed = np.flatnonzero(counts.any(axis=0))
+    start = int(observed[0]) if observed.size else window
+
+    rate_changes: list[dict[str, Any]] = []
+    if start < window:
+        baseline = counts[:, :window].sum(axis=1)
+        current = counts[:, window:].sum(axis=1)
+        change = (current - baseline) / np.maximum(baseline, 1)
+        significant = (np.maximum(baseline, current) >= MIN_ANOMALY_COUNT) & (
+            (baseline == 0) | (np.abs(change) >= RATE_CHANGE_THRESHOLD)
+        )
+        for i in np.flatnonzero(significant):
+            rate_changes.append(
+                {
+                    "pattern_id": timed[i].pattern_id,
+                    "template": timed[i].template,
+                    "baseline_count": int(baseline[i]),
+                    "window_count": int(current[i]),
+                    "change_pct": round(float(change[i]) * 100, 1)
+                    if baseline[i]
+                    else None,
+                }
+            )
+        rate_changes.sort(
+            key=lambda r: (r["change_pct"] is None, abs(r["change_pct"] or 0)),
+            reverse=True,
+        )
+
+    bursts: list[dict[str, Any]] = []
+    span = counts[:, start:].astype(np.float64)
+    minutes = span.shape[1]
+    if minutes >= 3:
+        peak_at = span.argmax(axis=1)
+        peak = span.max(axis=1)
+        rest_mean = (span.sum(axis=1) - peak) / (minutes - 1)
+        rest_var = (np.square(span).sum(axis=1) - np.square(peak)) / (
+            minutes - 1
+        ) - np.square(rest_mean)
+        rest_std = np.sqrt(np.maximum(rest_var, 0))
+        is_burst = (
+            (peak >= MIN_ANOMALY_COUNT)
+            & (peak > rest_mean + BURST_SIGMA * rest_std)
+            & (peak >= 2 * rest_mean)
+        )
+        for i in np.flatnonzero(is_burst):
+            bursts.append(
+                {
+                    "pattern_id": timed[i].pattern_id,
+                    "template": timed[i].template,
+                    "minute": minute_isoformat(
+                        end - 2 * window + 1 + start + int(peak_at[i])
+                    ),
+                    "count": int(peak[i]),
+                    "typical_per_minute": round(float(rest_mean[i]), 2),
+                }
+            )
+        bursts.sort(
+            key=lambda b: b["count"] / max(b["typical_per_minute"], 1.0),
+            reverse=True,
+        )
+
+    return {
+        "window": {
+            "start": minute_isoformat(end - window + 1),
+            "end": minute_isoformat(end),
+            "minutes": window,
+        },
+        "rate_changes": rate_changes[:max_results],
+        "bursts": bursts[:max_results],
+    }
+
+
 def get_pattern_summary(
     patterns: list[LogPattern],
     max_length: int = 2000,
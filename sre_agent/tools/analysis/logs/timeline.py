@@ -0,0 +1,153 @@
+"""Per-minute, per-severity occurrence counts of a log pattern.
+
+A `PatternTimeline` is a fixed-size ring buffer: one row per epoch minute
+(`minute % size`) and one column per Cloud Logging severity. Recording a
+minute newer than the buffer's head clears the rows it skips over, so a
+pattern keeps the last `size` minutes in constant memory however many logs
+it matches. The buffer is allocated on first use.
+
+`stack_series()` lines the timelines of many patterns up on one minute
+axis, so windowed detection (rate changes, bursts) is a single array pass.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ...common.trace_frame import parse_timestamp_ns
+
+# Minutes of history kept per pattern.
+TIMELINE_MINUTES = 180
+
+# Cloud Logging severities, in column order; unknown values count as DEFAULT.
+SEVERITY_LEVELS = (
+    "DEFAULT",
+    "DEBUG",
+    "INFO",
+    "NOTICE",
+    "WARNING",
+    "ERROR",
+    "CRITICAL",
+    "ALERT",
+    "EMERGENCY",
+)
+_SEVERITY_INDEX = {name: i for i, name in enumerate(SEVERITY_LEVELS)}
+
+_NS_PER_MINUTE = 60 * 1_000_000_000
+
+
+@lru_cache(maxsize=4096)
+def _utc_minute(prefix: str) -> int | None:
+    try:
+        parsed = datetime.strptime(prefix, "%Y-%m-%dT%H:%M")
+    except ValueError:
+        return None
+    return int(parsed.replace(tzinfo=timezone.utc).timestamp()) // 60
+
+
+def epoch_minute(timestamp: Any) -> int | None:
+    """Return the epoch minute of an RFC3339 timestamp, or None if invalid.
+
+    UTC timestamps (the Cloud Logging format) are resolved from their cached
+    minute prefix; anything else goes through `parse_timestamp_ns`.
+    """
+    if (
+        isinstance(timestamp, str)
+        and timestamp[16:17] == ":"
+        and timestamp.endswith(("Z", "+00:00"))
+    ):
+        minute = _utc_minute(timestamp[:16])
+        if minute is not None:
+            return minute
+    ns = parse_timestamp_ns(timestamp)
+    return None if ns is None else ns // _NS_PER_MINUTE
+
+
+def minute_isoformat(minute: int) -> str:
+    """Format an epoch minute as an ISO-8601 UTC timestamp."""
+    return datetime.fromtimestamp(minute * 60, tz=timezone.utc).isoformat()
+
+
+class PatternTimeline:
+    """Ring buffer of per-minute counts by severity for one pattern."""
+
+    __slots__ = ("_counts", "head", "size")
+
+    def __init__(self, size: int = TIMELINE_MINUTES) -> None:
+        """Create an empty timeline.
+
+        Args:
+            size: Number of minutes kept, ending at the newest one recorded
+        """
+        self.size = size
+        self.head: int | None = None
+        self._counts: npt.NDArray[np.int32] | None = None
+
+    def add(self, minute: int, severity: str | None = None, count: int = 1) -> None:
+        """Count `count` occurrences at an epoch minute.
+
+        Minutes older than the kept window are ignored.
+        """
+        if self._counts is None or self.head is None:
+            self._counts = np.zeros((self.size, len(SEVERITY_LEVELS)), dtype=np.int32)
+            self.head = minute
+        elif minute > self.head:
+            if minute - self.head >= self.size:
+                self._counts[:] = 0
+            else:
+                self._counts[np.arange(self.head + 1, minute + 1) % self.size] = 0
+            self.head = minute
+        elif minute <= self.head - self.size:
+            return
+        column = _SEVERITY_INDEX.get(severity or "", 0)
+        self._counts[minute % self.size, column] += count
+
+    def add_counts(self, counts: dict[tuple[int, str], int]) -> None:
+        """Add `(minute, severity) -> count` buckets, oldest first."""
+        for (minute, severity), count in sorted(counts.items()):
+            self.add(minute, severity, count)
+
+    def series(
+        self,
+        end_minute: int,
+        minutes: int,
+        severities: Iterable[str] | None = None,
+    ) -> npt.NDArray[np.int32]:
+        """Get the counts of the `minutes` minutes ending at `end_minute`.
+
+        Args:
+            end_minute: Last epoch minute of the series (inclusive)
+            minutes: Length of the series
+            severities: Only count these severities (all by default)
+
+        Returns:
+            Counts oldest minute first, zero outside the kept window
+        """
+        out = np.zeros(minutes, dtype=np.int32)
+        if self._counts is None or self.head is None:
+            return out
+        counts = self._counts
+        if severities is not None:
+            columns = [_SEVERITY_INDEX[s] for s in severities if s in _SEVERITY_INDEX]
+            counts = counts[:, columns]
+        wanted = np.arange(end_minute - minutes + 1, end_minute + 1)
+        kept = (wanted <= self.head) & (wanted > self.head - self.size)
+        out[kept] = counts[wanted[kept] % self.size].sum(axis=1)
+        return out
+
+
+def stack_series(
+    timelines: list[PatternTimeline],
+    end_minute: int,
+    minutes: int,
+    severities: Iterable[str] | None = None,
+) -> npt.NDArray[np.int32]:
+    """Stack the totals of several timelines into a (pattern, minute) array."""
+    wanted = None if severities is None else tuple(severities)
+    if not timelines:
+        return np.zeros((0, minutes), dtype=np.int32)
+    return np.stack([t.series(end_minute, minutes, wanted) for t in timelines])
@@ -20,6 +20,7 @@ from .patterns import (
     detect_cascading_timeout,
     detect_connection_pool_issues,
     detect_retry_storm,
+    detect_sre_patterns_across_traces,
 )
 from .statistical_analysis import (
     analyze_trace_patterns,
@@ -39,6 +40,7 @@ __all__ = [
     "detect_connection_pool_issues",
     "detect_latency_anomalies",
     "detect_retry_storm",
+    "detect_sre_patterns_across_traces",
     "extract_errors",
     "find_structural_differences",
     "perform_causal_analysis",
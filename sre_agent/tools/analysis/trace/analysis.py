@@ -13,14 +13,15 @@ Key Functions:
 
 import logging
 import time
-from datetime import datetime
-from typing import Any, cast
+from typing import Any
 
 from opentelemetry.trace import StatusCode
 
 from ...clients.trace import fetch_trace_data
 from ...common import adk_tool
 from ...common.telemetry import get_meter, get_tracer, log_tool_call
+from ...common.trace_frame import NO_PARENT, as_trace_frame
+from ...common.trace_index import get_trace_index
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +65,7 @@ TraceData = dict[str, Any]
 SpanData = dict[str, Any]
 
 
-@adk_tool
+@adk_tool(memoize=True)
 def calculate_span_durations(
     trace_id: str, project_id: str | None = None
 ) -> list[SpanData]:
@@ -98,44 +99,12 @@ def calculate_span_durations(
                 span.set_status(StatusCode.ERROR, str(trace.get("error")))
                 return [{"error": str(trace["error"])}]
 
-            spans = trace.get("spans", [])
-            span.set_attribute("sre_agent.span_count", len(spans))
-
-            timing_info = []
-
-            for s in spans:
-                s_start = s.get("start_time")
-                s_end = s.get("end_time")
-
-                duration_ms = None
-                if s_start and s_end:
-                    try:
-                        start_dt = datetime.fromisoformat(
-                            s_start.replace("Z", "+00:00")
-                        )
-                        end_dt = datetime.fromisoformat(s_end.replace("Z", "+00:00"))
-                        duration_ms = (end_dt - start_dt).total_seconds() * 1000
-                    except (ValueError, TypeError) as e:
-                        logger.warning(
-                            f"Failed to parse timestamps for span {s.get('span_id')}: {e}"
-                        )
-
-                timing_info.append(
-                    {
-                        "span_id": s.get("span_id"),
-                        "name": s.get("name"),
-                        "duration_ms": duration_ms,
-                        "start_time": s_start,
-                        "end_time": s_end,
-                        "parent_span_id": s.get("parent_span_id"),
-                        "labels": s.get("labels", {}),
-                    }
-                )
-
-            # Sort by duration (descending) for easy analysis
-            timing_info.sort(key=lambda x: x.get("duration_ms") or 0, reverse=True)
+            index = get_trace_index(trace)
+            span.set_attribute("sre_agent.span_count", index.frame.span_count)
 
-            return timing_info
+            # Sorted by duration (descending) for easy analysis. Shared with
+            # the index, so callers must not mutate the timings.
+            return index.span_timings
 
         except Exception as e:
             span.record_exception(e)
@@ -285,13 +254,10 @@ def validate_trace_quality(
             "issues": [{"type": "fetch_error", "message": trace["error"]}],
         }
 
-    spans = trace.get("spans", [])
+    frame = as_trace_frame(trace)
     issues: list[dict[str, Any]] = []
 
-    # Build parent-child map
-    span_map = {s["span_id"]: s for s in spans if "span_id" in s}
-
-    for span in spans:
+    for i, span in enumerate(frame.spans):
         span_id = span.get("span_id")
         if not span_id:
             issues.append({"type": "missing_span_id", "message": "Span missing ID"})
@@ -299,7 +265,8 @@ def validate_trace_quality(
 
         # Check for orphaned spans
         parent_id = span.get("parent_span_id")
-        if parent_id and parent_id not in span_map:
+        parent_row = int(frame.parent_index[i])
+        if parent_id and parent_row == NO_PARENT:
             issues.append(
                 {
                     "type": "orphaned_span",
@@ -308,54 +275,44 @@ def validate_trace_quality(
                 }
             )
 
+        if not (span.get("start_time") and span.get("end_time")):
+            continue
+        if not frame.has_timing[i]:
+            issues.append(
+                {
+                    "type": "timestamp_error",
+                    "span_id": span_id,
+                    "error": "Invalid start_time or end_time",
+                }
+            )
+            continue
+
         # Check for negative durations and clock skew
-        try:
-            start_str = span.get("start_time")
-            end_str = span.get("end_time")
-
-            if start_str and end_str:
-                start = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-                end = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
-                duration = (end - start).total_seconds()
-
-                if duration < 0:
-                    issues.append(
-                        {
-                            "type": "negative_duration",
-                            "span_id": span_id,
-                            "duration_s": duration,
-                        }
-                    )
-
-                # Check clock skew
-                if parent_id and parent_id in span_map:
-                    parent = span_map[parent_id]
-                    p_start_str = parent.get("start_time")
-                    p_end_str = parent.get("end_time")
-
-                    if p_start_str and p_end_str:
-                        p_start = datetime.fromisoformat(
-                            p_start_str.replace("Z", "+00:00")
-                        )
-                        p_end = datetime.fromisoformat(p_end_str.replace("Z", "+00:00"))
-
-                        if start < p_start or end > p_end:
-                            issues.append(
-                                {
-                                    "type": "clock_skew",
-                                    "span_id": span_id,
-                                    "message": "Child span outside parent timespan",
-                                }
-                            )
-        except (ValueError, TypeError, KeyError) as e:
+        start = frame.start_ns[i]
+        end = frame.end_ns[i]
+        if end < start:
             issues.append(
-                {"type": "timestamp_error", "span_id": span_id, "error": str(e)}
+                {
+                    "type": "negative_duration",
+                    "span_id": span_id,
+                    "duration_s": int(end - start) / 1e9,
+                }
             )
 
+        if parent_row != NO_PARENT and frame.has_timing[parent_row]:
+            if start < frame.start_ns[parent_row] or end > frame.end_ns[parent_row]:
+                issues.append(
+                    {
+                        "type": "clock_skew",
+                        "span_id": span_id,
+                        "message": "Child span outside parent timespan",
+                    }
+                )
+
     return {"valid": len(issues) == 0, "issue_count": len(issues), "issues": issues}
 
 
-@adk_tool
+@adk_tool(memoize=True)
 def build_call_graph(trace_id: str, project_id: str | None = None) -> dict[str, Any]:
     """Builds a hierarchical call graph from the trace spans.
 
@@ -387,52 +344,11 @@ def build_call_graph(trace_id: str, project_id: str | None = None) -> dict[str,
                 return {"error": trace["error"]}
 
             spans = trace.get("spans", [])
-
-            # Create lookup maps
-            span_by_id = {}
-            children_by_parent: dict[str, list[str]] = {}
-            root_spans = []
-            span_names: set[str] = set()
-
-            for s in spans:
-                span_id = s.get("span_id")
-                parent_id = s.get("parent_span_id")
-                span_name = s.get("name", "unknown")
-
-                if span_id:
-                    span_by_id[span_id] = s
-
-                span_names.add(span_name)
-
-                if parent_id:
-                    if parent_id not in children_by_parent:
-                        children_by_parent[parent_id] = []
-                    children_by_parent[parent_id].append(span_id)
-                else:
-                    root_spans.append(span_id)
-
-            def build_subtree(span_id: str, depth: int = 0) -> dict[str, Any]:
-                s = span_by_id.get(span_id, {})
-                children_ids = children_by_parent.get(span_id, [])
-
-                return {
-                    "span_id": span_id,
-                    "name": s.get("name", "unknown"),
-                    "depth": depth,
-                    "children": [
-                        build_subtree(child_id, depth + 1) for child_id in children_ids
-                    ],
-                    "labels": s.get("labels", {}),
-                }
-
-            span_tree = [build_subtree(root_id) for root_id in root_spans]
-
-            def get_max_depth(node: dict[str, Any]) -> int:
-                if not node.get("children"):
-                    return cast(int, node.get("depth", 0))
-                return max(get_max_depth(child) for child in node["children"])
-
-            max_depth = max((get_max_depth(tree) for tree in span_tree), default=0)
+            index = get_trace_index(trace)
+            root_spans = [index.frame.span_ids[row] for row in index.root_rows]
+            span_names = {s.get("name", "unknown") for s in spans}
+            span_tree = index.call_tree
+            max_depth = index.max_depth
 
             result = {
                 "trace_id": trace.get("trace_id"),
@@ -487,19 +403,11 @@ def summarize_trace(trace_id: str, project_id: str | None = None) -> dict[str, A
         errors = extract_errors(trace_id, project_id)
 
     # Extract slow spans
-    spans_with_dur = []
-    for s in spans:
-        dur: float = 0.0
-        if "duration_ms" in s:
-            dur = s["duration_ms"]
-        elif s.get("start_time") and s.get("end_time"):
-            try:
-                start = datetime.fromisoformat(s["start_time"].replace("Z", "+00:00"))
-                end = datetime.fromisoformat(s["end_time"].replace("Z", "+00:00"))
-                dur = (end - start).total_seconds() * 1000
-            except (ValueError, TypeError):
-                pass
-        spans_with_dur.append({"name": s.get("name"), "duration_ms": dur})
+    frame = as_trace_frame(trace_data)
+    spans_with_dur: list[dict[str, Any]] = [
+        {"name": s.get("name"), "duration_ms": frame.span_duration_ms(i) or 0.0}
+        for i, s in enumerate(frame.spans)
+    ]
 
     spans_with_dur.sort(key=lambda x: x["duration_ms"], reverse=True)
     top_slowest = spans_with_dur[:5]
@@ -46,7 +46,7 @@ def _record_telemetry(
 SpanData = dict[str, Any]
 
 
-@adk_tool
+@adk_tool(memoize=True)
 def compare_span_timings(
     baseline_trace_id: str,
     target_trace_id: str,
@@ -320,7 +320,7 @@ def compare_span_timings(
             _record_telemetry("compare_span_timings", success, duration_ms)
 
 
-@adk_tool
+@adk_tool(memoize=True)
 def find_structural_differences(
     baseline_trace_id: str,
     target_trace_id: str,
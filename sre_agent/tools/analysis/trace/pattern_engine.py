@@ -0,0 +1,408 @@
+"""Single-pass engine behind the SRE pattern detectors.
+
+Each detector used to fetch the trace on its own, regroup the spans by name
+and sort them again, so `detect_all_sre_patterns` did that work three times.
+`PatternEngine` builds one `SpanIndex` per trace (spans sorted by start time,
+grouped by name, parent/child maps) and walks it once, handing every span and
+every name group to all registered detectors.
+
+Detectors are visitors: subclass `PatternDetector`, override the hooks you
+need and return the detector's result from `finish()`. Detector instances hold
+per-trace state, so the engine takes factories and creates fresh detectors
+for every trace it scans.
+
+Example:
+    >>> engine = PatternEngine([RetryStormDetector, ConnectionPoolDetector])
+    >>> results = engine.run(as_trace_frame(trace))
+    >>> results["retry_storm"]["has_retry_storm"]
+"""
+
+from collections.abc import Callable, Iterable
+from functools import cached_property
+from itertools import pairwise
+from typing import Any, cast
+
+import numpy as np
+
+from ...common.trace_frame import NO_PARENT, TraceFrame
+
+# Pattern indicator keywords in span names and labels
+RETRY_INDICATORS = ["retry", "attempt", "backoff", "reconnect"]
+TIMEOUT_INDICATORS = [
+    "timeout",
+    "deadline",
+    "exceeded",
+    "timed out",
+    "context deadline",
+]
+CONNECTION_INDICATORS = ["connection", "pool", "acquire", "checkout", "wait"]
+
+
+def _contains_indicator(text: str, indicators: list[str]) -> bool:
+    """Check if text contains any of the indicator keywords."""
+    text_lower = text.lower()
+    return any(ind in text_lower for ind in indicators)
+
+
+class SpanIndex:
+    """Derived lookups over a `TraceFrame`, built once and shared by detectors."""
+
+    def __init__(self, frame: TraceFrame) -> None:
+        """Initialize the index.
+
+        Args:
+            frame: The trace to index.
+        """
+        self.frame = frame
+
+    @cached_property
+    def rows_by_start(self) -> list[int]:
+        """Rows ordered by start time; spans without a start sort first."""
+        keys = np.where(self.frame.has_start, self.frame.start_ns, 0)
+        return cast(list[int], np.argsort(keys, kind="stable").tolist())
+
+    @cached_property
+    def rows_by_name(self) -> dict[int, list[int]]:
+        """Rows grouped by name id, each group ordered by start time."""
+        name_ids = self.frame.name_ids
+        groups: dict[int, list[int]] = {}
+        for row in self.rows_by_start:
+            groups.setdefault(int(name_ids[row]), []).append(row)
+        return groups
+
+    @cached_property
+    def parent_rows(self) -> list[int]:
+        """Parent row of each row (`NO_PARENT` for roots and orphans)."""
+        return cast(list[int], self.frame.parent_index.tolist())
+
+    def children_of(self, row: int) -> list[int]:
+        """Rows of the direct children of the given row."""
+        return cast(list[int], self.frame.children_of(row).tolist())
+
+    def ancestors_of(self, row: int) -> Iterable[int]:
+        """Yield the ancestors of a row, nearest first."""
+        parents = self.parent_rows
+        seen = {row}
+        current = parents[row]
+        while current != NO_PARENT and current not in seen:
+            yield current
+            seen.add(current)
+            current = parents[current]
+
+    @cached_property
+    def labels_text(self) -> list[str]:
+        """Lower-cased string form of each span's labels, for keyword checks."""
+        return [str(s.get("labels", {})).lower() for s in self.frame.spans]
+
+    def span_info(self, row: int) -> dict[str, Any]:
+        """Extract key info from a span for pattern reporting."""
+        span = self.frame.spans[row]
+        return {
+            "span_id": span.get("span_id"),
+            "span_name": span.get("name"),
+            "duration_ms": self.frame.span_duration_ms(row),
+            "parent_span_id": span.get("parent_span_id"),
+            "labels": span.get("labels", {}),
+        }
+
+
+class PatternDetector:
+    """Base visitor for `PatternEngine`.
+
+    Hooks are called in order: `visit_span()` for every row (in span-list
+    order), `visit_name_group()` for every group of same-named spans, then
+    `finish()` once.
+    """
+
+    #: Key of this detector's result in `PatternEngine.run()`.
+    name = "pattern"
+
+    def visit_span(self, index: SpanIndex, row: int) -> None:
+        """Inspect a single span."""
+
+    def visit_name_group(self, index: SpanIndex, name_id: int, rows: list[int]) -> None:
+        """Inspect all spans sharing a name, ordered by start time."""
+
+    def finish(self, index: SpanIndex) -> dict[str, Any]:
+        """Return the detection result for the trace."""
+        return {}
+
+
+DetectorFactory = Callable[[], PatternDetector]
+
+
+class PatternEngine:
+    """Runs a set of detectors over a trace in a single pass."""
+
+    def __init__(self, detectors: Iterable[DetectorFactory]) -> None:
+        """Initialize the engine.
+
+        Args:
+            detectors: Factories (usually detector classes or partials) that
+                create one fresh detector per trace.
+        """
+        self.detectors = list(detectors)
+
+    def run(self, frame: TraceFrame) -> dict[str, dict[str, Any]]:
+        """Run all detectors over one trace.
+
+        Returns:
+            Each detector's `finish()` result keyed by its `name`.
+        """
+        index = SpanIndex(frame)
+        detectors = [factory() for factory in self.detectors]
+
+        for row in range(len(frame)):
+            for detector in detectors:
+                detector.visit_span(index, row)
+        for name_id, rows in index.rows_by_name.items():
+            for detector in detectors:
+                detector.visit_name_group(index, name_id, rows)
+
+        return {detector.name: detector.finish(index) for detector in detectors}
+
+
+class RetryStormDetector(PatternDetector):
+    """Repeated, closely spaced calls of the same operation."""
+
+    name = "retry_storm"
+
+    def __init__(self, threshold: int = 3) -> None:
+        """Initialize the detector.
+
+        Args:
+            threshold: Minimum retry count to flag as a storm.
+        """
+        self.threshold = threshold
+        self.retry_patterns: list[dict[str, Any]] = []
+
+    def visit_name_group(self, index: SpanIndex, name_id: int, rows: list[int]) -> None:
+        """Flag groups of sequential same-named spans."""
+        frame = index.frame
+        name = frame.names[name_id]
+        # Check if name contains retry indicators
+        is_retry_span = _contains_indicator(name, RETRY_INDICATORS)
+
+        # Or check if we have many sequential spans with the same name
+        if len(rows) < self.threshold and not is_retry_span:
+            return
+
+        # Check for sequential pattern (small gaps between spans)
+        start_ns, end_ns = frame.start_ns, frame.end_ns
+        has_start, has_end = frame.has_start, frame.has_end
+        sequential_count = 1
+        for prev, curr in pairwise(rows):
+            if has_end[prev] and has_start[curr]:
+                gap_ms = int(start_ns[curr] - end_ns[prev]) / 1e6
+                # If gap is small (< 1 second), likely retries
+                if 0 <= gap_ms < 1000:
+                    sequential_count += 1
+
+        if sequential_count < self.threshold and not is_retry_span:
+            return
+
+        # Check for exponential backoff pattern
+        durations = [frame.span_duration_ms(r) or 0 for r in rows]
+        has_backoff = False
+        if len(durations) >= 3:
+            # Check if durations are increasing (backoff pattern)
+            has_backoff = all(
+                durations[i] <= durations[i + 1] * 1.5
+                for i in range(len(durations) - 1)
+            )
+
+        self.retry_patterns.append(
+            {
+                "pattern_type": "retry_storm",
+                "span_name": name,
+                "retry_count": len(rows),
+                "total_duration_ms": round(sum(durations), 2),
+                "has_exponential_backoff": has_backoff,
+                "impact": "high" if len(rows) >= 5 else "medium",
+                "recommendation": (
+                    "Investigate downstream service health. "
+                    "Consider circuit breaker pattern if not implemented."
+                ),
+            }
+        )
+
+    def finish(self, index: SpanIndex) -> dict[str, Any]:
+        """Return the retry storm report."""
+        return {
+            "patterns_found": len(self.retry_patterns),
+            "retry_patterns": self.retry_patterns,
+            "has_retry_storm": len(self.retry_patterns) > 0,
+        }
+
+
+class CascadingTimeoutDetector(PatternDetector):
+    """Timeouts that propagate up the call chain."""
+
+    name = "cascading_timeout"
+
+    def __init__(self, timeout_threshold_ms: float = 1000) -> None:
+        """Initialize the detector.
+
+        Args:
+            timeout_threshold_ms: Minimum duration to consider as a timeout.
+        """
+        self.timeout_threshold_ms = timeout_threshold_ms
+        self.timeout_rows: list[int] = []
+        self.explicit: set[int] = set()
+
+    def visit_span(self, index: SpanIndex, row: int) -> None:
+        """Collect spans that look like timeouts."""
+        s = index.frame.spans[row]
+        labels = s.get("labels", {})
+        labels_str = index.labels_text[row]
+
+        is_timeout = (
+            _contains_indicator(s.get("name", ""), TIMEOUT_INDICATORS)
+            or _contains_indicator(labels_str, TIMEOUT_INDICATORS)
+            or labels.get("error.type") == "timeout"
+            or "deadline" in labels_str
+        )
+        duration = index.frame.span_duration_ms(row) or 0
+
+        if is_timeout or duration >= self.timeout_threshold_ms:
+            self.timeout_rows.append(row)
+            if is_timeout:
+                self.explicit.add(row)
+
+    def finish(self, index: SpanIndex) -> dict[str, Any]:
+        """Link timeout spans into cascade chains."""
+        frame = index.frame
+        start_ns = frame.start_ns
+        has_start = frame.has_start
+        # Sort by start time to detect cascade
+        rows = sorted(
+            self.timeout_rows,
+            key=lambda r: int(start_ns[r]) if has_start[r] else 0,
+        )
+        timeout_set = set(rows)
+
+        # Detect cascade: child times out, then parent times out
+        cascade_chains: list[dict[str, Any]] = []
+        if len(rows) >= 2:
+            for row in rows:
+                chain = [row] + [a for a in index.ancestors_of(row) if a in timeout_set]
+                if len(chain) >= 2:
+                    names = [frame.spans[c].get("name") for c in chain]
+                    cascade_chains.append(
+                        {
+                            "chain_length": len(chain),
+                            "origin_span": names[0],
+                            "affected_spans": names,
+                            "total_timeout_duration_ms": sum(
+                                frame.span_duration_ms(c) or 0 for c in chain
+                            ),
+                        }
+                    )
+
+        # Remove duplicate chains (subsets of longer chains)
+        unique_chains: list[dict[str, Any]] = []
+        for c in sorted(
+            cascade_chains, key=lambda ch: ch["chain_length"], reverse=True
+        ):
+            affected = set(c["affected_spans"])
+            if not any(affected <= set(uc["affected_spans"]) for uc in unique_chains):
+                unique_chains.append(c)
+
+        timeout_spans = [
+            {
+                **index.span_info(r),
+                "is_explicit_timeout": r in self.explicit,
+                "start_ms": frame.start_ms(r),
+            }
+            for r in rows[:10]  # Limit output
+        ]
+
+        return {
+            "timeout_spans_count": len(rows),
+            "timeout_spans": timeout_spans,
+            "cascade_detected": len(unique_chains) > 0,
+            "cascade_chains": unique_chains,
+            "impact": "critical" if len(unique_chains) > 0 else "low",
+            "recommendation": (
+                "Review timeout configuration. Consider deadline propagation "
+                "and ensure child timeouts are shorter than parent timeouts."
+                if unique_chains
+                else "No cascading timeout detected."
+            ),
+        }
+
+
+class ConnectionPoolDetector(PatternDetector):
+    """Long waits to acquire database or HTTP connections."""
+
+    name = "connection_pool"
+
+    def __init__(self, wait_threshold_ms: float = 100) -> None:
+        """Initialize the detector.
+
+        Args:
+            wait_threshold_ms: Threshold for connection wait time to flag.
+        """
+        self.wait_threshold_ms = wait_threshold_ms
+        self.pool_issues: list[dict[str, Any]] = []
+
+    def visit_span(self, index: SpanIndex, row: int) -> None:
+        """Flag slow connection-related spans."""
+        s = index.frame.spans[row]
+        name = s.get("name", "")
+
+        # Check for connection-related spans
+        if not _contains_indicator(name, CONNECTION_INDICATORS):
+            return
+
+        duration = index.frame.span_duration_ms(row) or 0
+        if duration < self.wait_threshold_ms:
+            return
+
+        # Look for specific pool metrics in labels
+        labels = s.get("labels", {})
+        threshold = self.wait_threshold_ms
+        self.pool_issues.append(
+            {
+                "span_name": name,
+                "wait_duration_ms": round(duration, 2),
+                "pool_size": labels.get("pool.size") or labels.get("db.pool_size"),
+                "active_connections": labels.get("pool.active")
+                or labels.get("db.active_connections"),
+                "waiting_requests": labels.get("pool.waiting")
+                or labels.get("db.waiting_requests"),
+                "severity": (
+                    "high"
+                    if duration >= threshold * 5
+                    else "medium"
+                    if duration >= threshold * 2
+                    else "low"
+                ),
+            }
+        )
+
+    def finish(self, index: SpanIndex) -> dict[str, Any]:
+        """Return the connection pool report."""
+        # Calculate overall impact
+        total_wait = sum(p["wait_duration_ms"] for p in self.pool_issues)
+        return {
+            "issues_found": len(self.pool_issues),
+            "pool_issues": self.pool_issues,
+            "total_wait_ms": round(total_wait, 2),
+            "has_pool_exhaustion": len(self.pool_issues) > 0
+            and total_wait >= self.wait_threshold_ms * 3,
+            "recommendation": (
+                "Consider increasing connection pool size or reducing connection hold time. "
+                "Review connection lifecycle and ensure proper connection release."
+                if self.pool_issues
+                else "No connection pool issues detected."
+            ),
+        }
+
+
+#: Detectors run by `detect_all_sre_patterns` and the fleet scan.
+DEFAULT_DETECTORS: list[DetectorFactory] = [
+    RetryStormDetector,
+    CascadingTimeoutDetector,
+    ConnectionPoolDetector,
+]
@@ -1,48 +1,22 @@
 """Statistical analysis and anomaly detection for trace data."""
 
-import concurrent.futures
 import json
 import statistics
 from collections import defaultdict
-from datetime import datetime
 from typing import Any
 
 from ...clients.trace import fetch_trace_data
+from ...clients.trace_batch import fetch_traces_batch
 from ...common.decorators import adk_tool
+from ...common.sketch import QuantileSketch
 from ...common.telemetry import get_meter, get_tracer
+from ...common.trace_frame import as_trace_frame
+from ...common.trace_index import get_trace_index
 
 # Telemetry setup
 tracer = get_tracer(__name__)
 meter = get_meter(__name__)
 
-MAX_WORKERS = 10  # Max concurrent fetches
-
-
-def _fetch_traces_parallel(
-    trace_ids: list[str], project_id: str | None = None, max_traces: int = 50
-) -> list[dict[str, Any]]:
-    """Fetches multiple traces in parallel."""
-    # Cap the number of traces to avoid overwhelming the API
-    target_ids = trace_ids[:max_traces]
-
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Submit all tasks
-        future_to_tid = {
-            executor.submit(fetch_trace_data, tid, project_id): tid
-            for tid in target_ids
-        }
-
-        for future in concurrent.futures.as_completed(future_to_tid):
-            try:
-                data = future.result()
-                if data and "error" not in data:
-                    results.append(data)
-            except Exception:
-                pass
-
-    return results
-
 
 def compute_latency_statistics(
     trace_ids: list[str], project_id: str | None = None
@@ -57,14 +31,12 @@ def compute_latency_statistics(
         Dictionary containing statistical metrics.
     """
     with tracer.start_as_current_span("compute_latency_statistics"):
-        latencies = []
-        valid_traces = []
-
-        # Track stats per span name
-        span_durations = defaultdict(list)
+        # Mergeable sketches keep memory bounded however many spans we see.
+        latencies = QuantileSketch()
+        span_durations: dict[str, QuantileSketch] = defaultdict(QuantileSketch)
+        service_durations: dict[str, QuantileSketch] = defaultdict(QuantileSketch)
 
-        # Fetch traces in parallel
-        valid_trace_data = _fetch_traces_parallel(trace_ids, project_id)
+        valid_trace_data, fetch_stats = fetch_traces_batch(trace_ids, project_id)
 
         for trace_data in valid_trace_data:
             if isinstance(trace_data, dict):
@@ -73,76 +45,43 @@ def compute_latency_statistics(
 
                 # If we have spans, we can also aggregate span-level stats
                 if "spans" in trace_data:
-                    for s in trace_data["spans"]:
-                        # Try to get duration from span
-                        d = s.get("duration_ms")
-                        if d is None and s.get("start_time") and s.get("end_time"):
-                            try:
-                                start = datetime.fromisoformat(
-                                    s["start_time"].replace("Z", "+00:00")
-                                )
-                                end = datetime.fromisoformat(
-                                    s["end_time"].replace("Z", "+00:00")
-                                )
-                                d = (end - start).total_seconds() * 1000
-                            except Exception:
-                                pass
-
+                    frame = as_trace_frame(trace_data)
+                    services = frame.service_names
+                    for i, s in enumerate(frame.spans):
+                        d = frame.span_duration_ms(i)
                         if d is not None:
-                            span_durations[s.get("name", "unknown")].append(d)
+                            span_durations[s.get("name", "unknown")].add(d)
+                            service_durations[services[i] or "unknown"].add(d)
 
                 if duration is not None:
-                    latencies.append(float(duration))
-                    valid_traces.append(trace_data)
-
-        if not latencies:
-            return {"error": "No valid trace durations found"}
-
-        latencies.sort()
-        count = len(latencies)
-
-        stats: dict[str, Any] = {
-            "count": count,
-            "min": latencies[0],
-            "max": latencies[-1],
-            "mean": statistics.mean(latencies),
-            "median": statistics.median(latencies),
-            "p90": latencies[int(count * 0.9)] if count > 0 else 0,
-            "p95": latencies[int(count * 0.95)] if count > 0 else 0,
-            "p99": latencies[int(count * 0.99)] if count > 0 else 0,
-        }
+                    latencies.add(float(duration))
 
-        if count > 1:
-            stats["stdev"] = statistics.stdev(latencies)
-            stats["variance"] = statistics.variance(latencies)
-        else:
-            stats["stdev"] = 0
-            stats["variance"] = 0
+        if not latencies.count:
+            return {
+                "error": "No valid trace durations found",
+                "fetch_stats": fetch_stats.to_dict(),
+            }
+
+        stats: dict[str, Any] = latencies.summary()
 
         # Calculate per-span stats with Z-score support
         per_span_stats: dict[str, Any] = {}
-        for name, durs in span_durations.items():
-            if not durs:
-                continue
-            durs.sort()
-            c = len(durs)
-            span_mean = statistics.mean(durs)
+        for name, sketch in span_durations.items():
             per_span_stats[name] = {
-                "count": c,
-                "mean": span_mean,
-                "min": durs[0],
-                "max": durs[-1],
-                "p95": durs[int(c * 0.95)] if c > 0 else 0,
+                "count": sketch.count,
+                "mean": sketch.mean,
+                "min": sketch.min,
+                "max": sketch.max,
+                "p95": sketch.quantile(0.95),
+                "stdev": sketch.stdev,
+                "variance": sketch.variance,
             }
-            # Calculate stdev for Z-score anomaly detection (need at least 2 samples)
-            if c > 1:
-                per_span_stats[name]["stdev"] = statistics.stdev(durs)
-                per_span_stats[name]["variance"] = statistics.variance(durs)
-            else:
-                per_span_stats[name]["stdev"] = 0
-                per_span_stats[name]["variance"] = 0
 
         stats["per_span_stats"] = per_span_stats
+        stats["per_service_stats"] = {
+            svc: sketch.summary() for svc, sketch in service_durations.items()
+        }
+        stats["fetch_stats"] = fetch_stats.to_dict()
 
         return stats
 
@@ -204,21 +143,10 @@ def detect_latency_anomalies(
         # Check individual spans against baseline per-span stats using Z-score
         if "per_span_stats" in baseline_stats and "spans" in target_data:
             span_stats = baseline_stats["per_span_stats"]
-            for s in target_data["spans"]:
+            target_frame = as_trace_frame(target_data)
+            for i, s in enumerate(target_frame.spans):
                 name = s.get("name")
-                # Calc duration
-                dur = s.get("duration_ms")
-                if dur is None and s.get("start_time"):
-                    try:
-                        start = datetime.fromisoformat(
-                            s["start_time"].replace("Z", "+00:00")
-                        )
-                        end = datetime.fromisoformat(
-                            s["end_time"].replace("Z", "+00:00")
-                        )
-                        dur = (end - start).total_seconds() * 1000
-                    except Exception:
-                        pass
+                dur = target_frame.span_duration_ms(i)
 
                 if name in span_stats and dur is not None:
                     b_span = span_stats[name]
@@ -283,33 +211,23 @@ def analyze_critical_path(
         if not spans:
             return {"critical_path": []}
 
-        # Parse all spans into a structured format
+        # Index the spans with usable timestamps
+        frame = as_trace_frame(trace_data)
         parsed_spans = {}
-        for s in spans:
-            try:
-                start = (
-                    datetime.fromisoformat(
-                        s["start_time"].replace("Z", "+00:00")
-                    ).timestamp()
-                    * 1000
-                )
-                end = (
-                    datetime.fromisoformat(
-                        s["end_time"].replace("Z", "+00:00")
-                    ).timestamp()
-                    * 1000
-                )
-                parsed_spans[s["span_id"]] = {
-                    "id": s["span_id"],
-                    "name": s.get("name"),
-                    "start": start,
-                    "end": end,
-                    "duration": end - start,
-                    "parent": s.get("parent_span_id"),
-                    "children": [],
-                }
-            except (ValueError, KeyError):
+        for i, s in enumerate(frame.spans):
+            if "span_id" not in s or not frame.has_timing[i]:
                 continue
+            start = int(frame.start_ns[i]) / 1e6
+            end = int(frame.end_ns[i]) / 1e6
+            parsed_spans[s["span_id"]] = {
+                "id": s["span_id"],
+                "name": s.get("name"),
+                "start": start,
+                "end": end,
+                "duration": end - start,
+                "parent": s.get("parent_span_id"),
+                "children": [],
+            }
 
         # Build tree (children links)
         root_id = None
@@ -487,82 +405,40 @@ def perform_causal_analysis(
         )
         return json.dumps({"error": msg})
 
-    # 1. Build span name mappings for both traces
-    baseline_spans_by_name = defaultdict(list)
-    for s in baseline_data.get("spans", []):
-        baseline_spans_by_name[s.get("name")].append(s)
-
-    target_spans_by_id = {s.get("span_id"): s for s in target_data.get("spans", [])}
-    target_spans_by_name = defaultdict(list)
-    for s in target_data.get("spans", []):
-        target_spans_by_name[s.get("name")].append(s)
-
-    # 2. Analyze Critical Path of target trace to get actual span IDs
-    cp_report = analyze_critical_path(target_trace_id, project_id)
-    critical_path = cp_report.get("critical_path", [])
-    critical_path_ids = {s["span_id"] for s in critical_path}
-
-    # Create map of span_id -> critical path info
-    cp_info_map = {s["span_id"]: s for s in critical_path}
-
-    # 3. Build call graph to get depth information
-    from .analysis import build_call_graph
-
-    target_graph = build_call_graph(target_trace_id, project_id)
-
-    # Flatten tree to map span_id -> depth
-    depth_map = {}
-
-    def traverse(node: dict[str, Any]) -> None:
-        depth_map[node["span_id"]] = node["depth"]
-        for child in node["children"]:
-            traverse(child)
+    # 1. Shared derived views of both traces (built once per trace)
+    baseline_durations_by_name = get_trace_index(baseline_data).durations_by_name
+    target = get_trace_index(target_data)
+    target_frame = target.frame
+    target_rows_by_id = {s.get("span_id"): i for i, s in enumerate(target_frame.spans)}
+
+    # 2. Critical path of the target trace, by span ID
+    path = target.critical_path
+    cp_self_time: dict[Any, float] = {}
+    if path is not None:
+        cp_self_time = {
+            target_frame.span_ids[row]: float(path.self_time_ms[row])
+            for row in path.rows
+        }
 
-    for root in target_graph.get("span_tree", []):
-        traverse(root)
+    # 3. Depth of each span in the call tree
+    depth_by_row = target.depth
 
     # 4. Calculate detailed timing differences at span-ID level
-    candidates = []
+    candidates: list[dict[str, Any]] = []
 
-    for span_id, target_span in target_spans_by_id.items():
-        span_name = target_span.get("name")
+    for span_id, row in target_rows_by_id.items():
+        span_name = target_frame.spans[row].get("name")
 
         # Get baseline comparison
-        baseline_instances = baseline_spans_by_name.get(span_name, [])
-        if not baseline_instances:
+        if span_name not in baseline_durations_by_name:
             continue  # New span, not a slowdown cause
 
-        # Calculate durations
-        target_duration = target_span.get("duration_ms")
+        target_duration = target_frame.span_duration_ms(row)
         if target_duration is None:
-            try:
-                start = datetime.fromisoformat(
-                    target_span["start_time"].replace("Z", "+00:00")
-                )
-                end = datetime.fromisoformat(
-                    target_span["end_time"].replace("Z", "+00:00")
-                )
-                target_duration = (end - start).total_seconds() * 1000
-            except Exception:
-                continue
+            continue
 
         # Get average baseline duration for this span name
-        baseline_durations = []
-        for b_span in baseline_instances:
-            b_dur = b_span.get("duration_ms")
-            if b_dur is None:
-                try:
-                    start = datetime.fromisoformat(
-                        b_span["start_time"].replace("Z", "+00:00")
-                    )
-                    end = datetime.fromisoformat(
-                        b_span["end_time"].replace("Z", "+00:00")
-                    )
-                    b_dur = (end - start).total_seconds() * 1000
-                except Exception:
-                    continue
-            baseline_durations.append(b_dur)
-
+        baseline_durations = baseline_durations_by_name[span_name]
         if not baseline_durations:
             continue
 
@@ -575,12 +451,10 @@ def perform_causal_analysis(
             continue
 
         # Check if on critical path
-        on_critical_path = span_id in critical_path_ids
+        on_critical_path = span_id in cp_self_time
 
         # Get self-time contribution if on critical path
-        self_time_contribution = 0
-        if on_critical_path and span_id in cp_info_map:
-            self_time_contribution = cp_info_map[span_id].get("self_time_ms", 0)
+        self_time_contribution = cp_self_time.get(span_id, 0.0)
 
         # Calculate confidence score based on multiple factors
         # Factors:
@@ -589,7 +463,7 @@ def perform_causal_analysis(
         # 3. Self-time contribution (indicates actual work, not just child overhead)
         # 4. Depth (deeper = more likely root cause, diminishing returns after depth 5)
 
-        depth = depth_map.get(span_id, 0)
+        depth = max(int(depth_by_row[row]), 0)
         depth_factor = min(1.0 + (depth * 0.1), 1.5)  # Max 1.5x boost for depth
 
         score = diff_ms * depth_factor
@@ -629,7 +503,7 @@ def perform_causal_analysis(
         "root_cause_candidates": candidates[:10],  # Return top 10
         "analysis_method": "span_id_level_critical_path_analysis",
         "total_candidates": len(candidates),
-        "critical_path_spans": len(critical_path),
+        "critical_path_spans": len(cp_self_time),
     }
 
 
@@ -659,11 +533,13 @@ def analyze_trace_patterns(
         if len(trace_ids) < 3:
             return {"error": "Need at least 3 traces for pattern analysis"}
 
-        # Fetch traces in parallel
-        parsed_traces = _fetch_traces_parallel(trace_ids, project_id)
+        parsed_traces, fetch_stats = fetch_traces_batch(trace_ids, project_id)
 
         if len(parsed_traces) < 3:
-            return {"error": "Not enough valid traces for pattern analysis"}
+            return {
+                "error": "Not enough valid traces for pattern analysis",
+                "fetch_stats": fetch_stats.to_dict(),
+            }
 
         # Track span performance across traces
         span_performance: dict[str, dict[str, Any]] = defaultdict(
@@ -686,21 +562,10 @@ def analyze_trace_patterns(
             trace_id = trace.get("trace_id", "")
             trace_timestamps.append(trace_id)
 
-            for span in trace.get("spans", []):
+            frame = as_trace_frame(trace)
+            for i, span in enumerate(frame.spans):
                 span_name = span.get("name", "unknown")
-                duration = span.get("duration_ms")
-
-                if duration is None and span.get("start_time") and span.get("end_time"):
-                    try:
-                        start = datetime.fromisoformat(
-                            span["start_time"].replace("Z", "+00:00")
-                        )
-                        end = datetime.fromisoformat(
-                            span["end_time"].replace("Z", "+00:00")
-                        )
-                        duration = (end - start).total_seconds() * 1000
-                    except Exception:
-                        continue
+                duration = frame.span_duration_ms(i)
 
                 if duration is not None:
                     perf = span_performance[span_name]
@@ -807,6 +672,7 @@ def analyze_trace_patterns(
 
         return {
             "traces_analyzed": len(parsed_traces),
+            "fetch_stats": fetch_stats.to_dict(),
             "unique_spans": len(span_performance),
             "overall_trend": trend,
             "patterns": {
@@ -833,14 +699,14 @@ def compute_service_level_stats(
         project_id: The Google Cloud Project ID.
     """
     service_stats: dict[str, dict[str, Any]] = defaultdict(
-        lambda: {"count": 0, "errors": 0, "total_duration": 0}
+        lambda: {"count": 0, "errors": 0, "latency": QuantileSketch()}
     )
 
-    # Fetch traces in parallel
-    traces_data = _fetch_traces_parallel(trace_ids, project_id)
+    traces_data, _ = fetch_traces_batch(trace_ids, project_id)
 
     for t_data in traces_data:
-        for s in t_data.get("spans", []):
+        frame = as_trace_frame(t_data)
+        for i, s in enumerate(frame.spans):
             # Try to find service name in labels, or default to "unknown"
             # Common conventions: service.name, app, component
             labels = s.get("labels", {})
@@ -852,21 +718,14 @@ def compute_service_level_stats(
             )
 
             dur: float = 0.0
-            if s.get("start_time") and s.get("end_time"):
-                try:
-                    start = datetime.fromisoformat(
-                        s["start_time"].replace("Z", "+00:00")
-                    )
-                    end = datetime.fromisoformat(s["end_time"].replace("Z", "+00:00"))
-                    dur = (end - start).total_seconds() * 1000
-                except Exception:
-                    pass
+            if frame.has_timing[i]:
+                dur = int(frame.end_ns[i] - frame.start_ns[i]) / 1e6
 
             is_error = "error" in str(labels).lower()
 
             stats = service_stats[svc]
             stats["count"] += 1
-            stats["total_duration"] += dur
+            stats["latency"].add(dur)
             if is_error:
                 stats["errors"] += 1
 
@@ -874,10 +733,14 @@ def compute_service_level_stats(
     result = {}
     for svc, stats in service_stats.items():
         if stats["count"] > 0:
+            latency = stats["latency"]
             result[svc] = {
                 "request_count": stats["count"],
                 "error_rate": round(stats["errors"] / stats["count"] * 100, 2),
-                "avg_latency": round(stats["total_duration"] / stats["count"], 2),
+                "avg_latency": round(latency.mean, 2),
+                "p50_latency": round(latency.quantile(0.5), 2),
+                "p95_latency": round(latency.quantile(0.95), 2),
+                "p99_latency": round(latency.quantile(0.99), 2),
             }
 
     return result
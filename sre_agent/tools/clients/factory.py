@@ -1,18 +1,209 @@
-"""Lazy initialization for GCP service clients to optimize resource usage."""
+"""Lazy initialization for GCP service clients to optimize resource usage.
 
+Clients using the default credentials are process-wide singletons (one per
+event loop for asyncio clients). Clients for user credentials, set per
+request by the auth middleware, are kept in an LRU keyed by the credential's
+token and expiry: building one opens a new gRPC channel (and TLS handshake on
+its first call), which a multi-user deployment would otherwise pay on every
+API call. A cached user client lives until its token expires, at most
+`USER_CLIENT_MAX_AGE_SECONDS`, or until it is least recently used among
+SRE_AGENT_USER_CLIENT_CACHE_SIZE clients.
+"""
+
+import asyncio
+import os
 import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from datetime import datetime, timezone
 from typing import Any, TypeVar, cast
 
 from google.cloud import monitoring_v3, trace_v1
-from google.cloud.logging_v2.services.logging_service_v2 import LoggingServiceV2Client
+from google.cloud.logging_v2.services.logging_service_v2 import (
+    LoggingServiceV2AsyncClient,
+    LoggingServiceV2Client,
+)
+
+from ...auth import credentials_identity, get_current_credentials_or_none
+from ..common.telemetry import get_meter
 
-from ...auth import get_current_credentials_or_none
+meter = get_meter(__name__)
 
 T = TypeVar("T")
 
+DEFAULT_USER_CLIENT_CACHE_SIZE = 256
+# OAuth access tokens last an hour; a token without a known expiry is not
+# trusted for longer than that either.
+USER_CLIENT_MAX_AGE_SECONDS = 3600.0
+# Stop handing out a client this long before its token expires.
+_EXPIRY_MARGIN_SECONDS = 60.0
+
+client_creations = meter.create_counter(
+    name="sre_agent.clients.created",
+    description="GCP API clients created, by client and credentials (default/user)",
+    unit="1",
+)
+user_client_evictions = meter.create_counter(
+    name="sre_agent.clients.user_evicted",
+    description="Cached user-credential clients dropped, by reason (expired/lru)",
+    unit="1",
+)
+
 _clients: dict[str, Any] = {}
 _lock = threading.Lock()
 
+# grpc.aio channels are bound to the event loop they were created on, so async
+# clients are cached per loop and dropped together with it.
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _credentials_key(creds: Any) -> tuple[str | None, datetime | None]:
+    """Identity of user credentials (see `credentials_identity`) and expiry.
+
+    The auth middleware builds new credentials for every request, so equal
+    tokens, not equal objects, share a client. The identity is None for
+    credentials that cannot be told apart yet.
+    """
+    expiry = getattr(creds, "expiry", None)
+    if not isinstance(expiry, datetime):
+        expiry = None
+    return credentials_identity(creds), expiry
+
+
+def _seconds_until(expiry: datetime | None) -> float:
+    """Seconds a client for a token expiring at `expiry` may be reused."""
+    if expiry is None:
+        return USER_CLIENT_MAX_AGE_SECONDS
+    if expiry.tzinfo is None:
+        # google-auth stores expiry as naive UTC
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    remaining = (expiry - datetime.now(timezone.utc)).total_seconds()
+    return min(remaining - _EXPIRY_MARGIN_SECONDS, USER_CLIENT_MAX_AGE_SECONDS)
+
+
+def _loop_is_open(loop_ref: weakref.ref[asyncio.AbstractEventLoop] | None) -> bool:
+    """Whether a client bound to the referenced loop (if any) is usable."""
+    if loop_ref is None:
+        return True
+    loop = loop_ref()
+    return loop is not None and not loop.is_closed()
+
+
+class _UserClientCache:
+    """Thread-safe LRU of clients built with user credentials.
+
+    Async clients are bound to an event loop, which the cache only holds
+    weakly: their entries expire once the loop is closed or collected.
+
+    Dropped clients are not closed, since another request may still be
+    using them; their channels close when they are garbage collected.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_USER_CLIENT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[
+            Hashable,
+            tuple[Any, float, weakref.ref[asyncio.AbstractEventLoop] | None],
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        ttl: float,
+        create: Callable[[], T],
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> T:
+        """Get the cached client for `key`, creating it if missing or expired.
+
+        Args:
+            key: Identifies the client; include `id(loop)` for async clients
+            ttl: Seconds the client may be reused
+            create: Builds the client
+            loop: Event loop the client is bound to, if any
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry[1] and _loop_is_open(entry[2]):
+                    self._entries.move_to_end(key)
+                    return cast(T, entry[0])
+                del self._entries[key]
+                user_client_evictions.add(1, {"reason": "expired"})
+
+        client = create()
+        if ttl <= 0:
+            return client
+        with self._lock:
+            # Another thread may have created one meanwhile; keep the first.
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[1] and _loop_is_open(entry[2]):
+                return cast(T, entry[0])
+            if loop is not None:
+                # Clients of closed loops can never be used again.
+                for stale in [
+                    k for k, e in self._entries.items() if not _loop_is_open(e[2])
+                ]:
+                    del self._entries[stale]
+                    user_client_evictions.add(1, {"reason": "expired"})
+            loop_ref = weakref.ref(loop) if loop is not None else None
+            self._entries[key] = (client, now + ttl, loop_ref)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                user_client_evictions.add(1, {"reason": "lru"})
+        return client
+
+    def clear(self) -> None:
+        """Drop every cached client."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Number of cached clients, including expired ones not yet dropped."""
+        with self._lock:
+            return len(self._entries)
+
+
+_user_clients = _UserClientCache(
+    max_size=int(
+        os.environ.get(
+            "SRE_AGENT_USER_CLIENT_CACHE_SIZE", str(DEFAULT_USER_CLIENT_CACHE_SIZE)
+        )
+    )
+)
+
+
+def _create_client(name: str, client_class: type[T], **kwargs: Any) -> T:
+    client_creations.add(
+        1, {"client": name, "credentials": "user" if kwargs else "default"}
+    )
+    return client_class(**kwargs)
+
+
+def _get_user_client(
+    name: str,
+    client_class: type[T],
+    user_creds: Any,
+    loop: asyncio.AbstractEventLoop | None = None,
+) -> T:
+    """Get the cached client for the user's credentials (and event loop)."""
+    identity, expiry = _credentials_key(user_creds)
+    if identity is None:
+        # Not shared, since nothing tells them apart from another user's
+        return _create_client(name, client_class, credentials=user_creds)
+    key = (name, client_class, identity, expiry, id(loop) if loop else None)
+    return _user_clients.get(
+        key,
+        _seconds_until(expiry),
+        lambda: _create_client(name, client_class, credentials=user_creds),
+        loop,
+    )
+
 
 def _get_client(name: str, client_class: type[T]) -> T:
     """Helper for thread-safe lazy initialization of clients.
@@ -24,20 +215,42 @@ def _get_client(name: str, client_class: type[T]) -> T:
     Returns:
         The initialized client instance.
     """
+    # Check for user-specific credentials override
+    user_creds = get_current_credentials_or_none()
+    if user_creds:
+        return _get_user_client(name, client_class, user_creds)
+
     if name not in _clients:
         with _lock:
             if name not in _clients:
-                _clients[name] = client_class()
+                _clients[name] = _create_client(name, client_class)
 
-    # Check for user-specific credentials override
+    return cast(T, _clients[name])
+
+
+def _get_async_client(name: str, client_class: type[T]) -> T:
+    """Helper for lazy initialization of asyncio clients.
+
+    Must be called from a coroutine; clients are cached per running event
+    loop.
+
+    Args:
+        name: Unique name/key for the client instance.
+        client_class: The async client class to instantiate.
+
+    Returns:
+        The initialized client instance.
+    """
+    loop = asyncio.get_running_loop()
     user_creds = get_current_credentials_or_none()
     if user_creds:
-        # Create a new client with these credentials
-        # We don't cache these in the global cache to avoid mixing user sessions.
-        # In a high-throughput scenario, we might want a per-user cache.
-        return client_class(credentials=user_creds)  # type: ignore[call-arg]
+        return _get_user_client(name, client_class, user_creds, loop)
 
-    return cast(T, _clients[name])
+    with _lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        if name not in loop_clients:
+            loop_clients[name] = _create_client(name, client_class)
+        return cast(T, loop_clients[name])
 
 
 def get_trace_client() -> trace_v1.TraceServiceClient:
@@ -58,3 +271,18 @@ def get_monitoring_client() -> monitoring_v3.MetricServiceClient:
 def get_alert_policy_client() -> monitoring_v3.AlertPolicyServiceClient:
     """Returns a singleton Cloud Monitoring Alert Policy client."""
     return _get_client("alert_policies", monitoring_v3.AlertPolicyServiceClient)
+
+
+def get_trace_async_client() -> trace_v1.TraceServiceAsyncClient:
+    """Returns the Cloud Trace asyncio client for the running event loop."""
+    return _get_async_client("trace", trace_v1.TraceServiceAsyncClient)
+
+
+def get_logging_async_client() -> LoggingServiceV2AsyncClient:
+    """Returns the Cloud Logging asyncio client for the running event loop."""
+    return _get_async_client("logging", LoggingServiceV2AsyncClient)
+
+
+def get_monitoring_async_client() -> monitoring_v3.MetricServiceAsyncClient:
+    """Returns the Cloud Monitoring asyncio client for the running event loop."""
+    return _get_async_client("monitoring", monitoring_v3.MetricServiceAsyncClient)
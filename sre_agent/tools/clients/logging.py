@@ -12,17 +12,25 @@ Note: These functions are wrapped with `@adk_tool` for agent exposure, but they
 execute locally within the agent's process (via threadpool for async compatibility).
 """
 
+import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
 from ..common import adk_tool
+from ..common.cache import estimate_size, get_single_flight
+from ..common.proto_convert import log_entry_to_dict, raw_message
 from ..common.telemetry import get_tracer
-from .factory import get_logging_client
+from .factory import get_logging_async_client
 
 logger = logging.getLogger(__name__)
 tracer = get_tracer(__name__)
 
+# Defaults for `iter_log_entries`; 1000 is the largest page the API serves.
+DEFAULT_STREAM_MAX_ENTRIES = 5000
+STREAM_PAGE_SIZE = 1000
+
 
 @adk_tool
 async def list_log_entries(
@@ -43,17 +51,16 @@ async def list_log_entries(
 
     Example filter_str: 'resource.type="gce_instance" AND severity="ERROR"'
     """
-    from fastapi.concurrency import run_in_threadpool
-
-    return await run_in_threadpool(
-        _list_log_entries_sync, project_id, filter_str, limit, page_token
+    return await get_single_flight().do_async(
+        f"logs:{project_id}:{limit}:{page_token}:{filter_str}",
+        lambda: _list_log_entries_async(project_id, filter_str, limit, page_token),
     )
 
 
-def _list_log_entries_sync(
+async def _list_log_entries_async(
     project_id: str, filter_str: str, limit: int = 10, page_token: str | None = None
 ) -> str:
-    """Synchronous implementation of list_log_entries."""
+    """Asyncio implementation of list_log_entries."""
     with tracer.start_as_current_span("list_log_entries") as span:
         span.set_attribute("gcp.project_id", project_id)
         span.set_attribute("gcp.logging.filter", filter_str)
@@ -62,7 +69,7 @@ def _list_log_entries_sync(
         span.set_attribute("rpc.method", "list_log_entries")
 
         try:
-            client = get_logging_client()
+            client = get_logging_async_client()
             resource_names = [f"projects/{project_id}"]
 
             # Ensure timestamp desc ordering for recent logs
@@ -78,7 +85,7 @@ def _list_log_entries_sync(
                 request["page_token"] = page_token
 
             # Get the iterator/pager
-            entries_pager = client.list_log_entries(request=request)
+            entries_pager = await client.list_log_entries(request=request)
 
             # Fetch a single page to respect limit and get token
             # We use .pages iterator to get the first page object
@@ -87,28 +94,10 @@ def _list_log_entries_sync(
 
             # Get the first page of the iterator
             pages_iterator = entries_pager.pages
-            first_page = next(pages_iterator, None)
+            first_page = await anext(pages_iterator, None)
 
             if first_page:
-                for entry in first_page.entries:
-                    payload_data = _extract_log_payload(entry)
-
-                    results.append(
-                        {
-                            "timestamp": entry.timestamp.isoformat()
-                            if entry.timestamp
-                            else None,
-                            "severity": entry.severity.name
-                            if hasattr(entry.severity, "name")
-                            else str(entry.severity),
-                            "payload": payload_data,
-                            "resource": {
-                                "type": entry.resource.type,
-                                "labels": dict(entry.resource.labels),
-                            },
-                            "insert_id": entry.insert_id,
-                        }
-                    )
+                results = _page_entries(first_page)
                 next_token = first_page.next_page_token
 
             span.set_attribute("gcp.logging.count", len(results))
@@ -122,6 +111,78 @@ def _list_log_entries_sync(
             return json.dumps({"error": error_msg})
 
 
+async def iter_log_entries(
+    project_id: str,
+    filter_str: str,
+    max_entries: int = DEFAULT_STREAM_MAX_ENTRIES,
+    max_bytes: int | None = None,
+    page_size: int = STREAM_PAGE_SIZE,
+) -> AsyncIterator[dict[str, Any]]:
+    """Streams log entries across pages, newest first.
+
+    Entries are yielded as soon as their page arrives, in the same format as
+    `list_log_entries`. While a page is being consumed the next one is
+    already requested, so API latency overlaps with processing. Nothing
+    beyond the current and the prefetched page is held in memory.
+
+    Args:
+        project_id: The Google Cloud Project ID.
+        filter_str: The filter string to use.
+        max_entries: Stop after this many entries.
+        max_bytes: Stop before the estimated size of the yielded entries
+            would exceed this budget (no limit if None).
+        page_size: Entries requested per page.
+
+    Yields:
+        Log entry dictionaries.
+
+    Raises:
+        Exception: API errors are propagated to the consumer.
+    """
+    if max_entries <= 0:
+        return
+
+    client = get_logging_async_client()
+    request = {
+        "resource_names": [f"projects/{project_id}"],
+        "filter": filter_str,
+        "page_size": min(page_size, max_entries),
+        "order_by": "timestamp desc",
+    }
+    entries_pager = await client.list_log_entries(request=request)
+    pages_iterator = entries_pager.pages
+
+    count = 0
+    used_bytes = 0
+    pending: asyncio.Future[Any] | None = asyncio.ensure_future(
+        anext(pages_iterator, None)
+    )
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            if not page:
+                return
+            entries = _page_entries(page)
+            # Prefetch the next page only if this one cannot satisfy the limit
+            if page.next_page_token and count + len(entries) < max_entries:
+                pending = asyncio.ensure_future(anext(pages_iterator, None))
+
+            for entry in entries:
+                if max_bytes is not None:
+                    used_bytes += estimate_size(entry)
+                    if used_bytes > max_bytes:
+                        return
+                yield entry
+                count += 1
+                if count >= max_entries:
+                    return
+    finally:
+        if pending is not None:
+            pending.cancel()
+        logger.debug(f"Streamed {count} log entries for {project_id}")
+
+
 @adk_tool
 async def list_error_events(project_id: str, minutes_ago: int = 60) -> str:
     """Lists error events from Google Cloud Error Reporting using direct API.
@@ -189,13 +250,37 @@ async def get_logs_for_trace(project_id: str, trace_id: str, limit: int = 100) -
     """
     filter_str = f'trace="projects/{project_id}/traces/{trace_id}"'
 
-    from fastapi.concurrency import run_in_threadpool
-
-    return await run_in_threadpool(
-        _list_log_entries_sync, project_id, filter_str, limit
+    return await get_single_flight().do_async(
+        f"logs:{project_id}:{limit}:None:{filter_str}",
+        lambda: _list_log_entries_async(project_id, filter_str, limit),
     )
 
 
+def _page_entries(page: Any) -> list[dict[str, Any]]:
+    """Converts one `ListLogEntriesResponse` page to entry dictionaries."""
+    page_pb = raw_message(page)
+    if page_pb is not None:
+        return [log_entry_to_dict(entry) for entry in page_pb.entries]
+
+    results = []
+    for entry in page.entries:
+        results.append(
+            {
+                "timestamp": entry.timestamp.isoformat() if entry.timestamp else None,
+                "severity": entry.severity.name
+                if hasattr(entry.severity, "name")
+                else str(entry.severity),
+                "payload": _extract_log_payload(entry),
+                "resource": {
+                    "type": entry.resource.type,
+                    "labels": dict(entry.resource.labels),
+                },
+                "insert_id": entry.insert_id,
+            }
+        )
+    return results
+
+
 def _extract_log_payload(entry: Any) -> str | dict[str, Any]:
     """Extracts and normalizes payload from a log entry."""
     payload_data: str | dict[str, Any] | None = None
@@ -19,8 +19,10 @@ from google.cloud import monitoring_v3
 
 from ...auth import get_current_credentials
 from ..common import adk_tool
+from ..common.cache import get_single_flight
+from ..common.proto_convert import raw_message, time_series_to_dict
 from ..common.telemetry import get_tracer
-from .factory import get_monitoring_client
+from .factory import get_monitoring_async_client
 
 logger = logging.getLogger(__name__)
 tracer = get_tracer(__name__)
@@ -48,17 +50,16 @@ async def list_time_series(
 
     Example filter_str: 'metric.type="compute.googleapis.com/instance/cpu/utilization" AND resource.labels.instance_id="123456789"'
     """
-    from fastapi.concurrency import run_in_threadpool
-
-    return await run_in_threadpool(
-        _list_time_series_sync, project_id, filter_str, minutes_ago
+    return await get_single_flight().do_async(
+        f"metrics:{project_id}:{minutes_ago}:{filter_str}",
+        lambda: _list_time_series_async(project_id, filter_str, minutes_ago),
     )
 
 
-def _list_time_series_sync(
+async def _list_time_series_async(
     project_id: str, filter_str: str, minutes_ago: int = 60
 ) -> str:
-    """Synchronous implementation of list_time_series."""
+    """Asyncio implementation of list_time_series."""
     with tracer.start_as_current_span("list_time_series") as span:
         span.set_attribute("gcp.project_id", project_id)
         span.set_attribute("gcp.monitoring.filter", filter_str)
@@ -67,7 +68,7 @@ def _list_time_series_sync(
         span.set_attribute("rpc.method", "list_time_series")
 
         try:
-            client = get_monitoring_client()
+            client = get_monitoring_async_client()
             project_name = f"projects/{project_id}"
             now = time.time()
             seconds = int(now)
@@ -81,14 +82,18 @@ def _list_time_series_sync(
                     },
                 }
             )
-            results = client.list_time_series(
+            results = await client.list_time_series(
                 name=project_name,
                 filter=filter_str,
                 interval=interval,
                 view=monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,  # type: ignore
             )
             time_series_data = []
-            for result in results:
+            async for result in results:
+                series_pb = raw_message(result)
+                if series_pb is not None:
+                    time_series_data.append(time_series_to_dict(series_pb))
+                    continue
                 time_series_data.append(
                     {
                         "metric": {
@@ -25,9 +25,11 @@ from google.cloud import trace_v1
 from google.protobuf.timestamp_pb2 import Timestamp
 
 from ..common import adk_tool
-from ..common.cache import get_data_cache
+from ..common.cache import get_data_cache, get_single_flight
+from ..common.proto_convert import raw_message, trace_summary
 from ..common.telemetry import get_meter, get_tracer
-from .factory import get_trace_client
+from ..common.trace_frame import TraceDict, TraceFrame
+from .factory import get_trace_async_client, get_trace_client
 
 logger = logging.getLogger(__name__)
 tracer = get_tracer(__name__)
@@ -153,24 +155,20 @@ def fetch_trace_data(
     if not project_id:
         return {"error": "Project ID required to fetch trace."}
 
-    trace_json = _fetch_trace_sync(project_id, trace_id_or_json)
-    try:
-        if isinstance(trace_json, dict):
-            return trace_json
-        data = json.loads(trace_json)
-        if data and isinstance(data, dict) and "error" in data:
-            return cast(dict[str, Any], data)
-        return cast(dict[str, Any], data)
-    except json.JSONDecodeError:
-        return {"error": "Invalid trace JSON"}
+    trace_id = trace_id_or_json
+    return get_single_flight().do(
+        f"trace:{project_id}:{trace_id}",
+        lambda: _fetch_trace_sync(project_id, trace_id),
+    )
 
 
 @adk_tool
 async def fetch_trace(project_id: str, trace_id: str) -> str:
     """Fetches a specific trace by ID from Cloud Trace API.
 
-    Uses caching to avoid redundant API calls when the same trace
-    is requested multiple times (e.g., by different sub-agents).
+    Uses caching and in-flight request coalescing to avoid redundant API
+    calls when the same trace is requested multiple times (e.g., by
+    different sub-agents).
 
     Args:
         project_id: The Google Cloud Project ID.
@@ -179,82 +177,103 @@ async def fetch_trace(project_id: str, trace_id: str) -> str:
     Returns:
         A JSON string representation of the trace, including all spans.
     """
-    from fastapi.concurrency import run_in_threadpool
+    # Sub-agents running in parallel ask for the same trace at once; only the
+    # first call reaches the API, the others wait for its result.
+    trace_data = await get_single_flight().do_async(
+        f"trace:{project_id}:{trace_id}",
+        lambda: _fetch_trace_async(project_id, trace_id),
+    )
+    if isinstance(trace_data, TraceDict):
+        return trace_data.frame.to_json()
+    return json.dumps(trace_data)
+
+
+def _get_cached_trace(trace_id: str) -> dict[str, Any] | None:
+    """Return the cached trace view, if any."""
+    return _trace_view(trace_id, get_data_cache().get(f"trace:{trace_id}"))
 
-    return await run_in_threadpool(_fetch_trace_sync, project_id, trace_id)
 
+async def _get_cached_trace_async(trace_id: str) -> dict[str, Any] | None:
+    """Return the cached trace view, reading the disk tier off the event loop."""
+    cached = await get_data_cache().get_async(f"trace:{trace_id}")
+    return _trace_view(trace_id, cached)
 
-def _fetch_trace_sync(project_id: str, trace_id: str) -> str:
-    """Synchronous implementation of fetch_trace."""
-    # Check cache first
-    cache = get_data_cache()
 
-    cached = cache.get(f"trace:{trace_id}")
-    if cached:
+def _trace_view(trace_id: str, cached: Any) -> dict[str, Any] | None:
+    if isinstance(cached, TraceFrame):
         logger.debug(f"Cache hit for trace {trace_id}, skipping API call")
-        return cast(str, cached)
+        return cached.to_dict()
+    return None
 
-    with tracer.start_as_current_span("fetch_trace") as span:
-        span.set_attribute("gcp.project_id", project_id)
-        span.set_attribute("gcp.trace_id", trace_id)
-        span.set_attribute("rpc.system", "google_cloud")
-        span.set_attribute("rpc.service", "cloud_trace")
-        span.set_attribute("rpc.method", "get_trace")
 
-        try:
-            client = get_trace_client()
+def _cache_trace(span: Any, trace_id: str, trace_obj: Any) -> dict[str, Any]:
+    """Convert a fetched Trace message, cache it and return its dict view."""
+    # Parse once; every later hit shares this immutable frame.
+    frame = TraceFrame.from_proto(trace_obj)
 
-            trace_obj = client.get_trace(project_id=project_id, trace_id=trace_id)
+    span.set_attribute("gcp.trace.duration_ms", frame.trace_duration_ms)
+    span.set_attribute("gcp.trace.span_count", frame.span_count)
 
-            spans = []
-            trace_start = None
-            trace_end = None
-
-            for span_proto in trace_obj.spans:
-                s_start = span_proto.start_time.timestamp()
-                s_end = span_proto.end_time.timestamp()
-
-                if trace_start is None or s_start < trace_start:
-                    trace_start = s_start
-                if trace_end is None or s_end > trace_end:
-                    trace_end = s_end
-
-                spans.append(
-                    {
-                        "span_id": span_proto.span_id,
-                        "name": span_proto.name,
-                        "start_time": span_proto.start_time.isoformat(),
-                        "end_time": span_proto.end_time.isoformat(),
-                        "parent_span_id": span_proto.parent_span_id,
-                        "labels": dict(span_proto.labels),
-                    }
-                )
+    get_data_cache().put(f"trace:{trace_id}", frame)
 
-            dur_ms = (
-                (trace_end - trace_start) * 1000 if trace_start and trace_end else 0
-            )
-            span.set_attribute("gcp.trace.duration_ms", dur_ms)
-            span.set_attribute("gcp.trace.span_count", len(spans))
-
-            result = {
-                "trace_id": trace_obj.trace_id,
-                "project_id": trace_obj.project_id,
-                "spans": spans,
-                "span_count": len(spans),
-                "duration_ms": dur_ms,
-            }
+    return frame.to_dict()
+
+
+def _fetch_trace_error(span: Any, e: Exception) -> dict[str, Any]:
+    """Record a fetch failure and build the error response."""
+    span.record_exception(e)
+    error_msg = f"Failed to fetch trace: {e!s}"
+    logger.error(error_msg, exc_info=True)
+    return {"error": error_msg}
 
-            # Cache the result before returning
-            result_json = json.dumps(result)
-            cache.put(f"trace:{trace_id}", result_json)
 
-            return result_json
+def _set_fetch_trace_attributes(span: Any, project_id: str, trace_id: str) -> None:
+    """Set the RPC attributes shared by the sync and async fetch paths."""
+    span.set_attribute("gcp.project_id", project_id)
+    span.set_attribute("gcp.trace_id", trace_id)
+    span.set_attribute("rpc.system", "google_cloud")
+    span.set_attribute("rpc.service", "cloud_trace")
+    span.set_attribute("rpc.method", "get_trace")
+
+
+async def _fetch_trace_async(project_id: str, trace_id: str) -> dict[str, Any]:
+    """Asyncio implementation of fetch_trace, used by the async tools.
+
+    Returns the shared, read-only dictionary view of the cached `TraceFrame`
+    (or an error dictionary). Serialization is left to the caller.
+    """
+    cached = await _get_cached_trace_async(trace_id)
+    if cached is not None:
+        return cached
 
+    with tracer.start_as_current_span("fetch_trace") as span:
+        _set_fetch_trace_attributes(span, project_id, trace_id)
+        try:
+            client = get_trace_async_client()
+            trace_obj = await client.get_trace(project_id=project_id, trace_id=trace_id)
+            return _cache_trace(span, trace_id, trace_obj)
         except Exception as e:
-            span.record_exception(e)
-            error_msg = f"Failed to fetch trace: {e!s}"
-            logger.error(error_msg, exc_info=True)
-            return json.dumps({"error": error_msg})
+            return _fetch_trace_error(span, e)
+
+
+def _fetch_trace_sync(project_id: str, trace_id: str) -> dict[str, Any]:
+    """Synchronous implementation of fetch_trace, used by `fetch_trace_data`.
+
+    Returns the shared, read-only dictionary view of the cached `TraceFrame`
+    (or an error dictionary). Serialization is left to the caller.
+    """
+    cached = _get_cached_trace(trace_id)
+    if cached is not None:
+        return cached
+
+    with tracer.start_as_current_span("fetch_trace") as span:
+        _set_fetch_trace_attributes(span, project_id, trace_id)
+        try:
+            client = get_trace_client()
+            trace_obj = client.get_trace(project_id=project_id, trace_id=trace_id)
+            return _cache_trace(span, trace_id, trace_obj)
+        except Exception as e:
+            return _fetch_trace_error(span, e)
 
 
 @adk_tool
@@ -283,10 +302,7 @@ async def list_traces(
     Returns:
         JSON string list of trace summaries.
     """
-    from fastapi.concurrency import run_in_threadpool
-
-    return await run_in_threadpool(
-        _list_traces_sync,
+    return await _list_traces_async(
         project_id,
         limit,
         min_latency_ms,
@@ -297,7 +313,7 @@ async def list_traces(
     )
 
 
-def _list_traces_sync(
+async def _list_traces_async(
     project_id: str,
     limit: int,
     min_latency_ms: int | None,
@@ -306,10 +322,10 @@ def _list_traces_sync(
     end_time: str | None,
     attributes_json: str | None,
 ) -> str:
-    """Synchronous implementation of list_traces."""
+    """Asyncio implementation of list_traces."""
     with tracer.start_as_current_span("list_traces"):
         try:
-            client = get_trace_client()
+            client = get_trace_async_client()
 
             # Construct complex filter string
             # Placeholder for build_trace_filter, assuming it's defined elsewhere or will be added.
@@ -354,12 +370,19 @@ def _list_traces_sync(
             if end_timestamp:
                 request_kwargs["end_time"] = end_timestamp
 
-            response = client.list_traces(
+            response = await client.list_traces(
                 request=trace_v1.ListTracesRequest(**request_kwargs)
             )
 
             traces = []
-            for trace in response:
+            async for trace in response:
+                trace_pb = raw_message(trace)
+                if trace_pb is not None:
+                    traces.append(trace_summary(trace_pb))
+                    if len(traces) >= limit:
+                        break
+                    continue
+
                 summary = {"trace_id": trace.trace_id, "project_id": trace.project_id}
 
                 # Extract root span details if available
@@ -0,0 +1,312 @@
+"""Bounded-concurrency batch fetching of Cloud Trace traces.
+
+Fleet-wide analysis tools work on hundreds or thousands of trace IDs at a
+time. `TraceBatchFetcher` fetches them with a fixed number of concurrent
+`get_trace` calls on the asyncio client and streams each trace as soon as it
+arrives, so callers can aggregate without waiting for the slowest fetch.
+
+- Inline traces (dicts or JSON strings) and `DataCache` hits are yielded
+  immediately without scheduling any work.
+- Each network fetch goes through the shared `SingleFlight`, so a batch and a
+  concurrent `fetch_trace` for the same trace issue a single RPC.
+- Failures and fetches that exceed the per-call deadline are skipped and
+  counted in `BatchFetchStats` instead of being silently dropped. A timed-out
+  RPC keeps its concurrency slot until it actually finishes.
+
+Synchronous analyzers use `fetch_all()`, which runs the batch on a shared
+background event loop so the asyncio clients (bound to their loop) are reused
+across calls.
+
+Example:
+    >>> fetcher = TraceBatchFetcher(project_id, max_concurrency=64)
+    >>> async for trace in fetcher.iter_traces(trace_ids):
+    ...     frame = as_trace_frame(trace)
+    >>> fetcher.stats.failed
+    0
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from ..common.cache import get_single_flight
+from ..common.telemetry import get_tracer
+from .trace import _fetch_trace_async, _get_cached_trace_async, _get_project_id
+
+logger = logging.getLogger(__name__)
+tracer = get_tracer(__name__)
+
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("SRE_AGENT_TRACE_FETCH_CONCURRENCY", "32"))
+DEFAULT_FETCH_TIMEOUT_SECONDS = 30.0
+
+TraceRef = str | dict[str, Any]
+
+# Sentinel pushed by each worker when the work queue is drained.
+_DONE = object()
+
+
+@dataclass(slots=True)
+class BatchFetchStats:
+    """Outcome counters for one batch fetch."""
+
+    requested: int = 0
+    inline: int = 0
+    cache_hits: int = 0
+    fetched: int = 0
+    failed: int = 0
+    timed_out: int = 0
+
+    @property
+    def succeeded(self) -> int:
+        """Number of traces that were yielded to the caller."""
+        return self.inline + self.cache_hits + self.fetched
+
+    def to_dict(self) -> dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return {**asdict(self), "succeeded": self.succeeded}
+
+
+def _parse_inline(ref: TraceRef) -> dict[str, Any] | None:
+    """Return the trace for refs that carry the payload instead of an ID.
+
+    Returns an error dictionary for malformed payloads and None for trace IDs.
+    """
+    if isinstance(ref, dict):
+        if "trace_id" in ref or "spans" in ref or "error" in ref:
+            return ref
+        return {"error": "Invalid trace dictionary provided."}
+    if ref.strip().startswith("{"):
+        try:
+            data = json.loads(ref)
+        except json.JSONDecodeError:
+            return {"error": "Failed to parse trace JSON"}
+        if isinstance(data, dict):
+            return data
+        return {"error": "Invalid trace JSON"}
+    return None
+
+
+class TraceBatchFetcher:
+    """Fetches many traces with bounded concurrency and a per-call deadline.
+
+    A fetcher is cheap; create one per batch and read `stats` once iteration
+    has finished.
+    """
+
+    def __init__(
+        self,
+        project_id: str | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout_seconds: float | None = DEFAULT_FETCH_TIMEOUT_SECONDS,
+    ) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            project_id: Project owning the traces. Defaults to the project
+                from the environment, resolved on the first fetch.
+            max_concurrency: Maximum number of `get_trace` calls in flight.
+            timeout_seconds: Deadline for each fetch. None waits forever.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.project_id = project_id
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.stats = BatchFetchStats()
+
+    async def iter_traces(
+        self, trace_refs: Iterable[TraceRef]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield traces in completion order, skipping failed fetches.
+
+        Args:
+            trace_refs: Trace IDs, or traces already given as dicts / JSON.
+
+        Yields:
+            Trace dictionaries (read-only `TraceDict` views for fetched ones).
+        """
+        pending: list[str] = []
+        for ref in trace_refs:
+            self.stats.requested += 1
+            inline = _parse_inline(ref)
+            if inline is not None:
+                if "error" in inline:
+                    self.stats.failed += 1
+                    continue
+                self.stats.inline += 1
+                yield inline
+                continue
+            cached = await _get_cached_trace_async(ref)  # type: ignore[arg-type]
+            if cached is not None:
+                self.stats.cache_hits += 1
+                yield cached
+                continue
+            pending.append(ref)  # type: ignore[arg-type]
+
+        if pending:
+            async for trace in self._fetch_pending(pending):
+                yield trace
+
+        if self.stats.failed:
+            logger.warning(
+                f"Batch trace fetch: {self.stats.failed} of "
+                f"{self.stats.requested} traces failed "
+                f"({self.stats.timed_out} timed out)"
+            )
+
+    def fetch_all(self, trace_refs: Iterable[TraceRef]) -> list[dict[str, Any]]:
+        """Blocking variant of `iter_traces` for synchronous callers.
+
+        Must not be called from a coroutine running on the batch loop itself.
+        """
+        loop = _get_batch_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("fetch_all() cannot block the batch fetch loop")
+
+        async def collect() -> list[dict[str, Any]]:
+            return [trace async for trace in self.iter_traces(trace_refs)]
+
+        # Submitting copies the caller's context, so per-request credentials
+        # still apply to the fetches.
+        return asyncio.run_coroutine_threadsafe(collect(), loop).result()
+
+    async def _fetch_pending(
+        self, trace_ids: list[str]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Run the network fetches on a fixed pool of worker tasks."""
+        project_id = self.project_id
+        if not project_id:
+            try:
+                project_id = _get_project_id()
+            except ValueError:
+                logger.error("Project ID required to fetch traces.")
+                self.stats.failed += len(trace_ids)
+                return
+
+        work: asyncio.Queue[str] = asyncio.Queue()
+        for trace_id in trace_ids:
+            work.put_nowait(trace_id)
+        results: asyncio.Queue[Any] = asyncio.Queue()
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def worker() -> None:
+            while not work.empty():
+                trace_id = work.get_nowait()
+                trace = await self._fetch_one(project_id, trace_id, slots)
+                if trace is not None:
+                    await results.put(trace)
+            await results.put(_DONE)
+
+        with tracer.start_as_current_span("fetch_traces_batch") as span:
+            span.set_attribute("gcp.project_id", project_id)
+            span.set_attribute("gcp.trace.batch_size", len(trace_ids))
+
+            n_workers = min(self.max_concurrency, len(trace_ids))
+            workers = [asyncio.create_task(worker()) for _ in range(n_workers)]
+            try:
+                remaining = n_workers
+                while remaining:
+                    item = await results.get()
+                    if item is _DONE:
+                        remaining -= 1
+                    else:
+                        yield item
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+            span.set_attribute("gcp.trace.batch_failed", self.stats.failed)
+
+    async def _fetch_one(
+        self, project_id: str, trace_id: str, slots: asyncio.Semaphore
+    ) -> dict[str, Any] | None:
+        """Fetch one trace, recording the outcome in `stats`.
+
+        A slot of `slots` is held until the flight finishes, not just until
+        this call gives up on it, so abandoned RPCs still count against
+        `max_concurrency`.
+        """
+        await slots.acquire()
+        # Shielded so that a deadline here never cancels a flight that other
+        # callers joined; the abandoned RPC still fills the cache.
+        flight = asyncio.ensure_future(
+            get_single_flight().do_async(
+                f"trace:{project_id}:{trace_id}",
+                lambda: _fetch_trace_async(project_id, trace_id),
+            )
+        )
+        flight.add_done_callback(_consume_result)
+        flight.add_done_callback(lambda _: slots.release())
+        try:
+            trace = await asyncio.wait_for(asyncio.shield(flight), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.debug(f"Timed out fetching trace {trace_id}")
+            self.stats.failed += 1
+            self.stats.timed_out += 1
+            return None
+        except Exception as e:
+            logger.debug(f"Failed to fetch trace {trace_id}: {e!s}")
+            self.stats.failed += 1
+            return None
+
+        if not trace or "error" in trace:
+            self.stats.failed += 1
+            return None
+        self.stats.fetched += 1
+        return trace
+
+
+def _consume_result(future: "asyncio.Future[Any]") -> None:
+    """Retrieve the outcome of abandoned flights so it is not logged."""
+    if not future.cancelled():
+        future.exception()
+
+
+_batch_loop: asyncio.AbstractEventLoop | None = None
+_batch_loop_lock = threading.Lock()
+
+
+def _get_batch_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop used by `TraceBatchFetcher.fetch_all`."""
+    global _batch_loop
+    with _batch_loop_lock:
+        if _batch_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="trace-batch-fetch", daemon=True
+            ).start()
+            _batch_loop = loop
+        return _batch_loop
+
+
+def fetch_traces_batch(
+    trace_refs: Iterable[TraceRef],
+    project_id: str | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    timeout_seconds: float | None = DEFAULT_FETCH_TIMEOUT_SECONDS,
+) -> tuple[list[dict[str, Any]], BatchFetchStats]:
+    """Fetch many traces from synchronous code.
+
+    Args:
+        trace_refs: Trace IDs, or traces already given as dicts / JSON.
+        project_id: The Google Cloud Project ID.
+        max_concurrency: Maximum number of `get_trace` calls in flight.
+        timeout_seconds: Deadline for each fetch.
+
+    Returns:
+        The successfully fetched traces (in completion order) and the batch
+        statistics.
+    """
+    fetcher = TraceBatchFetcher(project_id, max_concurrency, timeout_seconds)
+    traces = fetcher.fetch_all(trace_refs)
+    return traces, fetcher.stats
@@ -1,14 +1,19 @@
 """Common utilities for SRE Agent tools."""
 
-from .cache import DataCache, get_data_cache
-from .decorators import adk_tool
+from .cache import DataCache, SingleFlight, get_data_cache, get_single_flight
+from .decorators import adk_tool, get_tool_result_cache
+from .disk_cache import DiskCache
 from .telemetry import get_meter, get_tracer, log_tool_call
 
 __all__ = [
     "DataCache",
+    "DiskCache",
+    "SingleFlight",
     "adk_tool",
     "get_data_cache",
     "get_meter",
+    "get_single_flight",
+    "get_tool_result_cache",
     "get_tracer",
     "log_tool_call",
 ]
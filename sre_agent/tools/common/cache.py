@@ -1,15 +1,79 @@
 """Thread-safe cache to prevent duplicate API calls."""
 
+import asyncio
 import logging
+import os
+import sys
 import threading
-from datetime import datetime, timedelta, timezone
-from typing import Any
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, TypeVar, cast
+
+from ...auth import credentials_identity, get_current_credentials_or_none
+from .disk_cache import DEFAULT_DISK_MAX_BYTES, DiskCache
+from .telemetry import get_meter
 
 logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Traces are immutable once complete; logs and metrics go stale quickly.
+DEFAULT_PREFIX_TTLS: dict[str, float] = {
+    "trace": 600,
+    "logs": 60,
+    "metrics": 60,
+}
+
+coalesced_calls = meter.create_counter(
+    name="sre_agent.cache.coalesced_calls",
+    description="Calls that joined an in-flight request instead of issuing their own",
+    unit="1",
+)
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    data: Any
+    expires_at: float
+    size: int
+
+
+def estimate_size(obj: Any) -> int:
+    """Roughly estimate the memory footprint of a cached value in bytes.
+
+    Objects exposing an integer `nbytes` attribute (NumPy arrays,
+    `TraceFrame`) report their own size; containers are walked with an
+    explicit stack, so deeply nested values (call trees) are fine too.
+    """
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str | bytes | bytearray):
+            total += sys.getsizeof(item)
+            continue
+        nbytes = getattr(item, "nbytes", None)
+        if isinstance(nbytes, int):
+            total += nbytes
+            continue
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple | set | frozenset):
+            stack.extend(item)
+    return total
 
 
 class DataCache:
-    """Thread-safe cache to prevent duplicate API calls.
+    """Thread-safe, size-bounded LRU cache to prevent duplicate API calls.
 
     This cache stores data with TTL (time-to-live) expiration.
     It's designed to eliminate redundant API calls when multiple sub-agents
@@ -22,31 +86,72 @@ class DataCache:
         All operations use a threading.Lock to ensure thread-safe access.
 
     Memory Management:
-        Expired entries are automatically removed during get() operations.
+        - Entries are evicted least-recently-used first once the estimated
+          size of all entries exceeds `max_bytes`.
+        - TTLs can differ per key prefix (the text before the first ':'),
+          e.g. traces are immutable once complete while logs and metrics go
+          stale quickly.
+        - Expired entries are removed on lookup and by a background sweeper
+          thread, started with the first `put()`.
+        - Expiry uses `time.monotonic()`, so wall-clock jumps do not matter.
 
     Example:
-        >>> cache = DataCache(ttl_seconds=300)
-        >>> cache.put("trace123", '{"trace_id": "trace123", "spans": [...]}')
-        >>> data = cache.get("trace123")  # Returns cached data
-        >>> data = cache.get("trace999")  # Returns None (not found)
+        >>> cache = DataCache(ttl_seconds=300, prefix_ttls={"logs": 60})
+        >>> cache.put("trace:trace123", frame)
+        >>> data = cache.get("trace:trace123")  # Returns cached data
+        >>> data = cache.get("trace:trace999")  # Returns None (not found)
     """
 
-    def __init__(self, ttl_seconds: int = 300) -> None:
+    def __init__(
+        self,
+        ttl_seconds: int = 300,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        prefix_ttls: Mapping[str, float] | None = None,
+        sweep_interval_seconds: float | None = 60.0,
+        disk: DiskCache | None = None,
+    ) -> None:
         """Initialize the data cache.
 
         Args:
-            ttl_seconds: Time-to-live for cached entries in seconds.
+            ttl_seconds: Default time-to-live for cached entries in seconds.
                         Default is 300 seconds (5 minutes).
+            max_bytes: Budget for the estimated size of all entries.
+            prefix_ttls: TTL overrides keyed by key prefix (e.g. "logs").
+            sweep_interval_seconds: How often the background sweeper purges
+                expired entries. None disables the sweeper.
+            disk: Optional persistent tier consulted on memory misses and
+                written behind on `put()` for the prefixes it accepts.
         """
-        self._cache: dict[str, dict[str, Any]] = {}
+        self._cache: OrderedDict[str, _CacheEntry] = OrderedDict()
         self._lock = threading.Lock()
         self.ttl_seconds = ttl_seconds
-        logger.info(f"DataCache initialized with TTL={ttl_seconds}s")
+        self.max_bytes = max_bytes
+        self.prefix_ttls: dict[str, float] = dict(prefix_ttls or {})
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._disk_hits = 0
+        self.disk = disk
+        self._sweeper: threading.Thread | None = None
+        self._stop_sweeper = threading.Event()
+        logger.info(
+            f"DataCache initialized with TTL={ttl_seconds}s, "
+            f"max_bytes={max_bytes}, prefix_ttls={self.prefix_ttls}"
+        )
+
+    def ttl_for(self, key: str) -> float:
+        """Get the TTL in seconds that applies to a key."""
+        return self.prefix_ttls.get(key.split(":", 1)[0], self.ttl_seconds)
 
     def get(self, key: str) -> Any | None:
         """Get cached data if available and not expired.
 
         This method automatically removes expired entries during lookup.
+        A memory miss reads the disk tier inline; coroutines should use
+        `get_async()`, which reads it in a worker thread.
 
         Args:
             key: The cache key to look up.
@@ -54,49 +159,157 @@ class DataCache:
         Returns:
             The cached data, or None if not found or expired.
         """
+        data = self._get_memory(key)
+        if data is None and self._uses_disk(key):
+            data = self._get_disk(key)
+        if data is None:
+            self._count_miss(key)
+        return data
+
+    async def get_async(self, key: str) -> Any | None:
+        """Like `get()`, but keeps disk tier reads off the event loop.
+
+        Args:
+            key: The cache key to look up.
+
+        Returns:
+            The cached data, or None if not found or expired.
+        """
+        data = self._get_memory(key)
+        if data is None and self._uses_disk(key):
+            data = await asyncio.to_thread(self._get_disk, key)
+        if data is None:
+            self._count_miss(key)
+        return data
+
+    def _get_memory(self, key: str) -> Any | None:
         with self._lock:
             entry = self._cache.get(key)
-            if entry:
-                if datetime.now(timezone.utc) < entry["expires"]:
-                    logger.debug(f"Cache HIT for key {key}")
-                    return entry["data"]
-                else:
-                    # Entry expired, remove it
-                    logger.debug(f"Cache EXPIRED for key {key}")
-                    del self._cache[key]
-                    return None
-            else:
-                logger.debug(f"Cache MISS for key {key}")
+            if entry is None:
                 return None
+            if time.monotonic() < entry.expires_at:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                logger.debug(f"Cache HIT for key {key}")
+                return entry.data
+            # Entry expired, remove it
+            self._remove(key)
+            self._expirations += 1
+            logger.debug(f"Cache EXPIRED for key {key}")
+            return None
+
+    def _uses_disk(self, key: str) -> bool:
+        return self.disk is not None and self.disk.accepts(key)
+
+    def _get_disk(self, key: str) -> Any | None:
+        """Read through the disk tier, promoting a hit to memory."""
+        data = self.disk.get(key) if self.disk is not None else None
+        if data is None:
+            return None
+        logger.debug(f"Cache DISK HIT for key {key}")
+        self._store(key, data, self.ttl_for(key))
+        with self._lock:
+            self._disk_hits += 1
+        return data
 
-    def put(self, key: str, data: Any) -> None:
+    def _count_miss(self, key: str) -> None:
+        with self._lock:
+            self._misses += 1
+        logger.debug(f"Cache MISS for key {key}")
+
+    def put(self, key: str, data: Any, ttl_seconds: float | None = None) -> None:
         """Cache data with expiration.
 
+        Values larger than the whole budget are not cached.
+
         Args:
             key: The cache key.
             data: The data to cache.
+            ttl_seconds: Optional TTL overriding the key's prefix TTL.
         """
+        ttl = self.ttl_for(key) if ttl_seconds is None else ttl_seconds
+        self._store(key, data, ttl)
+        if self.disk is not None and self.disk.accepts(key):
+            # Only queued; the disk tier encodes and writes it in the background.
+            self.disk.put(key, data)
+
+    def _store(self, key: str, data: Any, ttl: float) -> None:
+        """Insert into the in-memory tier and evict down to the budget."""
+        size = estimate_size(data)
         with self._lock:
-            self._cache[key] = {
-                "data": data,
-                "expires": datetime.now(timezone.utc)
-                + timedelta(seconds=self.ttl_seconds),
-                "cached_at": datetime.now(timezone.utc),
-            }
-            logger.debug(f"Cached key {key} (TTL={self.ttl_seconds}s)")
+            self._remove(key)
+            if size > self.max_bytes:
+                logger.debug(f"Not caching key {key}: {size} bytes exceeds budget")
+                return
+            self._cache[key] = _CacheEntry(data, time.monotonic() + ttl, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted_key, evicted = self._cache.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+                logger.debug(f"Evicted key {evicted_key} (LRU)")
+            logger.debug(f"Cached key {key} (TTL={ttl}s, {size} bytes)")
+        self._ensure_sweeper()
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry; the caller must hold the lock."""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def purge_expired(self) -> int:
+        """Remove all expired entries.
+
+        Returns:
+            The number of entries removed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, e in self._cache.items() if now >= e.expires_at]
+            for key in expired:
+                self._remove(key)
+            self._expirations += len(expired)
+        if expired:
+            logger.debug(f"Cache sweep removed {len(expired)} expired entries")
+        return len(expired)
+
+    def _ensure_sweeper(self) -> None:
+        if self.sweep_interval_seconds is None or self._sweeper is not None:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            # The thread only holds a weak reference so it never keeps a
+            # discarded cache alive.
+            self._sweeper = threading.Thread(
+                target=_sweep_loop,
+                args=(
+                    weakref.ref(self),
+                    self._stop_sweeper,
+                    self.sweep_interval_seconds,
+                ),
+                name="DataCacheSweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
+
+    def close(self) -> None:
+        """Stop the background sweeper, if running."""
+        self._stop_sweeper.set()
 
     def clear(self) -> None:
-        """Clear all cached entries."""
+        """Clear all in-memory entries (the disk tier is left intact)."""
         with self._lock:
             count = len(self._cache)
             self._cache.clear()
+            self._bytes = 0
             logger.info(f"Cache cleared ({count} entries removed)")
 
     def size(self) -> int:
         """Get the number of cached entries.
 
-        Note: This includes both valid and expired entries.
-        Expired entries are only removed during get() operations.
+        Note: This may include expired entries the sweeper has not yet
+        removed.
 
         Returns:
             The number of cached entries.
@@ -112,25 +325,278 @@ class DataCache:
             - total_entries: Total number of cached entries
             - expired_entries: Number of expired entries
             - active_entries: Number of active (non-expired) entries
+            - hits / misses: Lookup outcomes since startup
+            - evictions: Entries dropped to stay within max_bytes
+            - expirations: Entries removed after their TTL
+            - bytes / max_bytes: Estimated size in use and the budget
+            - disk_hits: Misses served from the disk tier
+            - disk: Disk tier statistics, when configured
         """
         with self._lock:
-            now = datetime.now(timezone.utc)
+            now = time.monotonic()
             total = len(self._cache)
             expired = sum(
-                1 for entry in self._cache.values() if now >= entry["expires"]
+                1 for entry in self._cache.values() if now >= entry.expires_at
             )
             active = total - expired
 
-            return {
+            stats: dict[str, Any] = {
                 "total_entries": total,
                 "expired_entries": expired,
                 "active_entries": active,
                 "ttl_seconds": self.ttl_seconds,
+                "prefix_ttls": dict(self.prefix_ttls),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_hits": self._disk_hits,
             }
+        # Flushes pending writes and queries SQLite, so not under the lock
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+def _sweep_loop(
+    cache_ref: "weakref.ref[DataCache]", stop: threading.Event, interval: float
+) -> None:
+    """Periodically purge expired entries until stopped or collected."""
+    while not stop.wait(interval):
+        cache = cache_ref()
+        if cache is None:
+            return
+        cache.purge_expired()
+        del cache
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    """Get the event loop running on the current thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _caller_key(key: str) -> str | None:
+    """Coalescing key of `key` for the current caller, or None to not coalesce.
+
+    Clients are built from the caller's credentials, so calls made with user
+    credentials only share a flight with calls made with the same ones.
+    """
+    creds = get_current_credentials_or_none()
+    if creds is None:
+        return key
+    identity = credentials_identity(creds)
+    return None if identity is None else f"{key}:{identity}"
 
 
-# Global singleton instance
-_data_cache = DataCache()
+class _LeaderCancelled(Exception):
+    """Set on a flight whose leader was cancelled, so its followers retry."""
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into a single execution.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is still running wait on the leader's pending future and
+    receive the same result (or exception). Once the call completes the key
+    is released, so later callers are expected to hit `DataCache` instead.
+
+    Both synchronous callers (threadpool workers) and coroutines can join the
+    same flight, because the pending result is a `concurrent.futures.Future`.
+    A synchronous caller on the event loop thread that is running an async
+    leader does not join: blocking there would stall the leader, so it makes
+    its own call instead.
+
+    Keys are namespaced by the text before the first ':' (e.g.
+    ``trace:<project>:<id>``); that prefix is used as the metric attribute.
+    Calls made with user credentials are keyed by credential identity too,
+    so one user never gets the result (or error) of another user's request;
+    calls with credentials that have no identity yet are not coalesced.
+
+    Example:
+        >>> flight = get_single_flight()
+        >>> data = await flight.do_async(
+        ...     f"trace:{project_id}:{trace_id}",
+        ...     lambda: _fetch_trace_async(project_id, trace_id),
+        ... )
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._calls: dict[str, Future[Any]] = {}
+        # Event loop running each async leader, absent for synchronous leaders
+        self._loops: dict[str, asyncio.AbstractEventLoop] = {}
+        self._coalesced: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _join(
+        self,
+        key: str,
+        loop: asyncio.AbstractEventLoop | None = None,
+        blocking: bool = False,
+    ) -> tuple[Future[Any] | None, bool]:
+        """Return the pending future for key and whether the caller leads.
+
+        Args:
+            key: The coalescing key.
+            loop: The event loop running on the caller's thread, if any.
+            blocking: Whether the caller would block its thread on the future.
+
+        Returns:
+            The pending future (None when a blocking caller must not wait on
+            it) and whether the caller is the leader.
+        """
+        with self._lock:
+            pending = self._calls.get(key)
+            if pending is not None:
+                if blocking and loop is not None and self._loops.get(key) is loop:
+                    logger.debug(f"Not coalescing blocking call for key {key}")
+                    return None, False
+                operation = key.split(":", 1)[0]
+                self._coalesced[operation] = self._coalesced.get(operation, 0) + 1
+                coalesced_calls.add(1, {"cache.operation": operation})
+                logger.debug(f"Coalesced call for key {key}")
+                return pending, False
+            pending = Future()
+            self._calls[key] = pending
+            if loop is not None and not blocking:
+                self._loops[key] = loop
+            return pending, True
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+            self._loops.pop(key, None)
+
+    @staticmethod
+    def _settle(
+        pending: "Future[Any]", result: Any = None, error: BaseException | None = None
+    ) -> None:
+        """Complete the shared future unless it already is (e.g. cancelled)."""
+        if pending.done():
+            return
+        if error is not None:
+            pending.set_exception(error)
+        else:
+            pending.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn once for all concurrent synchronous callers of key.
+
+        Args:
+            key: The coalescing key.
+            fn: Zero-argument callable performing the actual request.
+
+        Returns:
+            The result of the (possibly shared) call.
+        """
+        user_key = _caller_key(key)
+        if user_key is None:
+            return fn()
+        key = user_key
+        while True:
+            pending, leader = self._join(key, _running_loop(), blocking=True)
+            if pending is None:
+                return fn()
+            if leader:
+                break
+            try:
+                return cast(T, pending.result())
+            except _LeaderCancelled:
+                continue
+        try:
+            result = fn()
+        except BaseException as e:
+            self._release(key)
+            self._settle(pending, error=e)
+            raise
+        self._release(key)
+        self._settle(pending, result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn once for all concurrent callers of key.
+
+        If the leader is cancelled, its followers are not: the key is
+        released and they retry, one of them becoming the new leader.
+
+        Args:
+            key: The coalescing key.
+            fn: Zero-argument callable returning the awaitable to run.
+
+        Returns:
+            The result of the (possibly shared) call.
+        """
+        user_key = _caller_key(key)
+        if user_key is None:
+            return await fn()
+        key = user_key
+        while True:
+            pending, leader = self._join(key, asyncio.get_running_loop())
+            if pending is None:
+                return await fn()
+            if leader:
+                break
+            try:
+                # Shielded: a cancelled follower must not cancel the shared call.
+                return cast(T, await asyncio.shield(asyncio.wrap_future(pending)))
+            except _LeaderCancelled:
+                continue
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._release(key)
+            self._settle(pending, error=_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._release(key)
+            self._settle(pending, error=e)
+            raise
+        self._release(key)
+        self._settle(pending, result)
+        return result
+
+    def in_flight(self) -> int:
+        """Get the number of keys with a call currently in flight."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        """Get the number of coalesced calls per key prefix."""
+        with self._lock:
+            return dict(self._coalesced)
+
+
+def _disk_cache_from_env() -> DiskCache | None:
+    """Build the optional disk tier from SRE_AGENT_DISK_CACHE_PATH."""
+    path = os.environ.get("SRE_AGENT_DISK_CACHE_PATH")
+    if not path:
+        return None
+    try:
+        return DiskCache(
+            path,
+            max_bytes=int(
+                os.environ.get(
+                    "SRE_AGENT_DISK_CACHE_MAX_BYTES", str(DEFAULT_DISK_MAX_BYTES)
+                )
+            ),
+        )
+    except Exception as e:
+        logger.warning(f"Disk cache disabled, failed to open {path}: {e}")
+        return None
+
+
+# Global singleton instances
+_data_cache = DataCache(
+    max_bytes=int(os.environ.get("SRE_AGENT_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+    prefix_ttls=DEFAULT_PREFIX_TTLS,
+    disk=_disk_cache_from_env(),
+)
+_single_flight = SingleFlight()
 
 
 def get_data_cache() -> DataCache:
@@ -148,3 +614,12 @@ def get_data_cache() -> DataCache:
         >>> cache.put("key123", data)
     """
     return _data_cache
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the global single-flight instance used by the API clients.
+
+    Returns:
+        The global SingleFlight instance.
+    """
+    return _single_flight
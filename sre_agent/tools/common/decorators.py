@@ -1,15 +1,24 @@
 """Decorators for SRE Agent tools with OpenTelemetry instrumentation."""
 
+import copy
 import functools
+import hashlib
 import inspect
+import json
 import logging
+import os
+import random
+import reprlib
 import time
 from collections.abc import Callable
-from typing import Any
+from typing import Any, overload
 
 from opentelemetry import metrics, trace
 from opentelemetry.trace import Status, StatusCode
 
+from ...auth import credentials_identity, get_current_credentials_or_none
+from .cache import DataCache
+
 logger = logging.getLogger(__name__)
 
 # Initialize OTel instruments
@@ -26,9 +35,237 @@ tool_execution_count = meter.create_counter(
     description="Total number of tool calls",
     unit="1",
 )
+tool_cache_hits = meter.create_counter(
+    name="sre_agent.tool.cache_hits",
+    description="Memoized tool calls answered from the result cache",
+    unit="1",
+)
+tool_cache_misses = meter.create_counter(
+    name="sre_agent.tool.cache_misses",
+    description="Memoized tool calls that had to run the tool",
+    unit="1",
+)
+
+# Memoized results live as long as the traces they are computed from.
+DEFAULT_MEMOIZE_TTL_SECONDS = 600
+
+# Results of `@adk_tool(memoize=True)` tools, kept apart from the data cache
+# so they never evict the traces and logs they were computed from.
+_tool_results = DataCache(
+    ttl_seconds=DEFAULT_MEMOIZE_TTL_SECONDS,
+    max_bytes=int(
+        os.environ.get("SRE_AGENT_TOOL_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+    ),
+)
+
+# Fraction of recorded tool spans that get `arg.*` and `tool.result`
+# attributes (0 disables them, 1 records them on every span).
+ATTRIBUTE_SAMPLE_RATE = float(
+    os.environ.get("SRE_AGENT_TOOL_ATTRIBUTE_SAMPLE_RATE", "1.0")
+)
+
+_LOG_ARG_CHARS = 200
+_ATTRIBUTE_CHARS = 1000
+
+# Bounded repr: large containers and strings are cut while formatting,
+# instead of formatting everything and truncating the result.
+_repr = reprlib.Repr()
+_repr.maxlevel = 2
+_repr.maxtuple = _repr.maxlist = _repr.maxset = _repr.maxfrozenset = 10
+_repr.maxdeque = _repr.maxarray = _repr.maxdict = 10
+_repr.maxstring = _repr.maxlong = _repr.maxother = _LOG_ARG_CHARS
+
+
+def _short_repr(value: Any, limit: int) -> str:
+    """Repr of `value` cut to `limit` characters, without a full repr."""
+    text = _repr.repr(value)
+    return text if len(text) <= limit else text[:limit]
+
+
+def _attribute_value(value: Any) -> str:
+    """Span attribute for an argument or result, truncated for span limits."""
+    text = value if isinstance(value, str) else _short_repr(value, _ATTRIBUTE_CHARS)
+    if len(text) > _ATTRIBUTE_CHARS:
+        return text[:_ATTRIBUTE_CHARS] + "...(truncated)"
+    return text
+
+
+def _bind_arguments(
+    sig: inspect.Signature | None, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Map call arguments to parameter names, or None if they do not bind."""
+    if sig is None:
+        return None
+    try:
+        bound = sig.bind(*args, **kwargs)
+    except TypeError:
+        return None
+    bound.apply_defaults()
+    return bound.arguments
+
+
+def _memo_key(
+    tool_name: str,
+    sig: inspect.Signature | None,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str | None:
+    """Canonical cache key of a call, or None if the arguments have none.
+
+    Arguments are bound to parameter names with defaults applied, so
+    positional, keyword and omitted-default spellings of a call share a key.
+    Arguments that are not plain JSON data are not memoized. Calls made with
+    user credentials are keyed by credential identity too, so one user's
+    results are never served to another, and are not memoized when the
+    credentials have no identity yet.
+    """
+    arguments = _bind_arguments(sig, args, kwargs)
+    if arguments is None:
+        return None
+    try:
+        canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    digest = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+    creds = get_current_credentials_or_none()
+    if creds is None:
+        return f"tool:{tool_name}:{digest}"
+    identity = credentials_identity(creds)
+    if identity is None:
+        return None
+    return f"tool:{tool_name}:{identity}:{digest}"
+
+
+def _cached_result(span: trace.Span, tool_name: str, key: str) -> Any | None:
+    """Look a memoized call up, counting the hit or miss.
+
+    Returns the cached object itself; callers copy its top level on the way
+    out.
+    """
+    result = _tool_results.get(key)
+    attributes = {"tool.name": tool_name}
+    if result is None:
+        tool_cache_misses.add(1, attributes)
+        return None
+    tool_cache_hits.add(1, attributes)
+    span.set_attribute("tool.name", tool_name)
+    span.set_attribute("tool.cache_hit", True)
+    logger.debug(f"Tool '{tool_name}' served from result cache")
+    return result
+
+
+def _remember(key: str, result: Any, ttl: float) -> bool:
+    """Memoize a result unless it is empty or reports an error.
+
+    The result is stored as is and must not be mutated afterwards.
+
+    Returns:
+        Whether the result was stored
+    """
+    if result is None or _is_error_result(result):
+        return False
+    _tool_results.put(key, result, ttl_seconds=ttl)
+    return True
+
 
+def _is_error_result(result: Any) -> bool:
+    """Whether a tool returned an error payload instead of raising."""
+    if isinstance(result, list) and result:
+        result = result[0]
+    return isinstance(result, dict) and "error" in result
 
-def adk_tool(func: Callable[..., Any]) -> Callable[..., Any]:
+
+def _start_call(
+    span: trace.Span,
+    tool_name: str,
+    sig: inspect.Signature | None,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> bool:
+    """Log the call and record argument attributes, each only when enabled.
+
+    Returns:
+        Whether the span is sampled for argument/result attributes
+    """
+    span.set_attribute("tool.name", tool_name)
+    span.set_attribute("code.function", tool_name)
+    sampled = span.is_recording() and random.random() < ATTRIBUTE_SAMPLE_RATE
+    log_info = logger.isEnabledFor(logging.INFO)
+    if not (sampled or log_info):
+        return sampled
+
+    arguments = _bind_arguments(sig, args, kwargs)
+    if sampled and arguments is not None:
+        for k, v in arguments.items():
+            span.set_attribute(f"arg.{k}", _attribute_value(v))
+
+    if log_info:
+        if arguments is None:
+            arg_str = (
+                f"args={_short_repr(args, _LOG_ARG_CHARS)}, "
+                f"kwargs={_short_repr(kwargs, _LOG_ARG_CHARS)}"
+            )
+        else:
+            arg_str = ", ".join(
+                f"{k}={_short_repr(v, _LOG_ARG_CHARS)}" for k, v in arguments.items()
+            )
+        logger.info(f"🛠️  Tool Call: '{tool_name}' | Args: {arg_str}")
+    if arguments is not None and logger.isEnabledFor(logging.DEBUG):
+        full_arg_str = ", ".join(f"{k}={v!r}" for k, v in arguments.items())
+        logger.debug(f"Tool '{tool_name}' FULL ARGS: {full_arg_str}")
+    return sampled
+
+
+def _finish_call(
+    span: trace.Span, tool_name: str, start_time: float, result: Any, sampled: bool
+) -> None:
+    """Log a successful call and record the result attribute if sampled."""
+    if logger.isEnabledFor(logging.INFO):
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(f"✅ Tool Success: '{tool_name}' | Duration: {duration_ms:.2f}ms")
+    if sampled:
+        span.set_attribute("tool.result", _attribute_value(result))
+    if logger.isEnabledFor(logging.DEBUG):
+        # Truncate result logging
+        result_str = _short_repr(result, _ATTRIBUTE_CHARS)
+        logger.debug(f"Tool '{tool_name}' RESULT: {result_str}")
+
+
+def _fail_call(
+    span: trace.Span, tool_name: str, start_time: float, error: Exception
+) -> None:
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    logger.error(
+        f"❌ Tool Failed: '{tool_name}' | Duration: {duration_ms:.2f}ms | Error: {error}",
+        exc_info=True,
+    )
+    span.record_exception(error)
+    span.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+def _record_metrics(tool_name: str, start_time: float, success: bool) -> None:
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    attributes = {"tool.name": tool_name, "success": str(success)}
+    tool_execution_duration.record(duration_ms, attributes)
+    tool_execution_count.add(1, attributes)
+
+
+@overload
+def adk_tool(func: Callable[..., Any]) -> Callable[..., Any]: ...
+
+
+@overload
+def adk_tool(
+    *, memoize: bool = False, ttl: float = DEFAULT_MEMOIZE_TTL_SECONDS
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
+
+
+def adk_tool(
+    func: Callable[..., Any] | None = None,
+    *,
+    memoize: bool = False,
+    ttl: float = DEFAULT_MEMOIZE_TTL_SECONDS,
+) -> Any:
     """Decorator to mark a function as an ADK tool.
 
     This decorator provides:
@@ -36,147 +273,105 @@ def adk_tool(func: Callable[..., Any]) -> Callable[..., Any]:
     - OTel Metrics (count and duration)
     - Standardized Logging of args and results/errors
     - Error handling (ensures errors are logged before raising/returning)
+    - Optional memoization of results (`memoize=True`)
+
+    The signature is resolved once, arguments are only bound and formatted
+    when the INFO/DEBUG log lines or the span attributes need them, and
+    argument/result attributes are sampled (SRE_AGENT_TOOL_ATTRIBUTE_SAMPLE_RATE).
+
+    Memoized tools must be deterministic functions of their arguments (and
+    of immutable data such as completed traces). Results are cached for
+    `ttl` seconds under a canonical key of the bound arguments, in a
+    size-bounded LRU store; error payloads are never cached. The tool may
+    return data it shares with other caches (such as trace index views):
+    the result is cached as is, and callers of a cached result get a copy of
+    its top level only, so hits stay cheap however large the result is.
+    Callers may add, drop or replace top-level items but must treat nested
+    data as read-only. Results that were not cached are returned as is.
+
+    Args:
+        func: The tool function (when used as a bare `@adk_tool`)
+        memoize: Cache results by argument values
+        ttl: Seconds a memoized result stays valid
 
     Example:
         @adk_tool
         async def fetch_trace(trace_id: str) -> dict:
             ...
+
+        @adk_tool(memoize=True)
+        def build_call_graph(trace_id: str, project_id: str | None = None) -> dict:
+            ...
     """
+    if func is None:
+        return functools.partial(adk_tool, memoize=memoize, ttl=ttl)
 
-    def _record_attributes(
-        span: trace.Span, bound_args: inspect.BoundArguments
-    ) -> None:
-        for k, v in bound_args.arguments.items():
-            # Truncate long strings to avoid span attribute limits
-            val_str = str(v)
-            if len(val_str) > 1000:
-                val_str = val_str[:1000] + "...(truncated)"
-            span.set_attribute(f"arg.{k}", val_str)
+    tool_name = func.__name__
+    try:
+        sig: inspect.Signature | None = inspect.signature(func)
+    except (TypeError, ValueError):
+        sig = None
 
     @functools.wraps(func)
     async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-        tool_name = func.__name__
-        start_time = time.time()
+        start_time = time.perf_counter()
         success = True
+        key = _memo_key(tool_name, sig, args, kwargs) if memoize else None
 
         with tracer.start_as_current_span(tool_name) as span:
-            span.set_attribute("tool.name", tool_name)
-            span.set_attribute("code.function", tool_name)
-
-            # Log calling
-            try:
-                sig = inspect.signature(func)
-                bound = sig.bind(*args, **kwargs)
-                bound.apply_defaults()
-                arg_str = ", ".join(
-                    f"{k}={repr(v)[:200]}" for k, v in bound.arguments.items()
-                )
-                _record_attributes(span, bound)
-
-                # Full args for debug
-                full_arg_str = ", ".join(
-                    f"{k}={v!r}" for k, v in bound.arguments.items()
-                )
-                logger.debug(f"Tool '{tool_name}' FULL ARGS: {full_arg_str}")
-            except Exception:
-                arg_str = f"args={args}, kwargs={kwargs}"
-
-            logger.info(f"🛠️  Tool Call: '{tool_name}' | Args: {arg_str}")
-
             try:
+                if key is not None:
+                    cached = _cached_result(span, tool_name, key)
+                    if cached is not None:
+                        return copy.copy(cached)
+                sampled = _start_call(span, tool_name, sig, args, kwargs)
                 result = await func(*args, **kwargs)
-                duration_ms = (time.time() - start_time) * 1000
-                logger.info(
-                    f"✅ Tool Success: '{tool_name}' | Duration: {duration_ms:.2f}ms"
-                )
-
-                # Truncate result logging
-                result_str = repr(result)
-                if len(result_str) > 1000:
-                    result_str = result_str[:1000] + "... (truncated)"
-                logger.debug(f"Tool '{tool_name}' RESULT: {result_str}")
+                _finish_call(span, tool_name, start_time, result, sampled)
+                if key is not None and _remember(key, result, ttl):
+                    return copy.copy(result)
                 return result
             except Exception as e:
                 success = False
-                duration_ms = (time.time() - start_time) * 1000
-                logger.error(
-                    f"❌ Tool Failed: '{tool_name}' | Duration: {duration_ms:.2f}ms | Error: {e}",
-                    exc_info=True,
-                )
-                span.record_exception(e)
-                span.set_status(Status(StatusCode.ERROR, str(e)))
+                _fail_call(span, tool_name, start_time, e)
                 raise e
             finally:
-                duration_ms = (time.time() - start_time) * 1000
-                tool_execution_duration.record(
-                    duration_ms, {"tool.name": tool_name, "success": str(success)}
-                )
-                tool_execution_count.add(
-                    1, {"tool.name": tool_name, "success": str(success)}
-                )
+                _record_metrics(tool_name, start_time, success)
 
     @functools.wraps(func)
     def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-        tool_name = func.__name__
-        start_time = time.time()
+        start_time = time.perf_counter()
         success = True
+        key = _memo_key(tool_name, sig, args, kwargs) if memoize else None
 
         with tracer.start_as_current_span(tool_name) as span:
-            span.set_attribute("tool.name", tool_name)
-            span.set_attribute("code.function", tool_name)
-
-            # Log calling
-            try:
-                sig = inspect.signature(func)
-                bound = sig.bind(*args, **kwargs)
-                bound.apply_defaults()
-                arg_str = ", ".join(
-                    f"{k}={repr(v)[:200]}" for k, v in bound.arguments.items()
-                )
-                _record_attributes(span, bound)
-
-                # Full args for debug
-                full_arg_str = ", ".join(
-                    f"{k}={v!r}" for k, v in bound.arguments.items()
-                )
-                logger.debug(f"Tool '{tool_name}' FULL ARGS: {full_arg_str}")
-            except Exception:
-                arg_str = f"args={args}, kwargs={kwargs}"
-
-            logger.info(f"🛠️  Tool Call: '{tool_name}' | Args: {arg_str}")
-
             try:
+                if key is not None:
+                    cached = _cached_result(span, tool_name, key)
+                    if cached is not None:
+                        return copy.copy(cached)
+                sampled = _start_call(span, tool_name, sig, args, kwargs)
                 result = func(*args, **kwargs)
-                duration_ms = (time.time() - start_time) * 1000
-                logger.info(
-                    f"✅ Tool Success: '{tool_name}' | Duration: {duration_ms:.2f}ms"
-                )
-                # Truncate result logging
-                result_str = repr(result)
-                if len(result_str) > 1000:
-                    result_str = result_str[:1000] + "... (truncated)"
-                logger.debug(f"Tool '{tool_name}' RESULT: {result_str}")
+                _finish_call(span, tool_name, start_time, result, sampled)
+                if key is not None and _remember(key, result, ttl):
+                    return copy.copy(result)
                 return result
             except Exception as e:
                 success = False
-                duration_ms = (time.time() - start_time) * 1000
-                logger.error(
-                    f"❌ Tool Failed: '{tool_name}' | Duration: {duration_ms:.2f}ms | Error: {e}",
-                    exc_info=True,
-                )
-                span.record_exception(e)
-                span.set_status(Status(StatusCode.ERROR, str(e)))
+                _fail_call(span, tool_name, start_time, e)
                 raise e
             finally:
-                duration_ms = (time.time() - start_time) * 1000
-                tool_execution_duration.record(
-                    duration_ms, {"tool.name": tool_name, "success": str(success)}
-                )
-                tool_execution_count.add(
-                    1, {"tool.name": tool_name, "success": str(success)}
-                )
+                _record_metrics(tool_name, start_time, success)
 
     if inspect.iscoroutinefunction(func):
         return async_wrapper
     else:
         return sync_wrapper
+
+
+def get_tool_result_cache() -> DataCache:
+    """Get the cache holding the results of memoized tools.
+
+    Returns:
+        The global tool result cache, e.g. for `stats()` or `clear()`.
+    """
+    return _tool_results
@@ -0,0 +1,302 @@
+"""Persistent on-disk tier for `DataCache`.
+
+The in-process cache starts empty in every uvicorn worker and after every
+Cloud Run restart, so repeat investigations re-fetch the same traces. Traces
+are immutable once complete, which makes them safe to keep on disk and share
+between workers.
+
+`DiskCache` stores zlib-compressed payloads in a SQLite database running in
+WAL mode (concurrent readers, one writer, safe across processes). Only keys
+whose prefix is listed in `prefixes` (by default `trace:`) are persisted.
+When the total compressed size exceeds `max_bytes`, the least recently
+accessed rows are deleted.
+
+Lookups are read-only: a `get()` runs one SELECT and records the access time
+in memory. Writes are write-behind: `put()` only queues the value, and a
+background writer thread encodes and compresses it, writes it together with
+the recorded access times and evicts over budget. Call `flush()` to wait for
+queued writes. The tier is best-effort, so writes still queued at exit, or
+dropped while the queue is full, are lost.
+
+Values are stored as JSON, never pickled. `TraceFrame` values are stored as
+their dictionary view and rebuilt with `TraceFrame.from_dict()` on load.
+
+Example:
+    >>> disk = DiskCache("/tmp/sre_agent_cache.db", max_bytes=512 * 1024 * 1024)
+    >>> cache = DataCache(disk=disk)
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DISK_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_DISK_TTL_SECONDS = 24 * 60 * 60
+# Writes queued beyond this are dropped rather than held in memory.
+MAX_PENDING_WRITES = 1024
+
+_KIND_JSON = "json"
+_KIND_TRACE_FRAME = "trace_frame"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at
+    ON cache_entries (accessed_at);
+"""
+
+
+def _encode(data: Any) -> tuple[str, bytes] | None:
+    """Serialize a value for storage, or return None if unsupported."""
+    from .trace_frame import TraceFrame
+
+    if isinstance(data, TraceFrame):
+        kind, raw = _KIND_TRACE_FRAME, data.to_json()
+    else:
+        try:
+            kind, raw = _KIND_JSON, json.dumps(data)
+        except (TypeError, ValueError):
+            return None
+    return kind, zlib.compress(raw.encode("utf-8"), 6)
+
+
+def _decode(kind: str, payload: bytes) -> Any:
+    """Inverse of `_encode`."""
+    data = json.loads(zlib.decompress(payload).decode("utf-8"))
+    if kind == _KIND_TRACE_FRAME:
+        from .trace_frame import TraceFrame
+
+        return TraceFrame.from_dict(data)
+    return data
+
+
+class DiskCache:
+    """SQLite-backed, size-capped cache shared between processes.
+
+    Thread Safety:
+        A single connection is shared by all threads under a lock; other
+        processes coordinate through SQLite's WAL locking. Writes happen on
+        one background writer thread, started with the first `put()`.
+
+    Error Handling:
+        The disk tier is best-effort: any SQLite or decoding error is logged
+        and treated as a miss, so the in-memory cache keeps working.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_DISK_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_DISK_TTL_SECONDS,
+        prefixes: Iterable[str] = ("trace",),
+    ) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            path: Path of the SQLite database file.
+            max_bytes: Budget for the total compressed payload size.
+            ttl_seconds: How long persisted entries stay valid.
+            prefixes: Key prefixes (text before the first ':') to persist.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.prefixes = frozenset(prefixes)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._accessed: dict[str, float] = {}
+        self._writes: queue.Queue[tuple[str, Any] | None] = queue.Queue(
+            MAX_PENDING_WRITES
+        )
+        self._writer: threading.Thread | None = None
+        logger.info(
+            f"DiskCache opened at {path} (max_bytes={max_bytes}, "
+            f"prefixes={sorted(self.prefixes)})"
+        )
+
+    def accepts(self, key: str) -> bool:
+        """Whether values for this key are persisted."""
+        return key.split(":", 1)[0] in self.prefixes
+
+    def get(self, key: str) -> Any | None:
+        """Load a persisted value.
+
+        Read-only: expired rows are left for the writer to delete, and the
+        access time is written with the next write.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The decoded value, or None if missing, expired or unreadable.
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT kind, payload, expires_at FROM cache_entries WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None or now >= row[2]:
+                    return None
+                self._accessed[key] = now
+            return _decode(row[0], row[1])
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning(f"DiskCache read failed for key {key}: {e}")
+            return None
+
+    def put(self, key: str, data: Any) -> None:
+        """Queue a value to be persisted by the writer thread.
+
+        Args:
+            key: The cache key.
+            data: The value; must be a `TraceFrame` or JSON-serializable.
+        """
+        self._ensure_writer()
+        try:
+            self._writes.put_nowait((key, data))
+        except queue.Full:
+            logger.debug(f"DiskCache write queue full, dropping key {key}")
+
+    def flush(self) -> None:
+        """Wait until every queued write, and recorded access, is on disk."""
+        if self._writer is not None:
+            self._writes.join()
+        try:
+            with self._lock:
+                self._write_accessed()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"DiskCache access time update failed: {e}")
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="DiskCacheWriter", daemon=True
+                )
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._writes.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                logger.warning(f"DiskCache writer failed: {e}")
+            finally:
+                self._writes.task_done()
+
+    def _write(self, key: str, data: Any) -> None:
+        """Encode and store a value, evicting LRU rows over budget."""
+        encoded = _encode(data)
+        if encoded is None:
+            logger.debug(f"DiskCache skipping non-serializable key {key}")
+            return
+        kind, payload = encoded
+        if len(payload) > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self._write_accessed()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(key, kind, payload, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, kind, payload, len(payload), now + self.ttl_seconds, now),
+                )
+                self._evict_over_budget()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"DiskCache write failed for key {key}: {e}")
+
+    def _write_accessed(self) -> None:
+        """Write the recorded access times; the caller must hold the lock."""
+        if not self._accessed:
+            return
+        self._conn.executemany(
+            "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+            [(at, key) for key, at in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _evict_over_budget(self) -> None:
+        """Delete expired rows, then LRU rows until within budget.
+
+        The caller must hold the lock.
+        """
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+        )
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"DiskCache evicted {evicted} entries to stay within budget")
+
+    def clear(self) -> None:
+        """Delete all persisted entries, including queued writes."""
+        self.flush()
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.commit()
+
+    def stats(self) -> dict[str, Any]:
+        """Get disk tier statistics (entry count and compressed bytes).
+
+        Waits for queued writes first, so the counts include them.
+        """
+        self.flush()
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "entries": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        """Write queued values, stop the writer and close the connection."""
+        self.flush()
+        if self._writer is not None:
+            self._writes.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._lock:
+            self._conn.close()
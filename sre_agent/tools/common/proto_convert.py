@@ -0,0 +1,215 @@
+"""Fast conversion of Cloud API responses from raw protobuf messages.
+
+The GAPIC clients return proto-plus wrappers. Every attribute access on a
+wrapper goes through proto-plus marshalling: `span.start_time` builds a
+`DatetimeWithNanoseconds`, `entry.resource.labels` wraps the map, and
+iterating a repeated field wraps each element. On 10k-span traces and
+10k-point time series that marshalling dominates the conversion.
+
+The helpers here read the underlying `google.protobuf` messages instead:
+
+- `raw_message()` unwraps a proto-plus object (or returns a raw message
+  unchanged), and returns None for anything else, so callers can keep their
+  attribute-based path for duck-typed objects such as test doubles.
+- Timestamps are read as integer nanoseconds straight from the `Timestamp`
+  message; ISO strings are formatted from those integers, in the same
+  format proto-plus datetimes produce (`isoformat()`, UTC offset).
+- Labels are copied with `dict()` over the raw map, and JSON/proto payloads
+  go through `MessageToDict`.
+
+`scripts/benchmark_proto_convert.py` compares these paths with the
+proto-plus ones.
+
+Example:
+    >>> trace_pb = raw_message(client.get_trace(project_id=p, trace_id=t))
+    >>> spans, starts, ends = trace_span_columns(trace_pb)
+"""
+
+import time
+from functools import lru_cache
+from typing import Any
+
+import proto
+from google.logging.type import log_severity_pb2
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.message import Message
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_MS = 1_000_000
+
+# Same limit as the attribute-based log payload extraction.
+MAX_PAYLOAD_CHARS = 2000
+
+
+def raw_message(obj: Any) -> Any | None:
+    """Return the raw protobuf message behind a Cloud API object.
+
+    Args:
+        obj: A proto-plus message, a raw protobuf message or anything else.
+
+    Returns:
+        The `google.protobuf` message, or None if `obj` is neither.
+    """
+    if isinstance(obj, Message):
+        return obj
+    if isinstance(obj, proto.Message):
+        return type(obj).pb(obj)
+    return None
+
+
+def timestamp_ns(message: Any, field: str) -> int | None:
+    """Return a `Timestamp` field as epoch nanoseconds, or None if unset."""
+    if not message.HasField(field):
+        return None
+    ts = getattr(message, field)
+    return int(ts.seconds) * _NS_PER_SECOND + int(ts.nanos)
+
+
+@lru_cache(maxsize=4096)
+def _iso_seconds(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def isoformat_ns(ns: int) -> str:
+    """Format epoch nanoseconds like `datetime.isoformat()` of a UTC datetime.
+
+    Precision is microseconds, matching proto-plus datetimes; the seconds
+    prefix is cached since timestamps in one response share most seconds.
+    """
+    seconds, rem = divmod(ns, _NS_PER_SECOND)
+    micros = rem // 1000
+    if micros:
+        return f"{_iso_seconds(seconds)}.{micros:06d}+00:00"
+    return f"{_iso_seconds(seconds)}+00:00"
+
+
+def trace_span_columns(
+    trace: Any,
+) -> tuple[list[dict[str, Any]], list[int | None], list[int | None]]:
+    """Extract the spans of a raw Cloud Trace v1 `Trace` message.
+
+    Returns:
+        The span dictionaries (as built from proto-plus spans) and the start
+        and end timestamps in epoch nanoseconds (None when unset).
+    """
+    spans: list[dict[str, Any]] = []
+    starts: list[int | None] = []
+    ends: list[int | None] = []
+    for span in trace.spans:
+        start = timestamp_ns(span, "start_time")
+        end = timestamp_ns(span, "end_time")
+        starts.append(start)
+        ends.append(end)
+        spans.append(
+            {
+                "span_id": span.span_id,
+                "name": span.name,
+                "start_time": isoformat_ns(start) if start is not None else None,
+                "end_time": isoformat_ns(end) if end is not None else None,
+                "parent_span_id": span.parent_span_id,
+                "labels": dict(span.labels),
+            }
+        )
+    return spans, starts, ends
+
+
+def trace_summary(trace: Any) -> dict[str, Any]:
+    """Summarize a raw `Trace` message returned with the ROOTSPAN view."""
+    summary: dict[str, Any] = {
+        "trace_id": trace.trace_id,
+        "project_id": trace.project_id,
+    }
+    if trace.spans:
+        root = trace.spans[0]
+        start = timestamp_ns(root, "start_time")
+        end = timestamp_ns(root, "end_time")
+        labels = root.labels
+        summary["name"] = root.name
+        summary["start_time"] = isoformat_ns(start) if start is not None else None
+        summary["duration_ms"] = (
+            round((end - start) / _NS_PER_MS, 2)
+            if start is not None and end is not None
+            else 0.0
+        )
+        summary["status"] = labels.get("/http/status_code", "0")
+        summary["url"] = labels.get("/http/url", "")
+    return summary
+
+
+def _log_payload(entry: Any) -> str | dict[str, Any]:
+    kind = entry.WhichOneof("payload")
+    payload: str | dict[str, Any]
+    if kind == "text_payload":
+        payload = entry.text_payload
+    elif kind == "json_payload":
+        payload = MessageToDict(entry.json_payload)
+    elif kind == "proto_payload":
+        any_payload = entry.proto_payload
+        try:
+            payload = MessageToDict(any_payload)
+        except Exception:
+            payload = f"[ProtoPayload] {any_payload.type_url}"
+    else:
+        payload = ""
+
+    if isinstance(payload, str) and len(payload) > MAX_PAYLOAD_CHARS:
+        payload = payload[:MAX_PAYLOAD_CHARS] + "...(truncated)"
+    return payload
+
+
+def _severity_name(value: int) -> str:
+    try:
+        return str(log_severity_pb2.LogSeverity.Name(value))
+    except ValueError:
+        return str(value)
+
+
+def log_entry_to_dict(entry: Any) -> dict[str, Any]:
+    """Convert a raw Cloud Logging `LogEntry` message to the tool output."""
+    timestamp = timestamp_ns(entry, "timestamp")
+    resource = entry.resource
+    return {
+        "timestamp": isoformat_ns(timestamp) if timestamp is not None else None,
+        "severity": _severity_name(entry.severity),
+        "payload": _log_payload(entry),
+        "resource": {"type": resource.type, "labels": dict(resource.labels)},
+        "insert_id": entry.insert_id,
+    }
+
+
+def _point_value(value: Any) -> float:
+    kind = value.WhichOneof("value")
+    if kind == "double_value":
+        return float(value.double_value)
+    if kind == "int64_value":
+        return float(value.int64_value)
+    if kind == "bool_value":
+        return float(value.bool_value)
+    if kind == "distribution_value":
+        return float(value.distribution_value.mean)
+    return 0.0
+
+
+def time_series_to_dict(series: Any) -> dict[str, Any]:
+    """Convert a raw Cloud Monitoring `TimeSeries` message to the tool output.
+
+    Point values are read from whichever field of the typed value is set,
+    so INT64 and BOOL metrics report their values (distributions their
+    mean) instead of an unset `double_value`.
+    """
+    metric = series.metric
+    resource = series.resource
+    points = []
+    for point in series.points:
+        end = timestamp_ns(point.interval, "end_time")
+        points.append(
+            {
+                "timestamp": isoformat_ns(end) if end is not None else None,
+                "value": _point_value(point.value),
+            }
+        )
+    return {
+        "metric": {"type": metric.type, "labels": dict(metric.labels)},
+        "resource": {"type": resource.type, "labels": dict(resource.labels)},
+        "points": points,
+    }
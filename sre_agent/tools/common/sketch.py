@@ -0,0 +1,287 @@
+"""Mergeable streaming quantile sketch for latency statistics.
+
+Fleet-wide statistics used to keep every duration in a Python list per span
+name, sort it and index it for percentiles. Over 10k traces that is hundreds
+of thousands of floats per call. `QuantileSketch` keeps a DDSketch instead:
+values are counted in logarithmically sized buckets, so any quantile is
+returned within a fixed *relative* error (1% by default) using a bounded
+number of buckets, independent of the number of values added.
+
+- Small samples are kept exactly (up to `exact_limit` values), so quantiles
+  of a handful of traces are identical to sorting the list.
+- Count, sum, min, max and variance are tracked exactly alongside the
+  buckets (variance with Welford's algorithm).
+- Sketches with the same accuracy can be merged, so partial results from
+  parallel workers or earlier time windows can be combined, and they can be
+  round-tripped through `to_dict()` / `from_dict()`.
+
+Example:
+    >>> sketch = QuantileSketch()
+    >>> for d in durations:
+    ...     sketch.add(d)
+    >>> sketch.quantile(0.99)
+    >>> sketch.merge(other_window_sketch)
+"""
+
+import math
+import statistics
+from typing import Any
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+DEFAULT_EXACT_LIMIT = 1024
+
+# Values closer to zero than this all land in the zero bucket.
+_MIN_INDEXABLE = 1e-9
+
+
+class QuantileSketch:
+    """DDSketch with an exact buffer for small samples.
+
+    Not thread-safe; give each worker its own sketch and `merge()` them.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_bins: int = DEFAULT_MAX_BINS,
+        exact_limit: int = DEFAULT_EXACT_LIMIT,
+    ) -> None:
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of returned quantiles.
+            max_bins: Bucket budget per sign; beyond it the buckets closest
+                to zero are collapsed, trading accuracy for small values
+                (never the tail percentiles) for memory.
+            exact_limit: Number of values kept exactly before switching to
+                buckets. 0 always uses buckets.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.exact_limit = exact_limit
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self._exact: list[float] | None = [] if exact_limit > 0 else None
+        self._positive: dict[int, int] = {}
+        self._negative: dict[int, int] = {}
+        self._zero = 0
+
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of values added."""
+        return self.count
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether all values are still held exactly."""
+        return self._exact is not None
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean of the values (0 when empty)."""
+        return self.sum / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the values (0 for fewer than two values)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+    def add(self, value: float) -> None:
+        """Add a single value."""
+        value = float(value)
+        old_mean = self.mean
+        self.count += 1
+        self.sum += value
+        self._m2 += (value - old_mean) * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if self._exact is not None:
+            self._exact.append(value)
+            if len(self._exact) > self.exact_limit:
+                self._flush_exact()
+        else:
+            self._add_to_bins(value, 1)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch into this one.
+
+        Raises:
+            ValueError: If the sketches use different relative accuracies.
+        """
+        if not math.isclose(self.relative_accuracy, other.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different accuracies")
+        if not other.count:
+            return
+
+        # Chan et al. parallel variance combination.
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        if other._exact is not None:
+            if self._exact is not None:
+                self._exact.extend(other._exact)
+                if len(self._exact) > self.exact_limit:
+                    self._flush_exact()
+            else:
+                for value in other._exact:
+                    self._add_to_bins(value, 1)
+            return
+
+        self._flush_exact()
+        self._zero += other._zero
+        for key, n in other._positive.items():
+            self._positive[key] = self._positive.get(key, 0) + n
+        for key, n in other._negative.items():
+            self._negative[key] = self._negative.get(key, 0) + n
+        self._collapse(self._positive)
+        self._collapse(self._negative)
+
+    def quantile(self, q: float) -> float:
+        """Return the value at quantile q (0 <= q <= 1).
+
+        Uses the nearest-rank convention of `sorted(values)[int(count * q)]`.
+        Returns 0 for an empty sketch.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return 0.0
+        rank = min(int(self.count * q), self.count - 1)
+        if self._exact is not None:
+            return sorted(self._exact)[rank]
+
+        seen = 0
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return self._clamp(-self._value(key))
+        seen += self._zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._clamp(self._value(key))
+        return self.max
+
+    def median(self) -> float:
+        """Return the median, averaging the middle values while exact."""
+        if self._exact is not None and self._exact:
+            return statistics.median(self._exact)
+        return self.quantile(0.5)
+
+    def summary(self) -> dict[str, float]:
+        """Return count, min/max, mean, median, p90/p95/p99 and spread."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "median": self.median(),
+            "p90": self.quantile(0.9),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "stdev": self.stdev,
+            "variance": self.variance,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the sketch to JSON-compatible primitives."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "exact_limit": self.exact_limit,
+            "exact": list(self._exact) if self._exact is not None else None,
+            "positive": {str(k): n for k, n in self._positive.items()},
+            "negative": {str(k): n for k, n in self._negative.items()},
+            "zero": self._zero,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "m2": self._m2,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch serialized with `to_dict()`."""
+        sketch = cls(
+            relative_accuracy=data["relative_accuracy"],
+            max_bins=data["max_bins"],
+            exact_limit=data["exact_limit"],
+        )
+        exact = data.get("exact")
+        sketch._exact = list(exact) if exact is not None else None
+        sketch._positive = {int(k): n for k, n in data["positive"].items()}
+        sketch._negative = {int(k): n for k, n in data["negative"].items()}
+        sketch._zero = data["zero"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        sketch._m2 = data["m2"]
+        return sketch
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        # Midpoint (in relative terms) of the bucket (gamma^(k-1), gamma^k].
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.min), self.max)
+
+    def _add_to_bins(self, value: float, n: int) -> None:
+        if value > _MIN_INDEXABLE:
+            bins = self._positive
+            key = self._key(value)
+        elif value < -_MIN_INDEXABLE:
+            bins = self._negative
+            key = self._key(-value)
+        else:
+            self._zero += n
+            return
+        bins[key] = bins.get(key, 0) + n
+        if len(bins) > self.max_bins:
+            self._collapse(bins)
+
+    def _flush_exact(self) -> None:
+        """Move the exact buffer into the buckets."""
+        if self._exact is None:
+            return
+        exact, self._exact = self._exact, None
+        for value in exact:
+            self._add_to_bins(value, 1)
+
+    def _collapse(self, bins: dict[int, int]) -> None:
+        """Merge the buckets closest to zero until `max_bins` remain."""
+        if len(bins) <= self.max_bins:
+            return
+        keys = sorted(bins)
+        excess = keys[: len(keys) - self.max_bins + 1]
+        target = excess[-1]
+        bins[target] = sum(bins.pop(k) for k in excess[:-1]) + bins[target]
@@ -0,0 +1,481 @@
+"""Columnar in-memory trace model shared by the span analyzers.
+
+Every span analyzer used to walk the list of span dictionaries returned by
+`fetch_trace_data` and call `datetime.fromisoformat` on each span's
+timestamps. On large batch-job traces (tens of thousands of spans) that
+re-parsing dominates triage CPU time, because it is repeated by every tool.
+
+`TraceFrame` parses a trace exactly once into NumPy columns:
+
+- `start_ns` / `end_ns`: epoch nanoseconds (int64), valid where
+  `has_start` / `has_end` are set
+- `duration_ms`: span duration in milliseconds (float64, NaN when unknown)
+- `parent_index`: row index of the parent span (`NO_PARENT` for roots/orphans)
+- `name_ids`: ids into the interned `names` table
+- `is_error`: error flag derived from the span labels
+
+The legacy dictionary shape (`trace_id`, `spans`, `span_count`,
+`duration_ms`) is still available through `TraceFrame.to_dict()`, which
+returns a `TraceDict` - a plain `dict` that remembers the frame it came from,
+so analyzers handed a dict can recover the already-built columns with
+`as_trace_frame()`. Frames are immutable and are what `DataCache` stores for
+fetched traces, so a cache hit hands back the shared frame instead of
+re-decoding JSON; `to_json()` serializes only at the tool boundary.
+
+Example:
+    >>> frame = as_trace_frame(fetch_trace_data(trace_id, project_id))
+    >>> slowest = frame.duration_ms.argmax()
+    >>> frame.names[frame.name_ids[slowest]]
+"""
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .cache import estimate_size
+from .proto_convert import raw_message, trace_span_columns
+
+NO_PARENT = -1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_MS = 1_000_000
+
+# Memory of the views derived from a frame once tools have analyzed it: the
+# frame's own indexes (children, span ID map, service names) and the
+# `TraceIndex` views (call tree, span timings, depths, critical path), which
+# live as long as the frame. Measured at ~550 bytes per span on a 10k-span
+# trace; counted up front since `DataCache` sizes an entry when it is stored.
+_DERIVED_BYTES_PER_SPAN = 600
+
+_SERVICE_NAME_KEYS = ("service.name", "/service.name", "g.co/service.name")
+_NON_ERROR_VALUES = ("false", "0", "none", "ok", "")
+
+
+def datetime_to_ns(dt: datetime) -> int:
+    """Convert a datetime to integer nanoseconds since the Unix epoch.
+
+    Naive datetimes are treated as UTC. Sub-microsecond precision carried by
+    proto-plus `DatetimeWithNanoseconds` values is preserved.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    ns = (delta.days * 86_400 + delta.seconds) * _NS_PER_SECOND
+    ns += delta.microseconds * 1_000
+    nanosecond = getattr(dt, "nanosecond", 0)
+    if nanosecond:
+        ns += nanosecond % 1_000
+    return ns
+
+
+def parse_timestamp_ns(value: Any) -> int | None:
+    """Parse an ISO-8601 string or datetime to epoch nanoseconds.
+
+    Returns:
+        The timestamp in nanoseconds, or None if it is missing or malformed.
+    """
+    if isinstance(value, datetime):
+        return datetime_to_ns(value)
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime_to_ns(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
+
+def is_error_labels(labels: Mapping[str, Any]) -> bool:
+    """Check whether span labels indicate an error.
+
+    A span is an error if its status code is >= 400 or if any label whose
+    key mentions "error" carries a truthy value.
+    """
+    status = labels.get("status.code", labels.get("/http/status_code", 0))
+    try:
+        if int(status) >= 400:
+            return True
+    except (ValueError, TypeError):
+        pass
+    for key, value in labels.items():
+        if "error" in key.lower() and str(value).lower() not in _NON_ERROR_VALUES:
+            return True
+    return False
+
+
+def service_name_from_labels(labels: Mapping[str, Any]) -> str | None:
+    """Extract the service name from span labels, if present."""
+    for key in _SERVICE_NAME_KEYS:
+        if key in labels:
+            return str(labels[key])
+    return None
+
+
+class TraceDict(dict[str, Any]):
+    """Legacy dictionary view of a trace that remembers its `TraceFrame`."""
+
+    def __init__(self, data: Mapping[str, Any], frame: "TraceFrame") -> None:
+        """Initialize the view.
+
+        Args:
+            data: The dictionary contents.
+            frame: The columnar frame the contents were derived from.
+        """
+        super().__init__(data)
+        self.frame = frame
+
+
+@dataclass(frozen=True, eq=False)
+class TraceFrame:
+    """Immutable columnar representation of a single trace.
+
+    Row `i` of every column describes `spans[i]`, the dictionary view of the
+    same span. Treat the columns as read-only: frames are shared between
+    tools and sub-agents.
+    """
+
+    trace_id: str | None
+    project_id: str | None
+    spans: list[dict[str, Any]]
+    span_ids: list[Any]
+    parent_span_ids: list[Any]
+    names: tuple[str, ...]
+    name_ids: npt.NDArray[np.int32]
+    start_ns: npt.NDArray[np.int64]
+    end_ns: npt.NDArray[np.int64]
+    has_start: npt.NDArray[np.bool_]
+    has_end: npt.NDArray[np.bool_]
+    duration_ms: npt.NDArray[np.float64]
+    parent_index: npt.NDArray[np.int32]
+    is_error: npt.NDArray[np.bool_]
+    trace_duration_ms: float
+    attributes: Mapping[str, Any]
+
+    @classmethod
+    def from_dict(cls, trace: Mapping[str, Any]) -> "TraceFrame":
+        """Build a frame from the legacy trace dictionary.
+
+        Explicit per-span `duration_ms` values take precedence over the
+        duration derived from `start_time`/`end_time`.
+
+        Args:
+            trace: A trace dictionary with a `spans` list.
+
+        Returns:
+            The columnar frame.
+        """
+        spans: list[dict[str, Any]] = list(trace.get("spans") or [])
+        starts = [parse_timestamp_ns(s.get("start_time")) for s in spans]
+        ends = [parse_timestamp_ns(s.get("end_time")) for s in spans]
+        explicit = [s.get("duration_ms") for s in spans]
+        attributes = {k: v for k, v in trace.items() if k != "spans"}
+        return cls._from_columns(
+            trace.get("trace_id"),
+            trace.get("project_id"),
+            spans,
+            starts,
+            ends,
+            explicit,
+            attributes,
+        )
+
+    @classmethod
+    def from_proto(cls, trace_obj: Any) -> "TraceFrame":
+        """Build a frame directly from a Cloud Trace v1 `Trace` message.
+
+        Timestamps are converted to integers straight from the proto
+        datetimes; the ISO strings of the dictionary view are produced in the
+        same pass, so nothing is parsed back from text. Real protobuf
+        messages are read through `proto_convert` without proto-plus
+        marshalling; other objects are read attribute by attribute.
+
+        Args:
+            trace_obj: A `google.cloud.trace_v1.Trace` (proto-plus or raw
+                protobuf) object.
+
+        Returns:
+            The columnar frame.
+        """
+        trace_pb = raw_message(trace_obj)
+        if trace_pb is not None:
+            pb_spans, pb_starts, pb_ends = trace_span_columns(trace_pb)
+            return cls._from_columns(
+                trace_pb.trace_id,
+                trace_pb.project_id,
+                pb_spans,
+                pb_starts,
+                pb_ends,
+                [None] * len(pb_spans),
+                None,
+            )
+
+        spans: list[dict[str, Any]] = []
+        starts: list[int | None] = []
+        ends: list[int | None] = []
+        for span_proto in trace_obj.spans:
+            start_dt = span_proto.start_time
+            end_dt = span_proto.end_time
+            starts.append(datetime_to_ns(start_dt) if start_dt else None)
+            ends.append(datetime_to_ns(end_dt) if end_dt else None)
+            spans.append(
+                {
+                    "span_id": span_proto.span_id,
+                    "name": span_proto.name,
+                    "start_time": start_dt.isoformat() if start_dt else None,
+                    "end_time": end_dt.isoformat() if end_dt else None,
+                    "parent_span_id": span_proto.parent_span_id,
+                    "labels": dict(span_proto.labels),
+                }
+            )
+        return cls._from_columns(
+            trace_obj.trace_id,
+            trace_obj.project_id,
+            spans,
+            starts,
+            ends,
+            [None] * len(spans),
+            None,
+        )
+
+    @classmethod
+    def _from_columns(
+        cls,
+        trace_id: str | None,
+        project_id: str | None,
+        spans: list[dict[str, Any]],
+        starts: list[int | None],
+        ends: list[int | None],
+        explicit_durations: list[Any],
+        attributes: Mapping[str, Any] | None,
+    ) -> "TraceFrame":
+        """Assemble a frame from per-span values.
+
+        When `attributes` is None the trace-level fields of the dictionary
+        view (`trace_id`, `project_id`, `span_count`, `duration_ms`) are
+        derived from the spans.
+        """
+        n = len(spans)
+        span_ids: list[Any] = [s.get("span_id") for s in spans]
+        parent_span_ids: list[Any] = [s.get("parent_span_id") for s in spans]
+
+        name_table: dict[str, int] = {}
+        name_ids = np.fromiter(
+            (name_table.setdefault(s.get("name", ""), len(name_table)) for s in spans),
+            dtype=np.int32,
+            count=n,
+        )
+
+        has_start = np.fromiter(
+            (s is not None for s in starts), dtype=np.bool_, count=n
+        )
+        has_end = np.fromiter((e is not None for e in ends), dtype=np.bool_, count=n)
+        start_ns = np.fromiter((s or 0 for s in starts), dtype=np.int64, count=n)
+        end_ns = np.fromiter((e or 0 for e in ends), dtype=np.int64, count=n)
+        has_timing = has_start & has_end
+
+        duration_ms = np.full(n, np.nan, dtype=np.float64)
+        duration_ms[has_timing] = (
+            end_ns[has_timing] - start_ns[has_timing]
+        ) / _NS_PER_MS
+        for i, explicit in enumerate(explicit_durations):
+            if explicit is not None:
+                try:
+                    duration_ms[i] = float(explicit)
+                except (ValueError, TypeError):
+                    pass
+
+        row_by_id = {sid: i for i, sid in enumerate(span_ids) if sid}
+        parent_index = np.fromiter(
+            (
+                row_by_id.get(pid, NO_PARENT) if pid else NO_PARENT
+                for pid in parent_span_ids
+            ),
+            dtype=np.int32,
+            count=n,
+        )
+
+        is_error = np.fromiter(
+            (is_error_labels(s.get("labels") or {}) for s in spans),
+            dtype=np.bool_,
+            count=n,
+        )
+
+        trace_duration = attributes.get("duration_ms") if attributes else None
+        if trace_duration is None:
+            if has_start.any() and has_end.any():
+                trace_duration = (
+                    int(end_ns[has_end].max()) - int(start_ns[has_start].min())
+                ) / _NS_PER_MS
+            else:
+                trace_duration = 0
+
+        if attributes is None:
+            attributes = {
+                "trace_id": trace_id,
+                "project_id": project_id,
+                "span_count": n,
+                "duration_ms": trace_duration,
+            }
+
+        return cls(
+            trace_id=trace_id,
+            project_id=project_id,
+            spans=spans,
+            span_ids=span_ids,
+            parent_span_ids=parent_span_ids,
+            names=tuple(name_table),
+            name_ids=name_ids,
+            start_ns=start_ns,
+            end_ns=end_ns,
+            has_start=has_start,
+            has_end=has_end,
+            duration_ms=duration_ms,
+            parent_index=parent_index,
+            is_error=is_error,
+            trace_duration_ms=float(trace_duration),
+            attributes=attributes,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of spans in the trace."""
+        return len(self.spans)
+
+    @property
+    def span_count(self) -> int:
+        """Number of spans in the trace."""
+        return len(self.spans)
+
+    @cached_property
+    def nbytes(self) -> int:
+        """Estimated memory footprint, used by `DataCache` for its budget.
+
+        Includes the views later derived from the frame, so the cache budget
+        holds once tools have analyzed the trace.
+        """
+        columns = (
+            self.name_ids,
+            self.start_ns,
+            self.end_ns,
+            self.has_start,
+            self.has_end,
+            self.duration_ms,
+            self.parent_index,
+            self.is_error,
+        )
+        return (
+            sum(c.nbytes for c in columns)
+            + estimate_size(self.spans)
+            + _DERIVED_BYTES_PER_SPAN * len(self.spans)
+        )
+
+    def name_of(self, row: int) -> str:
+        """Return the span name of the given row."""
+        return self.names[int(self.name_ids[row])]
+
+    def span_duration_ms(self, row: int) -> float | None:
+        """Return the duration of the given row, or None if unknown."""
+        value = float(self.duration_ms[row])
+        return None if np.isnan(value) else value
+
+    @cached_property
+    def has_timing(self) -> npt.NDArray[np.bool_]:
+        """Rows whose start and end timestamps are both known."""
+        return self.has_start & self.has_end
+
+    def start_ms(self, row: int) -> float | None:
+        """Return the start of the given row in epoch milliseconds, if known."""
+        if not self.has_start[row]:
+            return None
+        return int(self.start_ns[row]) / _NS_PER_MS
+
+    def end_ms(self, row: int) -> float | None:
+        """Return the end of the given row in epoch milliseconds, if known."""
+        if not self.has_end[row]:
+            return None
+        return int(self.end_ns[row]) / _NS_PER_MS
+
+    @cached_property
+    def row_by_span_id(self) -> dict[Any, int]:
+        """Map of span ID to row index."""
+        return {sid: i for i, sid in enumerate(self.span_ids) if sid}
+
+    @cached_property
+    def service_names(self) -> list[str | None]:
+        """Service name of each span, extracted from its labels."""
+        return [service_name_from_labels(s.get("labels") or {}) for s in self.spans]
+
+    @cached_property
+    def child_index(self) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """CSR-style children index: (offsets, rows ordered by parent).
+
+        The children of row r are `rows[offsets[r] : offsets[r + 1]]`.
+        """
+        n = len(self.spans)
+        has_parent = self.parent_index != NO_PARENT
+        child_rows = np.flatnonzero(has_parent)
+        parents = self.parent_index[child_rows]
+        # Stable sort keeps children in their original (span list) order.
+        order = np.argsort(parents, kind="stable")
+        counts = np.bincount(parents, minlength=n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return offsets, child_rows[order]
+
+    def children_of(self, row: int) -> npt.NDArray[np.int64]:
+        """Return the rows of the direct children of the given row."""
+        offsets, children = self.child_index
+        return children[offsets[row] : offsets[row + 1]]
+
+    @cached_property
+    def root_rows(self) -> npt.NDArray[np.int64]:
+        """Rows whose parent is absent or not part of the trace."""
+        return np.flatnonzero(self.parent_index == NO_PARENT)
+
+    def to_dict(self) -> TraceDict:
+        """Return the legacy dictionary view of this trace.
+
+        The view is built once and shared; callers must not mutate it.
+        """
+        return self._dict_view
+
+    @cached_property
+    def _dict_view(self) -> TraceDict:
+        data: dict[str, Any] = {}
+        for key, value in self.attributes.items():
+            data[key] = value
+            if key == "project_id":
+                data["spans"] = self.spans
+        data.setdefault("spans", self.spans)
+        return TraceDict(data, self)
+
+    def to_json(self) -> str:
+        """Return the JSON serialization of `to_dict()`.
+
+        Used at the LLM/HTTP boundary. The string is not kept on the frame,
+        where it would hold a second copy of the trace outside the cache's
+        byte budget.
+        """
+        return json.dumps(self._dict_view)
+
+
+def as_trace_frame(trace: Mapping[str, Any]) -> TraceFrame:
+    """Return the `TraceFrame` for a trace dictionary.
+
+    Dictionaries produced by `TraceFrame.to_dict()` hand back their frame
+    without any work; any other trace dictionary is parsed once.
+
+    Args:
+        trace: A trace dictionary, as returned by `fetch_trace_data`.
+
+    Returns:
+        The columnar frame for the trace.
+    """
+    if isinstance(trace, TraceDict):
+        return trace.frame
+    return TraceFrame.from_dict(trace)
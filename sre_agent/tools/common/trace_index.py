@@ -0,0 +1,377 @@
+"""Shared per-trace derived views for the analysis tools.
+
+An investigation runs several tools over the same trace:
+`perform_causal_analysis` used to fetch the target trace and then call
+`analyze_critical_path` and `build_call_graph`, each of which fetched it
+again and rebuilt its own span map, children map and depth map. Comparisons did the same through
+`calculate_span_durations` and `build_call_graph`.
+
+`TraceIndex` wraps a `TraceFrame` and computes each derived view lazily, at
+most once: span timings, call-graph roots, depths, the call tree, the
+critical path and durations grouped by span name. Service names, error flags
+and children come straight from the frame's own cached columns.
+
+The critical path view comes from `compute_critical_path`, a sweep-line
+engine that attributes each span's wall time to self-time, time blocked on
+children and child work that ran in parallel.
+
+`get_trace_index()` memoizes indexes per frame. `DataCache` keeps a single
+frame per fetched trace ID, so every tool that analyzes the same trace during
+an investigation shares one index, and the index is released together with
+the frame when the cache evicts the trace.
+
+Example:
+    >>> index = get_trace_index(fetch_trace_data(trace_id, project_id))
+    >>> index.max_depth
+    >>> index.critical_path.rows
+"""
+
+import threading
+import weakref
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .trace_frame import NO_PARENT, TraceFrame, as_trace_frame
+
+_NS_PER_MS = 1_000_000
+
+_indexes: "weakref.WeakKeyDictionary[TraceFrame, TraceIndex]" = (
+    weakref.WeakKeyDictionary()
+)
+_indexes_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class CriticalPath:
+    """Critical path of a trace and the per-span attribution behind it.
+
+    `rows` lists the spans on the critical path in pre-order (root first,
+    each span's critical children in time order) and `depths` their depth
+    below the root. The per-span arrays are indexed by frame row; rows that
+    cannot be reached from a root span are left at zero / `NO_PARENT`.
+
+    - `self_time_ms`: wall time not covered by any child
+    - `blocked_ms`: wall time spent waiting on at least one child
+    - `parallel_ms`: child work hidden behind other, overlapping children
+    - `critical_ms`: time the span contributes to its parent's critical path
+    - `blocking_child`: the child with the largest `critical_ms`
+    """
+
+    rows: list[int]
+    depths: list[int]
+    total_duration_ms: float
+    self_time_ms: npt.NDArray[np.float64]
+    blocked_ms: npt.NDArray[np.float64]
+    parallel_ms: npt.NDArray[np.float64]
+    critical_ms: npt.NDArray[np.float64]
+    blocking_child: npt.NDArray[np.int64]
+    child_count: npt.NDArray[np.int64]
+
+
+def compute_critical_path(frame: TraceFrame) -> CriticalPath | None:
+    """Compute the concurrency-aware critical path of a trace.
+
+    For each span a sweep line walks its children (clipped to the span)
+    from the latest end backwards: the child that finishes last is what the
+    span was blocked on, the cursor then moves to that child's start, the
+    next child still running before the cursor is blocking, and so on. Gaps
+    between blocking children are the span's own self-time, and child time
+    overlapping another child's is reported as parallel work rather than
+    subtracted twice. All children of all spans are swept in a single
+    sorted pass, and the critical path is then walked from the longest
+    root span with an explicit stack, so arbitrarily deep traces cannot hit
+    the recursion limit. Cost is O(n log n) for n spans.
+
+    Children without both timestamps cannot be placed on the timeline; for
+    their parent the sequential model is used instead (self-time is the
+    duration minus the sum of child durations, and the longest child is the
+    only blocking one).
+
+    Spans without a span ID are ignored, and roots are spans without a
+    parent span ID.
+
+    Returns:
+        The critical path, or None if the trace has no root span.
+    """
+    n = len(frame)
+    has_id = np.fromiter((bool(sid) for sid in frame.span_ids), np.bool_, count=n)
+    no_parent_id = np.fromiter(
+        (not pid for pid in frame.parent_span_ids), np.bool_, count=n
+    )
+    roots = np.flatnonzero(has_id & no_parent_id)
+    if not len(roots):
+        return None
+
+    durations = np.nan_to_num(frame.duration_ms, nan=0.0)
+    has_timing = frame.has_timing
+    parent_index = frame.parent_index.astype(np.int64)
+    child_rows = np.flatnonzero(has_id & (parent_index != NO_PARENT))
+    parents = parent_index[child_rows]
+
+    child_count = np.bincount(parents, minlength=n)
+    untimed_children = np.bincount(
+        parents, weights=~has_timing[child_rows], minlength=n
+    )
+    swept = (child_count > 0) & has_timing & (untimed_children == 0)
+    sequential = (child_count > 0) & ~swept
+
+    self_time = durations.copy()
+    blocked = np.zeros(n, dtype=np.float64)
+    parallel = np.zeros(n, dtype=np.float64)
+    critical = np.zeros(n, dtype=np.float64)
+    blocking_child = np.full(n, NO_PARENT, dtype=np.int64)
+    on_path = np.zeros(n, dtype=np.bool_)
+
+    # Sequential model: children are assumed to run one after another.
+    in_sequence = sequential[parents]
+    seq_rows, seq_parents = child_rows[in_sequence], parents[in_sequence]
+    child_sum = np.bincount(seq_parents, weights=durations[seq_rows], minlength=n)
+    seq = np.flatnonzero(sequential)
+    blocked[seq] = np.minimum(child_sum[seq], durations[seq])
+    parallel[seq] = np.maximum(0.0, child_sum[seq] - durations[seq])
+    self_time[seq] = np.maximum(0.0, durations[seq] - child_sum[seq])
+    # Longest child per parent; the first one in span order wins ties.
+    order = np.lexsort((seq_rows, -durations[seq_rows], seq_parents))
+    _, first = np.unique(seq_parents[order], return_index=True)
+    longest = seq_rows[order[first]]
+    critical[longest] = durations[longest]
+    blocking_child[seq_parents[order[first]]] = longest
+    on_path[longest] = True
+
+    # Sweep line over children clipped to their parent's interval.
+    in_sweep = swept[parents]
+    sweep_rows, sweep_parents = child_rows[in_sweep], parents[in_sweep]
+    clip_start = np.maximum(frame.start_ns[sweep_rows], frame.start_ns[sweep_parents])
+    clip_end = np.minimum(frame.end_ns[sweep_rows], frame.end_ns[sweep_parents])
+    overlaps = clip_end > clip_start
+    sweep_rows, sweep_parents = sweep_rows[overlaps], sweep_parents[overlaps]
+    clip_start, clip_end = clip_start[overlaps], clip_end[overlaps]
+    child_work = np.bincount(sweep_parents, weights=clip_end - clip_start, minlength=n)
+    # Per parent: latest end first; on ties the earlier (longer) child wins.
+    order = np.lexsort((sweep_rows, clip_start, -clip_end, sweep_parents))
+    parent_ends: list[int] = frame.end_ns.tolist()
+    covered = [0] * n
+    waited_ns = [0] * n
+    blocking = [NO_PARENT] * n
+    current = NO_PARENT
+    cursor = 0
+    best = 0
+    for parent, child, start, end in zip(
+        sweep_parents[order].tolist(),
+        sweep_rows[order].tolist(),
+        clip_start[order].tolist(),
+        clip_end[order].tolist(),
+        strict=True,
+    ):
+        if parent != current:
+            current = parent
+            cursor = parent_ends[parent]
+            best = 0
+        if start >= cursor:
+            continue
+        waited = (end if end < cursor else cursor) - start
+        waited_ns[child] = waited
+        covered[parent] += waited
+        cursor = start
+        # Walking backwards in time, so ">=" lets the earlier child win ties.
+        if waited >= best:
+            best = waited
+            blocking[parent] = child
+
+    sweep = np.flatnonzero(swept)
+    blocked[sweep] = np.asarray(covered, dtype=np.float64)[sweep] / _NS_PER_MS
+    parallel[sweep] = child_work[sweep] / _NS_PER_MS - blocked[sweep]
+    self_time[sweep] = np.maximum(0.0, durations[sweep] - blocked[sweep])
+    blocking_child[sweep] = np.asarray(blocking, dtype=np.int64)[sweep]
+    waited_ms = np.asarray(waited_ns, dtype=np.float64)[sweep_rows] / _NS_PER_MS
+    critical[sweep_rows] = waited_ms
+    on_path[sweep_rows[waited_ms > 0]] = True
+
+    # Children index of the critical spans, each parent's in time order.
+    path_rows = np.flatnonzero(on_path)
+    path_parents = parent_index[path_rows]
+    path_order = np.lexsort((path_rows, frame.start_ns[path_rows], path_parents))
+    path_children: list[int] = path_rows[path_order].tolist()
+    path_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(path_parents, minlength=n), out=path_offsets[1:])
+
+    root = int(roots[np.argmax(durations[roots])])
+    critical[root] = durations[root]
+    rows: list[int] = []
+    depths: list[int] = []
+    stack = [(root, 0)]
+    while stack:
+        row, depth = stack.pop()
+        rows.append(row)
+        depths.append(depth)
+        lo, hi = int(path_offsets[row]), int(path_offsets[row + 1])
+        stack.extend((child, depth + 1) for child in reversed(path_children[lo:hi]))
+
+    return CriticalPath(
+        rows=rows,
+        depths=depths,
+        total_duration_ms=float(durations[root]),
+        self_time_ms=self_time,
+        blocked_ms=blocked,
+        parallel_ms=parallel,
+        critical_ms=critical,
+        blocking_child=blocking_child,
+        child_count=child_count.astype(np.int64),
+    )
+
+
+class TraceIndex:
+    """Lazily computed, memoized views over one trace.
+
+    Views are computed on first access and shared by every caller; treat
+    them as read-only.
+    """
+
+    def __init__(self, frame: TraceFrame) -> None:
+        """Initialize the index.
+
+        Args:
+            frame: The trace to index.
+        """
+        self.frame = frame
+
+    @property
+    def durations_ms(self) -> npt.NDArray[np.float64]:
+        """Span durations in milliseconds (NaN when unknown)."""
+        return self.frame.duration_ms
+
+    @property
+    def service_names(self) -> list[str | None]:
+        """Service name of each span."""
+        return self.frame.service_names
+
+    @property
+    def is_error(self) -> npt.NDArray[np.bool_]:
+        """Error flag of each span."""
+        return self.frame.is_error
+
+    def children_of(self, row: int) -> npt.NDArray[np.int64]:
+        """Return the rows of the direct children of the given row."""
+        return self.frame.children_of(row)
+
+    @cached_property
+    def root_rows(self) -> list[int]:
+        """Rows of the call-graph roots: spans without a parent span ID."""
+        return [
+            row
+            for row, parent_id in enumerate(self.frame.parent_span_ids)
+            if not parent_id
+        ]
+
+    @cached_property
+    def depth(self) -> npt.NDArray[np.int64]:
+        """Depth of each span below its root; -1 if no root reaches it."""
+        frame = self.frame
+        depth = np.full(len(frame), -1, dtype=np.int64)
+        offsets_array, children_array = frame.child_index
+        offsets: list[int] = offsets_array.tolist()
+        children: list[int] = children_array.tolist()
+        level = 0
+        frontier = self.root_rows
+        while frontier:
+            depth[frontier] = level
+            frontier = [
+                child
+                for row in frontier
+                for child in children[offsets[row] : offsets[row + 1]]
+            ]
+            level += 1
+        return depth
+
+    @cached_property
+    def max_depth(self) -> int:
+        """Depth of the deepest span reachable from a root (0 if none)."""
+        return int(self.depth.max(initial=0))
+
+    @cached_property
+    def call_tree(self) -> list[dict[str, Any]]:
+        """Nested call tree below each root, as returned by `build_call_graph`.
+
+        Built iteratively, so deep traces do not hit the recursion limit.
+        """
+        frame = self.frame
+        nodes: dict[int, dict[str, Any]] = {}
+        depth = self.depth.tolist()
+        for row in np.flatnonzero(self.depth >= 0).tolist():
+            span = frame.spans[row]
+            nodes[row] = {
+                "span_id": frame.span_ids[row],
+                "name": span.get("name", "unknown"),
+                "depth": depth[row],
+                "children": [],
+                "labels": span.get("labels", {}),
+            }
+        for row, node in nodes.items():
+            if depth[row] == 0:
+                continue
+            nodes[int(frame.parent_index[row])]["children"].append(node)
+        return [nodes[row] for row in self.root_rows]
+
+    @cached_property
+    def span_timings(self) -> list[dict[str, Any]]:
+        """Per-span timing records, slowest first."""
+        frame = self.frame
+        timings = [
+            {
+                "span_id": s.get("span_id"),
+                "name": s.get("name"),
+                "duration_ms": frame.span_duration_ms(i),
+                "start_time": s.get("start_time"),
+                "end_time": s.get("end_time"),
+                "parent_span_id": s.get("parent_span_id"),
+                "labels": s.get("labels", {}),
+            }
+            for i, s in enumerate(frame.spans)
+        ]
+        timings.sort(key=lambda x: x.get("duration_ms") or 0, reverse=True)
+        return timings
+
+    @cached_property
+    def durations_by_name(self) -> dict[Any, list[float]]:
+        """Known span durations grouped by span name.
+
+        Every span name is present, with an empty list if none of its spans
+        has a known duration.
+        """
+        frame = self.frame
+        by_name: dict[Any, list[float]] = defaultdict(list)
+        for i, s in enumerate(frame.spans):
+            durations = by_name[s.get("name")]
+            duration = frame.span_duration_ms(i)
+            if duration is not None:
+                durations.append(duration)
+        return dict(by_name)
+
+    @cached_property
+    def critical_path(self) -> CriticalPath | None:
+        """Concurrency-aware critical path, or None without a root span."""
+        return compute_critical_path(self.frame)
+
+
+def get_trace_index(trace: TraceFrame | Mapping[str, Any]) -> TraceIndex:
+    """Return the shared `TraceIndex` of a trace.
+
+    Args:
+        trace: A `TraceFrame` or a trace dictionary; dictionaries returned by
+            `fetch_trace_data` resolve to their cached frame.
+
+    Returns:
+        The index, created on first use and memoized per frame.
+    """
+    frame = trace if isinstance(trace, TraceFrame) else as_trace_frame(trace)
+    with _indexes_lock:
+        index = _indexes.get(frame)
+        if index is None:
+            index = _indexes[frame] = TraceIndex(frame)
+        return index
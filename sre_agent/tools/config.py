@@ -361,6 +361,13 @@ TOOL_DEFINITIONS: list[ToolConfig] = [
         category=ToolCategory.ANALYSIS,
         testable=False,
     ),
+    ToolConfig(
+        name="detect_sre_patterns_across_traces",
+        display_name="Detect SRE Patterns Across Traces",
+        description="Fleet-wide SRE anti-pattern scan over a batch of traces",
+        category=ToolCategory.ANALYSIS,
+        testable=False,
+    ),
     # -------------------------------------------------------------------------
     # Log Analysis Tools
     # -------------------------------------------------------------------------
@@ -378,6 +385,13 @@ TOOL_DEFINITIONS: list[ToolConfig] = [
         category=ToolCategory.ANALYSIS,
         testable=False,
     ),
+    ToolConfig(
+        name="compare_log_pattern_windows",
+        display_name="Compare Log Pattern Windows",
+        description="Compare stored log pattern counts between two time windows",
+        category=ToolCategory.ANALYSIS,
+        testable=False,
+    ),
     ToolConfig(
         name="analyze_log_anomalies",
         display_name="Analyze Log Anomalies",
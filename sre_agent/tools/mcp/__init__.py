@@ -17,23 +17,58 @@ Direct API Tools:
 - Error Reporting: list_error_events
 """
 
-from ..clients.logging import (
-    get_logs_for_trace,
-    list_error_events,
-    list_log_entries,
-)
-from ..clients.monitoring import list_time_series
-from ..clients.trace import get_current_time
-from .gcp import (
-    call_mcp_tool_with_retry,
-    create_bigquery_mcp_toolset,
-    create_logging_mcp_toolset,
-    create_monitoring_mcp_toolset,
-    get_project_id_with_fallback,
-    mcp_list_log_entries,
-    mcp_list_timeseries,
-    mcp_query_range,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..clients.logging import (
+        get_logs_for_trace,
+        list_error_events,
+        list_log_entries,
+    )
+    from ..clients.monitoring import list_time_series
+    from ..clients.trace import get_current_time
+    from .gcp import (
+        call_mcp_tool_with_retry,
+        create_bigquery_mcp_toolset,
+        create_logging_mcp_toolset,
+        create_monitoring_mcp_toolset,
+        get_project_id_with_fallback,
+        mcp_list_log_entries,
+        mcp_list_timeseries,
+        mcp_query_range,
+    )
+    from .pool import get_mcp_toolset_pool
+
+# The direct API clients are only imported when used, so loading `.gcp`
+# does not pull in every Google Cloud client library.
+_EXPORT_MODULES = {
+    "get_logs_for_trace": "..clients.logging",
+    "list_error_events": "..clients.logging",
+    "list_log_entries": "..clients.logging",
+    "list_time_series": "..clients.monitoring",
+    "get_current_time": "..clients.trace",
+    "call_mcp_tool_with_retry": ".gcp",
+    "create_bigquery_mcp_toolset": ".gcp",
+    "create_logging_mcp_toolset": ".gcp",
+    "create_monitoring_mcp_toolset": ".gcp",
+    "get_project_id_with_fallback": ".gcp",
+    "mcp_list_log_entries": ".gcp",
+    "mcp_list_timeseries": ".gcp",
+    "mcp_query_range": ".gcp",
+    "get_mcp_toolset_pool": ".pool",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name from its module on first access."""
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "call_mcp_tool_with_retry",
@@ -43,6 +78,7 @@ __all__ = [
     "create_monitoring_mcp_toolset",
     "get_current_time",
     "get_logs_for_trace",
+    "get_mcp_toolset_pool",
     # Utilities
     "get_project_id_with_fallback",
     "list_error_events",
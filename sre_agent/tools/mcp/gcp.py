@@ -8,6 +8,8 @@ This module provides lazy-loaded MCP toolsets for GCP observability services:
 MCP toolsets are created lazily in async context to avoid session lifecycle issues.
 Creating at module import time causes "Attempted to exit cancel scope in a
 different task" errors because anyio cancel scopes cannot cross task boundaries.
+Once created, toolsets stay open in the MCP toolset pool (`pool.py`) and are
+shared by later calls for the same project.
 """
 
 import asyncio
@@ -21,10 +23,15 @@ import httpx
 from google.adk.tools import ToolContext  # type: ignore[attr-defined]
 from google.adk.tools.api_registry import ApiRegistry
 
-from ...auth import get_current_credentials
+from ...auth import (
+    credentials_identity,
+    get_current_credentials,
+    get_current_credentials_or_none,
+)
 from ...schema import ToolStatus
 from ..common import adk_tool
 from .mock_mcp import MockMcpToolset
+from .pool import McpToolsetPool, get_mcp_toolset_pool
 
 logger = logging.getLogger(__name__)
 
@@ -204,6 +211,13 @@ async def call_mcp_tool_with_retry(
 ) -> dict[str, Any]:
     """Generic helper to call an MCP tool with retry logic for session errors.
 
+    The toolset comes from the MCP toolset pool, keyed by `create_toolset_fn`,
+    project and, with user credentials, the user, so warm sessions and their
+    tool lists are reused. A session error closes the pooled toolset and the
+    retry opens a new one; so does an UNAUTHENTICATED (401) error, whose
+    session likely holds an expired token, but only once. User credentials
+    without an identity yet get a toolset of their own, closed after the call.
+
     Args:
         create_toolset_fn: Function to create the MCP toolset.
         tool_name: Name of the MCP tool to call.
@@ -227,197 +241,221 @@ async def call_mcp_tool_with_retry(
             "error": "No project ID available. Set GOOGLE_CLOUD_PROJECT environment variable.",
         }
 
-    for attempt in range(max_retries):
-        mcp_toolset = None
-        try:
-            logger.debug(
-                f"DEBUG: Calling create_toolset_fn for {tool_name} (project_id={project_id})"
-            )
-            # Offload blocking synchronous toolset creation to threadpool
-            # Wrap in timeout to prevent hanging during initialization
-            try:
-                mcp_toolset = await asyncio.wait_for(
-                    run_in_threadpool(create_toolset_fn, project_id),
-                    timeout=60.0,  # 60s timeout for toolset creation
-                )
-            except asyncio.TimeoutError:
-                logger.error(f"Timeout creating MCP toolset for {tool_name}")
-                return {
-                    "status": ToolStatus.ERROR,
-                    "error": (
-                        f"Failed to create MCP toolset for '{tool_name}': Connection timed out after 60 seconds. "
-                        "The MCP server may be unavailable or overloaded. DO NOT retry this tool. "
-                        "Use direct API alternatives instead: list_log_entries for logs, fetch_trace for traces, "
-                        "query_promql for metrics."
-                    ),
-                    "non_retryable": True,
-                    "error_type": "MCP_CONNECTION_TIMEOUT",
-                }
-
-            logger.debug(f"DEBUG: create_toolset_fn returned for {tool_name}")
+    pool = get_mcp_toolset_pool()
+    private_pool: McpToolsetPool | None = None
+    pool_key: tuple[Any, ...] = (create_toolset_fn, project_id)
+    user_creds = get_current_credentials_or_none()
+    if user_creds is not None:
+        identity = credentials_identity(user_creds)
+        if identity is None:
+            # Nothing tells these credentials apart from another user's, so
+            # their toolset is not shared and is closed after the call.
+            pool = private_pool = McpToolsetPool()
+        pool_key = (*pool_key, identity)
+
+    async def connect() -> Any:
+        logger.debug(
+            f"DEBUG: Calling create_toolset_fn for {tool_name} (project_id={project_id})"
+        )
+        # Offload blocking synchronous toolset creation to threadpool
+        # Wrap in timeout to prevent hanging during initialization
+        return await asyncio.wait_for(
+            run_in_threadpool(create_toolset_fn, project_id),
+            timeout=60.0,  # 60s timeout for toolset creation
+        )
 
-            if not mcp_toolset:
+    try:
+        for attempt in range(max_retries):
+            try:
+                # Warm toolsets are reused; a new one is only opened on first use,
+                # after idle eviction, or after a session error invalidated it.
+                try:
+                    tools = await pool.get_tools(pool_key, connect)
+                except asyncio.TimeoutError:
+                    logger.error(f"Timeout creating MCP toolset for {tool_name}")
+                    return {
+                        "status": ToolStatus.ERROR,
+                        "error": (
+                            f"Failed to create MCP toolset for '{tool_name}': Connection timed out after 60 seconds. "
+                            "The MCP server may be unavailable or overloaded. DO NOT retry this tool. "
+                            "Use direct API alternatives instead: list_log_entries for logs, fetch_trace for traces, "
+                            "query_promql for metrics."
+                        ),
+                        "non_retryable": True,
+                        "error_type": "MCP_CONNECTION_TIMEOUT",
+                    }
+
+                if tools is None:
+                    return {
+                        "status": ToolStatus.ERROR,
+                        "error": (
+                            f"MCP toolset unavailable for '{tool_name}'. The MCP server could not be initialized. "
+                            "This is typically a configuration or authentication issue. DO NOT retry this tool. "
+                            "Use direct API alternatives instead: list_log_entries for logs, fetch_trace for traces, "
+                            "query_promql or list_time_series for metrics."
+                        ),
+                        "non_retryable": True,
+                        "error_type": "MCP_UNAVAILABLE",
+                    }
+
+                tool = tools.get(tool_name)
+                if tool is None:
+                    return {
+                        "status": ToolStatus.ERROR,
+                        "error": (
+                            f"Tool '{tool_name}' not found in MCP toolset. This is a configuration error - "
+                            "the tool may not be available in the current MCP server. DO NOT retry. "
+                            "Use direct API alternatives instead."
+                        ),
+                        "non_retryable": True,
+                        "error_type": "TOOL_NOT_FOUND",
+                    }
+
+                # Enforce timeout on tool execution
+                try:
+                    logger.info(
+                        f"🔗 MCP Call: '{tool_name}' (Project: {project_id}) | Args: {args}"
+                    )
+                    result = await asyncio.wait_for(
+                        tool.run_async(args=args, tool_context=tool_context),
+                        timeout=180.0,  # 180s timeout for tool execution
+                    )
+                    logger.info(f"✨ MCP Success: '{tool_name}'")
+                    return {
+                        "status": ToolStatus.SUCCESS,
+                        "result": result,
+                        "metadata": {"source": "mcp"},
+                    }
+                except asyncio.TimeoutError:
+                    logger.error(f"Timeout executing MCP tool {tool_name}")
+                    return {
+                        "status": ToolStatus.ERROR,
+                        "error": (
+                            f"Tool '{tool_name}' timed out after 180 seconds. This is typically caused by "
+                            "slow network conditions or high server load. DO NOT retry immediately. "
+                            "Consider using direct API alternatives (list_log_entries, fetch_trace, query_promql) "
+                            "which may be more reliable, or wait and try again later."
+                        ),
+                        "non_retryable": True,
+                        "error_type": "TIMEOUT",
+                    }
+
+            except asyncio.CancelledError:
+                logger.warning(f"MCP Tool execution cancelled: {tool_name}")
                 return {
                     "status": ToolStatus.ERROR,
                     "error": (
-                        f"MCP toolset unavailable for '{tool_name}'. The MCP server could not be initialized. "
-                        "This is typically a configuration or authentication issue. DO NOT retry this tool. "
-                        "Use direct API alternatives instead: list_log_entries for logs, fetch_trace for traces, "
-                        "query_promql or list_time_series for metrics."
+                        f"Tool '{tool_name}' execution was cancelled by the system. "
+                        "DO NOT retry this operation immediately. "
+                        "Use an alternative approach or smaller data scope if this was due to a timeout."
                     ),
                     "non_retryable": True,
-                    "error_type": "MCP_UNAVAILABLE",
+                    "error_type": "SYSTEM_CANCELLATION",
                 }
 
-            tools = await mcp_toolset.get_tools()
-
-            for tool in tools:
-                if tool.name == tool_name:
-                    # Enforce timeout on tool execution
-                    try:
-                        logger.info(
-                            f"🔗 MCP Call: '{tool_name}' (Project: {project_id}) | Args: {args}"
-                        )
-                        result = await asyncio.wait_for(
-                            tool.run_async(args=args, tool_context=tool_context),
-                            timeout=180.0,  # 180s timeout for tool execution
-                        )
-                        logger.info(f"✨ MCP Success: '{tool_name}'")
-                        return {
-                            "status": ToolStatus.SUCCESS,
-                            "result": result,
-                            "metadata": {"source": "mcp"},
-                        }
-                    except asyncio.TimeoutError:
-                        logger.error(f"Timeout executing MCP tool {tool_name}")
-                        return {
-                            "status": ToolStatus.ERROR,
-                            "error": (
-                                f"Tool '{tool_name}' timed out after 180 seconds. This is typically caused by "
-                                "slow network conditions or high server load. DO NOT retry immediately. "
-                                "Consider using direct API alternatives (list_log_entries, fetch_trace, query_promql) "
-                                "which may be more reliable, or wait and try again later."
-                            ),
-                            "non_retryable": True,
-                            "error_type": "TIMEOUT",
-                        }
-
-            return {
-                "status": ToolStatus.ERROR,
-                "error": (
-                    f"Tool '{tool_name}' not found in MCP toolset. This is a configuration error - "
-                    "the tool may not be available in the current MCP server. DO NOT retry. "
-                    "Use direct API alternatives instead."
-                ),
-                "non_retryable": True,
-                "error_type": "TOOL_NOT_FOUND",
-            }
-
-        except asyncio.CancelledError:
-            logger.warning(f"MCP Tool execution cancelled: {tool_name}")
-            return {
-                "status": ToolStatus.ERROR,
-                "error": (
-                    f"Tool '{tool_name}' execution was cancelled by the system. "
-                    "DO NOT retry this operation immediately. "
-                    "Use an alternative approach or smaller data scope if this was due to a timeout."
-                ),
-                "non_retryable": True,
-                "error_type": "SYSTEM_CANCELLATION",
-            }
-
-        except (httpx.HTTPStatusError, Exception) as e:
-            logger.error(
-                f"MCP Tool execution failed: {tool_name} error={e!s}", exc_info=True
-            )
-            if hasattr(e, "response") and hasattr(e.response, "text"):
-                logger.error(f"HTTP Response Body: {e.response.text}")
-
-            error_str = str(e)
-            is_session_error = "Session terminated" in error_str or (
-                "session" in error_str.lower() and "error" in error_str.lower()
-            )
-
-            if is_session_error and attempt < max_retries - 1:
-                delay = base_delay * (2**attempt)
-                logger.warning(
-                    f"MCP session error during {tool_name} attempt {attempt + 1}/{max_retries}: {e}. "
-                    f"Retrying in {delay}s..."
-                )
-                await asyncio.sleep(delay)
-            elif is_session_error and attempt >= max_retries - 1:
-                # Session errors exhausted all retries - mark as non-retryable
+            except (httpx.HTTPStatusError, Exception) as e:
                 logger.error(
-                    f"{tool_name} failed after {max_retries} attempts due to session errors: {e}"
+                    f"MCP Tool execution failed: {tool_name} error={e!s}", exc_info=True
                 )
-                return {
-                    "status": ToolStatus.ERROR,
-                    "error": (
-                        f"Tool '{tool_name}' failed after {max_retries} retry attempts due to persistent session errors. "
-                        "The MCP connection is unstable. DO NOT retry this tool. "
-                        "Switch to direct API alternatives: list_log_entries, fetch_trace, query_promql, list_time_series."
-                    ),
-                    "non_retryable": True,
-                    "error_type": "MAX_RETRIES_EXHAUSTED",
-                }
-            else:
-                # Non-session error - determine if retryable based on error content
-                error_str_lower = str(e).lower()
-                is_auth_error = any(
-                    kw in error_str_lower
-                    for kw in ["permission", "unauthorized", "forbidden", "403", "401"]
+                if hasattr(e, "response") and hasattr(e.response, "text"):
+                    logger.error(f"HTTP Response Body: {e.response.text}")
+
+                error_str = str(e)
+                is_session_error = "Session terminated" in error_str or (
+                    "session" in error_str.lower() and "error" in error_str.lower()
                 )
-                is_not_found = any(
-                    kw in error_str_lower
-                    for kw in ["not found", "404", "does not exist"]
+
+                is_unauthenticated = not is_session_error and (
+                    "401" in error_str or "unauthenticated" in error_str.lower()
                 )
-                is_non_retryable = is_auth_error or is_not_found
 
-                return {
-                    "status": ToolStatus.ERROR,
-                    "error": (
-                        f"Tool '{tool_name}' execution failed: {e!s}. "
-                        + (
-                            "This appears to be a permission or resource issue - DO NOT retry. "
-                            "Check authentication and resource availability."
-                            if is_non_retryable
-                            else "This may be a transient error. If the issue persists after one retry, "
-                            "try using direct API alternatives instead."
-                        )
-                    ),
-                    "non_retryable": is_non_retryable,
-                    "error_type": "AUTH_ERROR"
-                    if is_auth_error
-                    else "NOT_FOUND"
-                    if is_not_found
-                    else "EXECUTION_ERROR",
-                }
-        finally:
-            if mcp_toolset and hasattr(mcp_toolset, "close"):
-                try:
-                    await mcp_toolset.close()
-                except asyncio.CancelledError:
-                    # Ignore cancellation errors during cleanup to ensure result is returned
-                    logger.debug(
-                        "MCP toolset close interrupted by cancellation (ignored)"
+                if is_session_error:
+                    # Only a broken session is worth reconnecting for
+                    await pool.invalidate(pool_key)
+                elif is_unauthenticated:
+                    # ...or one opened with a token that has since expired
+                    await pool.invalidate(pool_key, reason="auth_error")
+
+                if is_unauthenticated and attempt == 0 and max_retries > 1:
+                    logger.warning(
+                        f"MCP auth error during {tool_name}: {e}. "
+                        "Reconnecting with fresh credentials..."
                     )
-                except RuntimeError as e:
-                    # Ignore "Attempted to exit cancel scope..." errors from anyio/mcp cleanup
-                    # These occur due to task scoping issues in the underlying library during forced cleanup
-                    logger.debug(f"RuntimeError during MCP cleanup (ignored): {e}")
-                except Exception as e:
-                    logger.warning(f"Error closing MCP toolset: {e}")
-
-    return {
-        "status": ToolStatus.ERROR,
-        "error": (
-            f"Tool '{tool_name}' failed after {max_retries} retry attempts due to persistent session errors. "
-            "The MCP connection is unstable. DO NOT retry this tool. "
-            "Switch to direct API alternatives: list_log_entries, fetch_trace, query_promql, list_time_series."
-        ),
-        "non_retryable": True,
-        "error_type": "MAX_RETRIES_EXHAUSTED",
-    }
+                elif is_session_error and attempt < max_retries - 1:
+                    delay = base_delay * (2**attempt)
+                    logger.warning(
+                        f"MCP session error during {tool_name} attempt {attempt + 1}/{max_retries}: {e}. "
+                        f"Retrying in {delay}s..."
+                    )
+                    await asyncio.sleep(delay)
+                elif is_session_error and attempt >= max_retries - 1:
+                    # Session errors exhausted all retries - mark as non-retryable
+                    logger.error(
+                        f"{tool_name} failed after {max_retries} attempts due to session errors: {e}"
+                    )
+                    return {
+                        "status": ToolStatus.ERROR,
+                        "error": (
+                            f"Tool '{tool_name}' failed after {max_retries} retry attempts due to persistent session errors. "
+                            "The MCP connection is unstable. DO NOT retry this tool. "
+                            "Switch to direct API alternatives: list_log_entries, fetch_trace, query_promql, list_time_series."
+                        ),
+                        "non_retryable": True,
+                        "error_type": "MAX_RETRIES_EXHAUSTED",
+                    }
+                else:
+                    # Non-session error - determine if retryable based on error content
+                    error_str_lower = str(e).lower()
+                    is_auth_error = any(
+                        kw in error_str_lower
+                        for kw in [
+                            "permission",
+                            "unauthorized",
+                            "unauthenticated",
+                            "forbidden",
+                            "403",
+                            "401",
+                        ]
+                    )
+                    is_not_found = any(
+                        kw in error_str_lower
+                        for kw in ["not found", "404", "does not exist"]
+                    )
+                    is_non_retryable = is_auth_error or is_not_found
+
+                    return {
+                        "status": ToolStatus.ERROR,
+                        "error": (
+                            f"Tool '{tool_name}' execution failed: {e!s}. "
+                            + (
+                                "This appears to be a permission or resource issue - DO NOT retry. "
+                                "Check authentication and resource availability."
+                                if is_non_retryable
+                                else "This may be a transient error. If the issue persists after one retry, "
+                                "try using direct API alternatives instead."
+                            )
+                        ),
+                        "non_retryable": is_non_retryable,
+                        "error_type": "AUTH_ERROR"
+                        if is_auth_error
+                        else "NOT_FOUND"
+                        if is_not_found
+                        else "EXECUTION_ERROR",
+                    }
+
+        return {
+            "status": ToolStatus.ERROR,
+            "error": (
+                f"Tool '{tool_name}' failed after {max_retries} retry attempts due to persistent session errors. "
+                "The MCP connection is unstable. DO NOT retry this tool. "
+                "Switch to direct API alternatives: list_log_entries, fetch_trace, query_promql, list_time_series."
+            ),
+            "non_retryable": True,
+            "error_type": "MAX_RETRIES_EXHAUSTED",
+        }
+    finally:
+        if private_pool is not None:
+            await private_pool.close()
 
 
 # =============================================================================
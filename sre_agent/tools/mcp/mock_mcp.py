@@ -61,3 +61,6 @@ class MockMcpToolset:
             MockMcpTool("list_timeseries"),
             MockMcpTool("query_range"),
         ]
+
+    async def close(self) -> None:
+        """Closes the mock toolset (nothing to release)."""
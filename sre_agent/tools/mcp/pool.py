@@ -0,0 +1,323 @@
+"""Pool of warm MCP toolsets, shared between tool calls.
+
+Opening an MCP toolset costs a session handshake and a `list_tools` round
+trip, which used to be paid by every MCP tool call. The pool keeps one
+toolset per (factory, project, user) in each event loop, with its tools
+indexed by name:
+
+- A toolset idle for longer than the idle TTL is closed and dropped.
+- A toolset older than the max age is replaced, since its session carries
+  the access token it was opened with, which expires after an hour.
+- A toolset unused for longer than the health check interval lists its
+  tools again before it is handed out, which also reconnects a dropped
+  session (ADK's session manager reopens disconnected sessions); if that
+  fails it is replaced by a new one.
+- Callers `invalidate()` a toolset after a session error or an
+  UNAUTHENTICATED (401) response so the next call reconnects; other errors
+  leave the session in place.
+
+Toolsets are keyed by event loop because MCP sessions are bound to the loop
+(and anyio task group) they were opened in.
+
+Environment variables:
+    SRE_AGENT_MCP_IDLE_TTL_SECONDS: Idle time before a toolset is closed
+    SRE_AGENT_MCP_HEALTH_CHECK_SECONDS: Idle time before a toolset is checked
+    SRE_AGENT_MCP_MAX_AGE_SECONDS: Age at which a toolset is replaced
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from ..common.telemetry import get_meter
+
+logger = logging.getLogger(__name__)
+meter = get_meter(__name__)
+
+DEFAULT_IDLE_TTL_SECONDS = 300.0
+DEFAULT_HEALTH_CHECK_SECONDS = 60.0
+# Below the one hour lifetime of Google access tokens.
+DEFAULT_MAX_AGE_SECONDS = 3000.0
+HEALTH_CHECK_TIMEOUT_SECONDS = 30.0
+
+toolset_connects = meter.create_counter(
+    name="sre_agent.mcp.toolset_connects",
+    description=(
+        "MCP toolsets opened, by reason "
+        "(new, health_check, max_age, session_error, auth_error)"
+    ),
+    unit="1",
+)
+toolset_reuses = meter.create_counter(
+    name="sre_agent.mcp.toolset_reuses",
+    description="MCP tool calls served by an already open toolset",
+    unit="1",
+)
+
+
+@dataclass(slots=True)
+class _PooledToolset:
+    toolset: Any
+    tools: dict[str, Any]
+    used_at: float
+    checked_at: float
+    opened_at: float
+
+
+def _describe(key: Hashable) -> str:
+    """Readable pool key: factories by name, other parts by repr."""
+    parts = key if isinstance(key, tuple) else (key,)
+    return "(" + ", ".join(getattr(p, "__name__", repr(p)) for p in parts) + ")"
+
+
+async def _index_tools(toolset: Any) -> dict[str, Any]:
+    """List a toolset's tools, by name."""
+    return {tool.name: tool for tool in await toolset.get_tools()}
+
+
+async def close_toolset(toolset: Any) -> None:
+    """Close an MCP toolset, ignoring errors from its session teardown."""
+    if not hasattr(toolset, "close"):
+        return
+    try:
+        await toolset.close()
+    except asyncio.CancelledError:
+        # Ignore cancellation errors during cleanup to ensure result is returned
+        logger.debug("MCP toolset close interrupted by cancellation (ignored)")
+    except RuntimeError as e:
+        # "Attempted to exit cancel scope..." errors from anyio/mcp cleanup
+        # occur when the session is closed from another task
+        logger.debug(f"RuntimeError during MCP cleanup (ignored): {e}")
+    except Exception as e:
+        logger.warning(f"Error closing MCP toolset: {e}")
+
+
+class McpToolsetPool:
+    """Long-lived MCP toolsets with a cached name-to-tool map.
+
+    Example:
+        >>> pool = get_mcp_toolset_pool()
+        >>> tools = await pool.get_tools((create_fn, project_id), connect)
+        >>> result = await tools["execute_sql"].run_async(args=..., tool_context=...)
+    """
+
+    def __init__(
+        self,
+        idle_ttl_seconds: float = DEFAULT_IDLE_TTL_SECONDS,
+        health_check_seconds: float = DEFAULT_HEALTH_CHECK_SECONDS,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            idle_ttl_seconds: Idle time after which a toolset is closed
+            health_check_seconds: Idle time after which a toolset lists its
+                tools again before it is reused
+            max_age_seconds: Age after which a toolset is closed, however
+                often it is used
+        """
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.health_check_seconds = health_check_seconds
+        self.max_age_seconds = max_age_seconds
+        self._entries: dict[tuple[Any, Hashable], _PooledToolset] = {}
+        # Held while a toolset is opened or checked; dropped with the toolset
+        self._locks: dict[tuple[Any, Hashable], asyncio.Lock] = {}
+        # Reason and time a toolset was invalidated, until the next one is
+        # opened or the idle TTL passes
+        self._invalidated: dict[tuple[Any, Hashable], tuple[str, float]] = {}
+
+    async def get_tools(
+        self, key: Hashable, connect: Callable[[], Awaitable[Any]]
+    ) -> dict[str, Any] | None:
+        """Get the tools of the warm toolset for `key`, opening it if needed.
+
+        Args:
+            key: Identifies the toolset, e.g. (factory, project ID, user)
+            connect: Creates a new toolset, or returns None if unavailable
+
+        Returns:
+            Tool name -> tool, or None if `connect` returned no toolset
+
+        Raises:
+            Whatever `connect` or the first `get_tools()` of a new toolset
+            raise; a new toolset that fails to list its tools is closed.
+        """
+        loop_key = (asyncio.get_running_loop(), key)
+        await self.evict_idle()
+        while True:
+            lock = self._locks.setdefault(loop_key, asyncio.Lock())
+            async with lock:
+                if self._locks.get(loop_key) is not lock:
+                    # Evicted while we waited, together with its lock
+                    continue
+                try:
+                    return await self._get_tools(loop_key, connect)
+                finally:
+                    if (
+                        loop_key not in self._entries
+                        and self._locks.get(loop_key) is lock
+                    ):
+                        # Nothing was opened, so the lock guards nothing
+                        del self._locks[loop_key]
+
+    async def _get_tools(
+        self, loop_key: tuple[Any, Hashable], connect: Callable[[], Awaitable[Any]]
+    ) -> dict[str, Any] | None:
+        """`get_tools()` with the lock of `loop_key` held."""
+        key = loop_key[1]
+        now = time.monotonic()
+        entry = self._entries.get(loop_key)
+        reason, _ = self._invalidated.pop(loop_key, ("new", now))
+        if entry is not None and now - entry.opened_at >= self.max_age_seconds:
+            logger.debug(f"Replacing aged MCP toolset {_describe(key)}")
+            await self._drop(loop_key)
+            entry = None
+            reason = "max_age"
+        if entry is not None and now - entry.checked_at >= self.health_check_seconds:
+            try:
+                entry.tools = await asyncio.wait_for(
+                    _index_tools(entry.toolset), HEALTH_CHECK_TIMEOUT_SECONDS
+                )
+                entry.checked_at = now
+            except Exception as e:
+                logger.warning(f"MCP toolset {_describe(key)} failed health check: {e}")
+                await self._drop(loop_key)
+                entry = None
+                reason = "health_check"
+        if entry is not None:
+            entry.used_at = now
+            toolset_reuses.add(1)
+            return entry.tools
+
+        toolset = await connect()
+        if not toolset:
+            return None
+        try:
+            tools = await _index_tools(toolset)
+        except BaseException:
+            await close_toolset(toolset)
+            raise
+        now = time.monotonic()
+        self._entries[loop_key] = _PooledToolset(toolset, tools, now, now, now)
+        toolset_connects.add(1, {"reason": reason})
+        logger.debug(f"Opened MCP toolset {_describe(key)} ({reason})")
+        return tools
+
+    async def invalidate(self, key: Hashable, reason: str = "session_error") -> None:
+        """Close the toolset for `key` after a session or auth error.
+
+        The next `get_tools()` for the key opens a new one.
+
+        Args:
+            key: Identifies the toolset
+            reason: Why it is closed, recorded when the next one is opened
+        """
+        loop_key = (asyncio.get_running_loop(), key)
+        if loop_key in self._entries:
+            self._invalidated[loop_key] = (reason, time.monotonic())
+            await self._evict(loop_key)
+
+    async def evict_idle(self) -> int:
+        """Close toolsets of the running loop that are idle or too old.
+
+        Toolsets opened in an event loop that has since closed are dropped
+        without closing them, since their sessions died with the loop.
+
+        Returns:
+            Number of toolsets evicted
+        """
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        evicted = 0
+        for loop_key, entry in list(self._entries.items()):
+            if loop_key[0].is_closed():
+                self._forget(loop_key)
+            elif loop_key[0] is loop and (
+                now - entry.used_at >= self.idle_ttl_seconds
+                or now - entry.opened_at >= self.max_age_seconds
+            ):
+                logger.debug(f"Closing idle MCP toolset {_describe(loop_key[1])}")
+                await self._evict(loop_key)
+            else:
+                continue
+            evicted += 1
+        # Toolsets invalidated and never reopened leave only their reason
+        for loop_key, (_, invalidated_at) in list(self._invalidated.items()):
+            if loop_key[0].is_closed() or now - invalidated_at >= self.idle_ttl_seconds:
+                del self._invalidated[loop_key]
+        return evicted
+
+    async def close(self) -> None:
+        """Close every toolset opened in the running event loop."""
+        loop = asyncio.get_running_loop()
+        for loop_key in list(self._entries):
+            if loop_key[0] is loop:
+                await self._evict(loop_key)
+            elif loop_key[0].is_closed():
+                self._forget(loop_key)
+
+    def stats(self) -> dict[str, Any]:
+        """Open toolsets with their tools and idle time.
+
+        Returns:
+            Dict with the pool settings and one item per open toolset.
+        """
+        now = time.monotonic()
+        return {
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "health_check_seconds": self.health_check_seconds,
+            "max_age_seconds": self.max_age_seconds,
+            "toolsets": [
+                {
+                    "key": _describe(key),
+                    "tools": sorted(entry.tools),
+                    "idle_seconds": round(now - entry.used_at, 1),
+                    "age_seconds": round(now - entry.opened_at, 1),
+                }
+                for (_, key), entry in self._entries.items()
+            ],
+        }
+
+    async def _drop(self, loop_key: tuple[Any, Hashable]) -> None:
+        """Close the toolset of `loop_key`, which is replaced right after."""
+        entry = self._entries.pop(loop_key, None)
+        if entry is not None:
+            await close_toolset(entry.toolset)
+
+    async def _evict(self, loop_key: tuple[Any, Hashable]) -> None:
+        """Close the toolset of `loop_key` and drop its lock."""
+        self._locks.pop(loop_key, None)
+        await self._drop(loop_key)
+
+    def _forget(self, loop_key: tuple[Any, Hashable]) -> None:
+        self._entries.pop(loop_key, None)
+        self._locks.pop(loop_key, None)
+        self._invalidated.pop(loop_key, None)
+
+
+_pool = McpToolsetPool(
+    idle_ttl_seconds=float(
+        os.environ.get("SRE_AGENT_MCP_IDLE_TTL_SECONDS", str(DEFAULT_IDLE_TTL_SECONDS))
+    ),
+    health_check_seconds=float(
+        os.environ.get(
+            "SRE_AGENT_MCP_HEALTH_CHECK_SECONDS", str(DEFAULT_HEALTH_CHECK_SECONDS)
+        )
+    ),
+    max_age_seconds=float(
+        os.environ.get("SRE_AGENT_MCP_MAX_AGE_SECONDS", str(DEFAULT_MAX_AGE_SECONDS))
+    ),
+)
+
+
+def get_mcp_toolset_pool() -> McpToolsetPool:
+    """Get the global MCP toolset pool.
+
+    Returns:
+        The pool used by `call_mcp_tool_with_retry`.
+    """
+    return _pool
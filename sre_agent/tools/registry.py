@@ -0,0 +1,174 @@
+"""Lazily imported ADK tools.
+
+Importing every tool module at startup pulls in the Google Cloud client
+libraries, Drain3 and the MCP clients before the server can take a request.
+A `LazyTool` knows its name, description and function declaration from
+`tool_manifest.json`, so the agent can advertise it to the model without
+importing anything; the tool's module is imported on its first call.
+
+The manifest is generated from the tool functions themselves:
+
+    uv run python scripts/generate_tool_manifest.py
+
+and a unit test fails when it no longer matches them. Tools missing from the
+manifest, or a manifest written by another ADK version, still work: their
+declaration is then built by importing the module, as ADK would.
+
+Example:
+    >>> from sre_agent.tools.registry import get_lazy_tool
+    >>> agent = LlmAgent(..., tools=[get_lazy_tool("fetch_trace")])
+"""
+
+import json
+import logging
+from collections.abc import Callable
+from functools import cache
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+import google.adk
+from google.adk.agents.llm_agent import ToolUnion
+from google.adk.tools import FunctionTool, ToolContext  # type: ignore[attr-defined]
+from google.adk.tools.base_tool import BaseTool
+from google.adk.utils.variant_utils import GoogleLLMVariant
+from google.genai import types
+
+from . import TOOL_MODULES
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = Path(__file__).with_name("tool_manifest.json")
+
+
+@cache
+def load_tool_manifest() -> dict[str, Any]:
+    """Load the tool manifest, or an empty one if it is missing or invalid."""
+    try:
+        with MANIFEST_PATH.open(encoding="utf-8") as f:
+            manifest: dict[str, Any] = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Tool manifest unavailable, tools load eagerly: {e}")
+        return {}
+    if manifest.get("adk_version") != google.adk.__version__:
+        logger.warning(
+            f"Tool manifest was generated for ADK {manifest.get('adk_version')}, "
+            f"running {google.adk.__version__}; declarations load eagerly"
+        )
+        # Declarations depend on the ADK version, descriptions do not.
+        manifest = {
+            "tools": {
+                name: {"description": entry.get("description", "")}
+                for name, entry in manifest.get("tools", {}).items()
+            }
+        }
+    return manifest
+
+
+class LazyTool(BaseTool):
+    """ADK function tool whose module is imported on first call.
+
+    It can also be called directly like the function it stands for.
+    """
+
+    def __init__(self, name: str, module: str | None = None) -> None:
+        """Create the tool.
+
+        Args:
+            name: Tool (function) name
+            module: Module defining it, relative to `sre_agent.tools`
+                (defaults to its `TOOL_MODULES` entry)
+        """
+        entry: dict[str, Any] = load_tool_manifest().get("tools", {}).get(name, {})
+        super().__init__(name=name, description=entry.get("description", ""))
+        self.__name__ = name
+        self.module = module or TOOL_MODULES[name]
+        self._declarations: dict[str, Any] = dict(entry.get("declarations", {}))
+        self._function_tool: FunctionTool | None = None
+
+    @property
+    def func(self) -> Callable[..., Any]:
+        """The tool function, imported on first access."""
+        return self._resolve().func
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the tool's module has been imported."""
+        return self._function_tool is not None
+
+    def _resolve(self) -> FunctionTool:
+        if self._function_tool is None:
+            module = import_module(self.module, __package__)
+            self._function_tool = FunctionTool(getattr(module, self.name))
+            logger.debug(f"Loaded tool '{self.name}' from {module.__name__}")
+        return self._function_tool
+
+    def _get_declaration(self) -> types.FunctionDeclaration | None:
+        declaration = self._declarations.get(self._api_variant.value)
+        if declaration is None:
+            return self._resolve()._get_declaration()
+        if not isinstance(declaration, types.FunctionDeclaration):
+            declaration = types.FunctionDeclaration.model_validate(declaration)
+            self._declarations[self._api_variant.value] = declaration
+        return declaration
+
+    async def run_async(
+        self, *, args: dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        """Import the tool if needed and run it like a `FunctionTool`."""
+        return await self._resolve().run_async(args=args, tool_context=tool_context)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """Call the tool function directly."""
+        return self.func(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        """Show the tool name and module without importing it."""
+        return f"LazyTool({self.name!r}, module={self.module!r})"
+
+
+@cache
+def get_lazy_tool(name: str) -> LazyTool:
+    """Get the shared lazy tool for a name in `TOOL_MODULES`."""
+    return LazyTool(name)
+
+
+def lazy_tools(*names: str) -> list[ToolUnion]:
+    """Get the shared lazy tools for several names, as an agent's tool list."""
+    return [get_lazy_tool(name) for name in names]
+
+
+class _VariantFunctionTool(FunctionTool):
+    """Function tool declared for a fixed LLM API variant."""
+
+    def __init__(self, func: Callable[..., Any], variant: GoogleLLMVariant) -> None:
+        super().__init__(func)
+        self._variant = variant
+
+    @property
+    def _api_variant(self) -> GoogleLLMVariant:
+        return self._variant
+
+
+def build_tool_manifest() -> dict[str, Any]:
+    """Import every tool and collect the metadata `LazyTool` needs.
+
+    Returns:
+        The manifest, as written to `tool_manifest.json`
+    """
+    tools: dict[str, Any] = {}
+    for name, module in sorted(TOOL_MODULES.items()):
+        func = getattr(import_module(module, __package__), name)
+        declarations = {}
+        for variant in GoogleLLMVariant:
+            declaration = _VariantFunctionTool(func, variant)._get_declaration()
+            if declaration is not None:
+                declarations[variant.value] = declaration.model_dump(
+                    mode="json", exclude_none=True
+                )
+        tools[name] = {
+            "module": module,
+            "description": FunctionTool(func).description,
+            "declarations": declarations,
+        }
+    return {"adk_version": google.adk.__version__, "tools": tools}
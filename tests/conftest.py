@@ -7,6 +7,8 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from sre_agent.tools.common.decorators import get_tool_result_cache
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -32,6 +34,13 @@ def generate_timestamp(
     return timestamp.isoformat() + "Z"
 
 
+@pytest.fixture(autouse=True)
+def _clear_tool_results():
+    """Keep memoized tool results from leaking between tests."""
+    yield
+    get_tool_result_cache().clear()
+
+
 # ============================================================================
 # Log Entry Fixtures
 # ============================================================================
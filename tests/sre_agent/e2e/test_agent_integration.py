@@ -2,7 +2,7 @@
 
 import json
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from google.adk.agents import LlmAgent
@@ -35,13 +35,13 @@ async def test_agent_initialization(mock_env):
 
 
 @pytest.mark.asyncio
-@patch("sre_agent.tools.clients.trace.trace_v1.TraceServiceClient")
-async def test_agent_finds_logs_for_trace(mock_trace_client):
+@patch("sre_agent.tools.clients.trace.get_trace_async_client")
+async def test_agent_finds_logs_for_trace(mock_get_client):
     """Test that agent can find logs for a specific trace."""
     from sre_agent.tools.clients.trace import list_traces
 
     mock_client = MagicMock()
-    mock_trace_client.return_value = mock_client
+    mock_get_client.return_value = mock_client
 
     # Setup mock response with datetime objects for timestamps (simulating proto-plus behavior)
     from datetime import datetime
@@ -57,7 +57,10 @@ async def test_agent_finds_logs_for_trace(mock_trace_client):
     mock_span.labels = {}
     mock_trace.spans = [mock_span]
 
-    mock_client.list_traces.return_value = [mock_trace]
+    async def pager():
+        yield mock_trace
+
+    mock_client.list_traces = AsyncMock(return_value=pager())
 
     # Run
     result = await list_traces("p", limit=1, min_latency_ms=500)
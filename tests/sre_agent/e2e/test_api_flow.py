@@ -42,3 +42,15 @@ def test_session_lifecycle():
     # Depending on implementation, might be 404 or return None/Empty
     # server.py implementation: returns 404 if not found
     assert response.status_code == 404
+
+
+def test_analyze_logs_requires_project_and_filter():
+    """Log analysis rejects payloads missing the project or filter."""
+    for payload in (
+        {"filter": "severity>=ERROR"},
+        {"project_id": "test-project"},
+        {"project_id": "test-project", "filter": ["severity>=ERROR"]},
+        {"project_id": "test-project", "filter": "severity>=ERROR", "max_entries": 0},
+    ):
+        response = client.post("/api/tools/logs/analyze", json=payload)
+        assert response.status_code == 400, payload
@@ -4,6 +4,8 @@ Tests the smart message extraction logic that handles various
 log payload formats: textPayload, jsonPayload, protoPayload.
 """
 
+from unittest.mock import patch
+
 from sre_agent.tools.analysis.logs.extraction import (
     LogMessageExtractor,
     extract_log_message,
@@ -221,6 +223,69 @@ class TestLogMessageExtractor:
         assert "api.call" in messages[2]
 
 
+class TestSchemaLearning:
+    """Tests for the per-schema learned message paths."""
+
+    @staticmethod
+    def _entry(payload, log_name="projects/p/logs/app"):
+        return {"logName": log_name, "jsonPayload": payload}
+
+    def test_learned_paths_skip_the_heuristics(self):
+        extractor = LogMessageExtractor()
+        first = {"Msg": "served request 1", "level": "info"}
+
+        assert extractor.extract(self._entry(first)) == "served request 1"
+        with patch.object(
+            extractor, "_search_json", side_effect=AssertionError("searched")
+        ):
+            entry = self._entry({"Msg": "served request 2", "level": "info"})
+            assert extractor.extract(entry) == "served request 2"
+
+    def test_field_names_keep_their_priority(self):
+        extractor = LogMessageExtractor()
+        extractor.extract(self._entry({"message": "", "msg": "from msg"}))
+
+        entry = self._entry({"message": "from message", "msg": "from msg"})
+        assert extractor.extract(entry) == "from message"
+
+    def test_scored_and_nested_fields_are_learned(self):
+        extractor = LogMessageExtractor()
+        scored = {"exception": "IllegalStateException at Payment.java:42"}
+        nested = {"event": {"message": "Cache refresh completed"}, "n": 1}
+        extractor.extract(self._entry(scored))
+        extractor.extract(self._entry(nested))
+
+        assert sorted(extractor._field_cache.values()) == [
+            [(("event",), 0), (("event", "message"), 10)],
+            [(("exception",), 10)],
+        ]
+        entry = self._entry({"event": {"message": "Cache refresh failed!"}, "n": 2})
+        assert extractor.extract(entry) == "Cache refresh failed!"
+
+    def test_miss_falls_back_to_the_heuristics(self):
+        extractor = LogMessageExtractor()
+        extractor.extract(self._entry({"exception": "Timeout talking to db"}))
+
+        # Too short for the learned field: compact JSON, as without learning
+        assert extractor.extract(self._entry({"exception": "oops"})) == (
+            '{"exception":"oops"}'
+        )
+
+    def test_schemas_are_per_log_and_key_set(self):
+        extractor = LogMessageExtractor()
+        extractor.extract(self._entry({"msg": "a message"}, "logs/a"))
+        extractor.extract(self._entry({"msg": "a message"}, "logs/b"))
+        extractor.extract(
+            {"payload": {"msg": "a message", "x": 1}, "resource": {"type": "gce"}}
+        )
+
+        assert set(extractor._field_cache) == {
+            ("logs/a", ("msg",)),
+            ("logs/b", ("msg",)),
+            ("gce", ("msg", "x")),
+        }
+
+
 class TestExtractMessagesFromEntries:
     """Tests for the extract_messages_from_entries function."""
 
@@ -0,0 +1,88 @@
+"""Unit tests for the fused single-pass log masker."""
+
+import random
+
+import pytest
+from drain3.masking import LogMasker
+
+from sre_agent.tools.analysis.logs.masking import (
+    MASKING_INSTRUCTIONS,
+    FusedLogMasker,
+)
+from sre_agent.tools.analysis.logs.patterns import LogPatternExtractor
+
+# Fragments of tokens, separators and near misses; random concatenations of
+# them make tokens overlap and touch in ways a fixed list would miss.
+FRAGMENTS = [
+    "0", "1", "12", "123", "2024", "9", "٣", "a", "f", "deadbeef", "ms", "T",
+    "é", "x", "_", ".", ":", "-", "@", '"', " ", "/", ",", "=",
+    "10.0.0.1", "12:30:45", "2024-01-01", "1.5ms", "3ms", '"a@b.io"', "a@b.c",
+    "123e4567-e89b-12d3-a456-426614174000", "4bf92f3577b34da6a3ce929d0e0e4736",
+]  # fmt: skip
+
+
+def _sequential():
+    return LogMasker(MASKING_INSTRUCTIONS, "<", ">")
+
+
+def _random_messages(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        size = rng.randint(0, 12)
+        yield "".join(rng.choice(FRAGMENTS) for _ in range(size))
+
+
+class TestFusedLogMasker:
+    """Tests for FusedLogMasker."""
+
+    def test_matches_sequential_masking(self):
+        sequential = _sequential()
+        fused = FusedLogMasker()
+
+        for message in _random_messages(20_000):
+            assert fused.mask(message) == sequential.mask(message), message
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("10.0.0.1.12:30:45", "<<IP>>.<<TIME>>"),
+            ("12:30:453ms", "<<TIME>><<DURATION>>"),
+            ("12:30:45:2024-01-01", "<<TIME>>:<<DATE>>"),
+            ('"deadbeefdeadbeefdeadbeef@1.5ms"', '"<<ID>>@<<DURATION>>"'),
+            ('"x@1.5ms"a@b.io"', '"x@<<DURATION>><<EMAIL>>'),
+            ("dial 10.0.0.5:5432 at 09:15:42", "dial <<IP>>:5432 at <<TIME>>"),
+        ],
+    )
+    def test_follows_instruction_priority(self, message, expected):
+        assert _sequential().mask(message) == expected
+        assert FusedLogMasker().mask(message) == expected
+
+    def test_masks_each_token_kind(self):
+        masked = FusedLogMasker().mask(
+            "2024-05-01T10:00:00 2024-05-01 10:00:00 10.0.0.1 1.5ms 3ms "
+            '"a@b.io" 123e4567-e89b-12d3-a456-426614174000 '
+            "4bf92f3577b34da6a3ce929d0e0e4736"
+        )
+
+        assert masked == (
+            "<<TIMESTAMP>> <<DATE>> <<TIME>> <<IP>> <<DURATION>> <<DURATION>> "
+            "<<EMAIL>> <<UUID>> <<ID>>"
+        )
+
+    def test_tokens_inside_words_are_kept(self):
+        message = "v2024-05-01 pod10.0.0.1 x3ms cafe"
+        assert FusedLogMasker().mask(message) == message
+
+    def test_keeps_drain_mask_names(self):
+        masker = FusedLogMasker()
+
+        assert set(masker.mask_names) == set(_sequential().mask_names)
+        assert len(masker.instructions_by_mask_name("<DURATION>")) == 2
+
+    def test_extractor_uses_fused_masker(self):
+        extractor = LogPatternExtractor()
+        assert isinstance(extractor.miner.masker, FusedLogMasker)
+
+        extractor.add_log("Connected to 10.0.0.1 in 12ms")
+        (pattern,) = extractor.patterns.values()
+        assert pattern.template == "Connected to <<IP>> in <<DURATION>>"
@@ -0,0 +1,375 @@
+"""Unit tests for the persistent log pattern store."""
+
+import time
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from sre_agent.tools.analysis.logs.pattern_store import (
+    PatternStore,
+    compare_log_pattern_windows,
+)
+from sre_agent.tools.analysis.logs.patterns import (
+    compare_log_patterns,
+    extract_log_patterns,
+)
+
+
+def _entries(minute, messages, severity="INFO"):
+    return [
+        {
+            "timestamp": f"2024-01-01T{minute}:{i:02d}Z",
+            "severity": severity,
+            "textPayload": message,
+            "resource": {"type": "k8s_container"},
+        }
+        for i, message in enumerate(messages)
+    ]
+
+
+def _as_user(creds):
+    return patch(
+        "sre_agent.tools.analysis.logs.pattern_store.get_current_credentials_or_none",
+        return_value=creds,
+    )
+
+
+def _listing(entries):
+    return {"entries": entries, "next_page_token": None}
+
+
+@pytest.fixture
+def store():
+    # The entries are from 2024, outside any retention window
+    store = PatternStore(retention_days=None)
+    yield store
+    store.close()
+
+
+class TestPatternStore:
+    """Tests for PatternStore ingestion, persistence and window lookups."""
+
+    def test_reingesting_a_range_counts_nothing_new(self, store):
+        entries = _entries("09:00", [f"User {i} logged in" for i in range(10)])
+
+        first, ingested = store.ingest("p", entries)
+        again, reingested = store.ingest("p", entries)
+
+        assert ingested == 10
+        assert reingested == 0
+        # The learned template is reused instead of being relearned
+        assert list(first.patterns)[-1] in again.patterns
+        assert len(again.patterns) == 1
+        patterns = store.window_patterns("p", "2024-01-01T09:00Z", "2024-01-01T10:00Z")
+        assert sum(p.count for p in patterns) == 10
+
+    def test_older_and_newer_ranges_are_both_ingested(self, store):
+        store.ingest("p", _entries("10:00", ["Cache warmed"] * 5))
+
+        _, older = store.ingest("p", _entries("09:00", ["Cache warmed"] * 3))
+        _, overlapping = store.ingest(
+            "p", _entries("10:00", ["Cache warmed"] * 8, severity="WARNING")
+        )
+
+        assert older == 3
+        # Entries 00-04 of 10:00 are already covered, 05-07 are new
+        assert overlapping == 3
+        (pattern,) = store.window_patterns(
+            "p", "2024-01-01T09:00Z", "2024-01-01T11:00Z"
+        )
+        assert pattern.count == 11
+        assert pattern.severity_counts == {"INFO": 8, "WARNING": 3}
+        assert pattern.first_seen == "2024-01-01T09:00:00+00:00"
+        assert pattern.last_seen == "2024-01-01T10:00:00+00:00"
+
+    def test_scopes_are_separate(self, store):
+        store.ingest("p", _entries("09:00", ["Cache warmed"]), service="a")
+
+        assert (
+            store.window_patterns("p", "2024-01-01T09:00Z", "2024-01-01T10:00Z") == []
+        )
+        assert store.window_patterns(
+            "p", "2024-01-01T09:00Z", "2024-01-01T10:00Z", service="a"
+        )
+
+    def test_users_only_see_their_own_patterns(self, store):
+        window = ("2024-01-01T09:00Z", "2024-01-01T10:00Z")
+        with _as_user(Credentials(token="alice")):
+            store.ingest("p", _entries("09:00", ["Password reset for alice"]))
+
+        with _as_user(Credentials(token="alice")):
+            assert store.window_patterns("p", *window)
+        with _as_user(Credentials(token="bob")):
+            assert store.window_patterns("p", *window) == []
+        assert store.window_patterns("p", *window) == []
+
+    def test_callers_without_identity_bypass_the_store(self, store):
+        with _as_user(Credentials(token=None)):
+            batch, ingested = store.ingest("p", _entries("09:00", ["Cache warmed"]))
+            assert (
+                store.window_patterns("p", "2024-01-01T09:00Z", "2024-01-01T10:00Z")
+                == []
+            )
+
+        assert ingested == 0
+        assert len(batch.patterns) == 1
+        assert not store._live
+
+    def test_unsaved_tree_changes_are_not_kept(self, store):
+        store.ingest("p", _entries("09:00", ["Cache warmed", "Cache warmed"]))
+        live = store._live["p/"][0]
+
+        # Covered by the first ingest, so mined but not saved
+        store.ingest("p", _entries("09:00", ["Disk full on node-1"]))
+        assert "p/" not in store._live
+        store.ingest("p", _entries("09:00", ["Cache warmed"]))
+        assert store._live["p/"][0] is not live
+        assert store._live["p/"][0].tree_changes == 0
+
+    def test_parse_tree_is_restored_from_disk(self, tmp_path):
+        path = str(tmp_path / "patterns.db")
+        first = PatternStore(path, retention_days=None)
+        batch, _ = first.ingest(
+            "p", _entries("09:00", ["User 1 logged in", "User 2 logged in"])
+        )
+        generalized = list(batch.patterns)[-1]
+        first.close()
+
+        restored = PatternStore(path, retention_days=None)
+        batch, ingested = restored.ingest("p", _entries("10:00", ["User 3 logged in"]))
+        restored.close()
+
+        # A fresh tree would template the first message verbatim
+        assert ingested == 1
+        assert list(batch.patterns) == [generalized]
+
+    def test_compare_windows_finds_new_patterns(self, store):
+        store.ingest("p", _entries("09:00", ["Cache warmed"] * 10))
+        store.ingest(
+            "p",
+            _entries("10:00", ["Cache warmed"] * 10)
+            + _entries("10:01", ["Connection refused to db:5432"] * 20, "ERROR"),
+        )
+
+        comparison = store.compare_windows(
+            "p",
+            "2024-01-01T09:00Z",
+            "2024-01-01T10:00Z",
+            "2024-01-01T10:00Z",
+            "2024-01-01T11:00Z",
+        )
+
+        assert [p.count for p in comparison.new_patterns] == [20]
+        assert comparison.new_patterns[0].severity_counts == {"ERROR": 20}
+        assert comparison.disappeared_patterns == []
+
+    def test_filters_are_separate_scopes(self, store):
+        entries = _entries("09:00", ["Cache warmed"] * 3)
+        store.ingest("p", entries, log_filter="severity>=ERROR")
+
+        _, ingested = store.ingest("p", entries, log_filter="severity>=INFO")
+
+        assert ingested == 3
+        (pattern,) = store.window_patterns(
+            "p", "2024-01-01T09:00Z", "2024-01-01T10:00Z", log_filter="severity>=ERROR"
+        )
+        assert pattern.count == 3
+
+    def test_truncated_batch_is_mined_but_not_counted(self, store):
+        entries = _entries("09:00", ["Cache warmed"] * 3)
+
+        batch, ingested = store.ingest("p", entries, complete=False)
+        _, complete = store.ingest("p", entries)
+
+        assert ingested == 0
+        assert batch.get_patterns()[0].count == 3
+        # The truncated batch did not mark its range covered
+        assert complete == 3
+
+    def test_generalized_template_keeps_its_pattern_id(self, store):
+        first, _ = store.ingest("p", _entries("09:00", ["User 1 logged in"]))
+        second, _ = store.ingest("p", _entries("10:00", ["User 2 logged in"]))
+
+        assert list(second.patterns) == list(first.patterns)
+        (pattern,) = store.window_patterns(
+            "p", "2024-01-01T09:00Z", "2024-01-01T11:00Z"
+        )
+        assert pattern.count == 2
+        assert pattern.template == "User <*> logged in"
+
+    def test_stores_sharing_a_database_stay_consistent(self, tmp_path):
+        path = str(tmp_path / "patterns.db")
+        first = PatternStore(path, retention_days=None)
+        second = PatternStore(path, retention_days=None)
+        first.ingest("p", _entries("09:00", ["User 1 logged in"]))
+
+        # Each worker learns a different second cluster
+        second.ingest("p", _entries("10:00", ["Disk full on node-1"]))
+        _, ingested = first.ingest(
+            "p",
+            _entries("11:00", ["Cache warmed"])
+            + _entries("10:00", ["Disk full on node-1"] * 2),
+        )
+        first.close()
+        second.close()
+
+        # A third worker restores the tree and cluster mapping from disk
+        third = PatternStore(path, retention_days=None)
+        third.ingest("p", _entries("12:00", ["Cache warmed", "User 2 logged in"]))
+        patterns = third.window_patterns("p", "2024-01-01T09:00Z", "2024-01-01T13:00Z")
+        third.close()
+
+        # 10:00:00 was covered by the second worker's ingest
+        assert ingested == 2
+        assert {p.template: p.count for p in patterns} == {
+            "User <*> logged in": 2,
+            "Disk full on node-1": 2,
+            "Cache warmed": 2,
+        }
+
+    def test_counts_outside_retention_are_pruned(self):
+        store = PatternStore(retention_days=1)
+        now = datetime.now(UTC)
+        recent = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        entries = [
+            {"timestamp": "2024-01-01T09:00:00Z", "textPayload": "Cache warmed"},
+            {"timestamp": recent, "textPayload": "Cache warmed"},
+        ]
+
+        _, ingested = store.ingest("p", entries)
+        store._conn.execute(
+            "INSERT INTO pattern_counts VALUES ('p/', 'old', 28401000, '', 1)"
+        )
+        deleted = store.prune()
+
+        assert ingested == 1
+        assert deleted == 1
+        (pattern,) = store.window_patterns(
+            "p", "2024-01-01T00:00Z", "2100-01-01T00:00Z"
+        )
+        assert pattern.count == 1
+        store.close()
+
+    def test_idle_scopes_are_pruned(self, store):
+        store.retention_days = 1
+        store.ingest("p", _entries("09:00", ["Cache warmed"]))
+        store._conn.execute(
+            "UPDATE pattern_scopes SET updated_at = ?", (time.time() - 2 * 86400,)
+        )
+
+        store.prune()
+
+        rows = store._conn.execute("SELECT COUNT(*) FROM pattern_scopes").fetchone()
+        assert rows == (0,)
+        store.retention_days = None
+        assert (
+            store.window_patterns("p", "2024-01-01T09:00Z", "2024-01-01T10:00Z") == []
+        )
+
+
+class TestPatternStoreTools:
+    """Tests for the tools backed by the global store."""
+
+    def test_extract_then_compare_windows(self, store):
+        with patch(
+            "sre_agent.tools.analysis.logs.pattern_store.get_pattern_store",
+            return_value=store,
+        ):
+            baseline = extract_log_patterns(
+                _listing(_entries("09:00", ["Cache warmed"] * 4)), project_id="p"
+            )
+            incident = extract_log_patterns(
+                _listing(
+                    _entries("10:00", ["Cache warmed"] * 4)
+                    + _entries("10:01", ["Disk full on node-1"] * 6, "ERROR")
+                ),
+                project_id="p",
+            )
+            result = compare_log_pattern_windows(
+                "p",
+                "2024-01-01T09:00Z",
+                "2024-01-01T10:00Z",
+                "2024-01-01T10:00Z",
+                "2024-01-01T11:00Z",
+            )
+
+        assert baseline["total_logs_processed"] == 4
+        assert incident["total_logs_processed"] == 10
+        assert result["baseline_summary"] == {"total_logs": 4, "unique_patterns": 1}
+        assert result["comparison_summary"] == {
+            "total_logs": 10,
+            "unique_patterns": 2,
+        }
+        assert len(result["anomalies"]["new_patterns"]) == 1
+
+    def test_extract_does_not_count_a_partial_listing(self, store):
+        listing = {
+            "entries": _entries("09:00", ["Cache warmed"] * 4),
+            "next_page_token": "abc",
+        }
+        with patch(
+            "sre_agent.tools.analysis.logs.pattern_store.get_pattern_store",
+            return_value=store,
+        ):
+            result = extract_log_patterns(listing, project_id="p")
+
+        assert result["total_logs_processed"] == 4
+        assert (
+            store.window_patterns("p", "2024-01-01T09:00Z", "2024-01-01T10:00Z") == []
+        )
+
+    def test_extract_does_not_count_a_plain_list(self, store):
+        with patch(
+            "sre_agent.tools.analysis.logs.pattern_store.get_pattern_store",
+            return_value=store,
+        ):
+            result = extract_log_patterns(
+                _entries("09:00", ["Cache warmed"] * 4), project_id="p"
+            )
+
+        assert result["total_logs_processed"] == 4
+        assert (
+            store.window_patterns("p", "2024-01-01T09:00Z", "2024-01-01T10:00Z") == []
+        )
+
+    def test_compare_log_patterns_uses_the_scope_pattern_ids(self, store):
+        with patch(
+            "sre_agent.tools.analysis.logs.pattern_store.get_pattern_store",
+            return_value=store,
+        ):
+            extracted = extract_log_patterns(
+                _listing(_entries("08:00", ["User 1 logged in", "User 2 logged in"])),
+                project_id="p",
+            )
+            result = compare_log_patterns(
+                _listing(_entries("09:00", ["User 3 logged in"])),
+                _listing(
+                    _entries("10:00", ["User 4 logged in"] * 3)
+                    + _entries("10:01", ["Disk full on node-1"] * 3, "ERROR")
+                ),
+                project_id="p",
+            )
+
+        # Fresh trees would template "User 3 ..." and "User 4 ..." verbatim
+        anomalies = result["anomalies"]
+        assert [p["template"] for p in anomalies["new_patterns"]] == [
+            "Disk full on node-1"
+        ]
+        assert anomalies["disappeared_patterns"] == []
+        (user,) = extracted["top_patterns"]
+        patterns = store.window_patterns("p", "2024-01-01T08:00Z", "2024-01-01T11:00Z")
+        assert {p.pattern_id: p.count for p in patterns} == {
+            user["pattern_id"]: 6,
+            anomalies["new_patterns"][0]["pattern_id"]: 3,
+        }
+
+    def test_compare_windows_rejects_bad_timestamps(self, store):
+        with patch(
+            "sre_agent.tools.analysis.logs.pattern_store.get_pattern_store",
+            return_value=store,
+        ):
+            result = compare_log_pattern_windows("p", "yesterday", "", "", "")
+
+        assert "error" in result
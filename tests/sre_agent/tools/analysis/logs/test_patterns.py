@@ -4,7 +4,11 @@ Tests the pattern extraction, comparison, and anomaly detection
 functionality using the Drain3 algorithm.
 """
 
+from unittest.mock import patch
+
+from sre_agent.tools.analysis.logs import patterns as patterns_module
 from sre_agent.tools.analysis.logs.patterns import (
+    DuplicateGroups,
     LogPattern,
     LogPatternExtractor,
     PatternComparison,
@@ -15,9 +19,35 @@ from sre_agent.tools.analysis.logs.patterns import (
     compare_patterns,
     extract_log_patterns,
     get_pattern_summary,
+    merge_shards,
+    mine_log_patterns_parallel,
 )
 
 
+def _service_logs(count):
+    """Interleaved logs from three services with disjoint message shapes."""
+    shapes = {
+        "checkout": "Order {i} charged to card ending {i}",
+        "frontend": "GET /product/{i} returned 200 in {i}ms",
+        "db": "Slow query on table orders took {i} seconds",
+    }
+    logs = []
+    for i in range(count):
+        service = list(shapes)[i % 3]
+        logs.append(
+            {
+                "timestamp": f"2024-01-01T00:00:{i % 60:02d}Z",
+                "severity": "ERROR" if i % 7 == 0 else "INFO",
+                "textPayload": shapes[service].format(i=i),
+                "resource": {
+                    "type": "k8s_container",
+                    "labels": {"container_name": service},
+                },
+            }
+        )
+    return logs
+
+
 class TestLogPatternExtractor:
     """Tests for the LogPatternExtractor class."""
 
@@ -141,6 +171,29 @@ class TestLogPatternExtractor:
         assert "k8s_container" in pattern.resources
         assert "gce_instance" in pattern.resources
 
+    def test_pattern_resources_are_bounded(self):
+        """Test that only distinct resource types are kept, up to a limit."""
+        extractor = LogPatternExtractor()
+
+        for i in range(50):
+            extractor.add_log(message="Log entry", resource=f"type_{i % 20}")
+
+        pattern = next(iter(extractor.patterns.values()))
+        assert pattern.resources == [f"type_{i}" for i in range(10)]
+
+    def test_pattern_tracks_timeline(self):
+        """Test that occurrences are bucketed per minute."""
+        extractor = LogPatternExtractor()
+
+        extractor.add_log("Log entry", "2024-01-01T10:00:01Z", "INFO")
+        extractor.add_log("Log entry", "2024-01-01T10:00:30Z", "ERROR")
+        extractor.add_log("Log entry", "2024-01-01T10:02:00Z", "ERROR")
+        extractor.add_log("Log entry", "", "ERROR")
+
+        timeline = next(iter(extractor.patterns.values())).timeline
+        assert timeline.series(timeline.head, 3).tolist() == [2, 0, 1]
+        assert timeline.series(timeline.head, 3, ["ERROR"]).tolist() == [1, 0, 1]
+
     def test_get_patterns_with_min_count(self):
         """Test filtering patterns by minimum count."""
         extractor = LogPatternExtractor()
@@ -446,6 +499,108 @@ class TestExtractLogPatterns:
         assert any(s in severity_dist for s in ["INFO", "ERROR", "WARNING"])
 
 
+class TestDuplicateCollapsing:
+    """Tests for the exact-duplicate pre-pass of extract_log_patterns."""
+
+    def _burst(self):
+        lines = [
+            "Connection refused to database-primary:5432",
+            "Request 17 completed in 12ms",
+            "Connection refused to database-primary:5432",
+            "Cache warmed",
+        ]
+        return [
+            {
+                "timestamp": f"2024-01-01T00:00:{i:02d}Z",
+                "severity": "ERROR" if i % 3 else "WARNING",
+                "textPayload": lines[i % 4] if i < 40 else lines[0],
+                "resource": {"type": "k8s_container"},
+            }
+            for i in range(60)
+        ]
+
+    def test_summary_matches_per_entry_mining(self):
+        logs = self._burst()
+        sequential = LogPatternExtractor()
+        for log in logs:
+            sequential.add_log(
+                message=log["textPayload"],
+                timestamp=log["timestamp"],
+                severity=log["severity"],
+                resource=log["resource"]["type"],
+            )
+
+        result = extract_log_patterns(logs)
+
+        assert result == sequential.get_summary(max_patterns=30)
+        top = result["top_patterns"][0]
+        assert top["count"] == 40
+        assert top["first_seen"] == "2024-01-01T00:00:00Z"
+        assert top["last_seen"] == "2024-01-01T00:00:59Z"
+
+    def test_each_distinct_message_is_mined_once(self):
+        original = LogPatternExtractor._mine
+        with patch.object(
+            LogPatternExtractor, "_mine", autospec=True, side_effect=original
+        ) as mine:
+            extract_log_patterns(self._burst())
+
+        assert mine.call_count == 3
+
+
+class TestParallelPatternMining:
+    """Tests for sharded Drain3 mining and the shard merge."""
+
+    def _sequential(self, logs):
+        extractor = LogPatternExtractor()
+        for log in logs:
+            extractor.add_log(
+                message=log["textPayload"],
+                timestamp=log["timestamp"],
+                severity=log["severity"],
+                resource=log["resource"]["type"],
+            )
+        return extractor
+
+    def test_single_shard_matches_sequential(self, sample_text_payload_logs):
+        logs = sample_text_payload_logs
+        merged = mine_log_patterns_parallel(logs, max_workers=4)
+        expected = extract_log_patterns(logs, max_patterns=50)
+
+        assert merged.get_summary(max_patterns=50) == expected
+
+    def test_merge_matches_sequential_summary(self):
+        logs = _service_logs(300)
+
+        merged = mine_log_patterns_parallel(logs, max_workers=1)
+        sequential = self._sequential(logs)
+
+        assert merged.get_summary() == sequential.get_summary()
+        pattern = merged.get_patterns()[0]
+        assert pattern.first_seen == sequential.patterns[pattern.pattern_id].first_seen
+        assert pattern.last_seen == sequential.patterns[pattern.pattern_id].last_seen
+
+    def test_result_independent_of_worker_count(self):
+        logs = _service_logs(90)
+
+        in_process = mine_log_patterns_parallel(logs, max_workers=1)
+        pooled = mine_log_patterns_parallel(logs, max_workers=3)
+
+        assert pooled.get_summary() == in_process.get_summary()
+        assert sum(p.count for p in pooled.patterns.values()) == 90
+
+    def test_process_pool_is_shared_between_calls(self):
+        logs = _service_logs(90)
+
+        mine_log_patterns_parallel(logs, max_workers=3)
+        pool = patterns_module._mining_pool
+        mine_log_patterns_parallel(logs, max_workers=2)
+
+        assert pool is not None
+        assert patterns_module._mining_pool is pool
+        assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+
+
 class TestCompareLogPatterns:
     """Tests for the compare_log_patterns tool."""
 
@@ -538,6 +693,96 @@ class TestAnalyzeLogAnomalies:
         assert len(result["recommendation"]) > 0
 
 
+def _minute_logs(minute, message, count, severity="INFO"):
+    return [
+        {
+            "timestamp": f"2024-01-01T10:{minute:02d}:{i:02d}Z",
+            "severity": severity,
+            "textPayload": message,
+        }
+        for i in range(count)
+    ]
+
+
+class TestWindowedAnomalies:
+    """Tests for rate-change and burst detection in analyze_log_anomalies."""
+
+    @staticmethod
+    def _incident_logs():
+        logs = []
+        for minute in range(30):
+            logs += _minute_logs(minute, "Cache warmed", 2)
+            if minute >= 15:
+                logs += _minute_logs(
+                    minute, "Connection refused to db:5432", 3, "ERROR"
+                )
+        logs += _minute_logs(20, "Disk full on node-1", 20, "ERROR")
+        return logs
+
+    def test_timelines_match_sequential_mining(self):
+        logs = self._incident_logs()
+        sequential = LogPatternExtractor()
+        for entry in logs:
+            sequential.add_log(
+                entry["textPayload"], entry["timestamp"], entry["severity"]
+            )
+
+        collapsed = LogPatternExtractor()
+        groups = DuplicateGroups()
+        for pos, entry in enumerate(logs):
+            groups.add(pos, entry)
+        merge_shards(collapsed, [groups.mine(collapsed)])
+
+        for pattern_id, pattern in sequential.patterns.items():
+            timeline = collapsed.patterns[pattern_id].timeline
+            assert timeline.head == pattern.timeline.head
+            assert (
+                timeline.series(timeline.head, 30).tolist()
+                == pattern.timeline.series(timeline.head, 30).tolist()
+            )
+
+    def test_rate_changes_and_bursts(self):
+        result = analyze_log_anomalies(self._incident_logs(), window_minutes=15)
+
+        assert result["window"] == {
+            "start": "2024-01-01T10:15:00+00:00",
+            "end": "2024-01-01T10:29:00+00:00",
+            "minutes": 15,
+        }
+        changes = {r["template"]: r for r in result["rate_changes"]}
+        assert set(changes) == {
+            "Connection refused to db:5432",
+            "Disk full on node-1",
+        }
+        assert changes["Connection refused to db:5432"]["window_count"] == 45
+        assert changes["Connection refused to db:5432"]["change_pct"] is None
+        (burst,) = result["bursts"]
+        assert burst["template"] == "Disk full on node-1"
+        assert burst["minute"] == "2024-01-01T10:20:00+00:00"
+        assert burst["count"] == 20
+
+    def test_increase_is_reported_with_change_pct(self):
+        logs = []
+        for minute in range(10):
+            logs += _minute_logs(minute, "Retrying request", 1 if minute < 5 else 4)
+
+        result = analyze_log_anomalies(logs, window_minutes=5)
+
+        (change,) = result["rate_changes"]
+        assert (change["baseline_count"], change["window_count"]) == (5, 20)
+        assert change["change_pct"] == 300.0
+        assert result["bursts"] == []
+
+    def test_short_or_untimed_logs_report_nothing(self):
+        untimed = [{"textPayload": "Cache warmed"}] * 10
+        assert analyze_log_anomalies(untimed)["window"] is None
+
+        # All logs inside the window: no baseline, too short for bursts
+        result = analyze_log_anomalies(_minute_logs(0, "Cache warmed", 10))
+        assert result["rate_changes"] == []
+        assert result["bursts"] == []
+
+
 class TestGetPatternSummary:
     """Tests for the get_pattern_summary function."""
 
@@ -0,0 +1,71 @@
+"""Unit tests for the per-minute pattern timeline ring buffer."""
+
+from sre_agent.tools.analysis.logs.timeline import (
+    PatternTimeline,
+    epoch_minute,
+    minute_isoformat,
+    stack_series,
+)
+
+# 2024-01-01T00:00:00Z
+_MINUTE = 28_401_120
+
+
+class TestEpochMinute:
+    """Tests for timestamp to epoch minute conversion."""
+
+    def test_utc_and_offset_timestamps(self):
+        assert epoch_minute("2024-01-01T00:00:59.999Z") == _MINUTE
+        assert epoch_minute("2024-01-01T00:01:00+00:00") == _MINUTE + 1
+        assert epoch_minute("2024-01-01T01:02:00+01:00") == _MINUTE + 2
+
+    def test_invalid_timestamps(self):
+        assert epoch_minute("") is None
+        assert epoch_minute(None) is None
+        assert epoch_minute("2024-13-01T00:00:00Z") is None
+
+    def test_minute_isoformat(self):
+        assert minute_isoformat(_MINUTE) == "2024-01-01T00:00:00+00:00"
+
+
+class TestPatternTimeline:
+    """Tests for PatternTimeline."""
+
+    def test_counts_by_minute_and_severity(self):
+        timeline = PatternTimeline(size=10)
+        timeline.add(_MINUTE, "ERROR")
+        timeline.add(_MINUTE, "INFO", 2)
+        timeline.add(_MINUTE + 2, "unknown")
+
+        assert timeline.series(_MINUTE + 2, 3).tolist() == [3, 0, 1]
+        assert timeline.series(_MINUTE + 2, 3, ["ERROR"]).tolist() == [1, 0, 0]
+        assert timeline.series(_MINUTE + 2, 3, ["DEFAULT"]).tolist() == [0, 0, 1]
+
+    def test_old_minutes_are_overwritten(self):
+        timeline = PatternTimeline(size=4)
+        for offset in range(6):
+            timeline.add(_MINUTE + offset, "INFO", offset + 1)
+
+        # Only the last 4 minutes are kept; earlier ones read as zero
+        assert timeline.series(_MINUTE + 5, 6).tolist() == [0, 0, 3, 4, 5, 6]
+        # Late entries outside the window are dropped, inside are counted
+        timeline.add(_MINUTE, "INFO")
+        timeline.add(_MINUTE + 3, "INFO")
+        assert timeline.series(_MINUTE + 5, 4).tolist() == [3, 5, 5, 6]
+
+    def test_large_gap_clears_the_buffer(self):
+        timeline = PatternTimeline(size=4)
+        timeline.add(_MINUTE, "INFO", 5)
+        timeline.add(_MINUTE + 100, "INFO")
+
+        assert timeline.series(_MINUTE + 100, 4).tolist() == [0, 0, 0, 1]
+
+    def test_stack_series(self):
+        first, second, empty = PatternTimeline(), PatternTimeline(), PatternTimeline()
+        first.add(_MINUTE, "INFO")
+        second.add(_MINUTE + 1, "ERROR", 4)
+
+        stacked = stack_series([first, second, empty], _MINUTE + 1, 2)
+
+        assert stacked.tolist() == [[1, 0], [0, 4], [0, 0]]
+        assert stack_series([], _MINUTE, 3).shape == (0, 3)
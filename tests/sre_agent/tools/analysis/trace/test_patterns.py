@@ -1,13 +1,23 @@
 import json
+from unittest.mock import patch
 
 import pytest
 
+from sre_agent.tools.analysis.trace.pattern_engine import (
+    DEFAULT_DETECTORS,
+    PatternDetector,
+    PatternEngine,
+    SpanIndex,
+)
 from sre_agent.tools.analysis.trace.patterns import (
     detect_all_sre_patterns,
     detect_cascading_timeout,
     detect_connection_pool_issues,
     detect_retry_storm,
+    detect_sre_patterns_across_traces,
 )
+from sre_agent.tools.clients.trace_batch import BatchFetchStats
+from sre_agent.tools.common.trace_frame import as_trace_frame
 
 
 @pytest.fixture
@@ -125,3 +135,78 @@ def test_no_patterns_found():
     result = detect_all_sre_patterns(json.dumps(trace))
     assert result["patterns_detected"] == 0
     assert result["overall_health"] == "healthy"
+
+
+def test_pattern_engine_visits_each_trace_once(
+    retry_storm_trace, connection_pool_trace
+):
+    calls = []
+
+    class CountingDetector(PatternDetector):
+        name = "counting"
+
+        def __init__(self):
+            self.rows = []
+            self.groups = 0
+
+        def visit_span(self, index, row):
+            self.rows.append(row)
+
+        def visit_name_group(self, index, name_id, rows):
+            self.groups += 1
+
+        def finish(self, index):
+            calls.append(self)
+            return {"rows": self.rows, "groups": self.groups}
+
+    engine = PatternEngine([CountingDetector, *DEFAULT_DETECTORS])
+    results = engine.run(as_trace_frame(retry_storm_trace))
+
+    assert results["counting"] == {"rows": [0, 1, 2], "groups": 1}
+    assert results["retry_storm"]["has_retry_storm"] is True
+    assert results["connection_pool"]["issues_found"] == 0
+
+    # Detectors are created per trace, so state never leaks between runs
+    results = engine.run(as_trace_frame(connection_pool_trace))
+    assert results["counting"] == {"rows": [0], "groups": 1}
+    assert calls[0] is not calls[1]
+
+
+def test_span_index_orders_name_groups_by_start(retry_storm_trace):
+    spans = list(reversed(retry_storm_trace["spans"]))
+    index = SpanIndex(as_trace_frame({"trace_id": "t", "spans": spans}))
+
+    (rows,) = index.rows_by_name.values()
+    assert [spans[r]["span_id"] for r in rows] == ["s1", "s2", "s3"]
+
+
+@patch("sre_agent.tools.analysis.trace.patterns.fetch_traces_batch")
+def test_detect_sre_patterns_across_traces(
+    mock_fetch_batch, retry_storm_trace, cascading_timeout_trace
+):
+    clean = {
+        "trace_id": "clean-trace",
+        "spans": [
+            {
+                "span_id": "1",
+                "name": "healthy-op",
+                "start_time": "2023-01-01T12:00:00Z",
+                "end_time": "2023-01-01T12:00:00.010Z",
+            }
+        ],
+    }
+    mock_fetch_batch.return_value = (
+        [retry_storm_trace, cascading_timeout_trace, clean],
+        BatchFetchStats(requested=4, fetched=3, failed=1),
+    )
+
+    result = detect_sre_patterns_across_traces(["a", "b", "c", "d"])
+
+    assert result["traces_scanned"] == 3
+    assert result["traces_with_patterns"] == 2
+    assert result["health_counts"]["critical"] == 1
+    assert result["health_counts"]["healthy"] == 1
+    assert result["pattern_counts"] == {"cascading_timeout": 1, "retry_storm": 1}
+    # Most severe first
+    assert result["affected_traces"][0]["trace_id"] == "timeout-trace"
+    assert result["fetch_stats"]["failed"] == 1
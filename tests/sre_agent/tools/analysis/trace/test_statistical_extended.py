@@ -6,6 +6,7 @@ from sre_agent.tools.analysis.trace.statistical_analysis import (
     detect_latency_anomalies,
     perform_causal_analysis,
 )
+from sre_agent.tools.clients.trace_batch import BatchFetchStats
 
 
 @patch("sre_agent.tools.analysis.trace.statistical_analysis.fetch_trace_data")
@@ -47,11 +48,7 @@ def test_analyze_critical_path_success(mock_fetch):
 
 
 @patch("sre_agent.tools.analysis.trace.statistical_analysis.fetch_trace_data")
-@patch("sre_agent.tools.analysis.trace.statistical_analysis.analyze_critical_path")
-@patch("sre_agent.tools.analysis.trace.analysis.build_call_graph")
-def test_perform_causal_analysis_success(
-    mock_build_graph, mock_analyze_critical, mock_fetch
-):
+def test_perform_causal_analysis_success(mock_fetch):
     # Baseline: Span A takes 10ms
     # Target: Span A takes 100ms
     baseline_data = {
@@ -78,28 +75,21 @@ def test_perform_causal_analysis_success(
     }
     mock_fetch.side_effect = [baseline_data, target_data]
 
-    # Mock critical path logic
-    mock_analyze_critical.return_value = {
-        "critical_path": [{"span_id": "t1", "self_time_ms": 100}]
-    }
-
-    # Mock call graph logic
-    mock_build_graph.return_value = {
-        "span_tree": [{"span_id": "t1", "depth": 0, "children": []}]
-    }
-
     result = perform_causal_analysis("base", "target")
 
+    # Each trace is fetched once; critical path and depths come from its index
+    assert mock_fetch.call_count == 2
     candidates = result["root_cause_candidates"]
     assert len(candidates) > 0
     top = candidates[0]
     assert top["span_name"] == "spanA"
     assert top["diff_ms"] == 90
     assert top["is_likely_root_cause"] is True
+    assert top["self_time_ms"] == 100
 
 
-@patch("sre_agent.tools.analysis.trace.statistical_analysis._fetch_traces_parallel")
-def test_analyze_trace_patterns_mocked_fetch(mock_fetch_parallel):
+@patch("sre_agent.tools.analysis.trace.statistical_analysis.fetch_traces_batch")
+def test_analyze_trace_patterns_mocked_fetch(mock_fetch_batch):
     t1 = {
         "trace_id": "t1",
         "duration_ms": 200,
@@ -115,7 +105,7 @@ def test_analyze_trace_patterns_mocked_fetch(mock_fetch_parallel):
         "duration_ms": 200,
         "spans": [{"name": "spanA", "duration_ms": 145}],
     }
-    mock_fetch_parallel.return_value = [t1, t2, t3]
+    mock_fetch_batch.return_value = ([t1, t2, t3], BatchFetchStats(fetched=3))
 
     result = analyze_trace_patterns(["t1", "t2", "t3"])
 
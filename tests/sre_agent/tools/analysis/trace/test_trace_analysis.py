@@ -53,6 +53,16 @@ def test_build_call_graph_dict(sample_trace_dict):
     assert graph["total_spans"] == 2
 
 
+def test_build_call_graph_result_can_be_modified(sample_trace_dict):
+    """Changing a call graph's fields changes neither the cached nor the next one."""
+    graph = build_call_graph(sample_trace_dict)
+    graph["span_tree"] = []
+    graph.pop("root_spans")
+
+    assert len(build_call_graph(sample_trace_dict)["span_tree"]) == 1
+    assert build_call_graph(sample_trace_dict)["root_spans"] == ["root"]
+
+
 def test_build_call_graph_str(sample_trace_str):
     """Test build_call_graph with a JSON string input (The Fix)."""
     graph = build_call_graph(sample_trace_str)
@@ -0,0 +1,186 @@
+import asyncio
+import gc
+import weakref
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from sre_agent.tools.clients import factory
+
+
+class _FakeAsyncClient:
+    def __init__(self, credentials=None):
+        self.credentials = credentials
+
+
+class _FakeClient:
+    created = 0
+
+    def __init__(self, credentials=None):
+        self.credentials = credentials
+        _FakeClient.created += 1
+
+
+@pytest.fixture(autouse=True)
+def _no_user_credentials():
+    with patch.object(factory, "get_current_credentials_or_none", return_value=None):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_clients():
+    _FakeClient.created = 0
+    with (
+        patch.object(factory, "_clients", {}),
+        patch.object(factory, "_user_clients", factory._UserClientCache(max_size=2)),
+    ):
+        yield
+
+
+def _as_user(creds):
+    return patch.object(factory, "get_current_credentials_or_none", return_value=creds)
+
+
+def _expiring_in(seconds):
+    # google-auth keeps expiry as naive UTC
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).replace(
+        tzinfo=None
+    )
+
+
+def test_async_clients_are_cached_per_event_loop():
+    async def get_twice():
+        return (
+            factory._get_async_client("fake", _FakeAsyncClient),
+            factory._get_async_client("fake", _FakeAsyncClient),
+        )
+
+    # Explicit loops: asyncio.run() may reuse one loop once nest_asyncio is
+    # applied elsewhere in the test session.
+    first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        first_a, first_b = first_loop.run_until_complete(get_twice())
+        second_a, _ = second_loop.run_until_complete(get_twice())
+    finally:
+        first_loop.close()
+        second_loop.close()
+
+    assert first_a is first_b
+    assert second_a is not first_a
+
+
+def test_async_client_requires_running_loop():
+    with pytest.raises(RuntimeError):
+        factory._get_async_client("fake", _FakeAsyncClient)
+
+
+@pytest.mark.asyncio
+async def test_async_client_with_user_credentials_is_not_shared():
+    creds = MagicMock()
+    with patch.object(factory, "get_current_credentials_or_none", return_value=creds):
+        client = factory._get_async_client("fake", _FakeAsyncClient)
+
+    assert client.credentials is creds
+    assert factory._get_async_client("fake", _FakeAsyncClient) is not client
+
+
+def test_user_clients_are_cached_by_token():
+    # The auth middleware builds new credentials for every request.
+    with _as_user(Credentials(token="alice")):
+        first = factory._get_client("fake", _FakeClient)
+    with _as_user(Credentials(token="alice")):
+        second = factory._get_client("fake", _FakeClient)
+    with _as_user(Credentials(token="bob")):
+        other = factory._get_client("fake", _FakeClient)
+
+    assert second is first
+    assert other is not first
+    assert other.credentials.token == "bob"
+    assert _FakeClient.created == 2
+
+
+def test_default_client_is_not_built_for_user_requests():
+    with _as_user(Credentials(token="alice")):
+        factory._get_client("fake", _FakeClient)
+
+    assert "fake" not in factory._clients
+    assert factory._get_client("fake", _FakeClient).credentials is None
+
+
+def test_user_client_expires_with_its_token():
+    expiry = _expiring_in(3600)
+    with _as_user(Credentials(token="alice", expiry=expiry)):
+        first = factory._get_client("fake", _FakeClient)
+    with _as_user(Credentials(token="alice", expiry=expiry)):
+        assert factory._get_client("fake", _FakeClient) is first
+
+    expiring = _expiring_in(10)
+    with _as_user(Credentials(token="carol", expiry=expiring)):
+        factory._get_client("fake", _FakeClient)
+    with _as_user(Credentials(token="carol", expiry=expiring)):
+        factory._get_client("fake", _FakeClient)
+
+    assert _FakeClient.created == 3
+    assert len(factory._user_clients) == 1
+
+
+def test_least_recently_used_user_client_is_evicted():
+    def client_for(token):
+        with _as_user(Credentials(token=token)):
+            return factory._get_client("fake", _FakeClient)
+
+    alice = client_for("alice")
+    client_for("bob")
+    client_for("alice")
+    client_for("carol")  # evicts bob
+
+    assert client_for("alice") is alice
+    client_for("bob")
+    assert _FakeClient.created == 4
+    assert len(factory._user_clients) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_user_clients_are_cached_per_token():
+    with _as_user(Credentials(token="alice")):
+        first = factory._get_async_client("fake", _FakeAsyncClient)
+    with _as_user(Credentials(token="alice")):
+        second = factory._get_async_client("fake", _FakeAsyncClient)
+
+    assert second is first
+
+
+def test_user_clients_without_a_token_are_not_cached():
+    for _ in range(2):
+        with _as_user(Credentials(token=None)):
+            factory._get_client("fake", _FakeClient)
+
+    assert _FakeClient.created == 2
+    assert len(factory._user_clients) == 0
+
+
+def test_user_async_clients_are_dropped_with_their_loop():
+    async def get_client():
+        return factory._get_async_client("fake", _FakeAsyncClient)
+
+    first_loop = asyncio.new_event_loop()
+    with _as_user(Credentials(token="alice")):
+        first = first_loop.run_until_complete(get_client())
+        assert first_loop.run_until_complete(get_client()) is first
+    first_loop.close()
+    first_loop_ref = weakref.ref(first_loop)
+    del first_loop
+    gc.collect()
+
+    second_loop = asyncio.new_event_loop()
+    try:
+        with _as_user(Credentials(token="alice")):
+            second = second_loop.run_until_complete(get_client())
+    finally:
+        second_loop.close()
+
+    assert first_loop_ref() is None
+    assert second is not first
+    assert len(factory._user_clients) == 1
@@ -1,11 +1,17 @@
+import asyncio
 import json
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
 from sre_agent.tools.clients.logging import list_log_entries
 
 
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
 def create_mock_page(entries, next_token=None):
     page = MagicMock()
     page.entries = entries
@@ -14,7 +20,7 @@ def create_mock_page(entries, next_token=None):
     return page
 
 
-@patch("sre_agent.tools.clients.logging.get_logging_client")
+@patch("sre_agent.tools.clients.logging.get_logging_async_client")
 @pytest.mark.asyncio
 async def test_list_log_entries_success_text_payload(mock_get_client):
     mock_client = mock_get_client.return_value
@@ -41,8 +47,8 @@ async def test_list_log_entries_success_text_payload(mock_get_client):
 
     mock_pager = MagicMock()
     mock_page = create_mock_page([mock_entry], next_token=None)
-    mock_pager.pages = iter([mock_page])
-    mock_client.list_log_entries.return_value = mock_pager
+    mock_pager.pages = _aiter([mock_page])
+    mock_client.list_log_entries = AsyncMock(return_value=mock_pager)
 
     result = await list_log_entries("my-project", "filter")
     data = json.loads(result)
@@ -59,15 +65,15 @@ async def test_list_log_entries_success_text_payload(mock_get_client):
     assert kwargs["request"]["page_size"] == 10
 
 
-@patch("sre_agent.tools.clients.logging.get_logging_client")
+@patch("sre_agent.tools.clients.logging.get_logging_async_client")
 @pytest.mark.asyncio
 async def test_list_log_entries_pagination(mock_get_client):
     mock_client = mock_get_client.return_value
 
     mock_pager = MagicMock()
     mock_page = create_mock_page([], next_token="token-abc")
-    mock_pager.pages = iter([mock_page])
-    mock_client.list_log_entries.return_value = mock_pager
+    mock_pager.pages = _aiter([mock_page])
+    mock_client.list_log_entries = AsyncMock(return_value=mock_pager)
 
     result = await list_log_entries("my-project", "filter", limit=5)
     data = json.loads(result)
@@ -82,7 +88,7 @@ async def test_list_log_entries_pagination(mock_get_client):
     assert last_call.kwargs["request"]["page_token"] == "token-abc"
 
 
-@patch("sre_agent.tools.clients.logging.get_logging_client")
+@patch("sre_agent.tools.clients.logging.get_logging_async_client")
 @pytest.mark.asyncio
 async def test_list_log_entries_json_payload(mock_get_client):
     mock_client = mock_get_client.return_value
@@ -109,8 +115,8 @@ async def test_list_log_entries_json_payload(mock_get_client):
 
     mock_pager = MagicMock()
     mock_page = create_mock_page([mock_entry])
-    mock_pager.pages = iter([mock_page])
-    mock_client.list_log_entries.return_value = mock_pager
+    mock_pager.pages = _aiter([mock_page])
+    mock_client.list_log_entries = AsyncMock(return_value=mock_pager)
 
     result = await list_log_entries("p", "f")
     data = json.loads(result)
@@ -150,3 +156,88 @@ async def test_list_error_events_error(mock_client_cls):
     result = await list_error_events("p")
     data = json.loads(result)
     assert "error" in data
+
+
+def _proto_page(start, count, next_token=""):
+    from google.cloud import logging_v2
+
+    return logging_v2.types.ListLogEntriesResponse(
+        entries=[
+            {"text_payload": f"message {i}", "insert_id": str(i), "severity": 500}
+            for i in range(start, start + count)
+        ],
+        next_page_token=next_token,
+    )
+
+
+def _tracking_pages(pages, fetched):
+    async def gen():
+        for i, page in enumerate(pages):
+            fetched.append(i)
+            yield page
+
+    return gen()
+
+
+@patch("sre_agent.tools.clients.logging.get_logging_async_client")
+@pytest.mark.asyncio
+async def test_iter_log_entries_streams_across_pages(mock_get_client):
+    from sre_agent.tools.clients.logging import iter_log_entries
+
+    fetched = []
+    pages = [_proto_page(0, 3, "t1"), _proto_page(3, 3, "t2"), _proto_page(6, 2)]
+    mock_pager = MagicMock()
+    mock_pager.pages = _tracking_pages(pages, fetched)
+    mock_client = mock_get_client.return_value
+    mock_client.list_log_entries = AsyncMock(return_value=mock_pager)
+
+    seen = []
+    async for entry in iter_log_entries("p", "filter", page_size=3):
+        # The next page is requested while the current one is consumed
+        await asyncio.sleep(0)
+        seen.append((entry["insert_id"], len(fetched)))
+
+    assert [insert_id for insert_id, _ in seen] == [str(i) for i in range(8)]
+    assert seen[0][1] == 2
+    assert seen[3][1] == 3
+    request = mock_client.list_log_entries.call_args.kwargs["request"]
+    assert request["page_size"] == 3
+    assert request["order_by"] == "timestamp desc"
+
+
+@patch("sre_agent.tools.clients.logging.get_logging_async_client")
+@pytest.mark.asyncio
+async def test_iter_log_entries_stops_at_limits(mock_get_client):
+    from sre_agent.tools.clients.logging import iter_log_entries
+
+    fetched = []
+    pages = [_proto_page(0, 3, "t1"), _proto_page(3, 3, "t2"), _proto_page(6, 3)]
+    mock_pager = MagicMock()
+    mock_pager.pages = _tracking_pages(pages, fetched)
+    mock_get_client.return_value.list_log_entries = AsyncMock(return_value=mock_pager)
+
+    entries = [e async for e in iter_log_entries("p", "f", max_entries=5)]
+
+    assert [e["insert_id"] for e in entries] == ["0", "1", "2", "3", "4"]
+    # The second page satisfies the limit, so the third is never requested
+    assert fetched == [0, 1]
+
+    mock_pager.pages = _aiter([_proto_page(0, 10)])
+    entries = [e async for e in iter_log_entries("p", "f", max_bytes=1)]
+    assert entries == []
+
+
+@patch("sre_agent.tools.clients.logging.get_logging_async_client")
+@pytest.mark.asyncio
+async def test_iter_log_entries_feeds_pattern_extraction(mock_get_client):
+    from sre_agent.tools.analysis.logs import extract_log_patterns_from_stream
+    from sre_agent.tools.clients.logging import iter_log_entries
+
+    mock_pager = MagicMock()
+    mock_pager.pages = _aiter([_proto_page(0, 4, "t1"), _proto_page(4, 4)])
+    mock_get_client.return_value.list_log_entries = AsyncMock(return_value=mock_pager)
+
+    summary = await extract_log_patterns_from_stream(iter_log_entries("p", "f"))
+
+    assert summary["total_logs_processed"] == 8
+    assert summary["severity_distribution"] == {"ERROR": 8}
@@ -6,8 +6,13 @@ import pytest
 from sre_agent.tools.clients.monitoring import list_time_series, query_promql
 
 
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
 @pytest.mark.asyncio
-@mock.patch("sre_agent.tools.clients.monitoring.get_monitoring_client")
+@mock.patch("sre_agent.tools.clients.monitoring.get_monitoring_async_client")
 async def test_list_time_series(mock_get_client):
     """Test list_time_series tool."""
     mock_client = mock.Mock()
@@ -25,7 +30,7 @@ async def test_list_time_series(mock_get_client):
     mock_point.value.double_value = 100.0
     mock_ts.points = [mock_point]
 
-    mock_client.list_time_series.return_value = [mock_ts]
+    mock_client.list_time_series = mock.AsyncMock(return_value=_aiter([mock_ts]))
 
     result_json = await list_time_series("p1", "filter", 60)
     result = json.loads(result_json)
@@ -58,11 +63,11 @@ async def test_query_promql(mock_auth_default, mock_session_cls):
 
 
 @pytest.mark.asyncio
-@mock.patch("sre_agent.tools.clients.monitoring.get_monitoring_client")
+@mock.patch("sre_agent.tools.clients.monitoring.get_monitoring_async_client")
 async def test_list_time_series_error(mock_get_client):
     """Test list_time_series tool error handling."""
     mock_client = mock_get_client.return_value
-    mock_client.list_time_series.side_effect = Exception("API error")
+    mock_client.list_time_series = mock.AsyncMock(side_effect=Exception("API error"))
 
     result_json = await list_time_series("p1", "filter")
     result = json.loads(result_json)
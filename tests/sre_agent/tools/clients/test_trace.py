@@ -1,5 +1,5 @@
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from google.cloud import logging_v2, trace_v1
@@ -13,6 +13,11 @@ from tests.fixtures.synthetic_otel_data import (
 )
 
 
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
 @pytest.fixture
 def mock_trace_client():
     """Mock Cloud Trace API client."""
@@ -31,7 +36,7 @@ class TestFetchTrace:
     """Tests for fetch_trace function."""
 
     @pytest.mark.asyncio
-    @patch("sre_agent.tools.clients.trace.get_trace_client")
+    @patch("sre_agent.tools.clients.trace.get_trace_async_client")
     async def test_fetch_trace_success(self, mock_get_client):
         """Test successful trace fetch."""
         # Setup mock
@@ -46,7 +51,7 @@ class TestFetchTrace:
         mock_trace.project_id = "test-project"
         mock_trace.spans = []
 
-        mock_client.get_trace.return_value = mock_trace
+        mock_client.get_trace = AsyncMock(return_value=mock_trace)
 
         # Execute
         result_json = await trace_client.fetch_trace(
@@ -60,7 +65,7 @@ class TestFetchTrace:
         mock_client.get_trace.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("sre_agent.tools.clients.trace.get_trace_client")
+    @patch("sre_agent.tools.clients.trace.get_trace_async_client")
     async def test_fetch_trace_with_invalid_trace_id(self, mock_get_client):
         """Test fetch trace with invalid trace ID."""
         mock_client = MagicMock()
@@ -69,7 +74,9 @@ class TestFetchTrace:
         # Setup mock to raise exception
         from google.api_core import exceptions
 
-        mock_client.get_trace.side_effect = exceptions.NotFound("Trace not found")
+        mock_client.get_trace = AsyncMock(
+            side_effect=exceptions.NotFound("Trace not found")
+        )
 
         # Execute
         result_json = await trace_client.fetch_trace(
@@ -81,12 +88,44 @@ class TestFetchTrace:
         assert "error" in result
         assert "404" in result["error"]
 
+    @pytest.mark.asyncio
+    @patch("sre_agent.tools.clients.trace.get_trace_client")
+    async def test_fetch_trace_cache_hit_shares_parsed_trace(self, mock_get_client):
+        """Cache hits return the shared parsed trace without re-decoding JSON."""
+        from sre_agent.tools.common.cache import get_data_cache
+        from sre_agent.tools.common.trace_frame import TraceFrame
+
+        get_data_cache().clear()
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+        trace_id = generate_trace_id()
+        mock_client.get_trace.return_value = trace_v1.Trace(
+            project_id="test-project",
+            trace_id=trace_id,
+            spans=[trace_v1.TraceSpan(span_id=1, name="root")],
+        )
+
+        first = trace_client.fetch_trace_data(trace_id, "test-project")
+        assert isinstance(get_data_cache().get(f"trace:{trace_id}"), TraceFrame)
+
+        with patch("sre_agent.tools.clients.trace.json.loads") as mock_loads:
+            second = trace_client.fetch_trace_data(trace_id, "test-project")
+            result_json = await trace_client.fetch_trace(
+                project_id="test-project", trace_id=trace_id
+            )
+            mock_loads.assert_not_called()
+
+        assert second is first
+        assert json.loads(result_json)["trace_id"] == trace_id
+        mock_client.get_trace.assert_called_once()
+        get_data_cache().clear()
+
 
 class TestListTraces:
     """Tests for list_traces function."""
 
     @pytest.mark.asyncio
-    @patch("sre_agent.tools.clients.trace.get_trace_client")
+    @patch("sre_agent.tools.clients.trace.get_trace_async_client")
     async def test_list_traces_success(self, mock_get_client):
         """Test successful trace listing."""
         mock_client = MagicMock()
@@ -101,7 +140,7 @@ class TestListTraces:
             mock_trace.spans = []  # Needed for duration calc
             mock_traces.append(mock_trace)
 
-        mock_client.list_traces.return_value = mock_traces
+        mock_client.list_traces = AsyncMock(return_value=_aiter(mock_traces))
 
         # Execute
         result_json = await trace_client.list_traces(
@@ -115,13 +154,13 @@ class TestListTraces:
         mock_client.list_traces.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("sre_agent.tools.clients.trace.get_trace_client")
+    @patch("sre_agent.tools.clients.trace.get_trace_async_client")
     async def test_list_traces_with_time_filter(self, mock_get_client):
         """Test trace listing with time filter."""
         mock_client = MagicMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.list_traces.return_value = []
+        mock_client.list_traces = AsyncMock(return_value=_aiter([]))
 
         # Execute with time filter
         await trace_client.list_traces(
@@ -139,7 +178,7 @@ class TestGetLogsForTrace:
     """Tests for get_logs_for_trace function."""
 
     @pytest.mark.asyncio
-    @patch("sre_agent.tools.clients.logging.get_logging_client")
+    @patch("sre_agent.tools.clients.logging.get_logging_async_client")
     async def test_get_logs_for_trace_success(self, mock_get_client):
         """Test successful log retrieval for trace."""
         mock_client = MagicMock()
@@ -172,8 +211,8 @@ class TestGetLogsForTrace:
         mock_page.entries = mock_entries
         mock_page.__iter__.return_value = iter(mock_entries)
         mock_page.next_page_token = None
-        mock_pager.pages = iter([mock_page])
-        mock_client.list_log_entries.return_value = mock_pager
+        mock_pager.pages = _aiter([mock_page])
+        mock_client.list_log_entries = AsyncMock(return_value=mock_pager)
 
         # Execute
         result_json = await list_log_entries(
@@ -192,7 +231,7 @@ class TestFindExampleTraces:
     """Tests for find_example_traces function."""
 
     @pytest.mark.asyncio
-    @patch("sre_agent.tools.clients.trace.get_trace_client")
+    @patch("sre_agent.tools.clients.trace.get_trace_async_client")
     async def test_find_example_traces_with_error_filter(self, mock_get_client):
         """Test finding example traces with error filter."""
         mock_client = MagicMock()
@@ -214,7 +253,9 @@ class TestFindExampleTraces:
             mock_trace.spans = [mock_span]
             mock_traces.append(mock_trace)
 
-        mock_client.list_traces.return_value = mock_traces
+        mock_client.list_traces = AsyncMock(
+            side_effect=lambda **kwargs: _aiter(mock_traces)
+        )
 
         # Execute
         result_json = await trace_client.find_example_traces(
@@ -298,7 +339,7 @@ class TestListLogEntries:
     """Tests for list_log_entries function."""
 
     @pytest.mark.asyncio
-    @patch("sre_agent.tools.clients.logging.get_logging_client")
+    @patch("sre_agent.tools.clients.logging.get_logging_async_client")
     async def test_list_log_entries_success(self, mock_get_client):
         """Test successful log entry listing."""
         mock_client = MagicMock()
@@ -327,8 +368,8 @@ class TestListLogEntries:
         mock_page.entries = mock_entries
         mock_page.__iter__.return_value = iter(mock_entries)
         mock_page.next_page_token = None
-        mock_pager.pages = iter([mock_page])
-        mock_client.list_log_entries.return_value = mock_pager
+        mock_pager.pages = _aiter([mock_page])
+        mock_client.list_log_entries = AsyncMock(return_value=mock_pager)
 
         # Execute
         result_json = await list_log_entries(
@@ -346,8 +387,8 @@ class TestIntegration:
     """Integration tests for trace client tools."""
 
     @pytest.mark.asyncio
-    @patch("sre_agent.tools.clients.trace.get_trace_client")
-    @patch("sre_agent.tools.clients.logging.get_logging_client")
+    @patch("sre_agent.tools.clients.trace.get_trace_async_client")
+    @patch("sre_agent.tools.clients.logging.get_logging_async_client")
     async def test_fetch_trace_and_logs_workflow(
         self, mock_get_logging, mock_get_trace
     ):
@@ -360,7 +401,7 @@ class TestIntegration:
         mock_trace.project_id = "test-project"
         mock_trace.spans = []
 
-        mock_get_trace.return_value.get_trace.return_value = mock_trace
+        mock_get_trace.return_value.get_trace = AsyncMock(return_value=mock_trace)
 
         # Setup logging mock
         mock_log_entry = MagicMock()
@@ -378,8 +419,10 @@ class TestIntegration:
         mock_page.entries = [mock_log_entry]
         mock_page.__iter__.return_value = iter([mock_log_entry])
         mock_page.next_page_token = None
-        mock_pager.pages = iter([mock_page])
-        mock_get_logging.return_value.list_log_entries.return_value = mock_pager
+        mock_pager.pages = _aiter([mock_page])
+        mock_get_logging.return_value.list_log_entries = AsyncMock(
+            return_value=mock_pager
+        )
 
         # Execute workflow
         trace_result = await trace_client.fetch_trace(
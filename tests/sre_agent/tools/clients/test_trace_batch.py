@@ -0,0 +1,129 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.api_core import exceptions
+from google.cloud import trace_v1
+
+from sre_agent.tools.clients.trace_batch import TraceBatchFetcher, fetch_traces_batch
+from sre_agent.tools.common.cache import get_data_cache
+
+
+@pytest.fixture
+def mock_client():
+    get_data_cache().clear()
+    client = MagicMock()
+    with patch(
+        "sre_agent.tools.clients.trace.get_trace_async_client", return_value=client
+    ):
+        yield client
+    get_data_cache().clear()
+
+
+@pytest.mark.asyncio
+async def test_iter_traces_respects_concurrency_limit(mock_client):
+    in_flight = 0
+    peak = 0
+
+    async def get_trace(project_id, trace_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return trace_v1.Trace(project_id=project_id, trace_id=trace_id)
+
+    mock_client.get_trace = AsyncMock(side_effect=get_trace)
+    fetcher = TraceBatchFetcher("p", max_concurrency=4)
+
+    ids = [f"t{i}" for i in range(40)]
+    traces = [t async for t in fetcher.iter_traces(ids)]
+
+    assert sorted(t["trace_id"] for t in traces) == sorted(ids)
+    assert peak == 4
+    assert fetcher.stats.fetched == 40
+    assert fetcher.stats.failed == 0
+
+
+@pytest.mark.asyncio
+async def test_iter_traces_skips_work_for_cache_hits_and_inline(mock_client):
+    mock_client.get_trace = AsyncMock(
+        side_effect=lambda project_id, trace_id: trace_v1.Trace(
+            project_id=project_id, trace_id=trace_id
+        )
+    )
+    warm = TraceBatchFetcher("p")
+    _ = [t async for t in warm.iter_traces(["cached"])]
+    mock_client.get_trace.reset_mock()
+
+    inline = json.dumps({"trace_id": "inline", "spans": []})
+    fetcher = TraceBatchFetcher("p")
+    traces = [t async for t in fetcher.iter_traces(["cached", inline])]
+
+    assert {t["trace_id"] for t in traces} == {"cached", "inline"}
+    mock_client.get_trace.assert_not_called()
+    assert fetcher.stats.cache_hits == 1
+    assert fetcher.stats.inline == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_traces_counts_failures_and_timeouts(mock_client):
+    async def get_trace(project_id, trace_id):
+        if trace_id == "missing":
+            raise exceptions.NotFound("Trace not found")
+        if trace_id == "slow":
+            await asyncio.sleep(1)
+        return trace_v1.Trace(project_id=project_id, trace_id=trace_id)
+
+    mock_client.get_trace = AsyncMock(side_effect=get_trace)
+    fetcher = TraceBatchFetcher("p", timeout_seconds=0.05)
+
+    traces = [t async for t in fetcher.iter_traces(["ok", "missing", "slow"])]
+
+    assert [t["trace_id"] for t in traces] == ["ok"]
+    assert fetcher.stats.to_dict() == {
+        "requested": 3,
+        "inline": 0,
+        "cache_hits": 0,
+        "fetched": 1,
+        "failed": 2,
+        "timed_out": 1,
+        "succeeded": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_timed_out_fetches_keep_their_concurrency_slot(mock_client):
+    in_flight = 0
+    peak = 0
+
+    async def get_trace(project_id, trace_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return trace_v1.Trace(project_id=project_id, trace_id=trace_id)
+
+    mock_client.get_trace = AsyncMock(side_effect=get_trace)
+    fetcher = TraceBatchFetcher("p", max_concurrency=2, timeout_seconds=0.01)
+
+    traces = [t async for t in fetcher.iter_traces([f"t{i}" for i in range(8)])]
+
+    assert traces == []
+    assert fetcher.stats.timed_out == 8
+    assert peak == 2
+
+
+def test_fetch_traces_batch_from_sync_code(mock_client):
+    mock_client.get_trace = AsyncMock(
+        side_effect=lambda project_id, trace_id: trace_v1.Trace(
+            project_id=project_id, trace_id=trace_id
+        )
+    )
+
+    traces, stats = fetch_traces_batch(["a", "b", "c"], "p")
+
+    assert sorted(t["trace_id"] for t in traces) == ["a", "b", "c"]
+    assert stats.fetched == 3
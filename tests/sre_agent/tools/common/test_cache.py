@@ -0,0 +1,345 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.cloud import trace_v1
+from google.oauth2.credentials import Credentials
+
+from sre_agent.auth import set_current_credentials
+from sre_agent.tools.common.cache import (
+    DataCache,
+    SingleFlight,
+    estimate_size,
+    get_data_cache,
+)
+
+
+def test_data_cache_hit_miss_stats():
+    cache = DataCache(sweep_interval_seconds=None)
+    cache.put("trace:a", "x" * 100)
+
+    assert cache.get("trace:a") == "x" * 100
+    assert cache.get("trace:b") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["active_entries"] == 1
+    assert stats["bytes"] == estimate_size("x" * 100)
+
+
+def test_estimate_size_handles_deep_nesting():
+    tree: dict = {"children": []}
+    node = tree
+    for _ in range(5000):
+        child: dict = {"children": []}
+        node["children"].append(child)
+        node = child
+
+    assert estimate_size(tree) > 5000 * estimate_size({})
+
+
+def test_data_cache_evicts_least_recently_used():
+    item = "x" * 1000
+    size = estimate_size(item)
+    cache = DataCache(max_bytes=size * 3, sweep_interval_seconds=None)
+    for key in ("a", "b", "c"):
+        cache.put(key, item)
+
+    cache.get("a")  # "b" becomes the least recently used entry
+    cache.put("d", item)
+
+    assert cache.get("b") is None
+    assert all(cache.get(k) == item for k in ("a", "c", "d"))
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == size * 3
+
+
+def test_data_cache_skips_values_larger_than_budget():
+    cache = DataCache(max_bytes=100, sweep_interval_seconds=None)
+    cache.put("big", "x" * 1000)
+
+    assert cache.get("big") is None
+    assert cache.size() == 0
+
+
+def test_data_cache_prefix_ttls():
+    cache = DataCache(
+        ttl_seconds=60, prefix_ttls={"logs": 0.05}, sweep_interval_seconds=None
+    )
+    cache.put("logs:p:filter", "entries")
+    cache.put("trace:abc", "trace")
+
+    assert cache.ttl_for("logs:p:filter") == 0.05
+    assert cache.ttl_for("trace:abc") == 60
+    time.sleep(0.1)
+
+    assert cache.get("logs:p:filter") is None
+    assert cache.get("trace:abc") == "trace"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_data_cache_sweeper_purges_expired_entries():
+    cache = DataCache(ttl_seconds=0.01, sweep_interval_seconds=0.02)
+    try:
+        cache.put("trace:a", "x")
+        deadline = time.monotonic() + 2
+        while cache.size() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.size() == 0
+        assert cache.stats()["bytes"] == 0
+    finally:
+        cache.close()
+
+
+def test_estimate_size_uses_nbytes():
+    from sre_agent.tools.common.trace_frame import TraceFrame
+
+    frame = TraceFrame.from_dict({"trace_id": "t", "spans": [{"span_id": "1"}]})
+    assert estimate_size(frame) == frame.nbytes > 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_async_calls():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    results = await asyncio.gather(
+        *(flight.do_async("trace:p:abc", fetch) for _ in range(6))
+    )
+
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"trace": 5}
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_distinct_keys_run_separately():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    results = await asyncio.gather(
+        flight.do_async("trace:p:a", lambda: fetch("a")),
+        flight.do_async("trace:p:b", lambda: fetch("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+    assert flight.stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_is_per_user():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch_as(creds):
+        set_current_credentials(creds)
+
+        async def fetch():
+            calls.append(creds)
+            await asyncio.sleep(0.02)
+            return creds.token
+
+        return await flight.do_async("logs:p:10:None:severity>=ERROR", fetch)
+
+    alice, bob = Credentials(token="alice"), Credentials(token="bob")
+    anonymous = Credentials(token=None)
+    results = await asyncio.gather(
+        fetch_as(alice),
+        fetch_as(Credentials(token="alice")),
+        fetch_as(bob),
+        fetch_as(anonymous),
+        fetch_as(anonymous),
+    )
+
+    assert results == ["alice", "alice", "bob", None, None]
+    assert len(calls) == 4
+    assert flight.stats() == {"logs": 1}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_exceptions_and_releases_key():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("api down")
+
+    results = await asyncio.gather(
+        flight.do_async("logs:p", boom),
+        flight.do_async("logs:p", boom),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.in_flight() == 0
+
+    async def ok():
+        return "recovered"
+
+    assert await flight.do_async("logs:p", ok) == "recovered"
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_follower_does_not_cancel_the_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "data"
+
+    leader = asyncio.create_task(flight.do_async("trace:p:abc", fetch))
+    await asyncio.sleep(0)
+    followers = [
+        asyncio.create_task(flight.do_async("trace:p:abc", fetch)) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    followers[0].cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await leader == "data"
+    assert [await f for f in followers[1:]] == ["data", "data"]
+    assert followers[0].cancelled()
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "data"
+
+    leader = asyncio.create_task(flight.do_async("trace:p:abc", fetch))
+    await asyncio.sleep(0)
+    followers = [
+        asyncio.create_task(flight.do_async("trace:p:abc", fetch)) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert [await f for f in followers] == ["data", "data"]
+    assert leader.cancelled()
+    # One follower took over as the new leader; the other joined it
+    assert calls == 2
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_sync_caller_on_the_loop_does_not_wait():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "async"
+
+    leader = asyncio.create_task(flight.do_async("trace:p:abc", fetch))
+    await asyncio.sleep(0)
+
+    # Waiting on the leader here would block the loop that has to finish it
+    assert flight.do("trace:p:abc", lambda: "sync") == "sync"
+    release.set()
+    assert await leader == "async"
+    assert flight.in_flight() == 0
+
+
+def test_single_flight_coalesces_threads():
+    flight = SingleFlight()
+    calls = 0
+    started = threading.Event()
+
+    def fetch():
+        nonlocal calls
+        calls += 1
+        started.set()
+        time.sleep(0.1)
+        return "data"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flight.do, "metrics:p", fetch)
+        started.wait()
+        followers = [pool.submit(flight.do, "metrics:p", fetch) for _ in range(3)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == ["data"] * 4
+    assert calls == 1
+    assert flight.stats() == {"metrics": 3}
+
+
+@pytest.mark.asyncio
+@patch("sre_agent.tools.clients.trace.get_trace_async_client")
+async def test_parallel_fetch_trace_issues_one_rpc(mock_get_client):
+    from sre_agent.tools.clients.trace import fetch_trace
+
+    get_data_cache().clear()
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+
+    async def slow_get_trace(**kwargs):
+        await asyncio.sleep(0.1)
+        return trace_v1.Trace(project_id="p", trace_id="shared")
+
+    mock_client.get_trace = AsyncMock(side_effect=slow_get_trace)
+
+    results = await asyncio.gather(*(fetch_trace("p", "shared") for _ in range(6)))
+
+    assert len(set(results)) == 1
+    mock_client.get_trace.assert_called_once()
+    get_data_cache().clear()
+
+
+@pytest.mark.asyncio
+@patch("sre_agent.tools.clients.trace.get_trace_client")
+@patch("sre_agent.tools.clients.trace.get_trace_async_client")
+async def test_sync_tool_on_the_loop_during_async_fetch(
+    mock_get_async_client, mock_get_client
+):
+    from sre_agent.tools.clients.trace import fetch_trace, fetch_trace_data
+
+    get_data_cache().clear()
+
+    async def slow_get_trace(**kwargs):
+        await asyncio.sleep(0.05)
+        return trace_v1.Trace(project_id="p", trace_id="shared")
+
+    mock_get_async_client.return_value.get_trace = AsyncMock(side_effect=slow_get_trace)
+    mock_get_client.return_value.get_trace.return_value = trace_v1.Trace(
+        project_id="p", trace_id="shared"
+    )
+
+    async_fetch = asyncio.create_task(fetch_trace("p", "shared"))
+    await asyncio.sleep(0.01)
+    # A sync tool (e.g. analyze_critical_path) run by ADK on the loop thread
+    data = fetch_trace_data("shared", "p")
+
+    assert data["trace_id"] == "shared"
+    assert "shared" in await async_fetch
+    get_data_cache().clear()
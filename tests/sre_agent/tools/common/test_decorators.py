@@ -0,0 +1,288 @@
+import logging
+from unittest import mock
+
+import pytest
+
+from sre_agent.tools.common import decorators
+from sre_agent.tools.common.decorators import adk_tool
+
+
+class _Loud:
+    """Argument whose repr is counted."""
+
+    calls = 0
+
+    def __repr__(self):
+        type(self).calls += 1
+        return "Loud()"
+
+
+@pytest.fixture
+def span():
+    span = mock.MagicMock()
+    span.is_recording.return_value = True
+    tracer = mock.MagicMock()
+    tracer.start_as_current_span.return_value.__enter__.return_value = span
+    with mock.patch.object(decorators, "tracer", tracer):
+        yield span
+
+
+@pytest.fixture(autouse=True)
+def _reset_loud():
+    _Loud.calls = 0
+
+
+def _attributes(span):
+    return {c.args[0]: c.args[1] for c in span.set_attribute.call_args_list}
+
+
+def test_signature_is_resolved_once(span):
+    @adk_tool
+    def tool(a, b=2):
+        return a + b
+
+    with mock.patch.object(
+        decorators.inspect, "signature", side_effect=AssertionError("resolved")
+    ):
+        assert tool(1) == 3
+
+    assert _attributes(span)["arg.b"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_async_tool_records_arguments_and_result(span):
+    @adk_tool
+    async def tool(trace_id):
+        return {"trace_id": trace_id}
+
+    assert await tool("abc") == {"trace_id": "abc"}
+
+    attributes = _attributes(span)
+    assert attributes["tool.name"] == "tool"
+    assert attributes["arg.trace_id"] == "abc"
+    assert attributes["tool.result"] == "{'trace_id': 'abc'}"
+
+
+def test_nothing_is_formatted_when_disabled(span):
+    span.is_recording.return_value = False
+
+    @adk_tool
+    def tool(value):
+        return value
+
+    with mock.patch.object(decorators.logger, "isEnabledFor", return_value=False):
+        tool(_Loud())
+
+    assert _Loud.calls == 0
+    assert set(_attributes(span)) == {"tool.name", "code.function"}
+
+
+def test_large_arguments_are_not_fully_formatted(span, caplog):
+    @adk_tool
+    def tool(entries):
+        return len(entries)
+
+    entries = [_Loud() for _ in range(10_000)]
+    with caplog.at_level(logging.INFO, logger=decorators.logger.name):
+        assert tool(entries) == 10_000
+
+    assert _Loud.calls <= 2 * decorators._repr.maxlist
+    (call_line,) = [r.message for r in caplog.records if "Tool Call" in r.message]
+    assert "entries=[Loud(), Loud()" in call_line
+    assert len(call_line) < 300
+
+
+def test_long_string_attributes_are_truncated(span):
+    @adk_tool
+    def tool(payload):
+        return None
+
+    tool("x" * 5000)
+
+    assert _attributes(span)["arg.payload"] == "x" * 1000 + "...(truncated)"
+
+
+def test_attribute_sampling(span):
+    @adk_tool
+    def tool(value):
+        return value
+
+    with mock.patch.object(decorators, "ATTRIBUTE_SAMPLE_RATE", 0.0):
+        tool("abc")
+
+    assert "arg.value" not in _attributes(span)
+    assert "tool.result" not in _attributes(span)
+
+
+def test_failures_are_recorded_and_raised(span):
+    @adk_tool
+    def tool():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        tool()
+
+    span.record_exception.assert_called_once()
+    span.set_status.assert_called_once()
+
+
+def test_memoized_tool_runs_once_per_arguments(span):
+    calls = []
+
+    @adk_tool(memoize=True)
+    def tool(trace_id, project_id=None):
+        calls.append(trace_id)
+        return {"trace_id": trace_id}
+
+    first = tool("abc")
+    assert tool("abc", project_id=None) == first
+    assert tool(trace_id="abc") == first
+    assert tool("def") == {"trace_id": "def"}
+
+    assert calls == ["abc", "def"]
+    assert (
+        span.set_attribute.call_args_list.count(mock.call("tool.cache_hit", True)) == 2
+    )
+
+
+@pytest.mark.asyncio
+async def test_memoized_async_tool(span):
+    calls = []
+
+    @adk_tool(memoize=True)
+    async def tool(trace_id):
+        calls.append(trace_id)
+        return [trace_id]
+
+    assert await tool("abc") == await tool("abc") == ["abc"]
+    assert calls == ["abc"]
+
+
+def test_memoized_results_are_copies(span):
+    @adk_tool(memoize=True)
+    def tool(trace_id):
+        return {"spans": [trace_id]}
+
+    first = tool("abc")
+    first["spans"] = ["changed"]
+    second = tool("abc")
+    second.clear()
+
+    assert tool("abc") == {"spans": ["abc"]}
+
+
+def test_memoized_results_copy_only_the_top_level(span):
+    shared = {"spans": ["abc"]}
+
+    @adk_tool(memoize=True)
+    def tool(trace_id):
+        return shared
+
+    with mock.patch.object(decorators.copy, "deepcopy") as deepcopy:
+        first = tool("abc")
+        second = tool("abc")
+        unkeyed = tool(_Loud())
+
+    deepcopy.assert_not_called()
+    assert first is not shared and second is not shared
+    assert second["spans"] is shared["spans"]
+    assert unkeyed is shared
+
+
+def test_uncached_results_are_not_copied(span):
+    error = [{"error": "trace not found"}]
+
+    @adk_tool(memoize=True)
+    def tool(trace_id):
+        return error
+
+    with mock.patch.object(decorators.copy, "copy") as copy:
+        assert tool("missing") is error
+
+    copy.assert_not_called()
+
+
+def test_memoized_results_are_per_user(span):
+    calls = []
+
+    @adk_tool(memoize=True)
+    def tool(trace_id):
+        calls.append(trace_id)
+        return {"trace_id": trace_id}
+
+    users = [mock.MagicMock(token="alice"), mock.MagicMock(token="bob")]
+    for creds in [*users, users[0], None]:
+        with mock.patch.object(
+            decorators, "get_current_credentials_or_none", return_value=creds
+        ):
+            tool("abc")
+
+    assert len(calls) == 3
+
+
+def test_memoization_skips_credentials_without_identity(span):
+    calls = []
+
+    @adk_tool(memoize=True)
+    def tool(trace_id):
+        calls.append(trace_id)
+        return {"trace_id": trace_id}
+
+    creds = [
+        mock.MagicMock(token=None, service_account_email=None),
+        mock.MagicMock(
+            token=None, service_account_email="sa@p.iam.gserviceaccount.com"
+        ),
+    ]
+    for user in [creds[0], creds[0], creds[1], creds[1]]:
+        with mock.patch.object(
+            decorators, "get_current_credentials_or_none", return_value=user
+        ):
+            tool("abc")
+
+    assert len(calls) == 3
+
+
+def test_memoization_skips_errors_and_unkeyable_arguments(span):
+    calls = []
+
+    @adk_tool(memoize=True)
+    def tool(value):
+        calls.append(value)
+        return [{"error": "trace not found"}] if value == "missing" else {"ok": True}
+
+    tool("missing")
+    tool("missing")
+    tool(_Loud())
+    tool(_Loud())
+
+    assert len(calls) == 4
+    assert decorators.get_tool_result_cache().size() == 0
+
+
+def test_memoized_results_expire(span):
+    calls = []
+
+    @adk_tool(memoize=True, ttl=0)
+    def tool(value):
+        calls.append(value)
+        return {"value": value}
+
+    tool(1)
+    tool(1)
+
+    assert calls == [1, 1]
+
+
+def test_unmemoized_tools_do_not_cache(span):
+    calls = []
+
+    @adk_tool
+    def tool(value):
+        calls.append(value)
+        return {"value": value}
+
+    tool(1)
+    tool(1)
+
+    assert calls == [1, 1]
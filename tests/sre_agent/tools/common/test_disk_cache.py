@@ -0,0 +1,159 @@
+import asyncio
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from sre_agent.tools.common import disk_cache
+from sre_agent.tools.common.cache import DataCache
+from sre_agent.tools.common.disk_cache import DiskCache
+from sre_agent.tools.common.trace_frame import TraceFrame
+
+
+def _frame(trace_id="abc"):
+    return TraceFrame.from_dict(
+        {
+            "trace_id": trace_id,
+            "project_id": "p",
+            "spans": [
+                {
+                    "span_id": "1",
+                    "name": "root",
+                    "start_time": "2024-01-01T00:00:00+00:00",
+                    "end_time": "2024-01-01T00:00:01+00:00",
+                }
+            ],
+        }
+    )
+
+
+def test_disk_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.db")
+    disk = DiskCache(path)
+    disk.put("trace:abc", _frame())
+    disk.close()
+
+    reopened = DiskCache(path)
+    frame = reopened.get("trace:abc")
+
+    assert isinstance(frame, TraceFrame)
+    assert frame.trace_id == "abc"
+    assert frame.duration_ms.tolist() == [1000.0]
+    assert reopened.get("trace:missing") is None
+
+    with sqlite3.connect(path) as conn:
+        (mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+    assert mode == "wal"
+
+
+def test_disk_cache_evicts_least_recently_accessed(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    payload = {"blob": "x" * 50_000}
+    disk.put("trace:a", payload)
+    disk.put("trace:b", payload)
+    entry_size = disk.stats()["bytes"] // 2
+
+    disk.max_bytes = entry_size * 2
+    disk.get("trace:a")  # "b" is now the least recently accessed
+    disk.put("trace:c", payload)
+    disk.flush()
+
+    assert disk.get("trace:b") is None
+    assert disk.get("trace:a") == payload
+    assert disk.get("trace:c") == payload
+    assert disk.stats()["entries"] == 2
+
+
+def test_disk_cache_expired_entries(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"), ttl_seconds=-1)
+    disk.put("trace:a", {"x": 1})
+    disk.flush()
+
+    assert disk.get("trace:a") is None
+
+
+def test_data_cache_reads_through_disk_tier(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_a = DataCache(sweep_interval_seconds=None, disk=DiskCache(path))
+    worker_a.put("trace:abc", _frame())
+    worker_a.put("logs:p:filter", "not persisted")
+    worker_a.disk.flush()
+
+    # A second worker (or a restart) starts with an empty memory tier.
+    worker_b = DataCache(sweep_interval_seconds=None, disk=DiskCache(path))
+    frame = worker_b.get("trace:abc")
+
+    assert isinstance(frame, TraceFrame)
+    assert worker_b.get("trace:abc") is frame
+    assert worker_b.get("logs:p:filter") is None
+    stats = worker_b.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["hits"] == 1
+    assert stats["disk"]["entries"] == 1
+
+
+def test_disk_cache_skips_unserializable_values(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    disk.put("trace:a", object())
+
+    assert disk.stats()["entries"] == 0
+
+
+def test_disk_cache_get_is_read_only(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+    disk.put("trace:a", {"x": 1})
+    disk.flush()
+
+    with patch.object(disk, "_conn", wraps=disk._conn) as conn:
+        assert disk.get("trace:a") == {"x": 1}
+        assert disk.get("trace:missing") is None
+
+    statements = [c.args[0].split()[0] for c in conn.execute.call_args_list]
+    assert statements == ["SELECT", "SELECT"]
+    conn.commit.assert_not_called()
+
+
+def test_disk_cache_put_writes_behind(tmp_path):
+    disk = DiskCache(str(tmp_path / "cache.db"))
+
+    with patch(
+        "sre_agent.tools.common.disk_cache._encode", wraps=disk_cache._encode
+    ) as encode:
+        disk.put("trace:a", _frame())
+        disk.flush()
+
+    assert encode.call_count == 1
+    assert disk._writer is not None
+    assert disk.get("trace:a").trace_id == "abc"
+
+
+@pytest.mark.asyncio
+async def test_data_cache_get_async_reads_disk_in_a_thread(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer = DataCache(sweep_interval_seconds=None, disk=DiskCache(path))
+    writer.put("trace:abc", _frame())
+    writer.disk.flush()
+
+    reader = DataCache(sweep_interval_seconds=None, disk=DiskCache(path))
+    with patch("asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+        frame = await reader.get_async("trace:abc")
+        assert await reader.get_async("trace:abc") is frame
+
+    assert isinstance(frame, TraceFrame)
+    assert to_thread.call_count == 1
+    assert await reader.get_async("trace:missing") is None
+
+
+def test_data_cache_stats_query_the_disk_tier_without_the_lock(tmp_path):
+    cache = DataCache(sweep_interval_seconds=None, disk=DiskCache(str(tmp_path / "c")))
+    cache.put("trace:abc", _frame())
+    disk_stats = cache.disk.stats
+
+    def stats():
+        # Another thread could use the memory tier meanwhile
+        assert cache._lock.acquire(blocking=False)
+        cache._lock.release()
+        return disk_stats()
+
+    with patch.object(cache.disk, "stats", side_effect=stats):
+        assert cache.stats()["disk"]["entries"] == 1
@@ -0,0 +1,162 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from google.cloud import logging_v2, monitoring_v3, trace_v1
+from google.protobuf.timestamp_pb2 import Timestamp
+
+from sre_agent.tools.common.proto_convert import (
+    MAX_PAYLOAD_CHARS,
+    isoformat_ns,
+    log_entry_to_dict,
+    raw_message,
+    time_series_to_dict,
+    timestamp_ns,
+    trace_span_columns,
+    trace_summary,
+)
+from sre_agent.tools.common.trace_frame import TraceFrame, datetime_to_ns
+
+
+def _trace():
+    return trace_v1.Trace(
+        project_id="p",
+        trace_id="abc",
+        spans=[
+            trace_v1.TraceSpan(
+                span_id=1,
+                name="GET /api",
+                start_time=Timestamp(seconds=1_700_000_000, nanos=0),
+                end_time=Timestamp(seconds=1_700_000_001, nanos=250_000_000),
+                labels={"/http/status_code": "200", "/http/url": "/api"},
+            ),
+            trace_v1.TraceSpan(
+                span_id=2,
+                parent_span_id=1,
+                name="db",
+                start_time=Timestamp(seconds=1_700_000_000, nanos=123_456_789),
+            ),
+        ],
+    )
+
+
+def test_raw_message_unwraps_proto_plus_only():
+    trace = _trace()
+    pb = raw_message(trace)
+
+    assert pb is type(trace).pb(trace)
+    assert raw_message(pb) is pb
+    assert raw_message(MagicMock()) is None
+    assert raw_message({"spans": []}) is None
+
+
+def test_isoformat_matches_proto_plus_datetimes():
+    trace = _trace()
+    pb = raw_message(trace)
+    for span, span_pb in zip(trace.spans, pb.spans, strict=True):
+        ns = timestamp_ns(span_pb, "start_time")
+        assert ns == datetime_to_ns(span.start_time)
+        assert isoformat_ns(ns) == span.start_time.isoformat()
+
+    assert timestamp_ns(pb.spans[1], "end_time") is None
+
+
+def test_trace_span_columns_match_attribute_access():
+    trace = _trace()
+    spans, starts, ends = trace_span_columns(raw_message(trace))
+
+    assert [s["span_id"] for s in spans] == [1, 2]
+    assert spans[0]["labels"] == dict(trace.spans[0].labels)
+    assert spans[0]["end_time"] == trace.spans[0].end_time.isoformat()
+    assert spans[1]["end_time"] is None
+    assert starts[1] == 1_700_000_000_123_456_789
+    assert ends == [1_700_000_001_250_000_000, None]
+
+
+def test_from_proto_fast_path_matches_attribute_path():
+    trace = _trace()
+    fast = TraceFrame.from_proto(trace).to_dict()
+
+    # A duck-typed object takes the attribute-based path
+    duck = SimpleNamespace(
+        trace_id=trace.trace_id, project_id=trace.project_id, spans=trace.spans
+    )
+    legacy = TraceFrame.from_proto(duck).to_dict()
+
+    assert dict(fast) == dict(legacy)
+
+
+def test_trace_summary():
+    summary = trace_summary(raw_message(_trace()))
+
+    assert summary == {
+        "trace_id": "abc",
+        "project_id": "p",
+        "name": "GET /api",
+        "start_time": "2023-11-14T22:13:20+00:00",
+        "duration_ms": 1250.0,
+        "status": "200",
+        "url": "/api",
+    }
+
+
+def test_log_entry_to_dict():
+    entry = logging_v2.types.LogEntry(
+        timestamp=Timestamp(seconds=1_700_000_000, nanos=5_000),
+        severity=500,
+        json_payload={"message": "boom", "code": 3},
+        resource={"type": "k8s_container", "labels": {"pod": "p-1"}},
+        insert_id="i1",
+    )
+
+    result = log_entry_to_dict(raw_message(entry))
+
+    assert result == {
+        "timestamp": entry.timestamp.isoformat(),
+        "severity": "ERROR",
+        "payload": {"message": "boom", "code": 3.0},
+        "resource": {"type": "k8s_container", "labels": {"pod": "p-1"}},
+        "insert_id": "i1",
+    }
+
+
+def test_log_entry_text_payload_is_truncated():
+    entry = logging_v2.types.LogEntry(text_payload="x" * (MAX_PAYLOAD_CHARS + 10))
+
+    result = log_entry_to_dict(raw_message(entry))
+
+    assert result["timestamp"] is None
+    assert result["severity"] == "DEFAULT"
+    assert result["payload"].endswith("...(truncated)")
+    assert len(result["payload"]) == MAX_PAYLOAD_CHARS + len("...(truncated)")
+
+
+def test_time_series_to_dict_reads_typed_values():
+    series = monitoring_v3.TimeSeries(
+        metric={"type": "custom/m", "labels": {"k": "v"}},
+        resource={"type": "gce_instance", "labels": {"instance_id": "1"}},
+        points=[
+            {
+                "interval": {"end_time": {"seconds": 1_700_000_060}},
+                "value": {"double_value": 1.5},
+            },
+            {
+                "interval": {"end_time": {"seconds": 1_700_000_000}},
+                "value": {"int64_value": 7},
+            },
+        ],
+    )
+
+    result = time_series_to_dict(raw_message(series))
+
+    assert result["metric"] == {"type": "custom/m", "labels": {"k": "v"}}
+    assert result["resource"] == {
+        "type": "gce_instance",
+        "labels": {"instance_id": "1"},
+    }
+    assert result["points"] == [
+        {
+            "timestamp": series.points[0].interval.end_time.isoformat(),
+            "value": 1.5,
+        },
+        {"timestamp": "2023-11-14T22:13:20+00:00", "value": 7.0},
+    ]
@@ -0,0 +1,86 @@
+import json
+import random
+import statistics
+
+import pytest
+
+from sre_agent.tools.common.sketch import QuantileSketch
+
+
+def _lognormal(n, seed=7):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(3, 1) for _ in range(n)]
+
+
+def test_small_samples_are_exact():
+    sketch = QuantileSketch()
+    for v in [5.0, 1.0, 4.0, 2.0, 3.0]:
+        sketch.add(v)
+
+    assert sketch.is_exact
+    summary = sketch.summary()
+    assert summary["median"] == 3.0
+    assert summary["p90"] == 5.0
+    assert summary["min"] == 1.0
+    assert summary["max"] == 5.0
+    assert summary["stdev"] == pytest.approx(statistics.stdev([1, 2, 3, 4, 5]))
+
+
+def test_quantiles_within_relative_accuracy():
+    values = _lognormal(50_000)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+
+    assert not sketch.is_exact
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.95, 0.99):
+        expected = ordered[int(len(ordered) * q)]
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.02)
+    assert sketch.mean == pytest.approx(statistics.mean(values))
+    assert sketch.stdev == pytest.approx(statistics.stdev(values))
+
+
+def test_merge_matches_single_sketch():
+    values = _lognormal(20_000)
+    whole = QuantileSketch()
+    parts = [QuantileSketch() for _ in range(4)]
+    for i, v in enumerate(values):
+        whole.add(v)
+        parts[i % 4].add(v)
+
+    merged = QuantileSketch()
+    for part in parts:
+        merged.merge(part)
+
+    assert merged.count == whole.count
+    assert merged.quantile(0.99) == whole.quantile(0.99)
+    assert merged.variance == pytest.approx(whole.variance)
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(relative_accuracy=0.01).merge(
+            QuantileSketch(relative_accuracy=0.05)
+        )
+
+
+def test_bins_are_bounded():
+    sketch = QuantileSketch(max_bins=128, exact_limit=0)
+    for v in _lognormal(10_000):
+        sketch.add(v)
+
+    assert len(sketch.to_dict()["positive"]) <= 128
+    # Collapsing only merges the low buckets, so the tail stays accurate.
+    ordered = sorted(_lognormal(10_000))
+    assert sketch.quantile(0.99) == pytest.approx(ordered[9900], rel=0.02)
+
+
+def test_round_trip_through_json():
+    sketch = QuantileSketch(exact_limit=10)
+    for v in [0.0, -3.0, *_lognormal(100)]:
+        sketch.add(v)
+
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+    assert restored.summary() == sketch.summary()
@@ -0,0 +1,196 @@
+import json
+import math
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from google.cloud import trace_v1
+from google.protobuf.timestamp_pb2 import Timestamp
+
+from sre_agent.tools.common.trace_frame import (
+    NO_PARENT,
+    TraceDict,
+    TraceFrame,
+    as_trace_frame,
+    parse_timestamp_ns,
+)
+
+
+def _sample_trace():
+    return {
+        "trace_id": "t1",
+        "spans": [
+            {
+                "span_id": "root",
+                "name": "GET /api",
+                "start_time": "2024-01-01T00:00:00Z",
+                "end_time": "2024-01-01T00:00:01Z",
+                "parent_span_id": None,
+                "labels": {"service.name": "frontend"},
+            },
+            {
+                "span_id": "db",
+                "name": "db.query",
+                "start_time": "2024-01-01T00:00:00.100Z",
+                "end_time": "2024-01-01T00:00:00.350Z",
+                "parent_span_id": "root",
+                "labels": {"/http/status_code": "500"},
+            },
+            {
+                "span_id": "db2",
+                "name": "db.query",
+                "duration_ms": 42,
+                "parent_span_id": "root",
+                "labels": {},
+            },
+            {
+                "span_id": "orphan",
+                "name": "late",
+                "start_time": "not-a-timestamp",
+                "end_time": "2024-01-01T00:00:02Z",
+                "parent_span_id": "missing",
+            },
+        ],
+    }
+
+
+def test_parse_timestamp_ns():
+    assert parse_timestamp_ns("1970-01-01T00:00:01Z") == 1_000_000_000
+    assert parse_timestamp_ns("1970-01-01T00:00:00.000250+00:00") == 250_000
+    assert parse_timestamp_ns(datetime(1970, 1, 1, 0, 0, 2)) == 2_000_000_000
+    assert parse_timestamp_ns("garbage") is None
+    assert parse_timestamp_ns(None) is None
+
+
+def test_from_dict_columns():
+    frame = TraceFrame.from_dict(_sample_trace())
+
+    assert frame.span_count == 4
+    assert frame.names == ("GET /api", "db.query", "late")
+    assert frame.name_ids.tolist() == [0, 1, 1, 2]
+    assert frame.duration_ms[0] == 1000.0
+    assert frame.duration_ms[1] == 250.0
+    # Explicit durations win over missing timestamps
+    assert frame.span_duration_ms(2) == 42.0
+    # Unparseable start time leaves the duration unknown
+    assert frame.span_duration_ms(3) is None
+    assert math.isnan(frame.duration_ms[3])
+    assert frame.has_timing.tolist() == [True, True, False, False]
+    assert frame.parent_index.tolist() == [NO_PARENT, 0, 0, NO_PARENT]
+    assert frame.is_error.tolist() == [False, True, False, False]
+    assert frame.service_names == ["frontend", None, None, None]
+
+
+def test_children_index():
+    frame = TraceFrame.from_dict(_sample_trace())
+
+    assert frame.root_rows.tolist() == [0, 3]
+    assert frame.children_of(0).tolist() == [1, 2]
+    assert frame.children_of(1).tolist() == []
+    assert frame.row_by_span_id["db2"] == 2
+
+
+def test_trace_duration_derived_from_spans():
+    frame = TraceFrame.from_dict(_sample_trace())
+    assert frame.trace_duration_ms == 2000.0
+
+    explicit = TraceFrame.from_dict({**_sample_trace(), "duration_ms": 5})
+    assert explicit.trace_duration_ms == 5.0
+
+
+def test_from_proto_matches_legacy_dict():
+    trace = trace_v1.Trace(
+        project_id="p",
+        trace_id="abc",
+        spans=[
+            trace_v1.TraceSpan(
+                span_id=1,
+                name="root",
+                start_time=Timestamp(seconds=1_700_000_000, nanos=0),
+                end_time=Timestamp(seconds=1_700_000_001, nanos=500_000_000),
+                labels={"k": "v"},
+            ),
+            trace_v1.TraceSpan(
+                span_id=2,
+                parent_span_id=1,
+                name="child",
+                start_time=Timestamp(seconds=1_700_000_000, nanos=123_456_789),
+                end_time=Timestamp(seconds=1_700_000_001, nanos=0),
+            ),
+        ],
+    )
+
+    frame = TraceFrame.from_proto(trace)
+    view = frame.to_dict()
+
+    assert list(view) == [
+        "trace_id",
+        "project_id",
+        "spans",
+        "span_count",
+        "duration_ms",
+    ]
+    assert view["span_count"] == 2
+    assert view["duration_ms"] == 1500.0
+    assert (
+        view["spans"][0]["start_time"]
+        == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc).isoformat()
+    )
+    assert view["spans"][1]["parent_span_id"] == 1
+    # Nanosecond precision is kept in the columns
+    assert frame.start_ns[1] == 1_700_000_000_123_456_789
+    assert frame.parent_index.tolist() == [NO_PARENT, 0]
+    assert json.loads(json.dumps(view))["trace_id"] == "abc"
+
+
+def test_nbytes_covers_derived_views_and_json_is_not_kept():
+    from sre_agent.tools.common.cache import estimate_size
+    from sre_agent.tools.common.trace_index import get_trace_index
+
+    frame = TraceFrame.from_dict(_sample_trace())
+    index = get_trace_index(frame)
+    assert index.call_tree and index.span_timings
+
+    assert frame.nbytes > estimate_size(frame.spans) + 500 * len(frame)
+    serialized = frame.to_json()
+    assert json.loads(serialized)["trace_id"] == "t1"
+    assert not any(v == serialized for v in vars(frame).values() if isinstance(v, str))
+
+
+def test_as_trace_frame_reuses_attached_frame():
+    frame = TraceFrame.from_dict(_sample_trace())
+    view = frame.to_dict()
+
+    assert isinstance(view, TraceDict)
+    assert view is frame.to_dict()
+    assert as_trace_frame(view) is frame
+    assert as_trace_frame(_sample_trace()) is not frame
+
+
+@patch("sre_agent.tools.clients.trace.get_trace_client")
+def test_fetch_trace_data_attaches_frame(mock_get_client):
+    from sre_agent.tools.clients.trace import fetch_trace_data
+    from sre_agent.tools.common.cache import get_data_cache
+
+    get_data_cache().clear()
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get_trace.return_value = trace_v1.Trace(
+        project_id="p",
+        trace_id="frame-trace",
+        spans=[
+            trace_v1.TraceSpan(
+                span_id=1,
+                name="root",
+                start_time=Timestamp(seconds=10),
+                end_time=Timestamp(seconds=11),
+            )
+        ],
+    )
+
+    first = fetch_trace_data("frame-trace", "p")
+    second = fetch_trace_data("frame-trace", "p")
+
+    mock_client.get_trace.assert_called_once()
+    assert as_trace_frame(first) is as_trace_frame(second)
+    assert as_trace_frame(first).duration_ms.tolist() == [1000.0]
+    get_data_cache().clear()
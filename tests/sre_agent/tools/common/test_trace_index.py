@@ -0,0 +1,226 @@
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sre_agent.tools.common.trace_frame import NO_PARENT, TraceFrame
+from sre_agent.tools.common.trace_index import (
+    TraceIndex,
+    compute_critical_path,
+    get_trace_index,
+)
+
+
+def _fan_out_chains(chains, depth):
+    """Deep chains hanging off a wide concurrent fan-out.
+
+    Chain c has `depth` nested spans; its span at `level` runs from `level`
+    to `chains + c - level` ms, so the last chain is the critical one.
+    """
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ms = [base + timedelta(milliseconds=i) for i in range(2 * chains + 1)]
+    spans = [
+        _span("root", None, None) | {"start_time": ms[0], "end_time": ms[2 * chains]}
+    ]
+    for chain in range(chains):
+        parent = "root"
+        for level in range(depth):
+            span_id = f"c{chain}-{level}"
+            span = _span(span_id, parent, None)
+            span["start_time"] = ms[level]
+            span["end_time"] = ms[chains + chain - level]
+            spans.append(span)
+            parent = span_id
+    return spans
+
+
+def _span(span_id, parent_id, duration_ms, name="op"):
+    return {
+        "span_id": span_id,
+        "parent_span_id": parent_id,
+        "name": name,
+        "duration_ms": duration_ms,
+    }
+
+
+def _timed(span_id, parent_id, start_ms, end_ms, name="op"):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return {
+        "span_id": span_id,
+        "parent_span_id": parent_id,
+        "name": name,
+        "start_time": (base + timedelta(milliseconds=start_ms)).isoformat(),
+        "end_time": (base + timedelta(milliseconds=end_ms)).isoformat(),
+    }
+
+
+class TestComputeCriticalPath:
+    """Tests for the iterative critical path engine."""
+
+    def test_follows_longest_child_and_attributes_self_time(self):
+        frame = TraceFrame.from_dict(
+            {
+                "spans": [
+                    _span("root", None, 100.0),
+                    _span("a", "root", 30.0),
+                    _span("b", "root", 50.0),
+                    _span("b1", "b", 20.0),
+                    _span("b2", "b", 20.0),
+                    _span("no-id", "root", 99.0) | {"span_id": None},
+                ]
+            }
+        )
+
+        path = compute_critical_path(frame)
+
+        assert path is not None
+        assert path.rows == [0, 2, 3]
+        assert path.total_duration_ms == 100.0
+        assert path.self_time_ms.tolist()[:5] == [20.0, 30.0, 10.0, 20.0, 20.0]
+        assert path.blocking_child.tolist()[:3] == [2, NO_PARENT, 3]
+        assert path.child_count.tolist()[:3] == [2, 0, 2]
+
+    def test_concurrent_fan_out_blocks_on_union(self):
+        # 30 concurrent backend calls; call i runs from 10ms to 20 + i ms.
+        spans = [_timed("root", None, 0, 60)]
+        spans += [_timed(f"call-{i}", "root", 10, 20 + i) for i in range(30)]
+        frame = TraceFrame.from_dict({"spans": spans})
+
+        path = compute_critical_path(frame)
+
+        assert path is not None
+        assert path.rows == [0, 30]
+        assert path.depths == [0, 1]
+        assert path.blocked_ms[0] == 39.0
+        assert path.self_time_ms[0] == 21.0
+        assert path.parallel_ms[0] == sum(10 + i for i in range(30)) - 39.0
+        assert path.critical_ms[30] == 39.0
+        assert path.blocking_child[0] == 30
+
+    def test_sequential_and_overlapping_children(self):
+        frame = TraceFrame.from_dict(
+            {
+                "spans": [
+                    _timed("root", None, 0, 100),
+                    _timed("auth", "root", 5, 20),
+                    _timed("db", "root", 30, 60),
+                    _timed("cache", "root", 50, 70),
+                    _timed("async", "root", 90, 150),
+                    _timed("db-child", "db", 35, 55),
+                ]
+            }
+        )
+
+        path = compute_critical_path(frame)
+
+        assert path is not None
+        assert [frame.span_ids[r] for r in path.rows] == [
+            "root",
+            "auth",
+            "db",
+            "db-child",
+            "cache",
+            "async",
+        ]
+        assert path.depths == [0, 1, 1, 2, 1, 1]
+        # auth 15 + db 20 (until cache took over) + cache 20 + async 10 (clipped)
+        assert path.critical_ms[1:5].tolist() == [15.0, 20.0, 20.0, 10.0]
+        assert path.critical_ms[5] == 20.0
+        assert path.blocked_ms[0] == 65.0
+        assert path.parallel_ms[0] == 10.0
+        assert path.self_time_ms[0] == 35.0
+        assert path.self_time_ms[2] == 10.0
+        assert path.blocking_child[0] == 2
+
+    def test_picks_longest_root(self):
+        frame = TraceFrame.from_dict(
+            {"spans": [_span("r1", None, 10.0), _span("r2", None, 20.0)]}
+        )
+
+        path = compute_critical_path(frame)
+
+        assert path is not None
+        assert path.rows == [1]
+
+    def test_no_root(self):
+        frame = TraceFrame.from_dict({"spans": [_span("a", "missing", 10.0)]})
+
+        assert compute_critical_path(frame) is None
+
+    def test_deep_trace_does_not_recurse(self):
+        depth = sys.getrecursionlimit() * 5
+        spans = [_span("s0", None, float(depth))]
+        spans += [
+            _span(f"s{i}", f"s{i - 1}", float(depth - i)) for i in range(1, depth)
+        ]
+
+        path = compute_critical_path(TraceFrame.from_dict({"spans": spans}))
+
+        assert path is not None
+        assert len(path.rows) == depth
+        assert path.self_time_ms[0] == 1.0
+
+    def test_deep_chains_under_wide_fan_out(self):
+        # The shape benchmarked by scripts/benchmark_critical_path.py, smaller.
+        frame = TraceFrame.from_dict({"spans": _fan_out_chains(chains=50, depth=20)})
+
+        path = compute_critical_path(frame)
+
+        assert path is not None
+        assert len(path.rows) == 21
+        assert frame.spans[path.rows[1]]["span_id"] == "c49-0"
+
+
+def _tree_trace():
+    return {
+        "trace_id": "t1",
+        "spans": [
+            _timed("root", None, 0, 100, name="GET /checkout"),
+            _timed("auth", "root", 0, 20, name="auth"),
+            _timed("db", "root", 20, 90, name="db"),
+            _timed("db-row", "db", 30, 80, name="db"),
+            _timed("orphan", "missing", 0, 5, name="late"),
+        ],
+    }
+
+
+class TestTraceIndex:
+    """Tests for the shared per-trace index."""
+
+    def test_memoized_per_frame(self):
+        frame = TraceFrame.from_dict(_tree_trace())
+
+        index = get_trace_index(frame)
+
+        assert get_trace_index(frame) is index
+        assert get_trace_index(frame.to_dict()) is index
+        assert index.critical_path is index.critical_path
+        assert get_trace_index(TraceFrame.from_dict(_tree_trace())) is not index
+
+    def test_depth_and_call_tree(self):
+        index = TraceIndex(TraceFrame.from_dict(_tree_trace()))
+
+        assert index.root_rows == [0]
+        assert index.depth.tolist() == [0, 1, 1, 2, -1]
+        assert index.max_depth == 2
+        (root,) = index.call_tree
+        assert root["span_id"] == "root"
+        assert [c["span_id"] for c in root["children"]] == ["auth", "db"]
+        assert root["children"][1]["children"][0]["depth"] == 2
+
+    def test_deep_call_tree_does_not_recurse(self):
+        depth = sys.getrecursionlimit() * 2
+        spans = [_span("s0", None, 1.0)]
+        spans += [_span(f"s{i}", f"s{i - 1}", 1.0) for i in range(1, depth)]
+
+        index = TraceIndex(TraceFrame.from_dict({"spans": spans}))
+
+        assert index.max_depth == depth - 1
+        assert len(index.call_tree) == 1
+
+    def test_span_views(self):
+        index = TraceIndex(TraceFrame.from_dict(_tree_trace()))
+
+        assert [t["span_id"] for t in index.span_timings[:2]] == ["root", "db"]
+        assert index.durations_by_name["db"] == [70.0, 50.0]
+        assert index.service_names == [None] * 5
+        assert not index.is_error.any()
+        assert index.children_of(2).tolist() == [3]
@@ -0,0 +1,309 @@
+"""Tests for the MCP toolset pool."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from sre_agent.schema import ToolStatus
+from sre_agent.tools.mcp.gcp import call_mcp_tool_with_retry
+from sre_agent.tools.mcp.mock_mcp import MockMcpToolset
+from sre_agent.tools.mcp.pool import McpToolsetPool, get_mcp_toolset_pool
+
+
+def _connector():
+    """Connect function returning new mock toolsets, with the ones it made."""
+    opened = []
+
+    async def connect():
+        toolset = MockMcpToolset()
+        toolset.close = AsyncMock()
+        toolset.get_tools = AsyncMock(wraps=toolset.get_tools)
+        opened.append(toolset)
+        return toolset
+
+    return connect, opened
+
+
+@pytest.mark.asyncio
+async def test_warm_toolset_is_reused():
+    pool = McpToolsetPool()
+    connect, opened = _connector()
+
+    first = await pool.get_tools(("logging", "p1"), connect)
+    second = await pool.get_tools(("logging", "p1"), connect)
+
+    assert len(opened) == 1
+    assert second is first
+    assert set(first) == {"list_log_entries", "list_timeseries", "query_range"}
+    opened[0].get_tools.assert_awaited_once()
+    opened[0].close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_toolsets_are_per_key():
+    pool = McpToolsetPool()
+    connect, opened = _connector()
+
+    await pool.get_tools(("logging", "p1"), connect)
+    await pool.get_tools(("logging", "p2"), connect)
+
+    assert len(opened) == 2
+    assert len(pool.stats()["toolsets"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_toolset_is_closed_and_replaced():
+    pool = McpToolsetPool(idle_ttl_seconds=0)
+    connect, opened = _connector()
+
+    await pool.get_tools("key", connect)
+    await pool.get_tools("key", connect)
+
+    assert len(opened) == 2
+    opened[0].close.assert_awaited_once()
+    opened[1].close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_aged_toolset_is_replaced_even_when_busy():
+    pool = McpToolsetPool(max_age_seconds=0)
+    connect, opened = _connector()
+
+    await pool.get_tools("key", connect)
+    await pool.get_tools("key", connect)
+
+    assert len(opened) == 2
+    opened[0].close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_health_check_refreshes_tools_without_reconnecting():
+    pool = McpToolsetPool(health_check_seconds=0)
+    connect, opened = _connector()
+
+    await pool.get_tools("key", connect)
+    await pool.get_tools("key", connect)
+
+    assert len(opened) == 1
+    assert opened[0].get_tools.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_health_check_reconnects():
+    pool = McpToolsetPool(health_check_seconds=0)
+    connect, opened = _connector()
+
+    await pool.get_tools("key", connect)
+    opened[0].get_tools.side_effect = ConnectionError("session closed")
+    tools = await pool.get_tools("key", connect)
+
+    assert len(opened) == 2
+    opened[0].close.assert_awaited_once()
+    assert "query_range" in tools
+
+
+@pytest.mark.asyncio
+async def test_invalidate_reconnects_on_next_use():
+    pool = McpToolsetPool()
+    connect, opened = _connector()
+
+    await pool.get_tools("key", connect)
+    await pool.invalidate("key")
+    await pool.get_tools("key", connect)
+
+    assert len(opened) == 2
+    opened[0].close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unavailable_toolset_is_not_pooled():
+    pool = McpToolsetPool()
+    connect = AsyncMock(return_value=None)
+
+    assert await pool.get_tools("key", connect) is None
+    assert await pool.get_tools("key", connect) is None
+    assert connect.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_toolset_failing_to_list_tools_is_closed():
+    pool = McpToolsetPool()
+    toolset = MagicMock()
+    toolset.get_tools = AsyncMock(side_effect=ConnectionError("handshake failed"))
+    toolset.close = AsyncMock()
+
+    with pytest.raises(ConnectionError):
+        await pool.get_tools("key", AsyncMock(return_value=toolset))
+
+    toolset.close.assert_awaited_once()
+    assert pool.stats()["toolsets"] == []
+
+
+@pytest.mark.asyncio
+async def test_close_closes_every_toolset():
+    pool = McpToolsetPool()
+    connect, opened = _connector()
+    await pool.get_tools("a", connect)
+    await pool.get_tools("b", connect)
+
+    await pool.close()
+
+    for toolset in opened:
+        toolset.close.assert_awaited_once()
+    assert pool.stats()["toolsets"] == []
+
+
+@pytest.mark.asyncio
+async def test_evicted_toolsets_leave_no_locks_or_reasons():
+    pool = McpToolsetPool(idle_ttl_seconds=0.05)
+    connect, _ = _connector()
+
+    async def unavailable():
+        return None
+
+    await pool.get_tools("idle", connect)
+    await pool.get_tools("broken", connect)
+    await pool.invalidate("broken")
+    await pool.get_tools("unavailable", unavailable)
+    await asyncio.sleep(0.06)
+    await pool.evict_idle()
+
+    assert pool._entries == {}
+    assert pool._locks == {}
+    assert pool._invalidated == {}
+
+
+class TestCallMcpToolWithPool:
+    """call_mcp_tool_with_retry keeps sessions open between calls."""
+
+    @pytest.fixture
+    def toolset(self):
+        toolset = AsyncMock()
+        tool = AsyncMock()
+        tool.name = "list_log_entries"
+        tool.run_async.return_value = {"entries": []}
+        toolset.get_tools = AsyncMock(return_value=[tool])
+        return toolset, tool
+
+    @pytest.fixture(autouse=True)
+    def inline_threadpool(self):
+        with patch(
+            "fastapi.concurrency.run_in_threadpool",
+            side_effect=lambda fn, pid: fn(pid),
+        ):
+            yield
+
+    async def _call(self, create_toolset):
+        return await call_mcp_tool_with_retry(
+            create_toolset,
+            "list_log_entries",
+            {},
+            MagicMock(),
+            project_id="test-project",
+        )
+
+    @pytest.mark.asyncio
+    async def test_successive_calls_share_one_toolset(self, toolset):
+        mock_toolset, mock_tool = toolset
+        create_toolset = MagicMock(return_value=mock_toolset)
+
+        for _ in range(3):
+            result = await self._call(create_toolset)
+            assert result["status"] == ToolStatus.SUCCESS
+
+        create_toolset.assert_called_once_with("test-project")
+        assert mock_tool.run_async.await_count == 3
+        mock_toolset.close.assert_not_awaited()
+        await get_mcp_toolset_pool().close()
+        mock_toolset.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_tool_errors_keep_the_session(self, toolset):
+        mock_toolset, mock_tool = toolset
+        create_toolset = MagicMock(return_value=mock_toolset)
+        mock_tool.run_async.side_effect = Exception("404: Resource not found")
+
+        await self._call(create_toolset)
+        mock_tool.run_async.side_effect = None
+        result = await self._call(create_toolset)
+
+        assert result["status"] == ToolStatus.SUCCESS
+        create_toolset.assert_called_once()
+        mock_toolset.close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_error_reconnects_once(self, toolset):
+        mock_toolset, mock_tool = toolset
+        create_toolset = MagicMock(return_value=mock_toolset)
+        mock_tool.run_async.side_effect = [
+            Exception("401 UNAUTHENTICATED: token expired"),
+            {"entries": []},
+        ]
+
+        result = await self._call(create_toolset)
+
+        assert result["status"] == ToolStatus.SUCCESS
+        assert create_toolset.call_count == 2
+        mock_toolset.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_repeated_unauthenticated_error_is_not_retried(self, toolset):
+        mock_toolset, mock_tool = toolset
+        create_toolset = MagicMock(return_value=mock_toolset)
+        mock_tool.run_async.side_effect = Exception("401 UNAUTHENTICATED")
+
+        result = await self._call(create_toolset)
+
+        assert result["error_type"] == "AUTH_ERROR"
+        assert result["non_retryable"] is True
+        assert mock_tool.run_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_users_get_separate_toolsets(self, toolset):
+        mock_toolset, _ = toolset
+        create_toolset = MagicMock(return_value=mock_toolset)
+        users = [MagicMock(token="alice"), MagicMock(token="bob")]
+
+        for creds in [*users, users[0]]:
+            with patch(
+                "sre_agent.tools.mcp.gcp.get_current_credentials_or_none",
+                return_value=creds,
+            ):
+                await self._call(create_toolset)
+
+        assert create_toolset.call_count == 2
+        assert len(get_mcp_toolset_pool().stats()["toolsets"]) == 2
+        await get_mcp_toolset_pool().close()
+
+    @pytest.mark.asyncio
+    async def test_credentials_without_identity_get_their_own_toolset(self, toolset):
+        mock_toolset, _ = toolset
+        create_toolset = MagicMock(return_value=mock_toolset)
+        creds = MagicMock(token=None, service_account_email=None)
+
+        with patch(
+            "sre_agent.tools.mcp.gcp.get_current_credentials_or_none",
+            return_value=creds,
+        ):
+            result = await self._call(create_toolset)
+
+        assert result["status"] == ToolStatus.SUCCESS
+        mock_toolset.close.assert_awaited_once()
+        assert get_mcp_toolset_pool().stats()["toolsets"] == []
+
+    @pytest.mark.asyncio
+    async def test_session_error_reconnects(self, toolset):
+        mock_toolset, mock_tool = toolset
+        create_toolset = MagicMock(return_value=mock_toolset)
+        mock_tool.run_async.side_effect = [
+            Exception("Session terminated"),
+            {"entries": []},
+        ]
+
+        with patch("asyncio.sleep", new_callable=AsyncMock):
+            result = await self._call(create_toolset)
+
+        assert result["status"] == ToolStatus.SUCCESS
+        assert create_toolset.call_count == 2
+        mock_toolset.close.assert_awaited_once()
@@ -0,0 +1,102 @@
+import json
+import subprocess
+import sys
+from importlib import import_module
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.adk.tools import FunctionTool
+
+import sre_agent.tools as tools
+from sre_agent.tools import TOOL_MODULES
+from sre_agent.tools.registry import (
+    MANIFEST_PATH,
+    LazyTool,
+    build_tool_manifest,
+    get_lazy_tool,
+)
+
+# Imported by tools only; none of them may load when the agent starts.
+HEAVY_MODULES = [
+    "drain3",
+    "google.cloud.errorreporting_v1beta1",
+    "google.cloud.logging_v2",
+    "google.cloud.monitoring_v3",
+    "google.cloud.trace_v1",
+    "numpy",
+    "sre_agent.tools.clients.factory",
+]
+
+
+def test_manifest_is_current():
+    """Regenerate with `uv run python scripts/generate_tool_manifest.py`."""
+    with MANIFEST_PATH.open(encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    assert manifest == build_tool_manifest()
+
+
+@pytest.mark.parametrize("name", sorted(TOOL_MODULES))
+def test_tool_modules_point_at_the_tools(name):
+    module = import_module(TOOL_MODULES[name], "sre_agent.tools")
+
+    assert getattr(tools, name) is getattr(module, name)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        _ = tools.not_a_tool
+
+
+def test_agent_startup_imports_no_tool_modules():
+    code = (
+        "import sys, sre_agent.agent\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_lazy_tool_metadata_does_not_import():
+    tool = LazyTool("get_current_time")
+
+    declaration = tool._get_declaration()
+
+    assert not tool.loaded
+    assert tool.name == tool.__name__ == "get_current_time"
+    assert tool.description == FunctionTool(tools.get_current_time).description
+    assert declaration == FunctionTool(tools.get_current_time)._get_declaration()
+
+
+@pytest.mark.asyncio
+async def test_lazy_tool_runs_on_first_call():
+    tool = LazyTool("get_current_time")
+
+    result = await tool.run_async(args={}, tool_context=MagicMock())
+
+    assert tool.loaded
+    assert result.endswith("+00:00")
+    assert tool() <= tools.get_current_time()
+
+
+def test_lazy_tool_without_manifest_entry_builds_declaration():
+    with patch(
+        "sre_agent.tools.registry.load_tool_manifest", return_value={"tools": {}}
+    ):
+        tool = LazyTool("select_traces_manually")
+
+    assert (
+        tool._get_declaration()
+        == FunctionTool(tools.select_traces_manually)._get_declaration()
+    )
+    assert tool.loaded
+
+
+def test_get_lazy_tool_is_shared():
+    assert get_lazy_tool("fetch_trace") is get_lazy_tool("fetch_trace")